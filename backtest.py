@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Olay Tabanlı Backtest
+Geçmiş 15 dakikalık mumları BitcoinDailyBot'un kendi döngüsünden geçirir
+
+Simüle saat ve tekrar oynatma (replay) veri kaynağı enjekte edilir; canlı
+döngüdeki gibi her kapanan mum için bir kez run_cycle(closed_bar), açık
+pozisyon varken mumlar arasında --interval saniyede bir pozisyon izleme
+çalışır, time.sleep yerine saat ilerletilir. Sinyal, pozisyon ve sayaç
+kodları canlıyla aynıdır; canlıdan farkları:
+
+- Simüle saat UTC'dir: günlük reset UTC gece yarısında olur (canlı bot
+  sunucunun yerel saatini kullanır, UTC dışı sunucuda gün sınırı kayar)
+- Canlıda hızlı pozisyon izleyici her fiyat tick'inde kontrol eder; burada
+  kontrol --interval aralığıyla ve oluşan mumun o ana kadar kapanan 1m
+  mumlarının kapanışıyla yapılır (--minutes yoksa sadece mum açılışıyla)
+- Zamanlayıcı gecikmesi sabittir (CANDLE_CLOSE_DELAY_MS), sunucu saat farkı,
+  eksik / geç gelen mum ve Telegram / durum günlüğü / defter yoktur
+
+Kullanım:
+  python backtest.py mumlar.csv [--trades islemler.csv] [--interval 30] [--minutes mumlar_1m.csv]
+  python backtest.py data --start 2024-01-01 --end 2025-01-01   # Geçmiş deposundan
+
+Süre mum başına bir canlı döngüdür (veri, indikatörler, sinyal; ~0.3 ms): bir
+yıllık 15m veri (~35 bin mum) ~10 saniyede oynatılır. Pozisyon izleme sadece
+görünen mumlar değiştiğinde çalışır (1m mum yoksa mum başına bir kez).
+
+CSV kolonları: timestamp (ms veya tarih), open, high, low, close, volume
+Sonuçlar mumlar + bot sabitleri anahtarıyla önbelleğe yazılır (result_cache);
+aynı veri ve yapılandırmayla tekrar çalıştırma replay yapmaz (--no-cache).
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import bitcoin_daily_bot_fixed as daily
+from bitcoin_daily_bot_fixed import BitcoinDailyBot
+from history_store import HistoryStore, parse_date
+from result_cache import CACHE_ROOT, content_key, result_cache
+
+EPOCH = datetime(1970, 1, 1)
+TRADE_COLUMNS = ['type', 'entry_time', 'entry_price', 'exit_time', 'exit_price', 'net_profit',
+                 'reason']
+TIME_COLUMNS = ('entry_time', 'exit_time')
+TIME_DTYPE = 'datetime64[ns]'  # Replay ve önbellek yolu aynı birimi döndürür (pandas sürümünden bağımsız)
+
+
+def ms_to_datetime(ms):
+    return EPOCH + timedelta(milliseconds=int(ms))
+
+
+class SimulatedClock:
+    """Backtest saati - bot `clock()` ile şimdiki zamanı okur"""
+
+    def __init__(self, start_ms):
+        self.current_ms = int(start_ms)
+
+    def __call__(self):
+        return ms_to_datetime(self.current_ms)
+
+    def set(self, ms):
+        self.current_ms = int(ms)
+
+    def sleep(self, seconds):
+        self.current_ms += int(seconds * 1000)
+
+
+class ReplayExchange:
+    """
+    Kayıtlı mumları saate göre sunan sahte borsa
+
+    Saat itibarıyla kapanmış mumlar ve canlıdaki gibi oluşmakta olan son mum
+    görünür (ileriye bakış yok). Oluşan mum 1m mumlar verilmişse o ana kadar
+    kapanan dakikalardan kurulur, verilmemişse sadece açılış fiyatını taşır.
+    """
+
+    def __init__(self, candles, clock, timeframe=daily.TIMEFRAME, minutes=None):
+        """
+        Args:
+            candles: (N, 6) dizi - timestamp_ms, open, high, low, close, volume
+            clock: SimulatedClock
+            minutes: (M, 6) 1m mumlar - oluşan mumun ara fiyatları için (opsiyonel)
+        """
+        self.candles = np.asarray(candles, dtype=np.float64)
+        self.timestamps = self.candles[:, 0].astype(np.int64)
+        self.minutes = None if minutes is None else np.asarray(minutes, dtype=np.float64)
+        self.minute_timestamps = None if minutes is None else self.minutes[:, 0].astype(np.int64)
+        self.clock = clock
+        self.timeframe = timeframe
+        self.timeframe_ms = self.parse_timeframe(timeframe) * 1000
+        self.requests = 0
+
+    @staticmethod
+    def parse_timeframe(timeframe):
+        units = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+        return int(timeframe[:-1]) * units[timeframe[-1]]
+
+    def milliseconds(self):
+        return self.clock.current_ms
+
+    def forming(self, index):
+        """`index` mumunun saat itibarıyla oluşan hali (kapanmış dakikalardan)"""
+        opened, open_ = self.timestamps[index], self.candles[index, 1]
+        if self.minutes is None:
+            return [int(opened), open_, open_, open_, open_, 0.0]
+        start = int(np.searchsorted(self.minute_timestamps, opened))
+        end = int(np.searchsorted(self.minute_timestamps, self.clock.current_ms - 60_000,
+                                  side='right'))
+        minutes = self.minutes[start:end]
+        if not len(minutes):
+            return [int(opened), open_, open_, open_, open_, 0.0]
+        return [int(opened), open_, float(max(open_, minutes[:, 2].max())),
+                float(min(open_, minutes[:, 3].min())), float(minutes[-1, 4]),
+                float(minutes[:, 5].sum())]
+
+    def changes(self, ticks):
+        """
+        İzleme anlarından görünen mumları bir öncekinden farklı olanlar
+
+        Görünen kapanmış / oluşan mumlar ve oluşan mumun kapanmış dakikaları
+        aynıysa fetch_ohlcv aynı mumları döndürür: o anki izleme bir öncekiyle
+        aynı fiyatı görüp aynı kararı verir. 1m mumlar yoksa oluşan mum sadece
+        açılışı taşıdığından mum başına tek an kalır.
+        """
+        ticks = np.asarray(ticks, dtype=np.int64)
+        if not len(ticks):
+            return ticks
+        visible = [np.searchsorted(self.timestamps, ticks - self.timeframe_ms, side='right'),
+                   np.searchsorted(self.timestamps, ticks, side='right')]
+        if self.minutes is not None:
+            visible.append(np.searchsorted(self.minute_timestamps, ticks - 60_000, side='right'))
+        changed = np.zeros(len(ticks), dtype=bool)
+        changed[0] = True
+        for column in visible:
+            changed[1:] |= column[1:] != column[:-1]
+        return ticks[changed]
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.requests += 1
+        now = self.clock.current_ms
+        # Açılış + periyot <= şimdi olan mumlar kapanmıştır, açılış <= şimdi olan son mum oluşuyor
+        closed = int(np.searchsorted(self.timestamps, now - self.timeframe_ms, side='right'))
+        end = int(np.searchsorted(self.timestamps, now, side='right'))
+        if since is None:
+            start = max(0, end - (limit or 500))
+        else:
+            start = int(np.searchsorted(self.timestamps, since))
+            end = min(end, start + (limit or 500))
+        rows = self.candles[start:min(end, closed)].tolist()
+        for row in rows:
+            row[0] = int(row[0])
+        if end > closed >= start:
+            rows.append(self.forming(closed))
+        return rows
+
+
+class BacktestDailyBot(BitcoinDailyBot):
+    """Telegram göndermeyen, kapanan işlemleri kaydeden günlük bot"""
+
+    def __init__(self, exchange, clock):
+        self.trades = []
+        super().__init__(telegram_token='backtest', telegram_chat_id='backtest',
+                         exchange=exchange, clock=clock, history_dir=None,
+                         state_dir=None, ledger_path=None)
+
+    def send_telegram(self, message, status=False):
+        return True
+
+    def close_position(self, exit_price, net_profit, reason):
+        self.trades.append({
+            'type': self.position_type,
+            'entry_time': self.entry_time,
+            'entry_price': self.entry_price,
+            'exit_time': self.clock(),
+            'exit_price': exit_price,
+            'net_profit': net_profit,
+            'reason': reason,
+        })
+        super().close_position(exit_price, net_profit, reason)
+
+
+def load_candles(path, start=None, end=None):
+    """
+    Mumları (N, 6) diziye oku
+
+    `path` bir klasörse geçmiş deposundan (HistoryStore kökü) kopyasız okunur,
+    değilse CSV olarak okunur. start / end: 'YYYY-MM-DD' (sadece depo için)
+    """
+    if os.path.isdir(path):
+        store = HistoryStore(daily.SYMBOL, daily.TIMEFRAME, root=path)
+        return store.load(parse_date(start) if start else None, parse_date(end) if end else None)
+
+    df = pd.read_csv(path)
+    if not np.issubdtype(df['timestamp'].dtype, np.number):
+        df['timestamp'] = pd.to_datetime(df['timestamp']).values.astype('datetime64[ms]').astype(np.int64)
+    return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+
+
+def run_backtest(candles, monitor_interval=daily.POSITION_CHECK_INTERVAL,
+                 warmup=daily.CANDLE_WINDOW, minutes=None):
+    """
+    Mumları canlı döngüdeki gibi bota oynat
+
+    Her mum kapanışında (kapanış + CANDLE_CLOSE_DELAY_MS) run_cycle(closed_bar)
+    bir kez çağrılır. Açık pozisyon varken sonraki kapanışa kadar
+    `monitor_interval` saniyede bir monitor_position çalışır (zamanlayıcının
+    TICK olayları gibi); görünen mumları bir öncekiyle aynı olan anlar
+    atlanır, sonuç her anı çalıştırmakla aynıdır.
+
+    Args:
+        monitor_interval: Pozisyon izleme aralığı (saniye, None / 0: kapalı)
+        minutes: (M, 6) 1m mumlar - verilirse izleme oluşan mumun ara fiyatlarını görür
+
+    Returns:
+        (trades, daily_pnl): İşlem listesi DataFrame'i ve gün bazında net kar (%)
+    """
+    candles = np.asarray(candles, dtype=np.float64)
+    timeframe_ms = ReplayExchange.parse_timeframe(daily.TIMEFRAME) * 1000
+    timestamps = candles[:, 0].astype(np.int64)
+    events = timestamps + timeframe_ms + daily.CANDLE_CLOSE_DELAY_MS
+    first = min(warmup, len(candles) - 1)
+
+    clock = SimulatedClock(events[first])
+    exchange = ReplayExchange(candles, clock, minutes=minutes)
+    bot = BacktestDailyBot(exchange, clock)
+    step = int(monitor_interval * 1000) if monitor_interval else 0
+
+    # Son mumdan sonra yeni mum açılmadığından son mum değerlendirilmez (canlıdaki gibi)
+    for index in range(first, len(candles) - 1):
+        clock.set(events[index])
+        bot.run_cycle(int(timestamps[index]))
+
+        if not step or not bot.in_position:
+            continue
+        # Görünen mumları değişmeyen izleme anları atlanır (aynı fiyat, aynı karar)
+        for tick in exchange.changes(np.arange(events[index] + step, events[index + 1], step)):
+            if not bot.in_position:
+                break
+            clock.set(tick)
+            bot.monitor_position()
+
+    trades = pd.DataFrame(bot.trades, columns=TRADE_COLUMNS)
+    for column in TIME_COLUMNS:
+        trades[column] = trades[column].astype(TIME_DTYPE)
+    return trades, daily_pnl(trades)
+
+
+def daily_pnl(trades):
+    """Gün bazında net kar (%) - çıkış gününe göre"""
+    if len(trades):
+        return trades.groupby(trades['exit_time'].dt.date)['net_profit'].sum()
+    return pd.Series(dtype=np.float64, name='net_profit')
+
+
+def backtest_key(candles, monitor_interval, warmup, minutes=None):
+    """Mumlar + botun tüm sabitleri (strateji yapılandırması) + replay ayarları"""
+    config = {name: value for name, value in vars(daily).items()
+              if name.isupper() and not callable(value)}
+    minutes = None if minutes is None else np.asarray(minutes, dtype=np.float64)
+    return content_key('backtest', np.asarray(candles, dtype=np.float64), config,
+                       monitor_interval, warmup,
+                       *(() if minutes is None else (minutes,)))
+
+
+def cached_backtest(candles, monitor_interval=daily.POSITION_CHECK_INTERVAL,
+                    warmup=daily.CANDLE_WINDOW, minutes=None, cache=None):
+    """
+    run_backtest - sonuç önbellekte varsa replay yapılmaz
+
+    Returns:
+        (trades, daily_pnl, cached)
+    """
+    if cache is None:
+        return (*run_backtest(candles, monitor_interval, warmup, minutes), False)
+
+    key = backtest_key(candles, monitor_interval, warmup, minutes)
+    stored = cache.get_json(key)
+    if stored is not None:
+        trades = pd.DataFrame(stored, columns=TRADE_COLUMNS)
+        for column in TIME_COLUMNS:
+            trades[column] = pd.to_datetime(trades[column], unit='ms').astype(TIME_DTYPE)
+        return trades, daily_pnl(trades), True
+
+    trades, pnl = run_backtest(candles, monitor_interval, warmup, minutes)
+    rows = trades.copy()
+    for column in TIME_COLUMNS:
+        rows[column] = rows[column].astype('datetime64[ms]').astype(np.int64)
+    cache.put_json(key, rows.values.tolist())
+    return trades, pnl, False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Günlük bot olay tabanlı backtest")
+    parser.add_argument('candles', help="Mum CSV dosyası veya geçmiş deposu klasörü")
+    parser.add_argument('--start', help="Depo için başlangıç tarihi (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Depo için bitiş tarihi (YYYY-MM-DD, hariç)")
+    parser.add_argument('--trades', help="İşlem listesinin yazılacağı CSV")
+    parser.add_argument('--interval', type=int, default=daily.POSITION_CHECK_INTERVAL,
+                        help="Açık pozisyon izleme aralığı (saniye, 0: kapalı)")
+    parser.add_argument('--minutes', help="1m mum CSV dosyası (pozisyon izleme ara fiyatları)")
+    parser.add_argument('--verbose', action='store_true', help="Bot loglarını göster")
+    parser.add_argument('--cache', default=CACHE_ROOT, help="Sonuç önbelleği klasörü")
+    parser.add_argument('--no-cache', action='store_true', help="Önbelleği kullanma")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    candles = load_candles(args.candles, args.start, args.end)
+    minutes = load_candles(args.minutes) if args.minutes else None
+    started = datetime.now()
+    cache = None if args.no_cache else result_cache(args.cache)
+    trades, pnl, cached = cached_backtest(candles, monitor_interval=args.interval,
+                                          minutes=minutes, cache=cache)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    print("\n" + "="*60)
+    print("📊 BACKTEST SONUÇLARI")
+    print("="*60)
+    print(f"Mum sayısı   : {len(candles)}")
+    print(f"Süre         : {elapsed:.1f}s{' (önbellekten)' if cached else ''}")
+    print(f"İşlem sayısı : {len(trades)}")
+    if len(trades):
+        wins = (trades['net_profit'] > 0).sum()
+        print(f"Kazanan      : {wins} (%{wins / len(trades) * 100:.1f})")
+        print(f"Toplam net   : %{trades['net_profit'].sum():.2f}")
+        print(f"En kötü gün  : %{pnl.min():.2f}")
+        print(f"En iyi gün   : %{pnl.max():.2f}")
+    print("="*60)
+
+    if args.trades:
+        trades.to_csv(args.trades, index=False)
+        print(f"✓ İşlemler yazıldı: {args.trades}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
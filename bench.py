@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çevrimdışı Performans Ölçümü
+Günlük botun sıcak yollarını sentetik mumlarla ölçer (Binance / Telegram yok)
+
+Ölçülen aşamalar:
+- calculate_indicators (akışkan motor, soğuk başlangıç - tüm seri işlenir)
+- calculate_indicators_vectorized, calculate_vwap: toplu referans hesaplar (bu dosyada)
+- generate_signals
+- fetch_data: sahte borsadan yeni mum + pencere görünümü
+- run_cycle: sahte borsaya karşı tam bir döngü (veri, indikatör, sinyal)
+
+Sentetik veri: tohumlu GBM, volatilite rejimleri (Markov geçişli) ve hacim
+sıçramaları. Aynı tohum her makinede aynı mumları üretir.
+
+Kullanım:
+  python bench.py                                  # Varsayılan boyutlar (200 - 200k mum)
+  python bench.py --sizes full                     # 200 - 10M mum (uzun sürer, ~4GB bellek)
+  python bench.py --sizes 200,50000 --only calculate_vwap,generate_signals
+  python bench.py --save baseline.json             # Sonuçları temel (baseline) olarak kaydet
+  python bench.py --compare baseline.json --threshold 0.2   # %20'den fazla yavaşlama hata döner
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import bitcoin_daily_bot_fixed as daily
+from backtest import BacktestDailyBot, ms_to_datetime
+from candle_store import candle_array
+from indicator_kernels import add_indicators, session_vwap
+
+DEFAULT_SIZES = (200, 2_000, 20_000, 200_000)
+FULL_SIZES = (200, 10_000, 100_000, 1_000_000, 10_000_000)
+SEED = 42
+START_MS = 1_700_000_000_000
+
+# Bar başına log-getiri volatilitesi: sakin / normal / hareketli piyasa
+REGIME_VOLATILITY = (0.0012, 0.003, 0.008)
+REGIME_SWITCH_PROB = 0.002  # Ortalama rejim süresi ~500 mum
+VOLUME_SPIKE_PROB = 0.003
+VOLUME_SPIKE_RANGE = (3.0, 10.0)  # Sıçramada hacim çarpanı
+ANCHOR_BARS = 35_040  # Fiyat her ~1 yılda (15m) başlangıç seviyesine bağlanır
+
+REPEAT = 7  # Minimum ölçüm sayısı
+MIN_TIME = 0.5  # Toplam ölçüm süresi en az (saniye)
+MAX_RUNS = 200
+TIME_BUDGET = 20.0  # Tek ölçüm bu süreyi aşarsa tekrar edilmez (saniye)
+REGRESSION_THRESHOLD = 0.15  # Medyan süre %15'ten fazla artarsa yavaşlama
+MIN_DELTA_MS = 0.05  # Bunun altındaki farklar gürültü sayılır
+
+
+def synthetic_market(n, seed=SEED, start_ms=START_MS, timeframe_ms=900_000, price=40_000.0,
+                     volatility=REGIME_VOLATILITY, switch_prob=REGIME_SWITCH_PROB,
+                     spike_prob=VOLUME_SPIKE_PROB):
+    """
+    Tohumlu sentetik OHLCV serisi
+
+    Kapanışlar geometrik Brown hareketi izler; volatilite rejimler arasında
+    rastgele sürelerle geçer. Hacim volatilite ve getiri büyüklüğü ile artar,
+    ayrıca seyrek hacim sıçramaları eklenir. Milyonlarca mumda fiyat sıfıra /
+    sonsuza kaymasın diye log-fiyat her ANCHOR_BARS mumda başlangıca bağlanır
+    (Brown köprüsü); bar başına düzeltme getiri gürültüsünün yanında ihmal edilir.
+
+    Returns:
+        (n, 6) float64 dizi - timestamp_ms, open, high, low, close, volume
+    """
+    rng = np.random.default_rng(seed)
+    volatility = np.asarray(volatility, dtype=np.float64)
+
+    # Rejim süreleri geometrik dağılımlı, her geçişte farklı bir rejime geçilir
+    lengths = rng.geometric(switch_prob, size=int(n * switch_prob * 2) + 16)
+    while lengths.sum() < n:
+        lengths = np.concatenate([lengths, rng.geometric(switch_prob, size=len(lengths))])
+    steps = rng.integers(1, len(volatility), size=len(lengths))
+    states = (rng.integers(len(volatility)) + np.cumsum(steps)) % len(volatility)
+    sigma = np.repeat(volatility[states], lengths)[:n]
+
+    z = rng.standard_normal(n)
+    walk = np.cumsum(sigma * z - 0.5 * sigma ** 2)
+    anchors = np.unique(np.append(np.arange(0, n, ANCHOR_BARS), n - 1))
+    walk -= np.interp(np.arange(n), anchors, walk[anchors])
+    close = price * np.exp(walk)
+    open_ = np.empty(n)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.standard_normal(n)) * sigma * 0.5)
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.standard_normal(n)) * sigma * 0.5)
+
+    volume = rng.lognormal(3.0, 0.4, n) * (sigma / volatility[1]) ** 0.8 * (1 + 0.5 * np.abs(z))
+    spikes = rng.random(n) < spike_prob
+    volume[spikes] *= rng.uniform(*VOLUME_SPIKE_RANGE, size=int(spikes.sum()))
+
+    timestamps = start_ms + np.arange(n, dtype=np.float64) * timeframe_ms
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+def candle_frame(candles):
+    """Mumları CandleStore.to_dataframe ile aynı biçimde DataFrame'e çevir"""
+    df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(np.int64), unit='ms')
+    return df
+
+
+class StubExchange:
+    """
+    Sentetik mumları canlı borsa gibi sunan sahte borsa
+
+    `index` numaralı mum oluşmakta olan mumdur (fetch_ohlcv onu da döndürür);
+    advance() saati bir mum ileri alır.
+    """
+
+    def __init__(self, candles, index, timeframe=daily.TIMEFRAME):
+        self.candles = candles
+        self.timestamps = candles[:, 0].astype(np.int64)
+        self.index = index
+        self.timeframe_ms = self.parse_timeframe(timeframe) * 1000
+        self.requests = 0
+
+    @staticmethod
+    def parse_timeframe(timeframe):
+        units = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+        return int(timeframe[:-1]) * units[timeframe[-1]]
+
+    def milliseconds(self):
+        return int(self.timestamps[self.index]) + self.timeframe_ms // 2
+
+    def now(self):
+        return ms_to_datetime(self.milliseconds())
+
+    @property
+    def closed_bar(self):
+        return int(self.timestamps[self.index - 1])
+
+    def advance(self):
+        self.index += 1
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.requests += 1
+        end = self.index + 1
+        if since is None:
+            start = max(0, end - (limit or 500))
+        else:
+            start = int(np.searchsorted(self.timestamps, since))
+            end = min(end, start + (limit or 500))
+        rows = self.candles[start:end].tolist()
+        for row in rows:
+            row[0] = int(row[0])
+        return rows
+
+
+def calculate_indicators_vectorized(df):
+    """Günlük botun tüm indikatörleri tüm seri için tek çağrıda (akışkan çerçeveye referans)"""
+    return add_indicators(df, **daily.INDICATOR_PARAMS)
+
+
+def calculate_vwap(df):
+    """Her mum için seans VWAP serisi (seans her gün VWAP_SESSION_HOUR'da sıfırlanır)"""
+    return session_vwap(np.asarray(df['timestamp']), df['high'], df['low'], df['close'],
+                        df['volume'], daily.VWAP_SESSION_HOUR)
+
+
+def make_bot(candles, window, fill=True):
+    """
+    Telegram göndermeyen günlük bot
+
+    fill: Mum penceresi (`window` mum) sahte borsadan doldurulsun mu
+    """
+    exchange = StubExchange(candles, index=window)
+    bot = BacktestDailyBot(exchange, exchange.now)
+    bot.candle_store.window = window
+    if fill:
+        bot.candle_store.update(exchange)
+    return bot, exchange
+
+
+# ----------------------------------------------------------------------
+# Ölçümler: her biri (ölçülecek fonksiyon, her ölçümden önce çalışacak hazırlık)
+# döndürür. Hazırlık süresi ölçüme dahil edilmez.
+# ----------------------------------------------------------------------
+
+def bench_calculate_indicators(candles, n):
+    bot, _ = make_bot(candles, n, fill=False)
+    records = candle_array(candles[:n])
+    return lambda: bot.calculate_indicators(records), bot.indicators.reset
+
+
+def bench_calculate_indicators_vectorized(candles, n):
+    df = candle_frame(candles[:n])
+    return lambda: calculate_indicators_vectorized(df), None
+
+
+def bench_calculate_vwap(candles, n):
+    df = candle_frame(candles[:n])
+    return lambda: calculate_vwap(df), None
+
+
+def bench_generate_signals(candles, n):
+    bot, _ = make_bot(candles, n, fill=False)
+    data = calculate_indicators_vectorized(candle_frame(candles[:n])).to_records(index=False)
+    return lambda: bot.generate_signals(data), None
+
+
+def bench_fetch_data(candles, n):
+    bot, exchange = make_bot(candles, n)
+    return bot.fetch_data, exchange.advance
+
+
+def bench_run_cycle(candles, n):
+    bot, exchange = make_bot(candles, n)
+    bot.run_cycle(exchange.closed_bar)  # Motor ısınsın, sonraki döngüler artımlı
+    return lambda: bot.run_cycle(exchange.closed_bar), exchange.advance
+
+
+# isim: (ölçüm, maksimum mum sayısı)
+BENCHMARKS = {
+    'calculate_indicators': (bench_calculate_indicators, 10_000_000),
+    'calculate_indicators_vectorized': (bench_calculate_indicators_vectorized, 10_000_000),
+    'calculate_vwap': (bench_calculate_vwap, 10_000_000),
+    'generate_signals': (bench_generate_signals, 10_000_000),
+    # Pencere Python listesi olarak tutulduğundan ~1M mumdan sonrası bellek sınırına dayanır
+    'fetch_data': (bench_fetch_data, 1_000_000),
+    'run_cycle': (bench_run_cycle, 1_000_000),
+}
+
+
+def measure(fn, setup=None, repeat=REPEAT, min_time=MIN_TIME, max_runs=MAX_RUNS,
+            budget=TIME_BUDGET):
+    """
+    Fonksiyonu tekrar tekrar çalıştırıp süreleri topla (çöp toplayıcı kapalı)
+
+    En az `repeat` ölçüm ve `min_time` saniye; toplam `budget` aşılırsa durur.
+
+    Returns:
+        dict: median_ms, min_ms, mean_ms, runs
+    """
+    times = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(times) < max_runs:
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+            total = sum(times)
+            if total >= budget or (len(times) >= repeat and total >= min_time):
+                break
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        'median_ms': statistics.median(times) * 1000,
+        'min_ms': min(times) * 1000,
+        'mean_ms': statistics.fmean(times) * 1000,
+        'runs': len(times),
+    }
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, only=None, seed=SEED, log=print):
+    """
+    Seçilen ölçümleri her boyut için çalıştır
+
+    Returns:
+        dict: {'created', 'seed', 'machine', 'results': {'isim@mum': ölçüm}}
+    """
+    names = only or list(BENCHMARKS)
+    results = {}
+    for n in sizes:
+        # Sahte borsanın her ölçümde ilerleyebilmesi için fazladan mum
+        candles = synthetic_market(n + MAX_RUNS + 2, seed=seed)
+        for name in names:
+            bench, max_bars = BENCHMARKS[name]
+            if n > max_bars:
+                log(f"  {name:32} {n:>10,}  atlandı (en fazla {max_bars:,} mum)")
+                continue
+            fn, setup = bench(candles, n)
+            result = measure(fn, setup)
+            results[f"{name}@{n}"] = {'name': name, 'bars': n, **result}
+            log(f"  {name:32} {n:>10,}  {result['median_ms']:12.3f}ms  "
+                f"(min {result['min_ms']:.3f}ms, {result['runs']} ölçüm)")
+            del fn, setup
+        del candles
+        gc.collect()
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'seed': seed,
+        'machine': machine_info(),
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD, min_delta_ms=MIN_DELTA_MS):
+    """
+    Medyan süreleri temel ölçümle karşılaştır
+
+    Returns:
+        list: (anahtar, temel_ms, şimdiki_ms, değişim_oranı, yavaşlama_mı) - ortak anahtarlar
+    """
+    rows = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        old, new = base['median_ms'], result['median_ms']
+        change = (new - old) / old if old > 0 else 0.0
+        regression = change > threshold and new - old > min_delta_ms
+        rows.append((key, old, new, change, regression))
+    return rows
+
+
+def save(result, path):
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def parse_sizes(value):
+    if value == 'default':
+        return DEFAULT_SIZES
+    if value == 'full':
+        return FULL_SIZES
+    return tuple(int(float(size)) for size in value.split(','))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çevrimdışı performans ölçümü")
+    parser.add_argument('--sizes', default='default',
+                        help="Mum sayıları: 'default', 'full' veya virgüllü liste (ör. 200,1e6)")
+    parser.add_argument('--only', help=f"Virgüllü ölçüm listesi ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--save', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--compare', help="Karşılaştırılacak temel JSON dosyası")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Yavaşlama eşiği (oran, 0.15 = %%15)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    only = args.only.split(',') if args.only else None
+    unknown = [name for name in only or [] if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Bilinmeyen ölçüm: {', '.join(unknown)}")
+
+    baseline = load(args.compare) if args.compare else None
+
+    print("\n" + "="*60)
+    print("⏱️  PERFORMANS ÖLÇÜMÜ")
+    print("="*60)
+    current = run_benchmarks(parse_sizes(args.sizes), only, args.seed)
+
+    if args.save:
+        save(current, args.save)
+        print(f"✓ Sonuçlar yazıldı: {args.save}")
+
+    if baseline is None:
+        return 0
+
+    if baseline.get('machine') != current['machine']:
+        print("⚠️ Temel ölçüm farklı bir ortamda alınmış, karşılaştırma yanıltıcı olabilir")
+    if baseline.get('seed') != current['seed']:
+        print("⚠️ Temel ölçüm farklı tohumla alınmış")
+
+    rows = compare(current, baseline, args.threshold)
+    print("\n" + "="*60)
+    print(f"📊 KARŞILAŞTIRMA (eşik %{args.threshold * 100:.0f})")
+    print("="*60)
+    for key, old, new, change, regression in rows:
+        flag = "✗ YAVAŞLAMA" if regression else "✓"
+        print(f"  {key:42} {old:12.3f}ms -> {new:12.3f}ms  {change * 100:+7.1f}%  {flag}")
+    regressions = sum(row[4] for row in rows)
+    print("="*60)
+    if regressions:
+        print(f"✗ {regressions} ölçümde yavaşlama var")
+        return 1
+    print(f"✓ Yavaşlama yok ({len(rows)} ölçüm karşılaştırıldı)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
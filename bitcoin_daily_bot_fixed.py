@@ -6,16 +6,27 @@ Bitcoin Günlük Trading Botu - Düzeltilmiş Versiyon
 Tüm hatalar giderilmiş, optimizasyonlar eklenmiş
 """
 
-import ccxt
-import pandas as pd
-import numpy as np
+import lazy_ccxt as ccxt  # Sadece Binance sınıfı yüklenir, piyasa bilgisi önbellekli
 import time
-import requests
 import logging
-from datetime import datetime, timedelta
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.trend import MACD, EMAIndicator
-from ta.volatility import BollingerBands, AverageTrueRange
+import os
+import threading
+from datetime import datetime
+import kline_stream
+import market_hub
+from candle_store import CandleStore
+from history_store import HistoryStore
+from metrics import (instrument_exchange, serve as serve_metrics, start_summary_log, timed,
+                     watch_candles, watch_queue)
+from position_watcher import PositionWatcher
+import rate_limiter
+from rate_limiter import CRITICAL, priority
+from scheduler import BAR, CandleScheduler, ServerClock, closed_frame
+from state_journal import StateJournal
+from telegram_queue import TelegramNotifier
+from trade_ledger import TradeLedger
+from streaming_indicators import IndicatorFrame
+from strategies import DailyStrategy
 
 # ============================================
 # TELEGRAM AYARLARI - BURAYA TOKENLERİNİZİ YAZIN
@@ -46,45 +57,112 @@ BOLLINGER_STD = 2
 STOCHASTIC_K = 14
 STOCHASTIC_D = 3
 
+VWAP_SESSION_HOUR = 0  # VWAP seansı her gün bu saatte (UTC) sıfırlanır
+
+# Akışkan motor ve vektörize çekirdekler için ortak parametreler
+INDICATOR_PARAMS = {
+    'rsi': RSI_PERIOD,
+    'ema': {'ema_short': EMA_SHORT, 'ema_medium': EMA_MEDIUM, 'ema_long': EMA_LONG},
+    'macd': (MACD_FAST, MACD_SLOW, MACD_SIGNAL),
+    'bollinger': (BOLLINGER_PERIOD, BOLLINGER_STD),
+    'stochastic': (STOCHASTIC_K, STOCHASTIC_D),
+    'atr': 14,
+    'volume_ma': 20,
+    'vwap': VWAP_SESSION_HOUR,
+}
+
 # Sinyal Eşik Değerleri
 MIN_SIGNAL_SCORE = 5  # Minimum 5/7 skor gerekli
 MIN_VOLUME_MULTIPLIER = 1.3
 
+# Vektörize skorlama için eşikler
+SIGNAL_THRESHOLDS = {
+    'rsi_oversold': RSI_OVERSOLD,
+    'rsi_overbought': RSI_OVERBOUGHT,
+    'volume_multiplier': MIN_VOLUME_MULTIPLIER,
+}
+
 # Kar/Zarar Yönetimi
 DAILY_PROFIT_TARGET = 0.8  # %0.8 günlük kar hedefi
 SIGNAL_PROFIT_TARGET = 0.8
 STOP_LOSS_PERCENT = 2.5
 
 # Bot Kontrol Ayarları
-CHECK_INTERVAL = 300  # 5 dakika
+CANDLE_CLOSE_DELAY_MS = 300  # Mum kapanışından sonra uyanma gecikmesi
+POSITION_CHECK_INTERVAL = 30  # Açık pozisyon izleme aralığı (saniye, izleyici kapalıyken)
+POSITION_WATCHER_ENABLED = True  # Kar hedefi / stop her fiyat tick'inde kontrol edilir
+POSITION_POLL_INTERVAL = 2  # Akış yokken ticker yoklama aralığı (saniye)
+METRICS_PORT = 9108  # Yerel /metrics adresi (None: kapalı)
+METRICS_SUMMARY_INTERVAL = 3600  # Metrik özetinin log'a yazılma aralığı (saniye)
 MIN_SIGNAL_INTERVAL = 900  # 15 dakika (900 saniye)
 
 # Timeframe
+SYMBOL = 'BTC/USDT'
 TIMEFRAME = '15m'
+CANDLE_WINDOW = 200  # Bellekte tutulan mum sayısı
+HISTORY_DIR = 'data'  # Kapanan mumların diskte tutulduğu klasör (None: kapalı)
+STREAM_ENABLED = True  # websockets kuruluysa mumlar WebSocket akışından gelir
+MARKET_HUB = None  # Ortak veri merkezi adresi, örn. ('127.0.0.1', 8765) - verilirse mumlar market_hub'dan gelir
+STATE_DIR = 'data/state'  # Pozisyon ve sayaçların durum günlüğü (None: kapalı)
+LEDGER_PATH = 'data/ledger.sqlite'  # Sinyal / işlem defteri (None: kapalı)
+
+# Yeniden başlatmada geri yüklenen durum alanları
+STATE_FIELDS = ('in_position', 'position_type', 'entry_price', 'entry_time', 'daily_profit',
+                'buy_signals', 'sell_signals', 'last_signal_time', 'last_reset_date',
+                'entry_score', 'entry_reasons')
 
 # Commission (Binance spot)
 COMMISSION_PERCENT = 0.1  # %0.1 per trade
 
 # Logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('daily_bot.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+LOG_FILE = 'daily_bot.log'
+
+
+def setup_logging(log_file=LOG_FILE):
+    """Log'u dosyaya ve konsola yaz (sadece bot çalıştırılırken; içe aktarmak dosya açmaz)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file, encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
 
 class BitcoinDailyBot:
-    def __init__(self, telegram_token=None, telegram_chat_id=None):
-        """Bot başlatma"""
-        self.exchange = ccxt.binance({'enableRateLimit': True})
-        self.symbol = 'BTC/USDT'
+    def __init__(self, telegram_token=None, telegram_chat_id=None, exchange=None, clock=None,
+                 history_dir=HISTORY_DIR, state_dir=STATE_DIR, ledger_path=LEDGER_PATH):
+        """
+        Bot başlatma
+        
+        Args:
+            exchange: Borsa nesnesi (backtest için tekrar oynatma kaynağı verilebilir)
+            clock: Şimdiki zamanı döndüren fonksiyon (backtest için simüle saat)
+            history_dir: Mum geçmişi klasörü - açılışta buradan ısınılır (None: kapalı)
+            state_dir: Durum günlüğü klasörü - açık pozisyon ve sayaçlar geri yüklenir (None: kapalı)
+            ledger_path: Sinyal / işlem defteri SQLite dosyası (None: kapalı)
+        """
+        # Aynı IP'deki diğer botlarla ortak ağırlık bütçesi, 429 / 418'de geri çekilme
+        self.exchange = exchange or rate_limiter.attach(ccxt.binance({'enableRateLimit': True}))
+        self.clock = clock or datetime.now
+        self.symbol = SYMBOL
         self.timeframe = TIMEFRAME
+        history = HistoryStore(self.symbol, self.timeframe, history_dir) if history_dir else None
+        self.candle_store = CandleStore(self.symbol, self.timeframe, window=CANDLE_WINDOW,
+                                        history=history)
+        self.candle_store.warm_up(self.exchange)
+        # Sinyal kuralları strateji eklentisinde, indikatörler ortak çerçevede hesaplanır
+        self.strategy = DailyStrategy('daily', self.symbol, self.timeframe, INDICATOR_PARAMS,
+                                      min_score=MIN_SIGNAL_SCORE, **SIGNAL_THRESHOLDS)
+        self.indicators = IndicatorFrame(history=CANDLE_WINDOW)
+        self.indicators.register(self.strategy.name, self.strategy.indicators)
         
         # Telegram
         self.telegram_token = telegram_token or TELEGRAM_BOT_TOKEN
         self.telegram_chat_id = telegram_chat_id or TELEGRAM_CHAT_ID
+        self.notifier = TelegramNotifier(self.telegram_token, self.telegram_chat_id,
+                                         parse_mode='Markdown')
         
         # Günlük trading parametreleri
         self.daily_profit_target = DAILY_PROFIT_TARGET
@@ -96,14 +174,27 @@ class BitcoinDailyBot:
         self.daily_profit = 0.0
         self.buy_signals = 0
         self.sell_signals = 0
-        self.last_reset_date = datetime.now().date()
+        self.last_reset_date = self.clock().date()
         self.last_signal_time = None  # Sinyal aralığı kontrolü için
+        self.last_closed_bar = None  # Değerlendirilen son kapanmış mum (ms)
         
         # Pozisyon bilgileri
         self.in_position = False
         self.position_type = None  # 'BUY' veya 'SELL'
         self.entry_price = None
         self.entry_time = None
+        self.entry_score = None
+        self.entry_reasons = []
+        self.position_lock = threading.RLock()  # Pozisyon izleyici ile ortak
+        self.watcher = None
+        
+        # Durum günlüğü: çökme / yeniden başlatmada pozisyon ve sayaçlar kaybolmaz
+        self.journal = StateJournal(os.path.join(state_dir, 'daily')) if state_dir else None
+        if self.journal:
+            self.restore_state()
+        
+        # Sinyal ve işlem defteri: raporlar log ayrıştırmadan SQL ile alınır
+        self.ledger = TradeLedger(ledger_path) if ledger_path else None
         
         logging.info("="*60)
         logging.info("🚀 Bitcoin Günlük Trading Botu Başlatıldı")
@@ -111,7 +202,7 @@ class BitcoinDailyBot:
         logging.info(f"⏱️  Timeframe: {TIMEFRAME} (15 dakika)")
         logging.info(f"💰 Günlük Hedef: %{self.daily_profit_target}")
         logging.info(f"🛑 Stop Loss: %{self.stop_loss_percent}")
-        logging.info(f"🔄 Kontrol Aralığı: {CHECK_INTERVAL}s (5 dakika)")
+        logging.info(f"🔄 Kontrol: Her mum kapanışında | Pozisyon izleme: {POSITION_CHECK_INTERVAL}s")
         logging.info(f"⏳ Min Sinyal Aralığı: {MIN_SIGNAL_INTERVAL}s (15 dakika)")
         logging.info(f"📊 Min Skor: {MIN_SIGNAL_SCORE}/7")
         logging.info("="*60)
@@ -120,26 +211,50 @@ class BitcoinDailyBot:
                           f"⏱️ Timeframe: {TIMEFRAME}\n"
                           f"💰 Günlük Hedef: %{self.daily_profit_target}\n"
                           f"🛑 Stop Loss: %{self.stop_loss_percent}\n"
-                          f"📊 Min Skor: {MIN_SIGNAL_SCORE}/7")
+                          f"📊 Min Skor: {MIN_SIGNAL_SCORE}/7", status=True)
     
-    def send_telegram(self, message):
-        """Telegram mesajı gönder"""
+    @timed('send_telegram')
+    def send_telegram(self, message, status=False):
+        """
+        Telegram mesajını gönderim kuyruğuna ekle (döngüyü bekletmez)
+        
+        Args:
+            status: Durum mesajı - art arda gelenler tek mesajda birleştirilebilir
+        
+        Returns:
+            Future: Gönderim sonucu (True / False)
+        """
+        return self.notifier.send(message, status=status)
+    
+    def restore_state(self):
+        """Durum günlüğünden pozisyon ve sayaçları geri yükle"""
         try:
-            url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
-            data = {
-                "chat_id": self.telegram_chat_id,
-                "text": message,
-                "parse_mode": "Markdown"
-            }
-            response = requests.post(url, data=data, timeout=10)
-            return response.status_code == 200
+            state = self.journal.load()
         except Exception as e:
-            logging.error(f"Telegram mesaj hatası: {e}")
-            return False
+            logging.error(f"Durum günlüğü okunamadı: {e}")
+            return
+        
+        for field in STATE_FIELDS:
+            if field in state:
+                setattr(self, field, state[field])
+        
+        if self.in_position:
+            logging.info(f"♻️ Açık pozisyon geri yüklendi: {self.position_type} "
+                         f"${self.entry_price:,.2f} ({self.entry_time:%Y-%m-%d %H:%M})")
+        if state:
+            logging.info(f"♻️ Durum geri yüklendi: Günlük kar %{self.daily_profit:.2f} | "
+                         f"Alış: {self.buy_signals} | Satış: {self.sell_signals}")
+    
+    def save_state(self):
+        """Değişen durum alanlarını günlüğe ekle (disk yazma arka planda)"""
+        if self.journal is None:
+            return
+        state = {field: getattr(self, field) for field in STATE_FIELDS}
+        self.journal.record(self.journal.changes(state))
     
     def check_daily_reset(self):
         """Günlük sayaçları sıfırla (gece yarısı)"""
-        current_date = datetime.now().date()
+        current_date = self.clock().date()
         
         if current_date > self.last_reset_date:
             logging.info("="*60)
@@ -154,27 +269,29 @@ class BitcoinDailyBot:
             self.send_telegram(f"🌅 *Yeni Gün Başladı*\n\n"
                              f"📅 {current_date}\n"
                              f"💰 Dün Kar: %{self.daily_profit:.2f}\n"
-                             f"📊 Alış: {self.buy_signals} | Satış: {self.sell_signals}")
+                             f"📊 Alış: {self.buy_signals} | Satış: {self.sell_signals}",
+                             status=True)
             
             # Sıfırla
             self.daily_profit = 0.0
             self.buy_signals = 0
             self.sell_signals = 0
             self.last_reset_date = current_date
+            self.save_state()
             
             # Pozisyon varsa uyar
             if self.in_position:
                 logging.warning("⚠️ Gün değişti ama açık pozisyon var!")
                 self.send_telegram("⚠️ *Dikkat*: Gün değişti, açık pozisyon var!\n"
                                  f"Tip: {self.position_type}\n"
-                                 f"Giriş: ${self.entry_price:,.2f}")
+                                 f"Giriş: ${self.entry_price:,.2f}", status=True)
     
     def check_signal_interval(self):
         """Minimum sinyal aralığını kontrol et (15 dakika)"""
         if self.last_signal_time is None:
             return True
         
-        time_since_last = (datetime.now() - self.last_signal_time).total_seconds()
+        time_since_last = (self.clock() - self.last_signal_time).total_seconds()
         
         if time_since_last < MIN_SIGNAL_INTERVAL:
             remaining = MIN_SIGNAL_INTERVAL - time_since_last
@@ -183,196 +300,45 @@ class BitcoinDailyBot:
         
         return True
     
+    @timed('fetch_data')
     def fetch_data(self):
-        """15 dakikalık veri çek"""
-        try:
-            ohlcv = self.exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=200)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            return df
-        except Exception as e:
-            logging.error(f"Veri çekme hatası: {e}")
-            return None
-    
-    def calculate_vwap(self, df):
-        """VWAP (Volume Weighted Average Price) hesapla - günlük"""
+        """
+        15 dakikalık veri çek (sadece yeni mumlar indirilir)
+        
+        Returns:
+            Mum penceresinin kopyasız görünümü (yapılandırılmış dizi: timestamp ms, OHLCV)
+        """
         try:
-            # Bugünün verilerini filtrele
-            today = datetime.now().date()
-            df_today = df[df['timestamp'].dt.date == today].copy()
-            
-            if len(df_today) == 0:
+            self.candle_store.update(self.exchange)
+            if len(self.candle_store) == 0:
                 return None
-            
-            # VWAP = (Price × Volume) toplamı / Volume toplamı
-            df_today['typical_price'] = (df_today['high'] + df_today['low'] + df_today['close']) / 3
-            df_today['vwap_numerator'] = df_today['typical_price'] * df_today['volume']
-            
-            vwap = df_today['vwap_numerator'].sum() / df_today['volume'].sum()
-            return vwap
-            
+            return self.candle_store.view()
         except Exception as e:
-            logging.error(f"VWAP hesaplama hatası: {e}")
+            logging.error(f"Veri çekme hatası: {e}")
             return None
     
-    def calculate_indicators(self, df):
-        """Tüm indikatörleri hesapla (7 indikatör)"""
+    @timed('calculate_indicators')
+    def calculate_indicators(self, candles):
+        """
+        Tüm indikatörleri hesapla (7 indikatör)
+        
+        Returns:
+            Mumlar + indikatör kolonları (çerçevenin strateji kolon adlarıyla kopyasız görünümü)
+        """
         try:
-            # RSI (9 period - hızlı tepki)
-            rsi = RSIIndicator(close=df['close'], window=RSI_PERIOD)
-            df['rsi'] = rsi.rsi()
-            
-            # EMA (3 katman: 9, 21, 50)
-            ema_short = EMAIndicator(close=df['close'], window=EMA_SHORT)
-            ema_medium = EMAIndicator(close=df['close'], window=EMA_MEDIUM)
-            ema_long = EMAIndicator(close=df['close'], window=EMA_LONG)
-            
-            df['ema_short'] = ema_short.ema_indicator()
-            df['ema_medium'] = ema_medium.ema_indicator()
-            df['ema_long'] = ema_long.ema_indicator()
-            
-            # MACD (8, 17, 9 - hızlı sinyal)
-            macd = MACD(close=df['close'], window_slow=MACD_SLOW, 
-                       window_fast=MACD_FAST, window_sign=MACD_SIGNAL)
-            df['macd'] = macd.macd()
-            df['macd_signal'] = macd.macd_signal()
-            
-            # Bollinger Bands
-            bb = BollingerBands(close=df['close'], window=BOLLINGER_PERIOD, window_dev=BOLLINGER_STD)
-            df['bb_high'] = bb.bollinger_hband()
-            df['bb_low'] = bb.bollinger_lband()
-            df['bb_mid'] = bb.bollinger_mavg()
-            
-            # Stochastic Oscillator
-            stoch = StochasticOscillator(high=df['high'], low=df['low'], close=df['close'],
-                                        window=STOCHASTIC_K, smooth_window=STOCHASTIC_D)
-            df['stoch_k'] = stoch.stoch()
-            df['stoch_d'] = stoch.stoch_signal()
-            
-            # Volume
-            df['volume_ma'] = df['volume'].rolling(window=20).mean()
-            df['volume_ratio'] = df['volume'] / df['volume_ma']
-            
-            # ATR (stop loss için)
-            atr = AverageTrueRange(high=df['high'], low=df['low'], close=df['close'])
-            df['atr'] = atr.average_true_range()
-            
-            # VWAP (günlük)
-            vwap = self.calculate_vwap(df)
-            df['vwap'] = vwap
-            
-            return df
+            # RSI(9), EMA(9/21/50), MACD(8/17/9), Bollinger, Stochastic, Volume, ATR, VWAP
+            # Sadece yeni / güncellenen mumlar çerçeveye işlenir (O(1) / mum)
+            records = self.indicators.update_candles(candles)
+            return self.indicators.select(records, self.strategy.name)
             
         except Exception as e:
             logging.error(f"İndikatör hesaplama hatası: {e}")
             return None
     
-    def generate_signals(self, df):
-        """7 indikatör ile sinyal üret (minimum 5/7 skor)"""
-        if df is None or len(df) < 100:
-            return None, 0
-        
-        latest = df.iloc[-1]
-        current_price = latest['close']
-        
-        # BUY SİNYALİ (7 kontrol)
-        buy_score = 0
-        buy_reasons = []
-        
-        # 1. RSI Oversold (<25)
-        if latest['rsi'] < RSI_OVERSOLD:
-            buy_score += 1
-            buy_reasons.append(f"RSI({latest['rsi']:.1f})<{RSI_OVERSOLD}")
-        
-        # 2. Bollinger Alt Band
-        bb_position = (current_price - latest['bb_low']) / (latest['bb_high'] - latest['bb_low'])
-        if bb_position < 0.2:  # Alt %20 bölgede
-            buy_score += 1
-            buy_reasons.append(f"BB Alt(%{bb_position*100:.0f})")
-        
-        # 3. MACD Bullish
-        if latest['macd'] > latest['macd_signal']:
-            buy_score += 1
-            buy_reasons.append("MACD+")
-        
-        # 4. EMA Trend (9>21 veya yükseliş)
-        if latest['ema_short'] > latest['ema_medium']:
-            buy_score += 1
-            buy_reasons.append("EMA+")
-        
-        # 5. Stochastic Oversold (<20)
-        if latest['stoch_k'] < 20:
-            buy_score += 1
-            buy_reasons.append(f"Stoch({latest['stoch_k']:.0f})<20")
-        
-        # 6. Volume Artışı
-        if latest['volume_ratio'] > MIN_VOLUME_MULTIPLIER:
-            buy_score += 1
-            buy_reasons.append(f"Vol({latest['volume_ratio']:.1f}x)")
-        
-        # 7. VWAP Altında (değerli bölge)
-        if latest['vwap'] and current_price < latest['vwap']:
-            buy_score += 1
-            buy_reasons.append(f"VWAP Altı")
-        
-        # SELL SİNYALİ (7 kontrol)
-        sell_score = 0
-        sell_reasons = []
-        
-        # 1. RSI Overbought (>75)
-        if latest['rsi'] > RSI_OVERBOUGHT:
-            sell_score += 1
-            sell_reasons.append(f"RSI({latest['rsi']:.1f})>{RSI_OVERBOUGHT}")
-        
-        # 2. Bollinger Üst Band
-        if bb_position > 0.8:  # Üst %20 bölgede
-            sell_score += 1
-            sell_reasons.append(f"BB Üst(%{bb_position*100:.0f})")
-        
-        # 3. MACD Bearish
-        if latest['macd'] < latest['macd_signal']:
-            sell_score += 1
-            sell_reasons.append("MACD-")
-        
-        # 4. EMA Trend (9<21 veya düşüş)
-        if latest['ema_short'] < latest['ema_medium']:
-            sell_score += 1
-            sell_reasons.append("EMA-")
-        
-        # 5. Stochastic Overbought (>80)
-        if latest['stoch_k'] > 80:
-            sell_score += 1
-            sell_reasons.append(f"Stoch({latest['stoch_k']:.0f})>80")
-        
-        # 6. Volume Artışı
-        if latest['volume_ratio'] > MIN_VOLUME_MULTIPLIER:
-            sell_score += 1
-            sell_reasons.append(f"Vol({latest['volume_ratio']:.1f}x)")
-        
-        # 7. VWAP Üstünde (pahalı bölge)
-        if latest['vwap'] and current_price > latest['vwap']:
-            sell_score += 1
-            sell_reasons.append(f"VWAP Üstü")
-        
-        # Sinyal kararı (minimum 5/7)
-        signal = None
-        score = 0
-        reasons = []
-        
-        if buy_score >= MIN_SIGNAL_SCORE:
-            signal = 'BUY'
-            score = buy_score
-            reasons = buy_reasons
-        elif sell_score >= MIN_SIGNAL_SCORE:
-            signal = 'SELL'
-            score = sell_score
-            reasons = sell_reasons
-        
-        # Debug log
-        if buy_score >= 4 or sell_score >= 4:
-            logging.debug(f"📊 BUY: {buy_score}/7 | SELL: {sell_score}/7")
-        
-        return signal, score, reasons if signal else None
+    @timed('generate_signals')
+    def generate_signals(self, data):
+        """7 indikatör ile sinyal üret (minimum 5/7 skor) - kurallar DailyStrategy'de"""
+        return self.strategy.evaluate(data)
     
     def calculate_targets(self, signal, entry_price):
         """Kar hedefi ve stop loss hesapla"""
@@ -397,13 +363,13 @@ class BitcoinDailyBot:
         
         return net_profit_percent
     
-    def check_position(self, df):
+    @timed('check_position')
+    def check_position(self, data):
         """Açık pozisyonu kontrol et"""
         if not self.in_position:
             return
         
-        latest = df.iloc[-1]
-        current_price = latest['close']
+        current_price = float(data['close'][-1])
         
         # Commission dahil kar/zarar
         net_profit = self.check_profit_with_commission(
@@ -433,17 +399,24 @@ class BitcoinDailyBot:
             self.close_position(current_price, net_profit, "Stop Loss")
         else:
             # Durum logu
-            duration = (datetime.now() - self.entry_time).total_seconds() / 60
+            duration = (self.clock() - self.entry_time).total_seconds() / 60
             logging.debug(f"💼 Pozisyon: {self.position_type} | Kar: %{net_profit:.2f} | "
                          f"Süre: {duration:.0f}dk | Hedef: ${take_profit:,.0f}")
     
     def close_position(self, exit_price, net_profit, reason):
         """Pozisyonu kapat"""
-        duration = (datetime.now() - self.entry_time).total_seconds() / 60
+        duration = (self.clock() - self.entry_time).total_seconds() / 60
         
         # Günlük kara ekle
         self.daily_profit += net_profit
         
+        if self.ledger:
+            take_profit, stop_loss = self.calculate_targets(self.position_type, self.entry_price)
+            self.ledger.record_trade('daily', self.symbol, self.position_type, self.entry_time,
+                                     self.entry_price, self.clock(), exit_price, net_profit,
+                                     2 * self.commission_percent, reason, self.entry_score,
+                                     self.entry_reasons, take_profit, stop_loss)
+        
         # Log
         logging.info("="*60)
         logging.info(f"🔔 POZİSYON KAPANDI: {reason}")
@@ -474,26 +447,34 @@ class BitcoinDailyBot:
         self.position_type = None
         self.entry_price = None
         self.entry_time = None
+        self.entry_score = None
+        self.entry_reasons = []
+        self.save_state()
     
     def execute_signal(self, signal, score, reasons, current_price):
-        """Sinyali uygula"""
+        """
+        Sinyali uygula
+        
+        Returns:
+            bool: Pozisyon açıldıysa True (limit / hedef / aralık engellediyse False)
+        """
         # Günlük hedefe ulaşıldı mı?
         if self.daily_profit >= self.daily_profit_target:
             logging.info(f"🎯 Günlük hedef zaten ulaşıldı (%{self.daily_profit:.2f})")
-            return
+            return False
         
         # Günlük sinyal limitleri
         if signal == 'BUY' and self.buy_signals >= 1:
             logging.info("⚠️ Bugün zaten 1 alış sinyali üretildi")
-            return
+            return False
         
         if signal == 'SELL' and self.sell_signals >= 1:
             logging.info("⚠️ Bugün zaten 1 satış sinyali üretildi")
-            return
+            return False
         
         # Sinyal aralığı kontrolü
         if not self.check_signal_interval():
-            return
+            return False
         
         # Hedef ve stop loss hesapla
         take_profit, stop_loss = self.calculate_targets(signal, current_price)
@@ -527,73 +508,158 @@ class BitcoinDailyBot:
             self.sell_signals += 1
         
         # Son sinyal zamanını kaydet
-        self.last_signal_time = datetime.now()
+        self.last_signal_time = self.clock()
         
         # Pozisyonu aç
         self.in_position = True
         self.position_type = signal
         self.entry_price = current_price
-        self.entry_time = datetime.now()
+        self.entry_time = self.clock()
+        self.entry_score = score
+        self.entry_reasons = list(reasons)
+        self.save_state()
+        return True
+    
+    @timed('run_cycle')
+    def run_cycle(self, closed_bar=None):
+        """
+        Tek kontrol döngüsü: günlük reset, veri, indikatörler, pozisyon / sinyal
+        
+        Args:
+            closed_bar: Kapanan mumun açılış zamanı (ms) - verilirse sadece o muma
+                        kadar olan mumlar değerlendirilir (oluşan mum hariç)
+        
+        Returns:
+            bool: Veri çekilemezse False
+        """
+        # Günlük reset kontrolü
+        self.check_daily_reset()
+        
+        # Veri çek
+        candles = self.fetch_data()
+        if candles is None:
+            return False
+        
+        if closed_bar is not None:
+            candles = closed_frame(candles, closed_bar)
+            if candles is None:
+                # Borsada yeni mum henüz açılmadı, zamanlayıcı tekrar dener
+                return True
+            self.last_closed_bar = closed_bar
+        
+        # İndikatörleri hesapla
+        data = self.calculate_indicators(candles)
+        if data is None:
+            return True
+        
+        current_price = float(data['close'][-1])
+        
+        with self.position_lock:
+            # Açık pozisyon varsa kontrol et
+            if self.in_position:
+                self.check_position(data)
+            else:
+                # Yeni sinyal ara
+                signal, score, reasons = self.generate_signals(data)
+                
+                if signal:
+                    acted = self.execute_signal(signal, score, reasons, current_price)
+                    if self.ledger:
+                        take_profit, stop_loss = self.calculate_targets(signal, current_price)
+                        self.ledger.record_signal('daily', self.symbol, self.clock(), signal, score,
+                                                  current_price, reasons, acted,
+                                                  take_profit, stop_loss)
+        
+        return True
+    
+    def monitor_position(self):
+        """Mumlar arası pozisyon izleme: sadece güncel fiyatla kar hedefi / stop kontrolü"""
+        with priority(CRITICAL):  # Backfill / tarama isteklerinin önüne geçer
+            candles = self.fetch_data()
+        if candles is not None:
+            with self.position_lock:
+                self.check_position(candles)
     
     def run(self):
-        """Ana döngü"""
+        """Ana döngü - her mum kapanışında bir kez değerlendirme"""
         logging.info("🔄 Ana döngü başladı...")
         consecutive_errors = 0
         max_errors = 10
         
+        # Metrikler: aşama süreleri, uç nokta istekleri, mum bayatlığı, kuyruk derinliği
+        timeframe_ms = self.exchange.parse_timeframe(self.timeframe) * 1000
+        instrument_exchange(self.exchange)
+        rate_limiter.watch_scheduler()
+        watch_candles(self.candle_store, timeframe_ms)
+        watch_queue(self.notifier)
+        if METRICS_PORT:
+            serve_metrics(METRICS_PORT)
+        stop_summary = start_summary_log(METRICS_SUMMARY_INTERVAL)
+        
+        scheduler = CandleScheduler(timeframe_ms,
+                                    ServerClock(self.exchange),
+                                    delay_ms=CANDLE_CLOSE_DELAY_MS,
+                                    monitor_interval=POSITION_CHECK_INTERVAL)
+        
+        # Akış / veri merkezi bağlıyken fetch_data REST isteği yapmaz, kopunca REST'e döner
+        if MARKET_HUB:
+            self.stream = market_hub.attach([self.candle_store], MARKET_HUB)
+        else:
+            self.stream = kline_stream.attach([self.candle_store], self.exchange) if STREAM_ENABLED else None
+        
+        # Hızlı pozisyon izleyici açıksa zamanlayıcı tick'lerine gerek kalmaz
+        if POSITION_WATCHER_ENABLED:
+            self.watcher = PositionWatcher(self, self.stream, POSITION_POLL_INTERVAL).start()
+        
         while True:
             try:
-                # Günlük reset kontrolü
-                self.check_daily_reset()
+                # Bir sonraki mum kapanışını (veya pozisyon izleme anını) bekle
+                event, closed_bar = scheduler.wait(self.last_closed_bar,
+                                                   monitor=self.in_position and self.watcher is None)
                 
-                # Veri çek
-                df = self.fetch_data()
-                if df is None:
+                if event != BAR:
+                    self.monitor_position()
+                    continue
+                
+                if not self.run_cycle(closed_bar):
                     consecutive_errors += 1
                     if consecutive_errors >= max_errors:
-                        self.send_telegram("❌ *HATA*: Çok fazla ardışık hata!")
+                        self.send_telegram("❌ *HATA*: Çok fazla ardışık hata!", status=True)
                         break
                     time.sleep(60)
                     continue
                 
                 consecutive_errors = 0
                 
-                # İndikatörleri hesapla
-                df = self.calculate_indicators(df)
-                if df is None:
-                    time.sleep(CHECK_INTERVAL)
-                    continue
-                
-                current_price = df.iloc[-1]['close']
-                
-                # Açık pozisyon varsa kontrol et
-                if self.in_position:
-                    self.check_position(df)
-                else:
-                    # Yeni sinyal ara
-                    signal, score, reasons = self.generate_signals(df)
-                    
-                    if signal:
-                        self.execute_signal(signal, score, reasons, current_price)
-                
-                # Bekleme
-                time.sleep(CHECK_INTERVAL)
-                
             except KeyboardInterrupt:
                 logging.info("\n👋 Bot durduruldu (kullanıcı)")
-                self.send_telegram("👋 Bot durduruldu")
+                self.send_telegram("👋 Bot durduruldu", status=True)
                 break
             
             except Exception as e:
                 logging.error(f"❌ Beklenmeyen hata: {e}")
                 consecutive_errors += 1
                 if consecutive_errors >= max_errors:
-                    self.send_telegram(f"❌ *HATA*: {e}")
+                    self.send_telegram(f"❌ *HATA*: {e}", status=True)
                     break
                 time.sleep(60)
+        
+        stop_summary.set()
+        if self.watcher:
+            self.watcher.stop()
+        if self.stream:
+            self.stream.stop()
+        
+        # Kuyrukta kalan bildirimleri gönder, durum günlüğünü snapshot'la kapat
+        self.notifier.close()
+        if self.journal:
+            self.journal.close()
+        if self.ledger:
+            self.ledger.close()
 
 def main():
     """Ana fonksiyon"""
+    setup_logging()
     try:
         bot = BitcoinDailyBot()
         bot.run()
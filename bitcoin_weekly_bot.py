@@ -7,33 +7,48 @@ Her sinyal %1.5 kar hedefine ulaşana kadar takip edilir
 Telegram ile bildirim gönderir
 """
 
-import ccxt
+import lazy_ccxt as ccxt  # Sadece Binance sınıfı yüklenir, piyasa bilgisi önbellekli
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import time
-import requests
-from ta.momentum import RSIIndicator
-from ta.trend import MACD, EMAIndicator
-from ta.volatility import BollingerBands, AverageTrueRange
 import warnings
 import logging
+import os
 import sys
+import threading
+import kline_stream
+import market_hub
+import rate_limiter
+from candle_store import CandleStore
+from history_store import HistoryStore
+from metrics import (instrument_exchange, serve as serve_metrics, start_summary_log, timed,
+                     watch_candles, watch_queue)
+from scheduler import CandleScheduler, ServerClock, closed_frame
+from state_journal import STATE_DIR, StateJournal
+from telegram_queue import TelegramNotifier
+from trade_ledger import LEDGER_PATH, TradeLedger
+from streaming_indicators import IndicatorFrame
+from strategies import WeeklyStrategy
 
 warnings.filterwarnings('ignore')
 
 # Logging ayarları
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+LOG_FILE = 'bot.log'
 logger = logging.getLogger(__name__)
 
 
+def setup_logging(log_file=LOG_FILE):
+    """Log'u dosyaya ve konsola yaz (sadece bot çalıştırılırken; içe aktarmak dosya açmaz)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+
 class BitcoinWeeklyBot:
     def __init__(self, telegram_token, telegram_chat_id):
         """
@@ -44,14 +59,17 @@ class BitcoinWeeklyBot:
             telegram_chat_id: Telegram chat ID
         """
         try:
-            self.exchange = ccxt.binance({
-                'enableRateLimit': True,
-                'rateLimit': 1200,
-            })
+            # Sabit rateLimit yerine ağırlık bütçeli ortak zamanlayıcı (aynı IP'deki botlarla)
+            self.exchange = rate_limiter.attach(ccxt.binance({'enableRateLimit': True}))
             self.symbol = 'BTC/USDT'
             self.timeframe = '1h'
+            # Kapanan mumlar diske yazılır, açılışta diskten ısınılır
+            self.candle_store = CandleStore(self.symbol, self.timeframe, window=200,
+                                            history=HistoryStore(self.symbol, self.timeframe))
+            self.candle_store.warm_up(self.exchange)
             self.telegram_token = telegram_token
             self.telegram_chat_id = telegram_chat_id
+            self.notifier = TelegramNotifier(telegram_token, telegram_chat_id, parse_mode='HTML')
             
             # HAFTALıK %1.5 KAR HEDEFİ SİSTEMİ
             self.weekly_profit_target = 1.5  # %1.5 haftalık hedef
@@ -61,6 +79,26 @@ class BitcoinWeeklyBot:
             # Sinyal durumu
             self.signals_this_week = {'buy': 0, 'sell': 0}
             self.signal_profit_target = 1.5  # Her sinyal %1.5 hedefler
+            self.commission_percent = 0.1  # Binance spot, alış ve satışta ayrı ayrı
+            self.open_signals = []  # Hedef / stop'a henüz ulaşmamış gönderilmiş sinyaller
+            self.pending_signals = []  # Telegram gönderimi henüz sonuçlanmamış sinyaller
+            # Gönderim sonucu Telegram iş parçacığında işlenir: sinyal sayıları ve
+            # takipteki sinyaller ana döngüyle bu kilit altında paylaşılır
+            self.state_lock = threading.RLock()
+            
+            # Sinyal ve işlem defteri: sinyal sonuçları kapanan mumlarla takip edilir
+            self.ledger = TradeLedger(LEDGER_PATH)
+            
+            # Durum günlüğü: yeniden başlatmada haftalık kar, sinyal sayıları ve
+            # takipteki sinyaller korunur
+            self.state_fields = ('weekly_profit', 'week_start', 'signals_this_week', 'open_signals')
+            self.journal = StateJournal(os.path.join(STATE_DIR, 'weekly'))
+            self._restore_state()
+            self.last_closed_bar = None  # Değerlendirilen son kapanmış mum (ms)
+            self.stream_enabled = True  # websockets kuruluysa WebSocket kline akışı
+            self.market_hub = None  # Ortak veri merkezi adresi, örn. ('127.0.0.1', 8765)
+            self.metrics_port = 9109  # Yerel /metrics adresi (None: kapalı)
+            self.metrics_summary_interval = 3600  # Metrik özeti log aralığı (saniye)
             
             # İndikatör parametreleri
             self.rsi_period = 14
@@ -78,12 +116,47 @@ class BitcoinWeeklyBot:
                 self.bb_period
             ) + 50
             
+            # Akışkan motor ve vektörize çekirdekler için ortak parametreler (MACD 12/26/9)
+            self.indicator_params = {
+                'rsi': self.rsi_period,
+                'ema': {'ema_20': self.ema_short, 'ema_50': self.ema_long},
+                'macd': (12, 26, 9),
+                'bollinger': (self.bb_period, self.bb_std),
+                'atr': 14,
+                'volume_ma': 20,
+            }
+            # Sinyal kuralları strateji eklentisinde, indikatörler ortak çerçevede hesaplanır
+            self.strategy = WeeklyStrategy('weekly', self.symbol, self.timeframe, self.indicator_params)
+            self.indicators = IndicatorFrame(history=200)
+            self.indicators.register(self.strategy.name, self.strategy.indicators)
+            
             logger.info("Bot başarıyla başlatıldı - Haftalık %1.5 kar hedefli sistem aktif")
             
         except Exception as e:
             logger.error(f"Bot başlatma hatası: {e}")
             raise
     
+    def _restore_state(self):
+        """Durum günlüğünden haftalık kar ve sinyal sayılarını geri yükle"""
+        try:
+            state = self.journal.load()
+        except Exception as e:
+            logger.error(f"Durum günlüğü okunamadı: {e}")
+            return
+        
+        for field in self.state_fields:
+            if field in state:
+                setattr(self, field, state[field])
+        if state:
+            logger.info(f"Durum geri yüklendi: Hafta {self.week_start:%Y-%m-%d}, "
+                        f"kar %{self.weekly_profit:.2f}, "
+                        f"sinyaller {self.signals_this_week['buy']}/{self.signals_this_week['sell']}")
+    
+    def _save_state(self):
+        """Değişen durum alanlarını günlüğe ekle (disk yazma arka planda)"""
+        state = {field: getattr(self, field) for field in self.state_fields}
+        self.journal.record(self.journal.changes(state))
+    
     def _get_week_start(self):
         """Haftanın başlangıcını hesapla (Pazartesi)"""
         today = datetime.now()
@@ -93,307 +166,261 @@ class BitcoinWeeklyBot:
     def _check_new_week(self):
         """Yeni hafta başladı mı kontrol et"""
         current_week_start = self._get_week_start()
-        if current_week_start > self.week_start:
-            logger.info(f"YENİ HAFTA BAŞLADI: {current_week_start.strftime('%Y-%m-%d')}")
-            logger.info(f"Geçen hafta kar: %{self.weekly_profit:.2f}")
-            
-            self.week_start = current_week_start
-            self.weekly_profit = 0.0  # Haftalık karı sıfırla
-            self.signals_this_week = {'buy': 0, 'sell': 0}
-            return True
+        with self.state_lock:
+            if current_week_start > self.week_start:
+                logger.info(f"YENİ HAFTA BAŞLADI: {current_week_start.strftime('%Y-%m-%d')}")
+                logger.info(f"Geçen hafta kar: %{self.weekly_profit:.2f}")
+                
+                self.week_start = current_week_start
+                self.weekly_profit = 0.0  # Haftalık karı sıfırla
+                self.signals_this_week = {'buy': 0, 'sell': 0}
+                self._save_state()
+                return True
         return False
     
     def _check_weekly_target_reached(self):
         """Haftalık %1.5 hedefe ulaşıldı mı?"""
         return self.weekly_profit >= self.weekly_profit_target
     
+    def _signal_limited(self, signal):
+        """Bu hafta bu yönde sinyal gönderildi mi (gönderimi süren sinyaller dahil)"""
+        with self.state_lock:
+            sent = self.signals_this_week['buy' if signal == 'BUY' else 'sell']
+            pending = sum(1 for entry in self.pending_signals if entry['side'] == signal)
+            return sent + pending >= 1
+    
+    @timed('fetch_data')
     def fetch_data(self, limit=200):
-        """Binance'den OHLCV verisi çek"""
-        max_retries = 3
-        retry_delay = 5
-        
-        for attempt in range(max_retries):
-            try:
-                ohlcv = self.exchange.fetch_ohlcv(
-                    self.symbol, 
-                    self.timeframe, 
-                    limit=limit
-                )
-                
-                if not ohlcv or len(ohlcv) == 0:
-                    logger.warning(f"Veri boş geldi, deneme {attempt + 1}/{max_retries}")
-                    time.sleep(retry_delay)
-                    continue
-                
-                df = pd.DataFrame(
-                    ohlcv, 
-                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                )
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                
-                if df.isnull().any().any():
-                    logger.warning("Veri içinde NULL değerler var")
-                    df = df.dropna()
-                
-                if len(df) < self.min_data_length:
-                    logger.warning(f"Yetersiz veri: {len(df)} < {self.min_data_length}")
-                    return None
-                
-                logger.info(f"{len(df)} adet mum verisi çekildi")
-                return df
-                
-            except ccxt.RateLimitExceeded:
-                logger.warning(f"Rate limit aşıldı, {retry_delay * 2} saniye bekleniyor...")
-                time.sleep(retry_delay * 2)
-            except ccxt.NetworkError as e:
-                logger.error(f"Network hatası: {e}, deneme {attempt + 1}/{max_retries}")
-                time.sleep(retry_delay)
-            except Exception as e:
-                logger.error(f"Veri çekme hatası: {e}, deneme {attempt + 1}/{max_retries}")
-                time.sleep(retry_delay)
+        """
+        Binance'den OHLCV verisi çek
         
-        return None
-    
-    def calculate_indicators(self, df):
-        """Teknik indikatörleri hesapla"""
+        Returns:
+            Mum penceresinin kopyasız görünümü (yapılandırılmış dizi: timestamp ms, OHLCV)
+        """
+        # 429 / 418 ve ağ hatalarında geri çekilme ve tekrar deneme ortak zamanlayıcıda
+        # (rate_limiter); buraya ulaşan hata tekrar denemeler tükendiği anlamına gelir
         try:
-            df = df.copy()
+            # Sadece son mumdan sonraki veriler çekilir
+            self.candle_store.window = limit
+            new_candles = self.candle_store.update(self.exchange)
             
-            # RSI
-            rsi = RSIIndicator(close=df['close'], window=self.rsi_period)
-            df['rsi'] = rsi.rsi()
-            
-            # EMA
-            ema_short = EMAIndicator(close=df['close'], window=self.ema_short)
-            ema_long = EMAIndicator(close=df['close'], window=self.ema_long)
-            df['ema_20'] = ema_short.ema_indicator()
-            df['ema_50'] = ema_long.ema_indicator()
+            if len(self.candle_store) == 0:
+                logger.warning("Veri boş geldi")
+                return None
             
-            # MACD
-            macd = MACD(close=df['close'])
-            df['macd'] = macd.macd()
-            df['macd_signal'] = macd.macd_signal()
-            df['macd_diff'] = macd.macd_diff()
+            # Eksik değerli mumlar depoya yazılırken atlanır (NULL kontrolü gerekmez)
+            candles = self.candle_store.view()
             
-            # Bollinger Bands
-            bb = BollingerBands(
-                close=df['close'], 
-                window=self.bb_period, 
-                window_dev=self.bb_std
-            )
-            df['bb_high'] = bb.bollinger_hband()
-            df['bb_mid'] = bb.bollinger_mavg()
-            df['bb_low'] = bb.bollinger_lband()
+            if len(candles) < self.min_data_length:
+                logger.warning(f"Yetersiz veri: {len(candles)} < {self.min_data_length}")
+                return None
             
-            # ATR
-            atr = AverageTrueRange(
-                high=df['high'], 
-                low=df['low'], 
-                close=df['close']
-            )
-            df['atr'] = atr.average_true_range()
+            logger.info(f"{len(candles)} adet mum verisi hazır ({new_candles} yeni)")
+            return candles
             
-            # Volume MA
-            df['volume_ma'] = df['volume'].rolling(window=20).mean()
+        except ccxt.RateLimitExceeded:
+            logger.warning("Rate limit aşıldı, sonraki döngüde tekrar denenecek")
+        except ccxt.NetworkError as e:
+            logger.error(f"Network hatası: {e}")
+        except Exception as e:
+            logger.error(f"Veri çekme hatası: {e}")
+        
+        return None
+    
+    @timed('calculate_indicators')
+    def calculate_indicators(self, candles):
+        """
+        Teknik indikatörleri hesapla
+        
+        Returns:
+            Mumlar + indikatör kolonları (çerçevenin strateji kolon adlarıyla kopyasız
+            görünümü, ısınma satırları hariç)
+        """
+        try:
+            # RSI, EMA, MACD, Bollinger, ATR ve Volume MA - sadece yeni mumlar işlenir
+            records = self.indicators.update_candles(candles)
+            data = self.indicators.select(records, self.strategy.name)
             
-            df = df.dropna()
+            # İndikatörleri henüz hesaplanmamış ilk mumlar atlanır (dropna yerine)
+            data = self.indicators.warmed_up(data, self.strategy.name)
             
-            if len(df) < 2:
+            if len(data) < 2:
                 logger.error("İndikatör hesaplamadan sonra yetersiz veri")
                 return None
             
             logger.info("İndikatörler başarıyla hesaplandı")
-            return df
+            return data
             
         except Exception as e:
             logger.error(f"İndikatör hesaplama hatası: {e}")
             return None
     
-    def generate_signal(self, df):
-        """Sinyal üret"""
+    @timed('generate_signals')
+    def generate_signal(self, data):
+        """Sinyal üret - kurallar WeeklyStrategy'de"""
         try:
-            if df is None or len(df) < 2:
+            if data is None or len(data) < 2:
                 return None, 0, [], None
             
-            latest = df.iloc[-1]
-            prev = df.iloc[-2]
-            
-            # NaN kontrolü
-            required_fields = [
-                'rsi', 'close', 'bb_low', 'bb_high', 'macd', 
-                'macd_signal', 'ema_20', 'ema_50', 'volume', 
-                'volume_ma', 'atr'
-            ]
-            
-            for field in required_fields:
-                if pd.isna(latest[field]):
-                    logger.warning(f"{field} değeri NaN, sinyal üretilemiyor")
-                    return None, 0, [], latest
-            
-            signal = None
-            score = 0
-            reasons = []
-            
-            # ALIŞ sinyali kontrolleri
-            buy_conditions = 0
-            buy_reasons = []
-            
-            if latest['rsi'] < 35:
-                buy_conditions += 1
-                buy_reasons.append(f"✓ RSI aşırı satım: {latest['rsi']:.1f}")
-            
-            bb_range = latest['bb_high'] - latest['bb_low']
-            if bb_range > 0:
-                price_to_lower = (latest['close'] - latest['bb_low']) / bb_range
-                if price_to_lower < 0.2:
-                    buy_conditions += 1
-                    buy_reasons.append(f"✓ Fiyat BB alt bandına yakın")
-            
-            if not pd.isna(prev['macd']) and not pd.isna(prev['macd_signal']):
-                if latest['macd'] > latest['macd_signal'] and prev['macd'] <= prev['macd_signal']:
-                    buy_conditions += 1
-                    buy_reasons.append(f"✓ MACD bullish crossover")
-                elif latest['macd'] > latest['macd_signal']:
-                    buy_conditions += 0.5
-                    buy_reasons.append(f"✓ MACD bullish")
-            
-            if latest['ema_20'] > latest['ema_50']:
-                buy_conditions += 1
-                buy_reasons.append(f"✓ EMA trend yukarı")
-            elif latest['ema_50'] > 0:
-                ema_diff_pct = abs(latest['ema_20'] - latest['ema_50']) / latest['ema_50']
-                if ema_diff_pct < 0.01:
-                    buy_conditions += 0.5
-                    buy_reasons.append(f"✓ EMA'lar yakın (potansiyel golden cross)")
-            
-            if latest['volume_ma'] > 0:
-                if latest['volume'] > latest['volume_ma'] * 1.2:
-                    buy_conditions += 1
-                    buy_reasons.append(f"✓ Hacim yüksek: {latest['volume']/latest['volume_ma']:.2f}x")
-            
-            # SATIŞ sinyali kontrolleri
-            sell_conditions = 0
-            sell_reasons = []
-            
-            if latest['rsi'] > 65:
-                sell_conditions += 1
-                sell_reasons.append(f"✓ RSI aşırı alım: {latest['rsi']:.1f}")
-            
-            if bb_range > 0:
-                price_to_lower = (latest['close'] - latest['bb_low']) / bb_range
-                if price_to_lower > 0.8:
-                    sell_conditions += 1
-                    sell_reasons.append(f"✓ Fiyat BB üst bandına yakın")
-            
-            if not pd.isna(prev['macd']) and not pd.isna(prev['macd_signal']):
-                if latest['macd'] < latest['macd_signal'] and prev['macd'] >= prev['macd_signal']:
-                    sell_conditions += 1
-                    sell_reasons.append(f"✓ MACD bearish crossover")
-                elif latest['macd'] < latest['macd_signal']:
-                    sell_conditions += 0.5
-                    sell_reasons.append(f"✓ MACD bearish")
-            
-            if latest['ema_20'] < latest['ema_50']:
-                sell_conditions += 1
-                sell_reasons.append(f"✓ EMA trend aşağı")
-            elif latest['ema_50'] > 0:
-                ema_diff_pct = abs(latest['ema_20'] - latest['ema_50']) / latest['ema_50']
-                if ema_diff_pct < 0.01:
-                    sell_conditions += 0.5
-                    sell_reasons.append(f"✓ EMA'lar yakın (potansiyel death cross)")
-            
-            if latest['volume_ma'] > 0:
-                if latest['volume'] > latest['volume_ma'] * 1.2:
-                    sell_conditions += 1
-                    sell_reasons.append(f"✓ Hacim yüksek: {latest['volume']/latest['volume_ma']:.2f}x")
-            
-            # Sinyal karar mekanizması
-            if buy_conditions >= 4 and sell_conditions >= 4:
-                if buy_conditions > sell_conditions:
-                    signal = 'BUY'
-                    score = buy_conditions
-                    reasons = buy_reasons
-                elif sell_conditions > buy_conditions:
-                    signal = 'SELL'
-                    score = sell_conditions
-                    reasons = sell_reasons
-            elif buy_conditions >= 4:
-                signal = 'BUY'
-                score = buy_conditions
-                reasons = buy_reasons
-            elif sell_conditions >= 4:
-                signal = 'SELL'
-                score = sell_conditions
-                reasons = sell_reasons
-            
-            return signal, score, reasons, latest
+            signal, score, reasons = self.strategy.evaluate(data)
+            return signal, score, reasons, data[-1]
             
         except Exception as e:
             logger.error(f"Sinyal üretme hatası: {e}")
             return None, 0, [], None
     
+    @timed('send_telegram')
     def send_telegram_message(self, message):
-        """Telegram'a mesaj gönder"""
-        url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
-        payload = {
-            'chat_id': self.telegram_chat_id,
-            'text': message,
-            'parse_mode': 'HTML'
-        }
+        """
+        Telegram mesajını gönderim kuyruğuna ekle (tekrar denemeler arka planda)
         
-        max_retries = 3
-        retry_delay = 2
+        Returns:
+            Future: Gönderim sonucu (True / False)
+        """
+        return self.notifier.send(message)
+    
+    def _on_signal_delivered(self, entry, success):
+        """Sinyal mesajı gönderim sonucu - sinyal sadece gönderildiyse sayılır ve takibe alınır"""
+        signal = entry['side']
+        with self.state_lock:
+            self.pending_signals = [e for e in self.pending_signals if e is not entry]
+            self.ledger.record_signal('weekly', self.symbol, entry['entry_ts'], signal, entry['score'],
+                                      entry['entry_price'], entry['reasons'], success,
+                                      entry['take_profit'], entry['stop_loss'])
+            if not success:
+                logger.warning("Telegram mesajı gönderilemedi, sinyal sayılmadı")
+                return
+            
+            logger.info("Telegram mesajı başarıyla gönderildi")
+            if signal == 'BUY':
+                self.signals_this_week['buy'] += 1
+            else:
+                self.signals_this_week['sell'] += 1
+            # Yeni liste: durum günlüğü değişikliği eski değerle karşılaştırarak bulur
+            self.open_signals = self.open_signals + [entry]
+            self._save_state()
+            
+            logger.info(
+                f"Bu hafta sinyaller - "
+                f"Alış: {self.signals_this_week['buy']}, "
+                f"Satış: {self.signals_this_week['sell']}"
+            )
+    
+    def _signal_levels(self, signal, data):
+        """
+        Sinyalin kar hedefi ve stop-loss seviyeleri
         
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    url, 
-                    json=payload, 
-                    timeout=10
-                )
+        Returns:
+            tuple: (take_profit, stop_loss, stop_loss_pct) - fiyat yoksa None
+        """
+        atr = data['atr'] if not pd.isna(data['atr']) else 0
+        close = data['close'] if not pd.isna(data['close']) else 0
+        if close == 0:
+            return None
+        
+        # Stop-loss: ATR bazlı
+        stop_loss_pct = (atr / close) * 100 * 2 if atr > 0 else 3
+        
+        # KAR HEDEFİ: %1.5 SABİT
+        profit_target_pct = self.signal_profit_target  # %1.5
+        
+        if signal == 'BUY':
+            stop_loss = close * (1 - stop_loss_pct/100)
+            take_profit = close * (1 + profit_target_pct/100)  # %1.5
+        else:
+            stop_loss = close * (1 + stop_loss_pct/100)
+            take_profit = close * (1 - profit_target_pct/100)  # %1.5
+        return take_profit, stop_loss, stop_loss_pct
+    
+    def _track_open_signals(self, candles):
+        """
+        Takipteki sinyalleri kapanan mumların high / low değerleriyle kontrol et
+        
+        Sinyal mumundan sonraki ilk hedef / stop dokunuşu sonuçtur; aynı mumda
+        ikisi birden görülürse (mum içi sıra bilinmediği için) stop sayılır.
+        Sonuç komisyon düşülerek deftere yazılır; haftalık karı ve sinyal
+        kararlarını etkilemez.
+        
+        Args:
+            candles: Döngüde çekilen kapanmış mumlar (closed_frame)
+        """
+        if not self.open_signals:
+            return
+        
+        timestamps = candles['timestamp']
+        highs = candles['high']
+        lows = candles['low']
+        timeframe_ms = self.exchange.parse_timeframe(self.timeframe) * 1000
+        
+        with self.state_lock:
+            still_open = []
+            for entry in self.open_signals:
+                after = timestamps > entry['bar']
+                if entry['side'] == 'BUY':
+                    stop_hit = after & (lows <= entry['stop_loss'])
+                    target_hit = after & (highs >= entry['take_profit'])
+                else:
+                    stop_hit = after & (highs >= entry['stop_loss'])
+                    target_hit = after & (lows <= entry['take_profit'])
                 
-                if response.status_code == 200:
-                    logger.info("Telegram mesajı başarıyla gönderildi")
-                    return True
+                hits = stop_hit | target_hit
+                if not hits.any():
+                    still_open.append(entry)
+                    continue
+                
+                i = int(hits.argmax())
+                if stop_hit[i]:
+                    exit_price, reason = entry['stop_loss'], 'Stop Loss'
                 else:
-                    logger.error(f"Telegram hatası (HTTP {response.status_code}): {response.text}")
-                    
-            except requests.exceptions.Timeout:
-                logger.warning(f"Telegram timeout, deneme {attempt + 1}/{max_retries}")
-                time.sleep(retry_delay)
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Telegram gönderim hatası: {e}, deneme {attempt + 1}/{max_retries}")
-                time.sleep(retry_delay)
+                    exit_price, reason = entry['take_profit'], 'Kar Hedefi'
+                self._close_signal(entry, exit_price, int(timestamps[i]) + timeframe_ms, reason)
+            
+            if len(still_open) != len(self.open_signals):
+                self.open_signals = still_open
+                self._save_state()
+    
+    def _close_signal(self, entry, exit_price, exit_ts, reason):
+        """Sonuçlanan sinyali deftere yaz ve bildir"""
+        entry_price = entry['entry_price']
+        if entry['side'] == 'BUY':
+            gross = (exit_price - entry_price) / entry_price * 100
+        else:
+            gross = (entry_price - exit_price) / entry_price * 100
+        commission = 2 * self.commission_percent
+        net = gross - commission
         
-        logger.error("Telegram mesajı gönderilemedi (tüm denemeler başarısız)")
-        return False
+        self.ledger.record_trade('weekly', self.symbol, entry['side'], entry['entry_ts'], entry_price,
+                                 exit_ts, exit_price, net, commission, reason, entry['score'],
+                                 entry['reasons'], entry['take_profit'], entry['stop_loss'])
+        
+        logger.info(f"{'✅' if net > 0 else '❌'} {entry['side']} sinyali sonuçlandı: {reason} | "
+                    f"${entry_price:,.2f} -> ${exit_price:,.2f} | Net: %{net:.2f}")
+        self.send_telegram_message(
+            f"{'✅' if net > 0 else '❌'} <b>Sinyal Sonuçlandı</b>\n\n"
+            f"<b>Sinyal:</b> {'ALIŞ' if entry['side'] == 'BUY' else 'SATIŞ'}\n"
+            f"<b>Giriş / Çıkış:</b> ${entry_price:,.2f} / ${exit_price:,.2f}\n"
+            f"<b>Net Kar:</b> %{net:.2f} (komisyon dahil)\n"
+            f"<b>Sebep:</b> {reason}"
+        )
     
     def format_signal_message(self, signal, score, reasons, data):
         """Telegram mesajı formatla - %1.5 KAR HEDEFİ"""
         try:
-            atr = data['atr'] if not pd.isna(data['atr']) else 0
-            close = data['close'] if not pd.isna(data['close']) else 0
-            
-            if close == 0:
+            levels = self._signal_levels(signal, data)
+            if levels is None:
                 logger.error("Fiyat bilgisi eksik, mesaj formatlanamıyor")
                 return None
             
-            # Stop-loss: ATR bazlı
-            stop_loss_pct = (atr / close) * 100 * 2 if atr > 0 else 3
-            
-            # KAR HEDEFİ: %1.5 SABİT
+            take_profit, stop_loss, stop_loss_pct = levels
+            close = data['close']
             profit_target_pct = self.signal_profit_target  # %1.5
             
             if signal == 'BUY':
                 emoji = "🟢"
                 action = "ALIŞ"
-                stop_loss = close * (1 - stop_loss_pct/100)
-                take_profit = close * (1 + profit_target_pct/100)  # %1.5
             else:
                 emoji = "🔴"
                 action = "SATIŞ"
-                stop_loss = close * (1 + stop_loss_pct/100)
-                take_profit = close * (1 - profit_target_pct/100)  # %1.5
             
             rsi_val = data['rsi'] if not pd.isna(data['rsi']) else 0
             macd_val = data['macd'] if not pd.isna(data['macd']) else 0
@@ -454,47 +481,76 @@ class BitcoinWeeklyBot:
         consecutive_errors = 0
         max_consecutive_errors = 10
         
+        # Her 1 saatlik mum kapanışından hemen sonra bir kez değerlendir
+        timeframe_ms = self.exchange.parse_timeframe(self.timeframe) * 1000
+        scheduler = CandleScheduler(timeframe_ms, ServerClock(self.exchange))
+        
+        # Metrikler: aşama süreleri, uç nokta istekleri, mum bayatlığı, kuyruk derinliği
+        instrument_exchange(self.exchange)
+        rate_limiter.watch_scheduler()
+        watch_candles(self.candle_store, timeframe_ms)
+        watch_queue(self.notifier)
+        if self.metrics_port:
+            serve_metrics(self.metrics_port)
+        stop_summary = start_summary_log(self.metrics_summary_interval, log=logger.info)
+        
+        # Akış / veri merkezi bağlıyken fetch_data REST isteği yapmaz, kopunca REST'e döner
+        stream = None
+        if self.market_hub:
+            stream = market_hub.attach([self.candle_store], self.market_hub)
+        elif self.stream_enabled:
+            stream = kline_stream.attach([self.candle_store], self.exchange, book_ticker=False)
+        
         while True:
             try:
+                _, closed_bar = scheduler.wait(self.last_closed_bar)
+                
                 # Yeni hafta kontrolü
                 self._check_new_week()
                 
+                # Veri çek (sinyal takibi ve sinyal üretimi aynı mumları kullanır)
+                logger.info("Veri çekiliyor...")
+                candles = self.fetch_data()
+                
+                if candles is None:
+                    consecutive_errors += 1
+                    logger.warning(f"Veri çekme başarısız ({consecutive_errors}/{max_consecutive_errors})")
+                    
+                    if consecutive_errors >= max_consecutive_errors:
+                        logger.critical("Çok fazla ardışık hata, bot durduruluyor!")
+                        break
+                    
+                    time.sleep(300)
+                    continue
+                
+                # Sadece kapanmış mumlar (borsada yeni mum yoksa zamanlayıcı tekrar dener)
+                candles = closed_frame(candles, closed_bar)
+                if candles is None:
+                    continue
+                self.last_closed_bar = closed_bar
+                
+                # Gönderilen sinyallerin hedef / stop takibi (limit dolu olsa da sürer)
+                self._track_open_signals(candles)
+                
                 # Haftalık hedefe ulaşıldı mı?
                 if self._check_weekly_target_reached():
                     logger.info(f"✅ HAFTALIK %{self.weekly_profit_target} HEDEFE ULAŞILDI!")
                     logger.info(f"Bu hafta toplam kar: %{self.weekly_profit:.2f}")
                     logger.info("Yeni haftaya kadar bekleniyor...")
-                    time.sleep(3600)  # 1 saat bekle
                     continue
                 
                 # Haftalık limit kontrolü (1 alış + 1 satış)
-                if self.signals_this_week['buy'] >= 1 and self.signals_this_week['sell'] >= 1:
+                if self._signal_limited('BUY') and self._signal_limited('SELL'):
                     logger.info(
                         f"Bu hafta sinyal limiti doldu. "
                         f"Mevcut kar: %{self.weekly_profit:.2f} / Hedef: %{self.weekly_profit_target}"
                     )
-                    time.sleep(3600)
-                    continue
-                
-                # Veri çek
-                logger.info("Veri çekiliyor...")
-                df = self.fetch_data()
-                
-                if df is None:
-                    consecutive_errors += 1
-                    logger.warning(f"Veri çekme başarısız ({consecutive_errors}/{max_consecutive_errors})")
-                    
-                    if consecutive_errors >= max_consecutive_errors:
-                        logger.critical("Çok fazla ardışık hata, bot durduruluyor!")
-                        break
-                    
-                    time.sleep(300)
                     continue
                 
                 # İndikatörleri hesapla
-                df = self.calculate_indicators(df)
+                data = self.calculate_indicators(candles)
                 
-                if df is None:
+                if data is None:
                     consecutive_errors += 1
                     logger.warning(f"İndikatör hesaplama başarısız ({consecutive_errors}/{max_consecutive_errors})")
                     time.sleep(300)
@@ -503,7 +559,7 @@ class BitcoinWeeklyBot:
                 consecutive_errors = 0
                 
                 # Sinyal üret
-                signal, score, reasons, latest_data = self.generate_signal(df)
+                signal, score, reasons, latest_data = self.generate_signal(data)
                 
                 if latest_data is not None:
                     close_val = latest_data['close'] if not pd.isna(latest_data['close']) else 0
@@ -515,11 +571,23 @@ class BitcoinWeeklyBot:
                     )
                 
                 if signal:
+                    levels = self._signal_levels(signal, latest_data)
+                    entry = None
+                    if levels is not None:
+                        entry = {'side': signal, 'bar': int(closed_bar),
+                                 'entry_ts': int(closed_bar) + timeframe_ms,
+                                 'entry_price': float(latest_data['close']),
+                                 'take_profit': float(levels[0]), 'stop_loss': float(levels[1]),
+                                 'score': float(score), 'reasons': list(reasons)}
+                    
                     # Haftalık limit kontrolü
-                    if signal == 'BUY' and self.signals_this_week['buy'] >= 1:
-                        logger.info("ALIŞ sinyali var ama bu hafta limitine ulaşıldı")
-                    elif signal == 'SELL' and self.signals_this_week['sell'] >= 1:
-                        logger.info("SATIŞ sinyali var ama bu hafta limitine ulaşıldı")
+                    if self._signal_limited(signal):
+                        logger.info(f"{'ALIŞ' if signal == 'BUY' else 'SATIŞ'} sinyali var "
+                                    f"ama bu hafta limitine ulaşıldı")
+                        if entry:
+                            self.ledger.record_signal('weekly', self.symbol, entry['entry_ts'], signal,
+                                                      score, entry['entry_price'], reasons, False,
+                                                      entry['take_profit'], entry['stop_loss'])
                     else:
                         logger.info("="*60)
                         logger.info(f"🎯 {signal} SİNYALİ ÜRETİLDİ! (Skor: {score:.1f}/5.0)")
@@ -530,30 +598,18 @@ class BitcoinWeeklyBot:
                         message = self.format_signal_message(signal, score, reasons, latest_data)
                         
                         if message:
-                            success = self.send_telegram_message(message)
-                            
-                            if success:
-                                # Sinyal sayacını güncelle
-                                if signal == 'BUY':
-                                    self.signals_this_week['buy'] += 1
-                                else:
-                                    self.signals_this_week['sell'] += 1
-                                
-                                # Haftalık kar tahmini güncelle (sinyal başarılı olursa)
-                                # Gerçek kar takibi için ayrı bir sistem gerekir
-                                logger.info(
-                                    f"Bu hafta sinyaller - "
-                                    f"Alış: {self.signals_this_week['buy']}, "
-                                    f"Satış: {self.signals_this_week['sell']}"
-                                )
-                            else:
-                                logger.warning("Telegram mesajı gönderilemedi, sinyal sayılmadı")
+                            # Sinyal sayacı gönderim onaylanınca güncellenir, sinyal
+                            # takibe alınır ve sonucu kapanan mumlarla izlenir
+                            with self.state_lock:
+                                self.pending_signals.append(entry)
+                            future = self.send_telegram_message(message)
+                            future.add_done_callback(
+                                lambda f, entry=entry: self._on_signal_delivered(entry, f.result())
+                            )
                         else:
                             logger.error("Mesaj formatlanamadı")
-                
-                # 30 dakika bekle
-                logger.info("Bekleniyor... (30 dakika)")
-                time.sleep(1800)
+
+                logger.info("Bir sonraki mum kapanışı bekleniyor...")
                 
             except KeyboardInterrupt:
                 logger.info("\n\nBot kullanıcı tarafından durduruldu.")
@@ -567,6 +623,15 @@ class BitcoinWeeklyBot:
                     break
                 
                 time.sleep(300)
+        
+        stop_summary.set()
+        if stream:
+            stream.stop()
+        
+        # Kuyrukta kalan bildirimleri gönder, durum günlüğünü snapshot'la kapat
+        self.notifier.close()
+        self.journal.close()
+        self.ledger.close()
 
 
 if __name__ == "__main__":
@@ -586,6 +651,7 @@ if __name__ == "__main__":
         print("="*60)
         sys.exit(1)
     
+    setup_logging()
     try:
         # Botu başlat
         bot = BitcoinWeeklyBot(
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mum Verisi Deposu
+Son N mumu bellekte tutar, borsadan sadece son mumdan sonraki verileri çeker
+Oluşmakta olan son mum güncellenir, kapanan mumlar pencereye eklenir
+İsteğe bağlı HistoryStore ile açılışta diskten ısınır, kapanan mumları diske yazar
+WebSocket akışı (kline_stream) mumları push() ile doğrudan pencereye işleyebilir
+
+Mumlar önceden ayrılmış bir NumPy yapılandırılmış dizisinde (int64 ms zaman
+damgası, float64 OHLCV) tutulur: yeni mumlar yerinde yazılır, view() ve kolonlar
+kopyasız görünümdür. DataFrame sadece istenirse (to_dataframe, hata ayıklama) oluşturulur.
+"""
+
+import logging
+import threading
+
+import numpy as np
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+CANDLE_DTYPE = np.dtype([('timestamp', np.int64)] + [(name, np.float64) for name in OHLCV_COLUMNS[1:]])
+
+
+class RecordBuffer:
+    """
+    Son `size` kaydı tutan önceden ayrılmış yapılandırılmış dizi
+
+    Kayıtlar dizinin sonuna yerinde yazılır, view() kopyasız görünüm döndürür.
+    Dizi dolunca son `size` kayıt yeni bir diziye taşınır (her `size` eklemede
+    bir kez): daha önce alınmış görünümler geçerli kalır, bellek kullanımı sabittir.
+    Görünümde sadece son kayıt (oluşan mum) yerinde değişebilir.
+    """
+
+    def __init__(self, dtype, size):
+        self.dtype = np.dtype(dtype)
+        self.size = size
+        self._data = np.empty(2 * size, self.dtype)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def view(self):
+        """Kayıtların kopyasız görünümü (eskiden yeniye)"""
+        return self._data[self._start:self._end]
+
+    def clear(self):
+        """Tüm kayıtları at (yeni dizi: eski görünümler değişmez)"""
+        self._data = np.empty(2 * self.size, self.dtype)
+        self._start = self._end = 0
+
+    def resize(self, size):
+        """Tutulacak kayıt sayısını değiştir - son kayıtlar korunur"""
+        if size == self.size:
+            return
+        keep = self.view()[-size:] if size else self.view()[:0]
+        self.size = size
+        self._data = np.empty(2 * size, self.dtype)
+        self._data[:len(keep)] = keep
+        self._start, self._end = 0, len(keep)
+
+    def push(self, count=1):
+        """
+        Sona `count` boş kayıt ekle
+
+        Returns:
+            Yazılacak kayıtların görünümü (çağıran doldurur)
+        """
+        if self._end + count > len(self._data):
+            keep = min(len(self), max(self.size - count, 0))
+            data = np.empty(max(2 * self.size, keep + count), self.dtype)
+            data[:keep] = self._data[self._end - keep:self._end]
+            self._data, self._start, self._end = data, 0, keep
+        rows = self._data[self._end:self._end + count]
+        self._end += count
+        self._start = max(self._start, self._end - self.size)
+        return rows
+
+
+def candle_array(ohlcv):
+    """(N, 6) OHLCV dizisinden yapılandırılmış mum dizisi (kopya - backtest / ölçüm için)"""
+    ohlcv = np.asarray(ohlcv, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+    records = np.empty(len(ohlcv), CANDLE_DTYPE)
+    for i, name in enumerate(OHLCV_COLUMNS):
+        records[name] = ohlcv[:, i]
+    return records
+
+
+def ohlcv_array(records, out=None):
+    """Yapılandırılmış mum kayıtlarını (N, 6) float64 diziye yaz (diske yazma / tarayıcı)"""
+    if out is None:
+        out = np.empty((len(records), len(OHLCV_COLUMNS)))
+    for i, name in enumerate(OHLCV_COLUMNS):
+        out[:, i] = records[name]
+    return out
+
+
+class CandleStore:
+    def __init__(self, symbol, timeframe, window=200, history=None):
+        """
+        Mum deposu başlatma
+
+        Args:
+            symbol: İşlem çifti (örn. 'BTC/USDT')
+            timeframe: Mum periyodu (örn. '15m')
+            window: Bellekte tutulacak maksimum mum sayısı
+            history: Diskteki geçmiş (HistoryStore) - verilirse kapanan mumlar yazılır
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.history = history
+        self.buffer = RecordBuffer(CANDLE_DTYPE, window)
+        self.lock = threading.RLock()  # Akış iş parçacığı ile bot döngüsü arasında
+        self.live = False  # Akış bağlı ve güncelken REST isteği yapılmaz
+
+    def __len__(self):
+        return len(self.buffer)
+
+    @property
+    def window(self):
+        return self.buffer.size
+
+    @window.setter
+    def window(self, window):
+        with self.lock:
+            self.buffer.resize(window)
+
+    @property
+    def last_timestamp(self):
+        """Son (oluşmakta olan) mumun açılış zamanı (ms)"""
+        candles = self.buffer.view()
+        return int(candles['timestamp'][-1]) if len(candles) else None
+
+    def view(self):
+        """
+        Penceredeki mumlar (kopyasız yapılandırılmış dizi görünümü)
+
+        Kolonlar view()['close'] gibi okunur. Sonraki güncellemelerde sadece son
+        mum (oluşan mum) yerinde değişebilir.
+        """
+        with self.lock:
+            return self.buffer.view()
+
+    def clear(self):
+        with self.lock:
+            self.buffer.clear()
+
+    def warm_up(self, exchange=None):
+        """
+        Pencereyi diskteki son mumlarla doldur
+
+        Exchange verilirse ve diskte veri varsa, önce diskteki son mumdan bu yana
+        kapanan mumlar çekilir (bot kapalıyken oluşan boşluk kalmasın diye).
+
+        Returns:
+            int: Diskten yüklenen mum sayısı
+        """
+        if self.history is None:
+            return 0
+        try:
+            if exchange is not None and self.history.last_timestamp is not None:
+                self.history.backfill(exchange, self.history.last_timestamp)
+            candles = self.history.tail(self.window)
+        except Exception as e:
+            logging.warning(f"⚠️ Disk geçmişi okunamadı: {e}")
+            return 0
+        with self.lock:
+            self.buffer.clear()
+            self.merge(candles)
+        if len(self):
+            logging.info(f"💾 {self.symbol} {self.timeframe}: {len(self)} mum diskten yüklendi")
+        return len(self)
+
+    def _needs_full_refresh(self, exchange):
+        """Pencere boşsa veya aradaki boşluk pencereden büyükse tüm pencereyi yeniden çek"""
+        if not len(self):
+            return True
+        timeframe_ms = exchange.parse_timeframe(self.timeframe) * 1000
+        missing = (exchange.milliseconds() - self.last_timestamp) // timeframe_ms
+        return missing >= self.window
+
+    def update(self, exchange):
+        """
+        Borsadan yeni mumları çek ve pencereye işle
+
+        Returns:
+            int: Pencereye eklenen yeni mum sayısı
+        """
+        if self.live:
+            return 0
+
+        full_refresh = self._needs_full_refresh(exchange)
+        if full_refresh:
+            ohlcv = exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=self.window)
+        else:
+            # Sadece son mumdan itibaren çek (son mum hâlâ oluşuyor olabilir)
+            ohlcv = exchange.fetch_ohlcv(self.symbol, self.timeframe, since=self.last_timestamp)
+
+        with self.lock:
+            if full_refresh:
+                self.buffer.clear()
+            added = self.merge(ohlcv)
+        if self.history is not None and added:
+            self._persist_closed()
+        return added
+
+    def push(self, candle):
+        """
+        Akıştan gelen tek mumu işle (oluşan mum güncellemesi veya yeni mum)
+
+        Returns:
+            int: Eklenen yeni mum sayısı (0 veya 1)
+        """
+        return self.extend([candle])
+
+    def extend(self, ohlcv):
+        """
+        Akıştan gelen mumları işle, kapananları diske yaz (tek yazma)
+
+        Returns:
+            int: Eklenen yeni mum sayısı
+        """
+        added = self.merge(ohlcv)
+        if self.history is not None and added:
+            self._persist_closed()
+        return added
+
+    def _persist_closed(self):
+        """Son (oluşan) mum hariç diskte olmayan mumları diske ekle"""
+        try:
+            with self.lock:
+                closed = self.buffer.view()[:-1]
+                last = self.history.last_timestamp
+                if last is not None:
+                    closed = closed[np.searchsorted(closed['timestamp'], last, side='right'):]
+                if not len(closed):
+                    return
+                ohlcv = ohlcv_array(closed)
+            self.history.append(ohlcv)
+        except Exception as e:
+            logging.warning(f"⚠️ Mumlar diske yazılamadı: {e}")
+
+    def merge(self, ohlcv):
+        """
+        OHLCV listesini pencereye işle
+
+        Aynı zamanlı mum son mumun yerine geçer, daha yeni mumlar eklenir,
+        daha eski mumlar yok sayılır. Eksik (NaN / None) değerli mumlar atlanır.
+
+        Returns:
+            int: Eklenen yeni mum sayısı
+        """
+        rows = np.asarray(ohlcv if ohlcv is not None else [], dtype=np.float64)
+        if rows.size == 0:
+            return 0
+        rows = rows.reshape(len(rows), -1)[:, :len(OHLCV_COLUMNS)]
+        incomplete = np.isnan(rows).any(axis=1)
+        if incomplete.any():
+            logging.debug(f"{self.symbol} {self.timeframe}: {int(incomplete.sum())} eksik mum atlandı")
+            rows = rows[~incomplete]
+        timestamps = rows[:, 0].astype(np.int64)
+        if len(rows) > 1 and not (np.diff(timestamps) > 0).all():
+            # Sıralı değilse aynı zamanlı mumlardan sonuncusu alınır
+            _, first = np.unique(timestamps[::-1], return_index=True)
+            index = len(rows) - 1 - first
+            rows, timestamps = rows[index], timestamps[index]
+
+        with self.lock:
+            last = self.last_timestamp
+            if last is not None:
+                same = np.flatnonzero(timestamps == last)
+                if len(same):
+                    self.buffer.view()[-1] = tuple(rows[same[-1]])
+                newer = timestamps > last
+                rows, timestamps = rows[newer], timestamps[newer]
+
+            added = len(rows)
+            if added:
+                # Pencereden taşacak eski mumlar yazılmaz
+                rows, timestamps = rows[-self.window:], timestamps[-self.window:]
+                target = self.buffer.push(len(rows))
+                target['timestamp'] = timestamps
+                for i, name in enumerate(OHLCV_COLUMNS[1:], 1):
+                    target[name] = rows[:, i]
+
+        if added > 1:
+            logging.debug(f"{self.symbol} {self.timeframe}: {added} yeni mum eklendi")
+
+        return added
+
+    def to_dataframe(self):
+        """Penceredeki mumları DataFrame olarak döndür (kopya - hata ayıklama / analiz için)"""
+        import pandas as pd
+
+        with self.lock:
+            candles = self.buffer.view()
+            df = pd.DataFrame({name: candles[name].copy() for name in OHLCV_COLUMNS})
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geçmiş Mum Deposu
+(symbol, timeframe) başına diskte tutulan kapanmış OHLCV geçmişi
+
+Düzen: <kök>/<SYMBOL>/<timeframe>/YYYY-MM-DD.bin (UTC gün bölümleri)
+Her kayıt 6 adet float64'tür (timestamp_ms, open, high, low, close, volume).
+Dosyalara sadece ekleme yapılır ve np.memmap ile kopyasız okunur; yarım
+kalmış son kayıt açılışta kırpılır.
+
+Kullanım:
+  python history_store.py backfill --since 2023-01-01 [--symbol BTC/USDT] [--timeframe 15m]
+  python history_store.py gaps [--symbol BTC/USDT] [--timeframe 15m]
+  python history_store.py info
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from rate_limiter import BULK, priority
+
+DAY_MS = 86_400_000
+FIELDS = 6
+RECORD_BYTES = FIELDS * 8
+DEFAULT_ROOT = 'data'
+
+
+def day_of(timestamp_ms):
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def parse_date(value):
+    """'YYYY-MM-DD' (UTC) -> ms"""
+    parsed = datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def timeframe_ms(timeframe):
+    units = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    return int(timeframe[:-1]) * units[timeframe[-1]] * 1000
+
+
+class HistoryStore:
+    def __init__(self, symbol, timeframe, root=DEFAULT_ROOT):
+        """
+        Args:
+            symbol: İşlem çifti (örn. 'BTC/USDT')
+            timeframe: Mum periyodu (örn. '15m')
+            root: Depo kök klasörü
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.timeframe_ms = timeframe_ms(timeframe)
+        self.path = os.path.join(root, symbol.replace('/', '-'), timeframe)
+        self._last_timestamp = None
+
+    def _partition_path(self, day):
+        return os.path.join(self.path, f'{day}.bin')
+
+    def days(self):
+        """Diskteki gün bölümleri (sıralı)"""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.path) if name.endswith('.bin'))
+
+    def _read_partition(self, day):
+        """Gün bölümünü kopyasız oku (yarım kayıt varsa kırp)"""
+        path = self._partition_path(day)
+        size = os.path.getsize(path)
+        if size % RECORD_BYTES:
+            logging.warning(f"⚠️ {path}: yarım kayıt kırpıldı")
+            with open(path, 'r+b') as f:
+                f.truncate(size - size % RECORD_BYTES)
+            size -= size % RECORD_BYTES
+        if size == 0:
+            return np.empty((0, FIELDS))
+        return np.memmap(path, dtype=np.float64, mode='r', shape=(size // RECORD_BYTES, FIELDS))
+
+    @property
+    def last_timestamp(self):
+        """Diskteki son mumun açılış zamanı (ms)"""
+        if self._last_timestamp is None:
+            for day in reversed(self.days()):
+                candles = self._read_partition(day)
+                if len(candles):
+                    self._last_timestamp = int(candles[-1, 0])
+                    break
+        return self._last_timestamp
+
+    def append(self, ohlcv):
+        """
+        Kapanmış mumları ilgili gün bölümlerine ekle
+
+        Diskteki son mumdan eski veya aynı zamanlı mumlar yok sayılır.
+
+        Returns:
+            int: Yazılan mum sayısı
+        """
+        candles = np.asarray(ohlcv, dtype=np.float64).reshape(-1, FIELDS)
+        last = self.last_timestamp
+        if last is not None:
+            candles = candles[candles[:, 0] > last]
+        if len(candles) == 0:
+            return 0
+
+        os.makedirs(self.path, exist_ok=True)
+        days = (candles[:, 0] // DAY_MS).astype(np.int64)
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        for chunk in np.split(candles, bounds):
+            with open(self._partition_path(day_of(chunk[0, 0])), 'ab') as f:
+                f.write(np.ascontiguousarray(chunk).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._last_timestamp = int(candles[-1, 0])
+        return len(candles)
+
+    def partitions(self, start_ms=None, end_ms=None):
+        """Aralıktaki gün bölümlerini memmap olarak döndür (kopyasız)"""
+        first = day_of(start_ms) if start_ms is not None else None
+        last = day_of(end_ms) if end_ms is not None else None
+        for day in self.days():
+            if (first and day < first) or (last and day > last):
+                continue
+            candles = self._read_partition(day)
+            if start_ms is not None or end_ms is not None:
+                lo = 0 if start_ms is None else np.searchsorted(candles[:, 0], start_ms)
+                hi = len(candles) if end_ms is None else np.searchsorted(candles[:, 0], end_ms)
+                candles = candles[lo:hi]
+            if len(candles):
+                yield candles
+
+    def load(self, start_ms=None, end_ms=None):
+        """
+        Aralıktaki mumları tek (N, 6) diziye oku - [start_ms, end_ms)
+
+        Tek bölüm varsa memmap doğrudan döner, yoksa bir kez birleştirilir.
+        """
+        parts = list(self.partitions(start_ms, end_ms))
+        if not parts:
+            return np.empty((0, FIELDS))
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def tail(self, count):
+        """Son `count` mumu oku (bot ısınması için)"""
+        parts = []
+        remaining = count
+        for day in reversed(self.days()):
+            candles = self._read_partition(day)
+            parts.append(candles[max(0, len(candles) - remaining):])
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+        if not parts:
+            return np.empty((0, FIELDS))
+        return np.concatenate(parts[::-1])
+
+    def find_gaps(self, start_ms=None, end_ms=None):
+        """
+        Eksik mum aralıklarını bul
+
+        Returns:
+            list: [(ilk_eksik_ms, son_eksik_ms, eksik_mum_sayısı), ...]
+        """
+        gaps = []
+        prev = None
+        for candles in self.partitions(start_ms, end_ms):
+            timestamps = candles[:, 0].astype(np.int64)
+            if prev is not None:
+                timestamps = np.concatenate([[prev], timestamps])
+            steps = np.diff(timestamps)
+            for i in np.flatnonzero(steps > self.timeframe_ms):
+                missing = int(steps[i] // self.timeframe_ms) - 1
+                gaps.append((int(timestamps[i]) + self.timeframe_ms,
+                             int(timestamps[i + 1]) - self.timeframe_ms, missing))
+            prev = timestamps[-1]
+        return gaps
+
+    def backfill(self, exchange, since_ms, until_ms=None, limit=1000, max_retries=5):
+        """
+        Borsadan `since` ile sayfa sayfa geçmiş çek ve diske ekle
+
+        Diskte veri varsa son mumdan devam eder. Sadece kapanmış mumlar yazılır.
+        ccxt'nin rateLimit değeri sayfalar arasında beklenir (enableRateLimit
+        kapalıysa da). İstekler BULK önceliğiyle gider: ortak zamanlayıcı bağlı
+        borsada (rate_limiter.attach) pozisyon izleme istekleri önce geçer.
+
+        Returns:
+            int: Yazılan mum sayısı
+        """
+        last = self.last_timestamp
+        cursor = max(since_ms, last + self.timeframe_ms) if last is not None else since_ms
+        until_ms = until_ms or exchange.milliseconds()
+        written = 0
+        retries = 0
+        delay = getattr(exchange, 'rateLimit', 0) / 1000
+
+        while cursor < until_ms:
+            try:
+                with priority(BULK):
+                    ohlcv = exchange.fetch_ohlcv(self.symbol, self.timeframe, since=cursor, limit=limit)
+            except Exception as e:
+                retries += 1
+                if retries > max_retries:
+                    logging.error(f"❌ Backfill durdu ({day_of(cursor)}): {e} - tekrar çalıştırınca devam eder")
+                    break
+                wait = delay * 2 ** retries + 1
+                logging.warning(f"⚠️ İstek hatası ({retries}/{max_retries}), {wait:.1f}s bekleniyor: {e}")
+                time.sleep(wait)
+                continue
+            retries = 0
+
+            # Oluşmakta olan ve aralık dışındaki mumları at
+            now = exchange.milliseconds()
+            closed = [c for c in ohlcv if c[0] + self.timeframe_ms <= now and c[0] < until_ms]
+            if not closed:
+                break
+
+            written += self.append(closed)
+            cursor = int(closed[-1][0]) + self.timeframe_ms
+            logging.info(f"📥 {self.symbol} {self.timeframe}: {day_of(closed[-1][0])} ({written} mum)")
+            if not getattr(exchange, 'enableRateLimit', False):
+                time.sleep(delay)
+
+        return written
+
+    def info(self):
+        days = self.days()
+        if not days:
+            return None
+        count = sum(os.path.getsize(self._partition_path(day)) // RECORD_BYTES for day in days)
+        return {'first_day': days[0], 'last_day': days[-1], 'partitions': len(days),
+                'candles': count}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geçmiş mum deposu")
+    parser.add_argument('command', choices=['backfill', 'gaps', 'info'])
+    parser.add_argument('--symbol', default='BTC/USDT')
+    parser.add_argument('--timeframe', default='15m')
+    parser.add_argument('--root', default=DEFAULT_ROOT, help="Depo kök klasörü")
+    parser.add_argument('--since', help="Başlangıç tarihi (YYYY-MM-DD, UTC)")
+    parser.add_argument('--until', help="Bitiş tarihi (YYYY-MM-DD, UTC, hariç)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = HistoryStore(args.symbol, args.timeframe, args.root)
+    start = parse_date(args.since) if args.since else None
+    end = parse_date(args.until) if args.until else None
+
+    if args.command == 'backfill':
+        if start is None and store.last_timestamp is None:
+            print("✗ İlk backfill için --since gerekli")
+            return 1
+        import lazy_ccxt
+        import rate_limiter
+        exchange = rate_limiter.attach(lazy_ccxt.binance({'enableRateLimit': True}))
+        written = store.backfill(exchange, start or 0, end)
+        print(f"✓ {written} mum yazıldı")
+
+    if args.command in ('backfill', 'gaps'):
+        gaps = store.find_gaps(start, end)
+        for first, last, missing in gaps:
+            print(f"⚠️ Boşluk: {datetime.fromtimestamp(first / 1000, tz=timezone.utc):%Y-%m-%d %H:%M} - "
+                  f"{datetime.fromtimestamp(last / 1000, tz=timezone.utc):%Y-%m-%d %H:%M} ({missing} mum)")
+        print(f"{'✓ Boşluk yok' if not gaps else f'⚠️ {len(gaps)} boşluk bulundu'}")
+
+    if args.command == 'info':
+        info = store.info()
+        if info is None:
+            print(f"✗ {store.path} boş")
+            return 1
+        print(f"{store.symbol} {store.timeframe}: {info['candles']} mum, "
+              f"{info['partitions']} gün ({info['first_day']} - {info['last_day']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vektörize İndikatör Çekirdekleri
+Bitişik float64 NumPy dizileri üzerinde çalışan RSI, EMA, MACD, Bollinger,
+Stochastic, ATR ve Volume MA hesaplamaları
+
+Tekrarlamalı (recursive) hesaplamalar numba kuruluysa JIT ile, değilse
+blok bazlı saf NumPy ile yapılır. Sonuçlar `ta` kütüphanesi ile aynıdır.
+Parametreler streaming_indicators.indicator_columns ile aynı isimleri kullanır.
+
+Çekirdekler son eksen boyunca çalışır: (sembol x mum) 2 boyutlu diziler tek
+çağrıda hesaplanır (çoklu sembol tarayıcı). 2 boyutlu girişte satırların aynı
+mum ızgarasında olması (NaN ısınma bölgesinin aynı olması) beklenir.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba isteğe bağlı
+    njit = None
+
+USE_JIT = njit is not None
+
+# Blok içindeki (1-alpha)^-k ağırlıklarının taşmaması için üst sınır (e^230 ≈ 1e100)
+_MAX_LOG_WEIGHT = 230.0
+
+HOUR_MS = 3_600_000
+DAY_MS = 86_400_000
+
+# Kayan pencere hesaplarında tek seferde işlenecek satır sayısı (bellek sınırı)
+_ROLLING_CHUNK = 65536
+
+
+def _as_array(values):
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def to_milliseconds(timestamps):
+    """datetime64 veya int zaman damgalarını int64 milisaniyeye çevir"""
+    values = np.asarray(timestamps)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ms]').astype(np.int64)
+    return values.astype(np.int64)
+
+
+def _ema_loop(x, alpha, start, init):
+    n = x.shape[0]
+    y = np.empty(n)
+    y[:] = np.nan
+    if start >= n:
+        return y
+    y[start] = init
+    for t in range(start + 1, n):
+        y[t] = y[t - 1] + alpha * (x[t] - y[t - 1])
+    return y
+
+
+def _ema_blocks(x, alpha, start, init):
+    """y[t] = (1-a)*y[t-1] + a*x[t] - blok bazlı kümülatif toplam ile (son eksen)"""
+    n = x.shape[-1]
+    y = np.full(x.shape, np.nan)
+    if start >= n:
+        return y
+    y[..., start] = init
+
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        y[..., start + 1:] = x[..., start + 1:]
+        return y
+
+    block = max(1, int(_MAX_LOG_WEIGHT / -np.log(decay)))
+    prev = np.asarray(init, dtype=np.float64)[..., None]
+    i = start + 1
+    while i < n:
+        j = min(n, i + block)
+        weights = decay ** -np.arange(1, j - i + 1, dtype=np.float64)
+        acc = np.cumsum(alpha * x[..., i:j] * weights, axis=-1)
+        y[..., i:j] = (prev + acc) / weights
+        prev = y[..., j - 1:j]
+        i = j
+    return y
+
+
+if USE_JIT:
+    _ema_kernel = njit(cache=True)(_ema_loop)
+else:
+    _ema_kernel = _ema_blocks
+
+
+def _recursive_mean(x, alpha, start, init):
+    if x.ndim > 1:
+        # Çok satırlı giriş: bloklar tüm semboller için birlikte işlenir
+        return _ema_blocks(x, float(alpha), int(start), np.asarray(init, dtype=np.float64))
+    return _ema_kernel(x, float(alpha), int(start), float(init))
+
+
+def ema(close, window):
+    """EMA (ta: ewm(span=window, adjust=False), ilk window-1 değer NaN)"""
+    x = _as_array(close)
+    valid = np.flatnonzero((~np.isnan(x)).reshape(-1, x.shape[-1]).all(axis=0))
+    if len(valid) == 0:
+        return np.full(x.shape, np.nan)
+    first = valid[0]
+    y = _recursive_mean(x, 2.0 / (window + 1), first, x[..., first])
+    y[..., :first + window - 1] = np.nan
+    return y
+
+
+def rsi(close, window=14):
+    """RSI - Wilder yumuşatması"""
+    x = _as_array(close)
+    diff = np.empty_like(x)
+    diff[..., 0] = 0.0
+    np.subtract(x[..., 1:], x[..., :-1], out=diff[..., 1:])
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+
+    alpha = 1.0 / window
+    avg_up = _recursive_mean(up, alpha, 0, up[..., 0])
+    avg_down = _recursive_mean(down, alpha, 0, down[..., 0])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(avg_down == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_up / avg_down))
+    result[..., :window - 1] = np.nan
+    return result
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD, sinyal ve histogram"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def _rolling(x, window, reducer):
+    """Parça parça sliding_window_view ile kayan pencere (NaN içeren pencere NaN)"""
+    n = x.shape[-1]
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out
+    # 2 boyutlu girişte parça boyu satır sayısına bölünür (bellek sınırı aynı kalır)
+    chunk = max(1, _ROLLING_CHUNK // max(1, x.size // n))
+    for start in range(window - 1, n, chunk):
+        end = min(n, start + chunk)
+        view = np.lib.stride_tricks.sliding_window_view(x[..., start - window + 1:end], window, axis=-1)
+        out[..., start:end] = reducer(view)
+    return out
+
+
+def rolling_mean(values, window):
+    return _rolling(_as_array(values), window, lambda v: v.mean(axis=-1))
+
+
+def rolling_std(values, window):
+    """Popülasyon standart sapması (ddof=0)"""
+    return _rolling(_as_array(values), window, lambda v: v.std(axis=-1))
+
+
+def rolling_max(values, window):
+    return _rolling(_as_array(values), window, lambda v: v.max(axis=-1))
+
+
+def rolling_min(values, window):
+    return _rolling(_as_array(values), window, lambda v: v.min(axis=-1))
+
+
+def bollinger(close, window=20, window_dev=2):
+    """Bollinger Bantları (üst, orta, alt)"""
+    mid = rolling_mean(close, window)
+    std = rolling_std(close, window)
+    return mid + window_dev * std, mid, mid - window_dev * std
+
+
+def stochastic(high, low, close, window=14, smooth_window=3):
+    """Stochastic Oscillator %K ve %D"""
+    smax = rolling_max(high, window)
+    smin = rolling_min(low, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = 100.0 * (_as_array(close) - smin) / (smax - smin)
+    k[~np.isfinite(k)] = np.nan
+    return k, rolling_mean(k, smooth_window)
+
+
+def true_range(high, low, close):
+    h = _as_array(high)
+    l = _as_array(low)
+    c = _as_array(close)
+    tr = h - l
+    if c.shape[-1] > 1:
+        prev = c[..., :-1]
+        tr[..., 1:] = np.maximum(tr[..., 1:], np.maximum(np.abs(h[..., 1:] - prev),
+                                                         np.abs(l[..., 1:] - prev)))
+    return tr
+
+
+def atr(high, low, close, window=14):
+    """ATR (ta: ilk değer ilk `window` TR ortalaması, sonrası Wilder; öncesi 0)"""
+    tr = true_range(high, low, close)
+    n = tr.shape[-1]
+    if n < window:
+        return np.zeros(tr.shape)
+    result = _recursive_mean(tr, 1.0 / window, window - 1, tr[..., :window].mean(axis=-1))
+    result[..., :window - 1] = 0.0
+    return result
+
+
+def session_vwap(timestamps, high, low, close, volume, session_start_hour=0):
+    """
+    Mum bazlı seans VWAP serisi
+
+    Seans her gün `session_start_hour` (UTC) saatinde sıfırlanır; her mum için
+    seans başından o muma kadar olan kümülatif VWAP döner. 2 boyutlu fiyat
+    dizilerinde `timestamps` tüm satırların ortak mum ızgarasıdır.
+    """
+    ts = to_milliseconds(timestamps)
+    n = len(ts)
+    volume = _as_array(volume)
+    if n == 0:
+        return np.empty(volume.shape)
+
+    typical = (_as_array(high) + _as_array(low) + _as_array(close)) / 3.0
+    cum_pv = np.cumsum(typical * volume, axis=-1)
+    cum_volume = np.cumsum(volume, axis=-1)
+
+    # Her mumun ait olduğu seansın başlangıcındaki kümülatif değerleri çıkar
+    session = (ts - int(session_start_hour * HOUR_MS)) // DAY_MS
+    starts = np.flatnonzero(np.concatenate([[True], session[1:] != session[:-1]]))
+    lengths = np.diff(np.append(starts, n))
+    zero = np.zeros(volume.shape[:-1] + (1,))
+    base_pv = np.repeat(np.concatenate([zero, cum_pv[..., starts[1:] - 1]], axis=-1), lengths, axis=-1)
+    base_volume = np.repeat(np.concatenate([zero, cum_volume[..., starts[1:] - 1]], axis=-1),
+                            lengths, axis=-1)
+
+    session_volume = cum_volume - base_volume
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = (cum_pv - base_pv) / session_volume
+    result[session_volume == 0] = np.nan
+    return result
+
+
+def compute_indicators(open_, high, low, close, volume, rsi=14, ema=None, macd=(12, 26, 9),
+                       bollinger=(20, 2), stochastic=None, atr=14, volume_ma=20, vwap=None,
+                       timestamps=None):
+    """
+    Tüm indikatör kolonlarını tek çağrıda hesapla
+
+    Parametreler indicator_columns ile aynıdır, kolonlar da aynı isimlerle döner.
+    `vwap` verilirse (seans başlangıç saati, UTC) `timestamps` gereklidir.
+
+    Returns:
+        dict: {kolon_adı: np.ndarray}
+    """
+    close = _as_array(close)
+    high = _as_array(high)
+    low = _as_array(low)
+    volume = _as_array(volume)
+
+    columns = {'rsi': _rsi(close, rsi)}
+    for name, window in (ema or {}).items():
+        columns[name] = _ema(close, window)
+
+    columns['macd'], columns['macd_signal'], columns['macd_diff'] = _macd(close, *macd)
+    columns['bb_high'], columns['bb_mid'], columns['bb_low'] = _bollinger(close, *bollinger)
+
+    if stochastic:
+        columns['stoch_k'], columns['stoch_d'] = _stochastic(high, low, close, *stochastic)
+
+    columns['volume_ma'] = rolling_mean(volume, volume_ma)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        columns['volume_ratio'] = volume / columns['volume_ma']
+    columns['atr'] = _atr(high, low, close, atr)
+    if vwap is not None:
+        columns['vwap'] = session_vwap(timestamps, high, low, close, volume, vwap)
+    return columns
+
+
+def add_indicators(df, **params):
+    """DataFrame'e tüm indikatör kolonlarını ekle (compute_indicators ile)"""
+    columns = compute_indicators(df['open'].values, df['high'].values, df['low'].values,
+                                 df['close'].values, df['volume'].values,
+                                 timestamps=df['timestamp'].values, **params)
+    for name, values in columns.items():
+        df[name] = values
+    return df
+
+
+# compute_indicators parametre isimleri fonksiyon isimlerini gölgelediği için takma adlar
+_rsi = rsi
+_ema = ema
+_macd = macd
+_bollinger = bollinger
+_stochastic = stochastic
+_atr = atr
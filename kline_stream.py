@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebSocket Kline Akışı
+Binance kline (ve bookTicker) akışlarını dinler, mumları doğrudan botların
+CandleStore pencerelerine işler
+
+- Bağlantı kurulunca (ve her yeniden bağlanmada) aradaki boşluk REST ile doldurulur
+- Belirli süre mesaj gelmezse akış bayat sayılır ve yeniden bağlanılır
+- Akış bağlıyken CandleStore.update() REST isteği yapmaz
+- Yerel tekrar oynatma (replay) sunucusu ile ağ olmadan test / benchmark
+
+`websockets` paketi isteğe bağlıdır (pip install websockets); kurulu değilse
+botlar REST ile çalışmaya devam eder.
+
+Kullanım:
+  python kline_stream.py replay mumlar.csv [--bars-per-second 20] [--drop-after 100]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    import websockets
+except ImportError:  # websockets isteğe bağlı
+    websockets = None
+
+BINANCE_WS_URL = 'wss://stream.binance.com:9443/stream'
+
+
+def available():
+    """WebSocket akışı kullanılabilir mi (websockets kurulu mu)"""
+    return websockets is not None
+
+
+def stream_symbol(symbol):
+    """'BTC/USDT' -> 'btcusdt'"""
+    return symbol.replace('/', '').lower()
+
+
+class KlineStream:
+    def __init__(self, stores, exchange=None, url=BINANCE_WS_URL, book_ticker=True,
+                 stale_after=30, max_backoff=30):
+        """
+        Args:
+            stores: CandleStore listesi (aynı sembol, farklı timeframe olabilir)
+            exchange: Boşluk doldurma için REST borsa nesnesi
+            url: Birleşik (combined) akış adresi
+            book_ticker: En iyi alış / satış (anlık fiyat) akışına da abone ol
+            stale_after: Bu kadar saniye mesaj gelmezse yeniden bağlan
+        """
+        if not available():
+            raise ImportError("WebSocket akışı için 'websockets' paketi gerekli")
+
+        self.stores = {store.timeframe: store for store in stores}
+        self.symbol = stores[0].symbol
+        self.exchange = exchange
+        self.book_ticker = book_ticker
+        self.stale_after = stale_after
+        self.max_backoff = max_backoff
+
+        name = stream_symbol(self.symbol)
+        streams = [f'{name}@kline_{timeframe}' for timeframe in self.stores]
+        if book_ticker:
+            streams.append(f'{name}@bookTicker')
+        self.url = f"{url}?streams={'/'.join(streams)}"
+
+        self.last_price = None
+        self.last_price_time = None
+        self.price_callbacks = []  # fn(fiyat, zaman_ms)
+        self.close_callbacks = []  # fn(timeframe, kapanan_mum)
+
+        self.stats = {'messages': 0, 'klines': 0, 'closed_bars': 0, 'prices': 0,
+                      'connects': 0, 'backfills': 0, 'stale': 0, 'errors': 0}
+        self.latencies_ms = deque(maxlen=1000)  # Olay zamanı -> işlenme
+
+        self._loop = None
+        self._thread = None
+        self._ws = None
+        self._stopping = False
+        self._stop_event = None
+        self.connected = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Bot tarafı
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Akışı arka plan iş parçacığında başlat"""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._main()),
+                                        name='kline-stream', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=10):
+        self._stopping = True
+        if self._loop is not None and self._stop_event is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._set_live(False)
+
+    @property
+    def healthy(self):
+        return self.connected.is_set()
+
+    def latency_summary(self):
+        """Olay -> işlenme gecikmesi (ms): medyan ve p99"""
+        if not self.latencies_ms:
+            return None
+        values = sorted(self.latencies_ms)
+        return {'p50': values[len(values) // 2], 'p99': values[int(len(values) * 0.99)],
+                'max': values[-1]}
+
+    # ------------------------------------------------------------------
+    # Akış iş parçacığı
+    # ------------------------------------------------------------------
+
+    def _set_live(self, live):
+        for store in self.stores.values():
+            store.live = live
+        if live:
+            self.connected.set()
+        else:
+            self.connected.clear()
+
+    def _backfill(self):
+        """Bağlantı yokken kaçan mumları REST ile çek"""
+        if self.exchange is None:
+            return
+        for store in self.stores.values():
+            added = store.update(self.exchange)
+            self.stats['backfills'] += 1
+            if added:
+                logging.info(f"🔁 {self.symbol} {store.timeframe}: {added} mum REST ile dolduruldu")
+
+    def _handle(self, raw):
+        received = time.time() * 1000
+        message = json.loads(raw)
+        data = message.get('data', message)
+        self.stats['messages'] += 1
+
+        if data.get('e') == 'kline':
+            k = data['k']
+            store = self.stores.get(k['i'])
+            if store is None:
+                return
+            candle = [int(k['t']), float(k['o']), float(k['h']), float(k['l']),
+                      float(k['c']), float(k['v'])]
+            store.push(candle)
+            self.stats['klines'] += 1
+            if 'E' in data:
+                self.latencies_ms.append(received - data['E'])
+            if k.get('x'):
+                self.stats['closed_bars'] += 1
+                for callback in self.close_callbacks:
+                    callback(k['i'], candle)
+
+        elif 'b' in data and 'a' in data:
+            # bookTicker: anlık fiyat olarak alış / satış ortası
+            self.last_price = (float(data['b']) + float(data['a'])) / 2
+            self.last_price_time = data.get('E', received)
+            self.stats['prices'] += 1
+            if 'E' in data:
+                self.latencies_ms.append(received - data['E'])
+            for callback in self.price_callbacks:
+                callback(self.last_price, self.last_price_time)
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        backoff = 1
+
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.url, ping_interval=20, ping_timeout=20,
+                                              close_timeout=5) as ws:
+                    self._ws = ws
+                    self.stats['connects'] += 1
+                    # Önce abone ol, sonra boşluğu doldur: aradaki mesajlar sokette bekler
+                    await self._loop.run_in_executor(None, self._backfill)
+                    self._set_live(True)
+                    logging.info(f"📡 WebSocket akışı bağlandı: {self.symbol} {list(self.stores)}")
+                    backoff = 1
+
+                    while not self._stopping:
+                        receive = asyncio.ensure_future(ws.recv())
+                        stop = asyncio.ensure_future(self._stop_event.wait())
+                        done, _ = await asyncio.wait({receive, stop}, timeout=self.stale_after,
+                                                     return_when=asyncio.FIRST_COMPLETED)
+                        stop.cancel()
+                        if receive not in done:
+                            receive.cancel()
+                            if not self._stopping:
+                                self.stats['stale'] += 1
+                                logging.warning(f"⚠️ Akış {self.stale_after}s sessiz, yeniden bağlanılıyor")
+                            break
+                        self._handle(receive.result())
+
+            except Exception as e:
+                self.stats['errors'] += 1
+                if not self._stopping:
+                    logging.warning(f"⚠️ WebSocket bağlantısı koptu: {e}")
+            finally:
+                self._ws = None
+                self._set_live(False)
+
+            if self._stopping:
+                break
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+def attach(stores, exchange, **kwargs):
+    """
+    Akışı başlat; websockets kurulu değilse None döner (bot REST ile devam eder)
+    """
+    if not available():
+        logging.info("ℹ️ websockets kurulu değil, REST ile devam ediliyor")
+        return None
+    try:
+        return KlineStream(stores, exchange, **kwargs).start()
+    except Exception as e:
+        logging.warning(f"⚠️ WebSocket akışı başlatılamadı: {e}")
+        return None
+
+
+# ----------------------------------------------------------------------------
+# Yerel tekrar oynatma (replay) sunucusu
+# ----------------------------------------------------------------------------
+
+class ReplayServer:
+    def __init__(self, candles, symbol='BTC/USDT', timeframe='15m', bars_per_second=20,
+                 updates_per_bar=3, drop_after=None, host='127.0.0.1', port=0):
+        """
+        Kayıtlı mumları Binance kline / bookTicker mesajları olarak yayınlar
+
+        Zaman sunucuya göre akar: bağlantı koptuğunda geçen mumlar kaçırılır ve
+        istemci REST taklidi (rest()) ile doldurmak zorundadır.
+
+        Args:
+            candles: (N, 6) dizi - timestamp_ms, open, high, low, close, volume
+            bars_per_second: Saniyede yayınlanan mum sayısı
+            updates_per_bar: Mum başına (kapanış dahil) güncelleme sayısı
+            drop_after: Bu kadar mumdan sonra bağlantıları bir kez kopar
+        """
+        if not available():
+            raise ImportError("Replay sunucusu için 'websockets' paketi gerekli")
+        self.candles = [[int(c[0]), *map(float, c[1:6])] for c in candles]
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.timeframe_ms = _timeframe_ms(timeframe)
+        self.interval = 1.0 / (bars_per_second * updates_per_bar)
+        self.updates_per_bar = updates_per_bar
+        self.drop_after = drop_after
+        self.host = host
+        self.port = port
+        self.index = 0  # Kapanmış mum sayısı
+        self.clients = set()
+        self.finished = threading.Event()
+        self._ready = threading.Event()
+        self._loop = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/stream"
+
+    def start(self, start_index=0):
+        self.index = start_index
+        threading.Thread(target=lambda: asyncio.run(self._main()), daemon=True).start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.finished.set)
+
+    def rest(self):
+        """Sunucunun o anki zamanına göre REST taklidi (boşluk doldurma için)"""
+        return _ReplayRest(self)
+
+    async def _handler(self, ws, *args):
+        self.clients.add(ws)
+        try:
+            await ws.wait_closed()
+        finally:
+            self.clients.discard(ws)
+
+    def _messages(self, candle, step):
+        """Mumun `step`. güncellemesi: kline + bookTicker mesajı"""
+        timestamp, open_, high, low, close, volume = candle
+        final = step == self.updates_per_bar - 1
+        if not final:
+            fraction = (step + 1) / self.updates_per_bar
+            close = open_ + (close - open_) * fraction
+            high = max(open_, close)
+            low = min(open_, close)
+            volume *= fraction
+        now = int(time.time() * 1000)
+        name = stream_symbol(self.symbol)
+        kline = {'stream': f'{name}@kline_{self.timeframe}', 'data': {
+            'e': 'kline', 'E': now, 's': name.upper(),
+            'k': {'t': timestamp, 'T': timestamp + self.timeframe_ms - 1, 'i': self.timeframe,
+                  'o': str(open_), 'h': str(high), 'l': str(low), 'c': str(close),
+                  'v': str(volume), 'x': final}}}
+        ticker = {'stream': f'{name}@bookTicker', 'data': {
+            'u': now, 'E': now, 's': name.upper(), 'b': str(close - 0.5), 'B': '1',
+            'a': str(close + 0.5), 'A': '1'}}
+        return json.dumps(kline), json.dumps(ticker)
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        async with websockets.serve(self._handler, self.host, self.port) as server:
+            self.port = list(server.sockets)[0].getsockname()[1]
+            self._ready.set()
+            dropped = False
+
+            while self.index < len(self.candles) and not self.finished.is_set():
+                candle = self.candles[self.index]
+                for step in range(self.updates_per_bar):
+                    for message in self._messages(candle, step):
+                        for ws in list(self.clients):
+                            try:
+                                await ws.send(message)
+                            except Exception:
+                                self.clients.discard(ws)
+                    await asyncio.sleep(self.interval)
+                self.index += 1
+
+                if self.drop_after and not dropped and self.index >= self.drop_after:
+                    dropped = True
+                    for ws in list(self.clients):
+                        await ws.close()
+            self.finished.set()
+
+
+class _ReplayRest:
+    """ReplayServer zamanına göre kapanmış mumları sunan REST taklidi"""
+
+    def __init__(self, server):
+        self.server = server
+        self.requests = 0
+
+    def parse_timeframe(self, timeframe):
+        return _timeframe_ms(timeframe) // 1000
+
+    def milliseconds(self):
+        candles = self.server.candles
+        index = min(self.server.index, len(candles) - 1)
+        return candles[index][0] + 1
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.requests += 1
+        end = min(self.server.index, len(self.server.candles))
+        rows = self.server.candles[:end]
+        if since is not None:
+            rows = [row for row in rows if row[0] >= since][:limit or 500]
+        else:
+            rows = rows[-(limit or 500):]
+        return [list(row) for row in rows]
+
+
+def _timeframe_ms(timeframe):
+    units = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    return int(timeframe[:-1]) * units[timeframe[-1]] * 1000
+
+
+def replay_benchmark(candles, timeframe='15m', bars_per_second=20, drop_after=None, window=200):
+    """
+    Replay sunucusunu KlineStream + CandleStore ile uçtan uca çalıştır
+
+    Returns:
+        dict: Akış istatistikleri, gecikme özeti, REST istek sayısı ve pencere doğruluğu
+    """
+    from candle_store import CandleStore
+
+    start_index = min(window, len(candles) - 1)
+    server = ReplayServer(candles, timeframe=timeframe, bars_per_second=bars_per_second,
+                          drop_after=drop_after and start_index + drop_after).start(start_index)
+    rest = server.rest()
+    store = CandleStore('BTC/USDT', timeframe, window=window)
+    stream = KlineStream([store], rest, url=server.url, stale_after=5).start()
+
+    started = time.perf_counter()
+    server.finished.wait()
+    time.sleep(0.5)
+    elapsed = time.perf_counter() - started
+    stream.stop()
+
+    expected = [list(map(float, c)) for c in server.candles[-window:]]
+    actual = [list(map(float, c)) for c in store.view().tolist()]
+    return {
+        'bars': len(candles) - start_index,
+        'elapsed_s': elapsed,
+        'rest_requests': rest.requests,
+        'window_matches': actual == expected,
+        'latency_ms': stream.latency_summary(),
+        **stream.stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket kline akışı")
+    parser.add_argument('command', choices=['replay'])
+    parser.add_argument('candles', help="Mum CSV dosyası veya geçmiş deposu klasörü")
+    parser.add_argument('--timeframe', default='15m')
+    parser.add_argument('--bars-per-second', type=float, default=20)
+    parser.add_argument('--drop-after', type=int, help="Bu kadar mumdan sonra bağlantıyı kopar")
+    args = parser.parse_args()
+
+    if not available():
+        print("✗ websockets kurulu değil: pip install websockets")
+        return 1
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger('websockets').setLevel(logging.WARNING)
+    from backtest import load_candles
+
+    result = replay_benchmark(load_candles(args.candles), args.timeframe, args.bars_per_second,
+                              args.drop_after)
+    print("\n" + "="*60)
+    print("📡 REPLAY AKIŞ TESTİ")
+    print("="*60)
+    for key, value in result.items():
+        print(f"{key:16}: {value:.2f}" if isinstance(value, float) else f"{key:16}: {value}")
+    print("="*60)
+    return 0 if result['window_matches'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
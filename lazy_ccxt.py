@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hafif ccxt Yükleyici
+Botların kullandığı ccxt parçalarını tembel (lazy) yükler, Binance piyasa
+bilgisini diskte önbelleğe alır
+
+- `import ccxt` paket __init__'inde 100'den fazla borsa modülünü içe aktarır;
+  burada paket __init__'i çalıştırılmadan sadece ccxt.binance yüklenir
+- Hata sınıfları (NetworkError, RateLimitExceeded, ...) ilk erişimde
+  ccxt.base.errors'tan gelir; `import lazy_ccxt as ccxt` ile mevcut kod
+  değişmeden çalışır
+- load_markets sonucu (exchangeInfo) TTL ile diske yazılır; yeniden
+  başlatmada önbellek tazeyse ağ isteği yapılmaz, ağ yoksa eski önbellek kullanılır
+- async_binance: tarayıcı için asyncio sürümü (ccxt.async_support.binance),
+  async_support paketinin __init__'i de çalıştırılmaz
+
+Daha sonra başka bir modül `import ccxt` yaparsa tam paket normal şekilde
+yüklenir; zaten yüklenmiş alt modüller (ve sınıflar) aynen kullanılır.
+"""
+
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import time
+
+MARKETS_CACHE_DIR = os.path.join('data', 'markets')
+MARKETS_TTL = 6 * 3600  # Piyasa bilgisi önbelleği geçerlilik süresi (saniye)
+MARKET_TYPES = ['spot']  # Botlar sadece spot piyasayı kullanır (vadeli listeleri indirilmez)
+
+
+def import_ccxt(name):
+    """
+    ccxt alt modülünü (ör. 'binance', 'base.errors', 'async_support.binance')
+    paket __init__'leri çalıştırılmadan içe aktar
+    """
+    module_name = f'ccxt.{name}'
+    if module_name in sys.modules or 'ccxt' in sys.modules:
+        return importlib.import_module(module_name)
+
+    # Boş paket nesneleri: alt modüller bulunur ama __init__ çalışmaz
+    packages = ['ccxt']
+    if name.startswith('async_support.'):
+        packages.append('ccxt.async_support')
+    for package in packages:
+        spec = importlib.util.find_spec(package)
+        sys.modules[package] = importlib.util.module_from_spec(spec)
+    try:
+        if len(packages) > 1:
+            # async_support modülleri hata sınıflarını ve Exchange'i `from ccxt import` ile alır
+            stub = sys.modules['ccxt']
+            errors = importlib.import_module('ccxt.base.errors')
+            stub.__dict__.update({key: getattr(errors, key) for key in errors.__all__})
+            stub.Exchange = importlib.import_module('ccxt.base.exchange').Exchange
+        return importlib.import_module(module_name)
+    finally:
+        # Sonraki `import ccxt` tam paketi yüklesin
+        for package in reversed(packages):
+            del sys.modules[package]
+
+
+def __getattr__(name):
+    """ccxt hata sınıfları ilk erişimde yüklenir, diğer isimler tam pakete yönlendirilir"""
+    errors = import_ccxt('base.errors')
+    if hasattr(errors, name):
+        return getattr(errors, name)
+    return getattr(importlib.import_module('ccxt'), name)
+
+
+def binance(config=None, markets_cache=MARKETS_CACHE_DIR, ttl=MARKETS_TTL):
+    """
+    Binance borsa nesnesi (ccxt.binance ile aynı)
+
+    Args:
+        config: ccxt ayarları
+        markets_cache: Piyasa bilgisi önbellek klasörü (None: önbellek kapalı,
+                       piyasa bilgisi ccxt'nin kendi akışıyla ilk istekte indirilir)
+        ttl: Önbellek geçerlilik süresi (saniye)
+    """
+    config = dict(config or {})
+    options = dict(config.get('options') or {})
+    options.setdefault('fetchMarkets', {'types': list(MARKET_TYPES)})
+    config['options'] = options
+
+    exchange = import_ccxt('binance').binance(config)
+    if markets_cache:
+        load_markets(exchange, markets_cache, ttl)
+    return exchange
+
+
+def async_binance(config=None, markets_cache=MARKETS_CACHE_DIR, ttl=MARKETS_TTL):
+    """
+    asyncio Binance borsa nesnesi (ccxt.async_support.binance ile aynı)
+
+    Piyasa bilgisi önbellekten yüklenir; önbellek yoksa / eskiyse
+    `await load_markets_async(exchange)` ile indirilir.
+
+    Returns:
+        (exchange, durum): durum 'cache' veya None (indirme gerekli)
+    """
+    config = dict(config or {})
+    options = dict(config.get('options') or {})
+    options.setdefault('fetchMarkets', {'types': list(MARKET_TYPES)})
+    config['options'] = options
+
+    exchange = import_ccxt('async_support.binance').binance(config)
+    status = None
+    if markets_cache:
+        status, _ = _load_cached(exchange, markets_cache, ttl)
+    return exchange, status
+
+
+def _cache_path(exchange, cache_dir):
+    return os.path.join(cache_dir, f'{exchange.id}.json')
+
+
+def _market_types(exchange):
+    options = exchange.options.get('fetchMarkets')
+    return list(options.get('types', [])) if isinstance(options, dict) else list(options or [])
+
+
+def _read_cache(path, types):
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Farklı piyasa tipleriyle yazılmış önbellek kullanılmaz
+    if cached.get('types') != types or not cached.get('markets'):
+        return None
+    return cached
+
+
+def _write_cache(path, exchange, types):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'saved': time.time(), 'types': types, 'markets': exchange.markets,
+                   'currencies': exchange.currencies}, f)
+    os.replace(tmp, path)  # Yarım yazılmış dosya okunmasın (iki bot aynı dosyayı kullanabilir)
+
+
+def load_markets(exchange, cache_dir=MARKETS_CACHE_DIR, ttl=MARKETS_TTL):
+    """
+    Piyasa bilgisini önbellekten yükle, yoksa / eskiyse borsadan indirip yaz
+
+    Returns:
+        str: 'cache', 'network', 'stale' (indirilemedi, eski önbellek) veya None (yüklenemedi)
+    """
+    status, cached = _load_cached(exchange, cache_dir, ttl)
+    if status:
+        return status
+    try:
+        exchange.load_markets()
+    except Exception as e:
+        return _download_failed(exchange, cached, e)
+    return _save_downloaded(exchange, cache_dir)
+
+
+async def load_markets_async(exchange, cache_dir=MARKETS_CACHE_DIR, ttl=MARKETS_TTL):
+    """load_markets'in asyncio borsa nesnesi için sürümü"""
+    status, cached = _load_cached(exchange, cache_dir, ttl)
+    if status:
+        return status
+    try:
+        await exchange.load_markets()
+    except Exception as e:
+        return _download_failed(exchange, cached, e)
+    return _save_downloaded(exchange, cache_dir)
+
+
+def _load_cached(exchange, cache_dir, ttl):
+    """Önbellek tazeyse yükle: ('cache', önbellek), değilse (None, eski önbellek / None)"""
+    path = _cache_path(exchange, cache_dir)
+    cached = _read_cache(path, _market_types(exchange))
+    if cached is not None and time.time() - cached['saved'] < ttl:
+        exchange.set_markets(cached['markets'], cached.get('currencies'))
+        logging.debug(f"Piyasa bilgisi önbellekten yüklendi: {path}")
+        return 'cache', cached
+    return None, cached
+
+
+def _download_failed(exchange, cached, error):
+    if cached is not None:
+        logging.warning(f"⚠️ Piyasa bilgisi indirilemedi, eski önbellek kullanılıyor: {error}")
+        exchange.set_markets(cached['markets'], cached.get('currencies'))
+        return 'stale'
+    logging.warning(f"⚠️ Piyasa bilgisi indirilemedi (ilk istekte tekrar denenecek): {error}")
+    return None
+
+
+def _save_downloaded(exchange, cache_dir):
+    try:
+        _write_cache(_cache_path(exchange, cache_dir), exchange, _market_types(exchange))
+    except (OSError, TypeError, ValueError) as e:
+        logging.warning(f"⚠️ Piyasa bilgisi önbelleğe yazılamadı: {e}")
+    return 'network'
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ortak Piyasa Verisi Merkezi
+Borsa bağlantısını tek bir süreçte toplar: 1m temel seriyi (WebSocket akışı,
+yoksa REST yoklaması) tutar, 15m / 1h gibi üst periyotları yerelde üretir ve
+güncellemeleri yerel soket üzerinden abone botlara yayınlar.
+
+- Bot eklemek borsaya ek istek getirmez (sadece merkez borsaya bağlanır)
+- Her güncelleme tüm abonelere aynı anda gider: botlar aynı kapanan mumu aynı anda görür
+- Üst periyotların penceresi açılışta bir kez REST ile doldurulur, sonrası 1m'den toplanır
+- Merkez kapalıysa / bayatsa botlar kendi REST isteklerine döner (HubClient)
+
+Protokol (satır başına bir JSON mesajı, 127.0.0.1 TCP):
+  bot -> merkez : {"subscribe": "15m", "symbol": "BTC/USDT", "window": 200}
+  merkez -> bot : {"type": "snapshot" | "candles", "timeframe": ..., "candles": [[t, o, h, l, c, v], ...]}
+                  {"type": "price", "price": ..., "time": ...}
+                  {"type": "status", "live": true}
+
+Kullanım:
+  python market_hub.py [--symbol BTC/USDT] [--timeframes 15m,1h] [--port 8765]
+"""
+
+import argparse
+import json
+import logging
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import numpy as np
+
+import kline_stream
+from candle_store import CandleStore, ohlcv_array
+
+HUB_ADDRESS = ('127.0.0.1', 8765)
+HUB_TIMEFRAMES = ('15m', '1h')
+HUB_WINDOW = 500  # Üst periyot başına tutulan mum sayısı (abonelerin penceresinden büyük olmalı)
+HUB_POLL_INTERVAL = 2  # Akış yokken 1m yoklama / durum mesajı aralığı (saniye)
+HUB_STALE_AFTER = 30  # Bu kadar saniye 1m güncellemesi gelmezse merkez bayat sayılır
+BASE_TIMEFRAME = '1m'
+
+
+def timeframe_ms(timeframe):
+    units = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    return int(timeframe[:-1]) * units[timeframe[-1]] * 1000
+
+
+def resample(records, period_ms):
+    """
+    1m mum kayıtlarını üst periyoda topla
+
+    Açılış ilk, kapanış son mumdan; en yüksek / en düşük uçlardan; hacim toplamdan.
+
+    Returns:
+        (K, 6) float64 dizi - periyot başına bir mum (son mum oluşmakta olabilir)
+    """
+    if not len(records):
+        return np.empty((0, 6))
+    timestamps = records['timestamp']
+    bars = timestamps - timestamps % period_ms
+    starts = np.flatnonzero(np.r_[True, bars[1:] != bars[:-1]])
+    ends = np.r_[starts[1:], len(bars)] - 1
+    out = np.empty((len(starts), 6))
+    out[:, 0] = bars[starts]
+    out[:, 1] = records['open'][starts]
+    out[:, 2] = np.maximum.reduceat(records['high'], starts)
+    out[:, 3] = np.minimum.reduceat(records['low'], starts)
+    out[:, 4] = records['close'][ends]
+    out[:, 5] = np.add.reduceat(records['volume'], starts)
+    return out
+
+
+class BaseSeries(CandleStore):
+    """Her birleştirmede değişen 1m mumları merkeze bildiren temel seri"""
+
+    def __init__(self, hub, symbol, window):
+        super().__init__(symbol, BASE_TIMEFRAME, window=window)
+        self.hub = hub
+
+    def merge(self, ohlcv):
+        with self.lock:
+            added = super().merge(ohlcv)
+            rows = np.asarray(ohlcv if ohlcv is not None else [], dtype=np.float64)
+            if rows.size:
+                self.hub._on_base(int(np.nanmin(rows.reshape(len(rows), -1)[:, 0])))
+        return added
+
+
+class _Subscriber:
+    """Merkeze bağlı bir bot bağlantısı"""
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.timeframes = set()
+        self.closed = False
+        self.lock = threading.Lock()  # Mesajlar satır bütünlüğüyle yazılır
+
+    def send(self, message):
+        if self.closed:
+            return False
+        try:
+            with self.lock:
+                self.sock.sendall((json.dumps(message) + '\n').encode())
+            return True
+        except OSError:
+            self.closed = True
+            return False
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        hub = self.server.hub
+        subscriber = _Subscriber(self.request, self.client_address)
+        self.request.settimeout(hub.send_timeout)  # Yazma zaman aşımı; okumada beklemeye devam
+        hub._add(subscriber)
+        pending = b''
+        try:
+            while not subscriber.closed:
+                try:
+                    chunk = self.request.recv(4096)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+                *lines, pending = (pending + chunk).split(b'\n')
+                for line in lines:
+                    if line.strip():
+                        hub._on_message(subscriber, json.loads(line))
+        except (OSError, ValueError) as e:
+            logging.debug(f"Abone bağlantısı kapandı {self.client_address}: {e}")
+        finally:
+            hub._remove(subscriber)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class MarketHub:
+    def __init__(self, exchange, symbol='BTC/USDT', timeframes=HUB_TIMEFRAMES, address=HUB_ADDRESS,
+                 window=HUB_WINDOW, stream=True, poll_interval=HUB_POLL_INTERVAL,
+                 stale_after=HUB_STALE_AFTER, send_timeout=5):
+        """
+        Args:
+            exchange: REST borsa nesnesi (tek bağlantı - rate_limiter ile sarılması önerilir)
+            timeframes: Yayınlanan üst periyotlar (1m'nin katları)
+            address: Dinlenecek (host, port) - port 0 ise boş port seçilir
+            window: Üst periyot başına tutulan mum sayısı
+            stream: websockets kuruluysa 1m mumları WebSocket akışından al
+            send_timeout: Yavaş aboneye yazma zaman aşımı (aşılırsa bağlantı kesilir)
+        """
+        self.exchange = exchange
+        self.symbol = symbol
+        self.address = address
+        self.use_stream = stream
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.send_timeout = send_timeout
+
+        self.periods = {tf: timeframe_ms(tf) for tf in timeframes}
+        self.bars = {tf: CandleStore(symbol, tf, window=window) for tf in timeframes}
+        # En uzun periyodun oluşan mumu ve bir öncekisi 1m seride bulunmalı
+        base_window = max(2 * max(self.periods.values()) // 60_000, 120)
+        self.base = BaseSeries(self, symbol, base_window)
+
+        self.lock = threading.RLock()  # Abone listesi ve yayın sırası
+        self.subscribers = set()
+        self.last_update = None  # Son 1m güncellemesi (time.time())
+        self.stats = {'base_updates': 0, 'closed_bars': 0, 'messages': 0, 'subscribers': 0,
+                      'dropped': 0, 'poll_errors': 0}
+
+        self.stream = None
+        self._server = None
+        self._stopping = threading.Event()
+        self._threads = []
+
+    @property
+    def live(self):
+        return self.last_update is not None and time.time() - self.last_update < self.stale_after
+
+    # ------------------------------------------------------------------
+    # Başlatma / durdurma
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Üst periyotları REST ile doldur, 1m beslemesini ve sunucuyu başlat"""
+        for store in self.bars.values():
+            store.update(self.exchange)
+            logging.info(f"🗄️ {self.symbol} {store.timeframe}: {len(store)} mum yüklendi")
+        self.base.update(self.exchange)
+
+        self._server = _Server(self.address, _Handler)
+        self._server.hub = self
+        self.address = self._server.server_address[:2]
+        self._threads = [threading.Thread(target=self._server.serve_forever, name='hub-server', daemon=True),
+                         threading.Thread(target=self._poll, name='hub-poll', daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+        if self.use_stream:
+            # Akış kopunca base.live düşer ve yoklama döngüsü REST'e döner
+            self.stream = kline_stream.attach([self.base], self.exchange, book_ticker=False)
+        logging.info(f"🛰️ Veri merkezi dinliyor: {self.address[0]}:{self.address[1]} "
+                     f"{self.symbol} {list(self.bars)}")
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self.stream:
+            self.stream.stop()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        with self.lock:
+            for subscriber in list(self.subscribers):
+                subscriber.closed = True
+                try:
+                    subscriber.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        for thread in self._threads:
+            thread.join(5)
+
+    def _poll(self):
+        """Akış yokken 1m seriyi REST ile güncelle, abonelere durum gönder"""
+        while not self._stopping.wait(self.poll_interval):
+            try:
+                self.base.update(self.exchange)  # Akış bağlıyken istek yapmaz
+            except Exception as e:
+                self.stats['poll_errors'] += 1
+                logging.warning(f"⚠️ 1m mumlar çekilemedi: {e}")
+            self._broadcast({'type': 'status', 'live': self.live})
+
+    # ------------------------------------------------------------------
+    # Toplama ve yayın
+    # ------------------------------------------------------------------
+
+    def _on_base(self, changed_from):
+        """1m seride `changed_from` ve sonrası değişti: etkilenen üst periyot mumlarını yeniden topla"""
+        candles = self.base.view()
+        if not len(candles):
+            return
+        first = int(candles['timestamp'][0])
+        with self.lock:
+            self.last_update = time.time()
+            self.stats['base_updates'] += 1
+            for tf, period in self.periods.items():
+                # Başı 1m seride olmayan (yarım) periyot toplanmaz
+                start = max(changed_from - changed_from % period, -(-first // period) * period)
+                rows = resample(candles[np.searchsorted(candles['timestamp'], start):], period)
+                store = self.bars[tf]
+                last = store.last_timestamp
+                if last is not None:
+                    rows = rows[rows[:, 0] >= last]
+                if not len(rows):
+                    continue
+                self.stats['closed_bars'] += store.merge(rows)
+                self._broadcast({'type': 'candles', 'timeframe': tf, 'candles': rows.tolist()}, tf)
+            self._broadcast({'type': 'price', 'price': float(candles['close'][-1]),
+                             'time': int(self.last_update * 1000)})
+
+    def _broadcast(self, message, timeframe=None):
+        with self.lock:
+            for subscriber in list(self.subscribers):
+                if timeframe is not None and timeframe not in subscriber.timeframes:
+                    continue
+                if subscriber.send(message):
+                    self.stats['messages'] += 1
+                else:
+                    self._remove(subscriber)
+
+    # ------------------------------------------------------------------
+    # Aboneler
+    # ------------------------------------------------------------------
+
+    def _add(self, subscriber):
+        with self.lock:
+            self.subscribers.add(subscriber)
+            self.stats['subscribers'] = len(self.subscribers)
+        logging.info(f"🔌 Abone bağlandı: {subscriber.address}")
+
+    def _remove(self, subscriber):
+        with self.lock:
+            if subscriber not in self.subscribers:
+                return
+            self.subscribers.discard(subscriber)
+            self.stats['subscribers'] = len(self.subscribers)
+            if subscriber.closed:
+                self.stats['dropped'] += 1
+        subscriber.closed = True
+        logging.info(f"🔌 Abone ayrıldı: {subscriber.address}")
+
+    def _on_message(self, subscriber, message):
+        timeframe = message.get('subscribe')
+        if timeframe is None:
+            return
+        store = self.bars.get(timeframe)
+        if store is None or message.get('symbol', self.symbol) != self.symbol:
+            subscriber.send({'type': 'error', 'timeframe': timeframe,
+                             'message': f"{message.get('symbol', self.symbol)} {timeframe} yayınlanmıyor "
+                                        f"({self.symbol} {list(self.bars)})"})
+            return
+        # Anlık görüntü ve abonelik aynı kilit altında: arada güncelleme kaçmaz
+        with self.lock:
+            window = int(message.get('window') or store.window)
+            candles = ohlcv_array(store.view()[-window:])
+            subscriber.send({'type': 'snapshot', 'timeframe': timeframe, 'candles': candles.tolist()})
+            subscriber.send({'type': 'status', 'live': self.live})
+            subscriber.timeframes.add(timeframe)
+
+
+class HubClient:
+    def __init__(self, stores, address=HUB_ADDRESS, stale_after=HUB_STALE_AFTER, max_backoff=30):
+        """
+        Veri merkezine abone olup mumları botun CandleStore pencerelerine işler
+
+        KlineStream ile aynı arayüz (start / stop / healthy / price_callbacks):
+        merkez bağlı ve güncelken store.live açıktır, aksi halde bot REST'e döner.
+
+        Args:
+            stores: CandleStore listesi (aynı sembol, farklı timeframe olabilir)
+            address: Merkezin (host, port) adresi
+            stale_after: Bu kadar saniye mesaj gelmezse yeniden bağlan
+        """
+        self.stores = {store.timeframe: store for store in stores}
+        self.symbol = stores[0].symbol
+        self.address = tuple(address)
+        self.stale_after = stale_after
+        self.max_backoff = max_backoff
+
+        self.last_price = None
+        self.last_price_time = None
+        self.price_callbacks = []  # fn(fiyat, zaman_ms)
+
+        self.stats = {'messages': 0, 'snapshots': 0, 'updates': 0, 'prices': 0,
+                      'connects': 0, 'stale': 0, 'errors': 0}
+        self.connected = threading.Event()
+        self._ready = set()  # Anlık görüntüsü alınmış timeframe'ler
+        self._hub_live = False
+        self._sock = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Aboneliği arka plan iş parçacığında başlat"""
+        self._thread = threading.Thread(target=self._run, name='hub-client', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=10):
+        self._stopping.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._set_live(False)
+
+    @property
+    def healthy(self):
+        return self.connected.is_set()
+
+    def _set_live(self, live):
+        self._hub_live = live
+        for timeframe, store in self.stores.items():
+            store.live = live and timeframe in self._ready
+        if live and self._ready:
+            self.connected.set()
+        else:
+            self.connected.clear()
+
+    def _handle(self, message):
+        self.stats['messages'] += 1
+        kind = message.get('type')
+
+        if kind in ('snapshot', 'candles'):
+            store = self.stores.get(message['timeframe'])
+            if store is None:
+                return
+            if kind == 'snapshot':
+                with store.lock:
+                    store.clear()
+                    store.extend(message['candles'])
+                self._ready.add(message['timeframe'])
+                self._set_live(self._hub_live)
+                self.stats['snapshots'] += 1
+                logging.info(f"🛰️ {self.symbol} {store.timeframe}: {len(store)} mum veri merkezinden alındı")
+            else:
+                store.extend(message['candles'])
+                self.stats['updates'] += 1
+
+        elif kind == 'price':
+            self.last_price = message['price']
+            self.last_price_time = message['time']
+            self.stats['prices'] += 1
+            for callback in self.price_callbacks:
+                callback(self.last_price, self.last_price_time)
+
+        elif kind == 'status':
+            if message['live'] != self._hub_live:
+                logging.info(f"🛰️ Veri merkezi {'güncel' if message['live'] else 'bayat, REST ile devam'}")
+            self._set_live(message['live'])
+
+        elif kind == 'error':
+            logging.warning(f"⚠️ Veri merkezi: {message.get('message')}")
+
+    def _session(self):
+        with socket.create_connection(self.address, timeout=5) as sock:
+            self._sock = sock
+            sock.settimeout(self.stale_after)
+            self.stats['connects'] += 1
+            for timeframe, store in self.stores.items():
+                sock.sendall((json.dumps({'subscribe': timeframe, 'symbol': self.symbol,
+                                          'window': store.window}) + '\n').encode())
+            logging.info(f"🛰️ Veri merkezine bağlandı: {self.address[0]}:{self.address[1]}")
+            reader = sock.makefile('r', encoding='utf-8')
+            while not self._stopping.is_set():
+                try:
+                    line = reader.readline()
+                except socket.timeout:
+                    self.stats['stale'] += 1
+                    logging.warning(f"⚠️ Veri merkezi {self.stale_after}s sessiz, yeniden bağlanılıyor")
+                    return
+                if not line:
+                    return
+                self._handle(json.loads(line))
+
+    def _run(self):
+        backoff = 1
+        while not self._stopping.is_set():
+            try:
+                self._session()
+                backoff = 1
+            except (OSError, ValueError) as e:
+                self.stats['errors'] += 1
+                if not self._stopping.is_set():
+                    logging.warning(f"⚠️ Veri merkezi bağlantısı yok: {e}")
+            finally:
+                self._sock = None
+                self._ready.clear()
+                self._set_live(False)
+            if self._stopping.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+def attach(stores, address=HUB_ADDRESS, **kwargs):
+    """
+    Veri merkezi aboneliğini başlat; başlatılamazsa None döner (bot REST ile devam eder)
+    """
+    try:
+        return HubClient(stores, address, **kwargs).start()
+    except Exception as e:
+        logging.warning(f"⚠️ Veri merkezi aboneliği başlatılamadı: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ortak piyasa verisi merkezi")
+    parser.add_argument('--symbol', default='BTC/USDT')
+    parser.add_argument('--timeframes', default=','.join(HUB_TIMEFRAMES),
+                        help="Yayınlanacak periyotlar (virgülle)")
+    parser.add_argument('--host', default=HUB_ADDRESS[0])
+    parser.add_argument('--port', type=int, default=HUB_ADDRESS[1])
+    parser.add_argument('--window', type=int, default=HUB_WINDOW)
+    parser.add_argument('--no-stream', action='store_true', help="WebSocket yerine REST yoklaması")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger('websockets').setLevel(logging.WARNING)
+    import lazy_ccxt
+    import rate_limiter
+    exchange = rate_limiter.attach(lazy_ccxt.binance({'enableRateLimit': True}))
+
+    hub = MarketHub(exchange, args.symbol, args.timeframes.split(','), (args.host, args.port),
+                    window=args.window, stream=not args.no_stream)
+    try:
+        hub.start()
+    except Exception as e:
+        print(f"✗ Veri merkezi başlatılamadı: {e}")
+        return 1
+    try:
+        while True:
+            time.sleep(60)
+            logging.info(f"📊 Veri merkezi: {hub.stats}")
+    except KeyboardInterrupt:
+        logging.info("👋 Veri merkezi durduruldu")
+    hub.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aşama Süreleri ve Metrikler
+Bot döngüsünün her aşaması için süre histogramları, borsa uç noktası başına
+istek / hata sayıları, mum bayatlığı ve bildirim kuyruğu derinliği
+
+- @timed('aşama') ile metot süreleri ölçülür
+- instrument_exchange() ccxt'nin HTTP fetch metodunu sararak uç nokta
+  (ör. /api/v3/klines) bazında istek, hata ve süre kaydeder
+- serve() yerel HTTP /metrics adresinde Prometheus metin formatı sunar
+- start_summary_log() periyodik olarak log'a özet yazar
+"""
+
+import bisect
+import functools
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# Saniye cinsinden histogram sınırları
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Kova sınırlarından yaklaşık yüzdelik (üst sınır)"""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+
+class Registry:
+    def __init__(self):
+        self.histograms = {}  # (isim, etiketler) -> Histogram
+        self.counters = {}  # (isim, etiketler) -> sayı
+        self.gauges = {}  # (isim, etiketler) -> fonksiyon
+        self.help = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def gauge(self, name, fn, description=None, **labels):
+        """Okunduğu anda `fn()` ile hesaplanan değer"""
+        self.gauges[self._key(name, labels)] = fn
+        if description:
+            self.help[name] = description
+
+    def time(self, stage):
+        """Aşama süresini ölçen context manager"""
+        return _Timer(self, stage)
+
+    # ------------------------------------------------------------------
+    # Çıktılar
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        items = list(labels) + list(extra)
+        if not items:
+            return ''
+        return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+    def render(self):
+        """Prometheus metin formatı"""
+        lines = []
+        with self.lock:
+            histograms = {k: (h.buckets, list(h.counts), h.sum, h.count)
+                          for k, h in self.histograms.items()}
+            counters = dict(self.counters)
+
+        for (name, labels), (buckets, counts, total, count) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + ['+Inf'], counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{self._labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{self._labels(labels)} {total}')
+            lines.append(f'{name}_count{self._labels(labels)} {count}')
+
+        for (name, labels), value in sorted(counters.items()):
+            lines.append(f'{name}{self._labels(labels)} {value}')
+
+        for (name, labels), fn in sorted(self.gauges.items(), key=lambda item: item[0]):
+            try:
+                value = fn()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            if name in self.help:
+                lines.append(f'# HELP {name} {self.help[name]}')
+            lines.append(f'{name}{self._labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """Aşama bazında okunabilir özet (log için)"""
+        lines = []
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        for (name, labels), histogram in histograms:
+            if histogram.count == 0:
+                continue
+            label = ','.join(str(v) for _, v in labels)
+            if name != 'bot_stage_seconds':
+                label = f"{name}{{{label}}}" if label else name
+            lines.append(f"  {label:28} n={histogram.count:<6} ort={histogram.sum / histogram.count * 1000:8.1f}ms "
+                         f"p95≤{histogram.quantile(0.95) * 1000:7.1f}ms max={histogram.max * 1000:8.1f}ms")
+        for (name, labels), value in counters:
+            label = ','.join(str(v) for _, v in labels)
+            lines.append(f"  {name}{{{label}}} = {value}")
+        for (name, labels), fn in sorted(self.gauges.items(), key=lambda item: item[0]):
+            try:
+                value = fn()
+            except Exception:
+                continue
+            if value is not None:
+                label = ','.join(str(v) for _, v in labels)
+                lines.append(f"  {name}{{{label}}} = {value:.2f}" if label else f"  {name} = {value:.2f}")
+        return '\n'.join(lines)
+
+
+class _Timer:
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe('bot_stage_seconds', time.perf_counter() - self.started, stage=self.stage)
+        if exc_type is not None:
+            self.registry.inc('bot_stage_errors_total', stage=self.stage)
+        return False
+
+
+REGISTRY = Registry()
+
+
+def timed(stage, registry=REGISTRY):
+    """Metot süresini `bot_stage_seconds{stage=...}` histogramına yazan dekoratör"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with registry.time(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_exchange(exchange, registry=REGISTRY):
+    """
+    ccxt borsasının HTTP isteklerini uç nokta bazında say ve süresini ölç
+
+    Düşük seviye `fetch(url, ...)` metodu sarılır; ccxt dışı (test / replay)
+    nesnelerde `fetch` yoksa dokunulmaz.
+    """
+    original = getattr(exchange, 'fetch', None)
+    if original is None or getattr(original, '_instrumented', False):
+        return exchange
+
+    @functools.wraps(original)
+    def fetch(url, *args, **kwargs):
+        endpoint = urlparse(url).path
+        started = time.perf_counter()
+        try:
+            return original(url, *args, **kwargs)
+        except Exception as e:
+            registry.inc('exchange_errors_total', endpoint=endpoint, error=type(e).__name__)
+            raise
+        finally:
+            registry.inc('exchange_requests_total', endpoint=endpoint)
+            registry.observe('exchange_request_seconds', time.perf_counter() - started,
+                             endpoint=endpoint)
+
+    fetch._instrumented = True
+    exchange.fetch = fetch
+    return exchange
+
+
+def watch_candles(store, timeframe_ms, registry=REGISTRY):
+    """
+    Mum bayatlığı: şimdi - son kapanmış mumun kapanışı (saniye)
+
+    Son mum oluşmakta olan mum olduğundan kapanmış son mumun kapanışı onun
+    açılışıdır; sağlıklı akışta değer 0 ile periyot arasında kalır.
+    """
+    def staleness():
+        last = store.last_timestamp
+        return None if last is None else time.time() - last / 1000
+
+    registry.gauge('candle_staleness_seconds', staleness,
+                   'Şimdi ile son kapanmış mumun kapanışı arasındaki süre',
+                   timeframe=store.timeframe)
+    registry.gauge('candle_timeframe_seconds', lambda: timeframe_ms / 1000, timeframe=store.timeframe)
+
+
+def watch_queue(notifier, registry=REGISTRY):
+    """Bildirim kuyruğu derinliği ve gönderim sayaçları"""
+    registry.gauge('telegram_queue_depth', notifier.queue.qsize, 'Gönderilmeyi bekleyen mesaj sayısı')
+    for key in ('sent', 'failed', 'dropped', 'merged', 'retries'):
+        registry.gauge('telegram_messages', lambda key=key: notifier.stats[key], result=key)
+    notifier.delivery_callbacks.append(
+        lambda seconds, success: registry.observe('telegram_delivery_seconds', seconds,
+                                                  result='ok' if success else 'failed'))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(port, registry=REGISTRY, host='127.0.0.1'):
+    """/metrics adresini arka planda sun; port kullanılıyorsa None döner"""
+    try:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    except OSError as e:
+        logging.warning(f"⚠️ Metrik sunucusu başlatılamadı ({host}:{port}): {e}")
+        return None
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    logging.info(f"📈 Metrikler: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def start_summary_log(interval, registry=REGISTRY, log=logging.info):
+    """Her `interval` saniyede aşama özetini log'a yaz"""
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            text = registry.summary()
+            if text:
+                log("📈 Metrik özeti:\n" + text)
+
+    threading.Thread(target=loop, name='metrics-summary', daemon=True).start()
+    return stop
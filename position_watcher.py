@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hızlı Pozisyon İzleyici
+Açık pozisyonun kar hedefi / stop loss seviyelerini her fiyat tick'inde kontrol eder
+
+İndikatör döngüsünden bağımsız çalışır: fiyatı WebSocket bookTicker akışından
+alır, akış yoksa veya koptuysa REST ticker'ı kısa aralıkla yoklar. Hedefler
+botun calculate_targets metoduyla hesaplanır ve pozisyon close_position ile
+kapatılır. Her çıkış için tick -> çıkış gecikmesi ve hedef seviyeye göre
+kayma (slippage) kaydedilir.
+"""
+
+import logging
+import threading
+import time
+
+from rate_limiter import CRITICAL, priority
+
+
+class PositionWatcher:
+    def __init__(self, bot, stream=None, poll_interval=2.0):
+        """
+        Args:
+            bot: BitcoinDailyBot (position_lock, calculate_targets, close_position)
+            stream: KlineStream - verilirse bookTicker fiyatları kullanılır
+            poll_interval: Akış yokken REST ticker yoklama aralığı (saniye)
+        """
+        self.bot = bot
+        self.stream = stream
+        self.poll_interval = poll_interval
+        self.exits = []  # Kapanan pozisyonların gecikme / kayma kayıtları
+        self.ticks = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.stream is not None:
+            self.stream.price_callbacks.append(self.on_price)
+        self._thread = threading.Thread(target=self._poll, name='position-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self.stream is not None and self.on_price in self.stream.price_callbacks:
+            self.stream.price_callbacks.remove(self.on_price)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _poll(self):
+        """Akış sağlıklı değilken pozisyon varsa REST ticker ile fiyat al"""
+        while not self._stop.wait(self.poll_interval):
+            if not self.bot.in_position:
+                continue
+            if self.stream is not None and self.stream.healthy:
+                continue
+            try:
+                with priority(CRITICAL):
+                    ticker = self.bot.exchange.fetch_ticker(self.bot.symbol)
+                self.on_price(ticker['last'], ticker.get('timestamp') or time.time() * 1000)
+            except Exception as e:
+                logging.debug(f"Ticker alınamadı: {e}")
+
+    def on_price(self, price, event_ms):
+        """
+        Tek fiyat tick'ini değerlendir
+
+        Args:
+            price: Anlık fiyat
+            event_ms: Fiyatın borsadaki zamanı (ms) - gecikme ölçümü için
+        """
+        bot = self.bot
+        if not bot.in_position:
+            return
+        self.ticks += 1
+
+        with bot.position_lock:
+            if not bot.in_position:
+                return
+            position_type = bot.position_type
+            entry_price = bot.entry_price
+            take_profit, stop_loss = bot.calculate_targets(position_type, entry_price)
+
+            if position_type == 'BUY':
+                profit_reached = price >= take_profit
+                stop_hit = price <= stop_loss
+            else:
+                profit_reached = price <= take_profit
+                stop_hit = price >= stop_loss
+            if not (profit_reached or stop_hit):
+                return
+
+            level = take_profit if profit_reached else stop_loss
+            reason = "Kar Hedefi" if profit_reached else "Stop Loss"
+            net_profit = bot.check_profit_with_commission(position_type, entry_price, price)
+            bot.close_position(price, net_profit, reason)
+
+        # Kayma: hedef seviyeye göre aleyhe fark (%) - pozitif değer kötü
+        direction = 1 if position_type == 'BUY' else -1
+        record = {
+            'type': position_type,
+            'reason': reason,
+            'level': level,
+            'exit_price': price,
+            'slippage_pct': (level - price) / level * 100 * direction,
+            'latency_ms': time.time() * 1000 - event_ms,
+        }
+        self.exits.append(record)
+        logging.info(f"⚡ Hızlı çıkış ({reason}): kayma %{record['slippage_pct']:+.3f}, "
+                     f"gecikme {record['latency_ms']:.0f}ms")
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ağırlık Bilinçli İstek Zamanlayıcı
+Aynı IP'yi paylaşan botların ve tarayıcının Binance isteklerini tek bütçeden yönetir
+
+- Binance dakikalık istek ağırlığı (REQUEST_WEIGHT) sayar; her istek ccxt'nin
+  hesapladığı ağırlık kadar bütçeden düşülür, sunucunun bildirdiği kullanım
+  (x-mbx-used-weight-1m) aynı IP'deki diğer süreçleri de içerdiği için yerel
+  sayaçtan büyükse o alınır
+- Öncelikler: CRITICAL (pozisyon izleme) > NORMAL (mum döngüsü) > BULK (backfill,
+  tarayıcı). Düşük öncelikler bütçenin daha küçük bir payını kullanır, kritik
+  isteklere her zaman yer kalır; bekleyen istekler öncelik sırasıyla geçer
+- Sabit bekleme yerine istekler dakika penceresine yayılır (pacing): pencere
+  başında küçük bir patlama payı, sonrası limitin hemen altında düzenli akış
+- 429 / 418 yanıtlarında (Retry-After varsa ona uyarak) jitter'lı üstel geri
+  çekilme uygulanır; bu sürede öncelikten bağımsız tüm istekler bekler
+- GET isteklerinde ağ hataları da jitter'lı geri çekilme ile tekrar denenir
+  (emir gibi POST istekleri tekrarlanmaz)
+
+Kullanım:
+  exchange = rate_limiter.attach(ccxt.binance({'enableRateLimit': True}))
+  with rate_limiter.priority(rate_limiter.CRITICAL):
+      exchange.fetch_ticker('BTC/USDT')
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+
+import lazy_ccxt as ccxt
+
+CRITICAL = 0
+NORMAL = 1
+BULK = 2
+PRIORITY_NAMES = {CRITICAL: 'critical', NORMAL: 'normal', BULK: 'bulk'}
+
+WEIGHT_LIMIT = 6000  # Binance spot REQUEST_WEIGHT limiti (IP başına, dakikalık)
+SAFETY = 0.9  # Limitin kullanılacak oranı
+SHARES = {CRITICAL: 1.0, NORMAL: 0.85, BULK: 0.6}  # Önceliğin kullanabileceği bütçe payı
+BURST = 0.2  # Pencere başında hemen kullanılabilecek bütçe oranı (gerisi dakikaya yayılır)
+WINDOW = 60  # Binance ağırlık penceresi (saniye)
+
+BACKOFF_BASE = 1.0  # İlk geri çekilme (saniye)
+BACKOFF_CAP = 120.0
+BAN_MIN_BACKOFF = 60.0  # 418 (IP yasağı) Retry-After olmadan gelirse en az bu kadar
+MAX_RETRIES = 4  # Hız limiti / ağ hatasında istek başına tekrar deneme
+
+USED_WEIGHT_HEADER = 'x-mbx-used-weight-1m'
+
+# Çağrı bağlamındaki öncelik (iş parçacığı ve asyncio görevi başına)
+_priority = contextvars.ContextVar('request_priority', default=None)
+
+
+@contextlib.contextmanager
+def priority(level):
+    """Bu blok içindeki borsa isteklerinin önceliği"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _header(headers, name):
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.upper())
+    return value
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Üstel geri çekilme, [yarısı, tamamı] aralığında jitter'lı (attempt: 1, 2, ...)"""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+class RequestScheduler:
+    def __init__(self, limit=WEIGHT_LIMIT, safety=SAFETY, shares=None, burst=BURST,
+                 clock=time.time):
+        """
+        Args:
+            limit: Dakikalık ağırlık limiti
+            safety: Limitin kullanılacak oranı
+            shares: {öncelik: bütçe payı}
+            burst: Pencere başında hemen kullanılabilecek bütçe oranı
+        """
+        self.limit = limit
+        self.capacity = limit * safety
+        self.shares = dict(SHARES, **(shares or {}))
+        self.burst = burst
+        self.clock = clock
+
+        self.window = None  # Dakika penceresinin başlangıcı (saniye)
+        self.used = 0  # Penceredeki kullanılan ağırlık (yerel veya sunucu, hangisi büyükse)
+        self.server_used = None  # Sunucunun bildirdiği son değer
+        self.backoff_until = 0.0
+        self.failures = 0  # Art arda hız limiti yanıtı
+        self.stats = {'requests': 0, 'weight': 0, 'waits': 0, 'wait_seconds': 0.0,
+                      'rate_limited': 0, 'banned': 0, 'retries': 0}
+
+        self._waiters = []  # (öncelik, sıra) - bekleyen senkron istekler
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    # ------------------------------------------------------------------
+    # Bütçe
+    # ------------------------------------------------------------------
+
+    def _roll(self, now):
+        window = now // WINDOW * WINDOW
+        if window != self.window:
+            self.window = window
+            self.used = 0
+
+    def _delay(self, weight, level, now):
+        """İsteğin gönderilebilmesi için beklenecek süre (0: hemen)"""
+        if now < self.backoff_until:
+            return self.backoff_until - now
+        self._roll(now)
+        budget = self.capacity * self.shares.get(level, 1.0)
+        window_end = self.window + WINDOW
+        if self.used + weight > budget:
+            return window_end - now + 0.05
+
+        if level != CRITICAL:
+            # Düzenli akış: pencerenin geçen kısmı kadar bütçe (+ patlama payı)
+            elapsed = now - self.window
+            allowance = budget * min(1.0, elapsed / WINDOW + self.burst)
+            if self.used + weight > allowance:
+                return min(((self.used + weight) / budget - self.burst) * WINDOW - elapsed,
+                           window_end - now + 0.05)
+        return 0.0
+
+    def _grant(self, weight, level, waited):
+        self.used += weight
+        self.stats['requests'] += 1
+        self.stats['weight'] += weight
+        if waited > 0:
+            self.stats['waits'] += 1
+            self.stats['wait_seconds'] += waited
+
+    def acquire(self, weight=1, level=NORMAL):
+        """
+        Bütçe uygun olana kadar bekle (iş parçacıkları arası öncelik sıralı)
+
+        Returns:
+            float: Beklenen süre (saniye)
+        """
+        started = self.clock()
+        with self._condition:
+            entry = (level, next(self._sequence))
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = self.clock()
+                    delay = self._delay(weight, level, now) if self._waiters[0] == entry else None
+                    if delay == 0:
+                        heapq.heappop(self._waiters)
+                        waited = now - started
+                        self._grant(weight, level, waited)
+                        self._condition.notify_all()
+                        return waited
+                    # Sıradaki değilse öndeki istek geçince uyandırılır
+                    self._condition.wait(delay if delay is not None else 1.0)
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+                raise
+
+    async def acquire_async(self, weight=1, level=NORMAL):
+        """acquire'ın asyncio sürümü - olay döngüsünü bloklamaz"""
+        started = self.clock()
+        while True:
+            with self._condition:
+                now = self.clock()
+                if self._waiters and self._waiters[0][0] <= level:
+                    delay = 0.05  # Aynı / yüksek öncelikli senkron istek bekliyor
+                else:
+                    delay = self._delay(weight, level, now)
+                if delay == 0:
+                    waited = now - started
+                    self._grant(weight, level, waited)
+                    return waited
+            await asyncio.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # Sunucu geri bildirimi
+    # ------------------------------------------------------------------
+
+    def observe(self, headers):
+        """Başarılı yanıt: kullanılan ağırlığı sunucu değeriyle eşitle"""
+        try:
+            used = int(_header(headers, USED_WEIGHT_HEADER))
+        except (TypeError, ValueError):
+            used = None
+        with self._condition:
+            self.failures = 0
+            if used is not None:
+                self._roll(self.clock())
+                self.server_used = used
+                self.used = max(self.used, used)
+
+    def penalize(self, headers=None, banned=False):
+        """
+        429 / 418 yanıtı: tüm istekleri geri çekilme süresince durdur
+
+        Returns:
+            float: Geri çekilme süresi (saniye)
+        """
+        try:
+            retry_after = float(_header(headers, 'Retry-After'))
+        except (TypeError, ValueError):
+            retry_after = None
+
+        with self._condition:
+            self.failures += 1
+            self.stats['banned' if banned else 'rate_limited'] += 1
+            delay = backoff_delay(self.failures)
+            if banned:
+                delay = max(delay, BAN_MIN_BACKOFF)
+            now = self.clock()
+            if retry_after is not None:
+                delay = retry_after + random.uniform(0, 1)
+            else:
+                # Sunucu süre bildirmediyse pencere dolmuş sayılır (yeni pencereden devam)
+                self._roll(now)
+                self.used = max(self.used, self.capacity)
+            self.backoff_until = max(self.backoff_until, now + delay)
+            self._condition.notify_all()
+        return delay
+
+    def utilization(self):
+        """Penceredeki bütçe kullanım oranı"""
+        with self._condition:
+            self._roll(self.clock())
+            return self.used / self.capacity
+
+
+# Süreç içindeki tüm borsa nesneleri için ortak zamanlayıcı
+SCHEDULER = RequestScheduler()
+
+
+def attach(exchange, scheduler=None, default=NORMAL):
+    """
+    ccxt borsa nesnesinin isteklerini zamanlayıcıdan geçir
+
+    ccxt'nin kendi throttle'ı yerine zamanlayıcı kullanılır. İstek ağırlığı ccxt
+    uç nokta tablosundan gelir: ccxt maliyeti rateLimit birimindedir (Binance
+    spot'ta rateLimit 50ms -> dakikada 1200 birim = 6000 ağırlık, maliyet 0.2 =
+    ağırlık 1), ağırlığa çevrilir. 429 / 418 ve GET ağ hataları tekrar denenir.
+    Senkron ve asyncio ccxt nesneleri desteklenir; ccxt dışı nesnelere dokunulmaz.
+
+    Args:
+        default: Bağlamda öncelik verilmemişse kullanılacak öncelik
+    """
+    scheduler = scheduler or SCHEDULER
+    original = getattr(exchange, 'fetch2', None)
+    if original is None or getattr(original, '_scheduled', False):
+        return exchange
+
+    exchange.enableRateLimit = True
+    exchange.rateLimiter = scheduler
+    # ccxt maliyet birimi -> istek ağırlığı
+    unit = scheduler.limit * exchange.rateLimit / 60000
+
+    def level_now():
+        level = _priority.get()
+        return default if level is None else level
+
+    def retry_delay(error, method, attempt):
+        """Tekrar denenecekse bekleme süresi, denenmeyecekse None"""
+        if attempt > MAX_RETRIES:
+            return None
+        headers = getattr(exchange, 'last_response_headers', None)
+        if isinstance(error, (ccxt.RateLimitExceeded, ccxt.DDoSProtection)):
+            # ccxt: 429 -> RateLimitExceeded, 418 -> DDoSProtection
+            banned = not isinstance(error, ccxt.RateLimitExceeded)
+            delay = scheduler.penalize(headers, banned=banned)
+            logging.warning(f"⚠️ {'IP yasağı (418)' if banned else 'Hız limiti (429)'}: "
+                            f"{delay:.1f}s geri çekiliniyor ({attempt}/{MAX_RETRIES})")
+            return 0.0  # Bekleme throttle'da (tüm istekler için ortak)
+        if isinstance(error, ccxt.NetworkError) and method == 'GET':
+            delay = backoff_delay(attempt)
+            logging.warning(f"⚠️ Ağ hatası, {delay:.1f}s sonra tekrar denenecek "
+                            f"({attempt}/{MAX_RETRIES}): {error}")
+            return delay
+        return None
+
+    if asyncio.iscoroutinefunction(original):
+        async def throttle(cost=None):
+            await scheduler.acquire_async(round((cost or 1) * unit, 3), level_now())
+
+        @functools.wraps(original)
+        async def fetch2(path, api='public', method='GET', params={}, headers=None, body=None,
+                         config={}):
+            for attempt in itertools.count(1):
+                try:
+                    result = await original(path, api, method, params, headers, body, config)
+                except ccxt.NetworkError as e:
+                    delay = retry_delay(e, method, attempt)
+                    if delay is None:
+                        raise
+                    scheduler.stats['retries'] += 1
+                    await asyncio.sleep(delay)
+                    continue
+                scheduler.observe(getattr(exchange, 'last_response_headers', None))
+                return result
+    else:
+        def throttle(cost=None):
+            scheduler.acquire(round((cost or 1) * unit, 3), level_now())
+
+        @functools.wraps(original)
+        def fetch2(path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+            for attempt in itertools.count(1):
+                try:
+                    result = original(path, api, method, params, headers, body, config)
+                except ccxt.NetworkError as e:
+                    delay = retry_delay(e, method, attempt)
+                    if delay is None:
+                        raise
+                    scheduler.stats['retries'] += 1
+                    time.sleep(delay)
+                    continue
+                scheduler.observe(getattr(exchange, 'last_response_headers', None))
+                return result
+
+    fetch2._scheduled = True
+    exchange.throttle = throttle
+    exchange.fetch2 = fetch2
+    return exchange
+
+
+def watch_scheduler(scheduler=None, registry=None):
+    """Bütçe kullanımı ve bekleme / geri çekilme sayaçları için metrik göstergeleri"""
+    from metrics import REGISTRY
+    scheduler = scheduler or SCHEDULER
+    registry = registry or REGISTRY
+    registry.gauge('rate_limit_utilization', scheduler.utilization,
+                   "Dakikalık istek ağırlığı bütçesinin kullanım oranı")
+    registry.gauge('rate_limit_server_used_weight', lambda: scheduler.server_used)
+    for name in ('waits', 'wait_seconds', 'rate_limited', 'banned', 'retries'):
+        registry.gauge(f'rate_limit_{name}_total', functools.partial(scheduler.stats.get, name))
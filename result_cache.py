@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İçerik Adresli Önbellek
+İndikatör kolonları ve backtest sonuçları için disk önbelleği
+
+- Anahtar içerikten türetilir: mum diliminin baytları + parametreler (content_key);
+  aynı mumlar ve aynı parametreler her süreçte, her oturumda aynı anahtarı verir
+- Kolon setleri tek .npy dosyasına (kolon başına bir satır) yazılır, okuma bellek
+  eşlemeli (mmap): kopya yok, aynı dosyayı okuyan süreçler sayfaları paylaşır
+- Küçük sonuçlar (JSON) SQLite indeksinin içinde tutulur
+- Boyut bütçesi aşılınca en uzun süredir kullanılmayan girdiler (LRU) silinir
+- Süreçler arası güvenli: dosyalar geçici isimle yazılıp os.replace ile
+  yayımlanır, indeks SQLite (WAL) ile güncellenir. Silinen dosyayı okumakta olan
+  süreç açık eşlemesini kullanmaya devam eder; dosyası kaybolan girdi ıska sayılır
+
+Kullanım:
+  python result_cache.py                  # Önbellek özeti
+  python result_cache.py --clear          # Tüm girdileri sil
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+CACHE_ROOT = os.path.join('data', 'cache')
+INDICATOR_BUDGET = 2 * 1024 ** 3  # İndikatör kolonları (byte)
+RESULT_BUDGET = 256 * 1024 ** 2  # Backtest / tarama sonuçları (byte)
+EVICT_RATIO = 0.9  # Bütçe aşılınca bu orana kadar boşaltılır
+TOUCH_INTERVAL = 60  # Erişim zamanı en fazla bu sıklıkla yazılır (saniye)
+BUSY_TIMEOUT = 30  # Kilitli indeks için bekleme (saniye)
+CACHE_VERSION = 2  # Hesaplama değişince artır (eski anahtarlar kullanılmaz)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    names TEXT,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+def content_key(*parts):
+    """
+    Parçaların SHA-1 özeti
+
+    NumPy dizileri dtype, şekil ve baytlarıyla; diğer parçalar sıralı JSON
+    olarak özetlenir.
+    """
+    digest = hashlib.sha1(f"v{CACHE_VERSION}".encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(part)
+            digest.update(f"{part.dtype.str}{part.shape}".encode())
+            digest.update(part.reshape(-1).view(np.uint8))
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Boyut bütçeli LRU disk önbelleği
+
+    Dizi girdileri (kolon sözlüğü) mmap ile, JSON girdileri indeksten okunur.
+    Nesne pickle ile işçilere gönderilebilir; her süreç kendi bağlantısını açar.
+    """
+
+    def __init__(self, root, budget_bytes):
+        self.root = root
+        self.budget = budget_bytes
+        self.path = os.path.join(root, 'index.sqlite')
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evicted': 0}
+        self._conn = None
+        self._pid = None
+
+        os.makedirs(root, exist_ok=True)
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_pid'] = None
+        return state
+
+    def _connection(self):
+        """Süreç başına bağlantı (fork sonrası üst sürecin bağlantısı kullanılmaz)"""
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._pid = os.getpid()
+        return self._conn
+
+    def close(self):
+        """
+        Bu sürecin indeks bağlantısını kapat (sonraki erişim yeniden açar)
+
+        Süreç havuzu başlatmadan ve önbellek klasörü silinmeden önce çağrılır:
+        açık kalan bağlantı fork ile işçilere geçer; SQLite'ın dosya kayıtları
+        (inode) silinmiş eski bir indeksi aynı inode'u alan yeni indeksle
+        karıştırabilir. Fork edilmiş süreçte üst sürecin bağlantısı kapatılmaz.
+        """
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+        self._pid = None
+
+    def _file(self, key):
+        return os.path.join(self.root, key[:2], key + '.npy')
+
+    def _touch(self, conn, keys_accessed):
+        """Erişim zamanını güncelle - sadece TOUCH_INTERVAL'dan eskiyse (okumalar yazmasın)"""
+        now = time.time()
+        stale = [(now, key) for key, accessed in keys_accessed if now - accessed > TOUCH_INTERVAL]
+        if stale:
+            conn.executemany('UPDATE entries SET accessed = ? WHERE key = ?', stale)
+
+    def _forget(self, key):
+        self._connection().execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    # ------------------------------------------------------------------
+    # Diziler
+    # ------------------------------------------------------------------
+
+    def get_arrays(self, key):
+        """
+        Kolon sözlüğünü oku (salt okunur, bellek eşlemeli görünümler)
+
+        Returns:
+            dict veya None: {kolon: np.memmap}
+        """
+        conn = self._connection()
+        row = conn.execute('SELECT names, accessed FROM entries WHERE key = ? AND names IS NOT NULL',
+                           (key,)).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        try:
+            data = np.load(self._file(key), mmap_mode='r')
+        except (OSError, ValueError):
+            # Başka süreç silmiş / yarım kalmış: girdi düşürülür, yeniden hesaplanır
+            self._forget(key)
+            self.stats['misses'] += 1
+            return None
+        self._touch(conn, [(key, row[1])])
+        self.stats['hits'] += 1
+        return {name: data[i] for i, name in enumerate(json.loads(row[0]))}
+
+    def put_arrays(self, key, columns):
+        """Eşit uzunluktaki kolonları tek dosyaya yaz (float64)"""
+        names = list(columns)
+        stacked = np.stack([np.asarray(columns[name], dtype=np.float64) for name in names])
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, stacked)
+        # Boyut yayımlamadan önce alınır: başka sürecin LRU silmesi dosyayı hemen kaldırabilir
+        size = os.path.getsize(tmp)
+        os.replace(tmp, path)
+        self._insert([(key, size, json.dumps(names), None)])
+
+    def arrays(self, key, compute):
+        """Önbellekte varsa oku, yoksa compute() ile hesaplayıp yaz"""
+        columns = self.get_arrays(key)
+        if columns is None:
+            columns = compute()
+            self.put_arrays(key, columns)
+        return columns
+
+    # ------------------------------------------------------------------
+    # JSON sonuçlar
+    # ------------------------------------------------------------------
+
+    def get_json_many(self, keys):
+        """Bulunan anahtarlar için {anahtar: değer}"""
+        conn = self._connection()
+        found = {}
+        accessed = []
+        keys = list(keys)
+        for start in range(0, len(keys), 500):  # SQLite parametre sınırı
+            chunk = keys[start:start + 500]
+            marks = ','.join('?' * len(chunk))
+            for key, value, when in conn.execute(
+                    f'SELECT key, value, accessed FROM entries '
+                    f'WHERE key IN ({marks}) AND value IS NOT NULL', chunk):
+                found[key] = json.loads(value)
+                accessed.append((key, when))
+        if accessed:
+            self._touch(conn, accessed)
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    def get_json(self, key):
+        return self.get_json_many([key]).get(key)
+
+    def put_json_many(self, items):
+        """{anahtar: değer} - tek işlemde yazılır"""
+        rows = []
+        for key, value in items.items():
+            payload = json.dumps(value)
+            rows.append((key, len(payload), None, payload))
+        if rows:
+            self._insert(rows)
+
+    def put_json(self, key, value):
+        self.put_json_many({key: value})
+
+    # ------------------------------------------------------------------
+    # İndeks ve LRU
+    # ------------------------------------------------------------------
+
+    def _insert(self, rows):
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('INSERT OR REPLACE INTO entries (key, size, accessed, names, value) '
+                             'VALUES (?, ?, ?, ?, ?)',
+                             [(key, size, now, names, value) for key, size, names, value in rows])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self.stats['writes'] += len(rows)
+        self.evict()
+
+    def size(self):
+        return self._connection().execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def evict(self, budget=None):
+        """Toplam boyut bütçeyi aşarsa en eski erişilen girdileri sil (EVICT_RATIO'ya kadar)"""
+        budget = self.budget if budget is None else budget
+        conn = self._connection()
+        if self.size() <= budget:
+            return 0
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            victims = []
+            target = budget * EVICT_RATIO if total > budget else total
+            for key, size, names in conn.execute(
+                    'SELECT key, size, names FROM entries ORDER BY accessed'):
+                if total <= target:
+                    break
+                victims.append((key, names is not None))
+                total -= size
+            conn.executemany('DELETE FROM entries WHERE key = ?', [(key,) for key, _ in victims])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        # Dosyalar indeksten düşürüldükten sonra silinir; açık eşlemeler geçerli kalır
+        for key, is_file in victims:
+            if is_file:
+                try:
+                    os.remove(self._file(key))
+                except OSError:
+                    pass
+        self.stats['evicted'] += len(victims)
+        return len(victims)
+
+    def clear(self):
+        return self.evict(budget=-1)
+
+    def summary(self):
+        conn = self._connection()
+        files, file_bytes = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE names IS NOT NULL').fetchone()
+        results, result_bytes = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE value IS NOT NULL').fetchone()
+        return {'arrays': files, 'array_bytes': file_bytes, 'results': results,
+                'result_bytes': result_bytes, 'budget': self.budget}
+
+
+def indicator_cache(root=CACHE_ROOT, budget_bytes=INDICATOR_BUDGET):
+    """İndikatör kolonları önbelleği (mum dilimi + indikatör parametreleri anahtarlı)"""
+    return ResultCache(os.path.join(root, 'indicators'), budget_bytes)
+
+
+def result_cache(root=CACHE_ROOT, budget_bytes=RESULT_BUDGET):
+    """Backtest / tarama sonuçları önbelleği (veri + strateji yapılandırması anahtarlı)"""
+    return ResultCache(os.path.join(root, 'results'), budget_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İndikatör / sonuç önbelleği")
+    parser.add_argument('--root', default=CACHE_ROOT, help="Önbellek klasörü")
+    parser.add_argument('--clear', action='store_true', help="Tüm girdileri sil")
+    args = parser.parse_args()
+
+    for name, cache in (('İndikatörler', indicator_cache(args.root)),
+                        ('Sonuçlar', result_cache(args.root))):
+        if args.clear:
+            print(f"✓ {name}: {cache.clear()} girdi silindi")
+            continue
+        info = cache.summary()
+        used = info['array_bytes'] + info['result_bytes']
+        print(f"{name:13}: {info['arrays']} kolon seti, {info['results']} sonuç | "
+              f"{used / 1024 ** 2:.1f} / {info['budget'] / 1024 ** 2:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
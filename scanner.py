@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çoklu Sembol Tarayıcı
+Günlük botun 7 indikatörlü skorlamasını yüzlerce sembol için her mum
+kapanışında çalıştırır ve sembolleri alış / satış skoruna göre sıralar
+
+- Veri asyncio ccxt ile çekilir: sınırlı eşzamanlılık, hız sınırı botlarla
+  ortak ağırlık bütçeli zamanlayıcıda (rate_limiter, BULK önceliği: aynı
+  süreçteki pozisyon izleme istekleri önce geçer)
+- Her sembolün penceresi CandleStore'da tutulur; ilk turdan sonra sadece son
+  mumdan itibaren çekilir (istek ağırlığı 1)
+- İndikatörler tüm semboller için (sembol x mum) matris üzerinde tek çağrıda
+  hesaplanır, skorlar sadece son kapanmış mum için alınır
+- Parametreler ve eşikler günlük bottan gelir, sinyaller bot ile aynıdır
+
+Kullanım:
+  python scanner.py --once                          # Tüm USDT spot çiftlerini bir kez tara
+  python scanner.py --symbols BTC/USDT,ETH/USDT --top 10
+  python scanner.py --max-symbols 300               # En hacimli 300 çift, her mum kapanışında
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+import numpy as np
+
+import bitcoin_daily_bot_fixed as daily
+import lazy_ccxt as ccxt
+from candle_store import OHLCV_COLUMNS, CandleStore, ohlcv_array
+from indicator_kernels import compute_indicators
+from metrics import REGISTRY
+import rate_limiter
+from signal_scoring import BUY, SELL, daily_reasons, daily_scores, daily_signals
+
+SCAN_QUOTE = 'USDT'
+SCAN_CONCURRENCY = 16  # Aynı anda açık istek sayısı
+TOP_N = 20
+CLOCK_RESYNC = 3600  # Sunucu saat farkının yenilenme aralığı (saniye)
+
+class MarketScanner:
+    def __init__(self, exchange, symbols, timeframe=daily.TIMEFRAME, window=daily.CANDLE_WINDOW,
+                 concurrency=SCAN_CONCURRENCY):
+        """
+        Args:
+            exchange: asyncio ccxt borsa nesnesi (lazy_ccxt.async_binance)
+            symbols: Taranacak semboller
+            window: Sembol başına bellekte tutulan mum sayısı (skor için tam pencere gerekir)
+            concurrency: Aynı anda açık istek sayısı (hız sınırı rate_limiter.attach ile)
+        """
+        self.exchange = exchange
+        self.timeframe = timeframe
+        self.timeframe_ms = exchange.parse_timeframe(timeframe) * 1000
+        self.window = window
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # Pencere + oluşmakta olan mum
+        self.stores = {symbol: CandleStore(symbol, timeframe, window=window + 1) for symbol in symbols}
+        self.offset_ms = 0
+        self.last_sync = None
+        self.last_timings = {}
+
+    # ------------------------------------------------------------------
+    # Veri
+    # ------------------------------------------------------------------
+
+    async def now_ms(self):
+        """Sunucu saati (yerel saat + periyodik ölçülen fark)"""
+        local = time.time() * 1000
+        if self.last_sync is None or local - self.last_sync > CLOCK_RESYNC * 1000:
+            try:
+                sent = time.time() * 1000
+                server = await self.exchange.fetch_time()
+                received = time.time() * 1000
+                self.offset_ms = server - (sent + received) / 2
+            except Exception as e:
+                logging.warning(f"⚠️ Sunucu saati alınamadı: {e}")
+            self.last_sync = local = time.time() * 1000
+        return int(local + self.offset_ms)
+
+    async def _update(self, store, now_ms):
+        """Tek sembolün penceresini güncelle - hata olursa False (tur devam eder)"""
+        last = store.last_timestamp
+        missing = None if last is None else (now_ms - last) // self.timeframe_ms
+        full_refresh = missing is None or missing >= self.window
+        # Oluşan mum dahil; limit küçük tutulursa istek ağırlığı 1 olur
+        limit = self.window + 1 if full_refresh else int(missing) + 2
+
+        async with self.semaphore:
+            try:
+                ohlcv = await self.exchange.fetch_ohlcv(store.symbol, self.timeframe,
+                                                         since=None if full_refresh else last,
+                                                         limit=limit)
+            except ccxt.RateLimitExceeded as e:
+                logging.warning(f"⚠️ {store.symbol}: hız limiti aşıldı: {e}")
+                return False
+            except Exception as e:
+                logging.debug(f"{store.symbol}: veri çekilemedi: {e}")
+                return False
+
+        with store.lock:
+            if full_refresh:
+                store.clear()
+            store.merge(ohlcv)
+        return True
+
+    async def refresh(self, now_ms=None):
+        """
+        Tüm sembollerin pencerelerini eşzamanlı güncelle
+
+        Returns:
+            int: Güncellenemeyen sembol sayısı
+        """
+        now_ms = now_ms or await self.now_ms()
+        results = await asyncio.gather(*(self._update(store, now_ms) for store in self.stores.values()))
+        return results.count(False)
+
+    # ------------------------------------------------------------------
+    # Skorlama
+    # ------------------------------------------------------------------
+
+    def matrix(self, closed_bar):
+        """
+        Kapanan muma kadar tam penceresi olan sembollerin (sembol x mum) dizileri
+
+        Returns:
+            (semboller, zaman ızgarası, [S x W x 6] OHLCV) - sembol yoksa None
+        """
+        grid = closed_bar - self.timeframe_ms * np.arange(self.window - 1, -1, -1, dtype=np.int64)
+        symbols, chunks = [], []
+        for symbol, store in self.stores.items():
+            candles = store.view()
+            timestamps = candles['timestamp']
+            # Son mum oluşan mumsa bir önceki kapanan mumdur
+            end = int(np.searchsorted(timestamps, closed_bar, side='right'))
+            if end < self.window or timestamps[end - 1] != closed_bar:
+                continue
+            # Artan zaman damgalarında uçlar tutuyorsa pencere boşluksuzdur
+            if timestamps[end - self.window] != grid[0]:
+                continue
+            symbols.append(symbol)
+            chunks.append(candles[end - self.window:end])
+
+        if not chunks:
+            return None
+        data = np.empty((len(chunks), self.window, len(OHLCV_COLUMNS)))
+        for i, chunk in enumerate(chunks):
+            ohlcv_array(chunk, out=data[i])
+        return symbols, grid, data
+
+    def score(self, closed_bar):
+        """
+        Son kapanmış mum için tüm sembollerin skorları
+
+        Returns:
+            list: Skora göre sıralı {'symbol', 'price', 'buy_score', 'sell_score',
+                  'signal', 'reasons'} sözlükleri
+        """
+        built = self.matrix(closed_bar)
+        if built is None:
+            return []
+        symbols, grid, data = built
+
+        with REGISTRY.time('scan_indicators'):
+            columns = compute_indicators(data[..., 1], data[..., 2], data[..., 3], data[..., 4],
+                                         data[..., 5], timestamps=grid, **daily.INDICATOR_PARAMS)
+            last = {name: values[:, -1] for name, values in columns.items()}
+            last['close'] = data[:, -1, 4]
+            buy_score, sell_score = daily_scores(last, **daily.SIGNAL_THRESHOLDS)
+            signals = daily_signals(buy_score, sell_score, daily.MIN_SIGNAL_SCORE)
+
+        results = []
+        for i, symbol in enumerate(symbols):
+            signal = {BUY: 'BUY', SELL: 'SELL'}.get(int(signals[i]))
+            reasons = []
+            if signal:
+                # Sebep metinleri sadece sinyal oluşan semboller için
+                reasons = daily_reasons({name: values[i] for name, values in last.items()},
+                                        signal, **daily.SIGNAL_THRESHOLDS)
+            results.append({'symbol': symbol, 'price': float(last['close'][i]),
+                            'buy_score': int(buy_score[i]), 'sell_score': int(sell_score[i]),
+                            'signal': signal, 'reasons': reasons})
+
+        results.sort(key=lambda r: (-max(r['buy_score'], r['sell_score']), r['signal'] is None,
+                                    r['symbol']))
+        return results
+
+    async def scan(self, closed_bar=None):
+        """
+        Tek tarama turu: pencereleri güncelle, tüm sembolleri skorla
+
+        Args:
+            closed_bar: Değerlendirilecek kapanmış mumun açılışı (ms) - None: son kapanan mum
+        """
+        started = time.perf_counter()
+        now = await self.now_ms()
+        if closed_bar is None:
+            closed_bar = now // self.timeframe_ms * self.timeframe_ms - self.timeframe_ms
+
+        with REGISTRY.time('scan_fetch'):
+            failed = await self.refresh(now)
+        fetched = time.perf_counter()
+        results = self.score(closed_bar)
+
+        self.last_timings = {'fetch': fetched - started, 'score': time.perf_counter() - fetched,
+                             'symbols': len(results), 'failed': failed}
+        return results
+
+    async def run(self, top=TOP_N, delay_ms=daily.CANDLE_CLOSE_DELAY_MS, on_results=None):
+        """Her mum kapanışında tara ve en yüksek skorlu sembolleri logla"""
+        last_bar = None
+        while True:
+            now = await self.now_ms()
+            bar = (now - delay_ms) // self.timeframe_ms * self.timeframe_ms - self.timeframe_ms
+            if bar != last_bar:
+                results = await self.scan(bar)
+                log_results(results, top, self.last_timings)
+                if on_results:
+                    on_results(bar, results)
+                last_bar = bar
+            next_close = bar + 2 * self.timeframe_ms + delay_ms
+            await asyncio.sleep(max(next_close - await self.now_ms(), 0) / 1000)
+
+
+async def universe(exchange, quote=SCAN_QUOTE, max_symbols=None):
+    """
+    Aktif spot çiftleri (örn. tüm */USDT)
+
+    max_symbols verilirse 24 saatlik işlem hacmine göre en büyükler alınır.
+    """
+    if not exchange.markets:
+        await ccxt.load_markets_async(exchange)
+    symbols = sorted(symbol for symbol, market in (exchange.markets or {}).items()
+                     if market.get('spot') and market.get('active') and market.get('quote') == quote)
+    if not max_symbols or len(symbols) <= max_symbols:
+        return symbols
+
+    tickers = await exchange.fetch_tickers()
+    symbols.sort(key=lambda s: -((tickers.get(s) or {}).get('quoteVolume') or 0))
+    return symbols[:max_symbols]
+
+
+def log_results(results, top=TOP_N, timings=None):
+    """En yüksek skorlu sembolleri logla"""
+    signals = [r for r in results if r['signal']]
+    if timings:
+        logging.info(f"🔎 {timings['symbols']} sembol tarandı | veri {timings['fetch']:.2f}s, "
+                     f"skor {timings['score'] * 1000:.0f}ms | {len(signals)} sinyal"
+                     + (f" | {timings['failed']} sembol güncellenemedi" if timings['failed'] else ""))
+    for r in results[:top]:
+        mark = {'BUY': '🟢', 'SELL': '🔴'}.get(r['signal'], '  ')
+        reasons = f" | {', '.join(r['reasons'][:3])}" if r['reasons'] else ""
+        logging.info(f"{mark} {r['symbol']:14} ${r['price']:>12,.4f}  "
+                     f"Alış {r['buy_score']}/7  Satış {r['sell_score']}/7{reasons}")
+
+
+async def _main(args):
+    exchange, _ = ccxt.async_binance({'enableRateLimit': True})
+    rate_limiter.attach(exchange, default=rate_limiter.BULK)
+    try:
+        if args.symbols:
+            symbols = [s.strip() for s in args.symbols.split(',') if s.strip()]
+        else:
+            symbols = await universe(exchange, args.quote, args.max_symbols)
+        if not symbols:
+            logging.error("❌ Taranacak sembol bulunamadı (piyasa bilgisi yüklenemedi mi?)")
+            return 1
+
+        scanner = MarketScanner(exchange, symbols, concurrency=args.concurrency)
+        logging.info(f"🔎 Tarayıcı: {len(symbols)} sembol, {scanner.timeframe}, "
+                     f"eşzamanlılık {args.concurrency}, ağırlık bütçesi "
+                     f"{rate_limiter.SCHEDULER.capacity * rate_limiter.SHARES[rate_limiter.BULK]:.0f}/dk")
+        if args.once:
+            log_results(await scanner.scan(), args.top, scanner.last_timings)
+        else:
+            await scanner.run(args.top)
+        return 0
+    finally:
+        await exchange.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Günlük strateji ile çoklu sembol tarayıcı")
+    parser.add_argument('--symbols', help="Virgülle ayrılmış semboller (varsayılan: tüm spot çiftler)")
+    parser.add_argument('--quote', default=SCAN_QUOTE, help="Karşı para birimi")
+    parser.add_argument('--max-symbols', type=int, help="Hacme göre en büyük N çift")
+    parser.add_argument('--concurrency', type=int, default=SCAN_CONCURRENCY)
+    parser.add_argument('--top', type=int, default=TOP_N, help="Loglanacak sembol sayısı")
+    parser.add_argument('--once', action='store_true', help="Tek tur tara ve çık")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        return asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        logging.info("👋 Tarayıcı durduruldu")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
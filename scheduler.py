@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mum Kapanışına Hizalı Zamanlayıcı
+Sabit time.sleep döngüleri yerine her timeframe sınırından birkaç yüz ms sonra uyanır
+
+- Borsa sunucu saati ile yerel saat arasındaki fark ölçülür (gidiş-dönüş
+  süresinin yarısı düzeltilerek) ve periyodik olarak yenilenir
+- Her kapanan mum için tek bir 'bar' olayı üretilir; bot mumu değerlendirdiğini
+  bildirmezse (veri henüz hazır değilse) kısa aralıkla tekrar denenir
+- Açık pozisyon varken mumlar arasında daha sık 'tick' olayları üretilir
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from indicator_kernels import to_milliseconds
+
+BAR = 'bar'
+TICK = 'tick'
+
+
+class ServerClock:
+    """Borsa sunucu saati (yerel saat + ölçülen fark)"""
+
+    def __init__(self, exchange, resync_interval=3600):
+        self.exchange = exchange
+        self.resync_interval = resync_interval
+        self.offset_ms = 0
+        self.round_trip_ms = None
+        self.last_sync = None
+
+    def sync(self):
+        """Sunucu saatini ölç - hata olursa önceki fark korunur"""
+        try:
+            sent = time.time() * 1000
+            server = self.exchange.fetch_time()
+            received = time.time() * 1000
+            self.round_trip_ms = received - sent
+            self.offset_ms = server - (sent + received) / 2
+            self.last_sync = received
+            logging.debug(f"🕐 Sunucu saat farkı: {self.offset_ms:+.0f}ms (RTT {self.round_trip_ms:.0f}ms)")
+        except Exception as e:
+            logging.warning(f"⚠️ Sunucu saati alınamadı: {e}")
+            self.last_sync = time.time() * 1000
+
+    def now_ms(self):
+        local = time.time() * 1000
+        if self.last_sync is None or local - self.last_sync > self.resync_interval * 1000:
+            self.sync()
+            local = time.time() * 1000
+        return int(local + self.offset_ms)
+
+
+class CandleScheduler:
+    def __init__(self, timeframe_ms, clock, delay_ms=300, monitor_interval=None,
+                 retry_delay=1.0, sleep=time.sleep):
+        """
+        Args:
+            timeframe_ms: Mum periyodu (ms)
+            clock: now_ms() sağlayan saat (ServerClock)
+            delay_ms: Sınırdan sonra uyanma gecikmesi
+            monitor_interval: Pozisyon izleme tick aralığı (saniye)
+            retry_delay: Mum henüz hazır değilse tekrar deneme aralığı (saniye)
+        """
+        self.timeframe_ms = timeframe_ms
+        self.clock = clock
+        self.delay_ms = delay_ms
+        self.monitor_interval = monitor_interval
+        self.retry_delay = retry_delay
+        self.sleep = sleep
+        self.last_emitted = None
+
+    def latest_closed_bar(self, now_ms):
+        """Şu an itibarıyla kapanmış son mumun açılış zamanı (ms)"""
+        return (now_ms - self.delay_ms) // self.timeframe_ms * self.timeframe_ms - self.timeframe_ms
+
+    def wait(self, last_processed, monitor=False):
+        """
+        Bir sonraki olaya kadar bekle
+
+        Args:
+            last_processed: Botun değerlendirdiği son kapanmış mum (ms veya None)
+            monitor: Açık pozisyon var mı (tick olayları üretilsin mi)
+
+        Returns:
+            (olay, mum_ms): (BAR, kapanan mumun açılışı) veya (TICK, None)
+        """
+        while True:
+            now = self.clock.now_ms()
+            bar = self.latest_closed_bar(now)
+
+            if last_processed is None or bar > last_processed:
+                if bar == self.last_emitted:
+                    # Aynı mum tekrar isteniyor: veri henüz hazır değil
+                    self.sleep(self.retry_delay)
+                self.last_emitted = bar
+                return BAR, bar
+
+            wait_ms = bar + 2 * self.timeframe_ms + self.delay_ms - now
+            if monitor and self.monitor_interval and self.monitor_interval * 1000 < wait_ms:
+                self.sleep(self.monitor_interval)
+                return TICK, None
+
+            self.sleep(max(wait_ms, 0) / 1000)
+
+
+def closed_frame(df, closed_bar_ms):
+    """
+    Mumları (CandleStore.view veya DataFrame) kapanan muma kadar kes
+
+    Yapılandırılmış dizi için kopyasız görünüm döner. Borsada daha yeni bir mum
+    yoksa kapanan mumun son hali henüz kesin değildir, None döner.
+    """
+    timestamps = to_milliseconds(df['timestamp'])
+    if len(timestamps) == 0 or timestamps[-1] <= closed_bar_ms:
+        return None
+    end = int(np.searchsorted(timestamps, closed_bar_ms, side='right'))
+    return df.iloc[:end] if hasattr(df, 'iloc') else df[:end]
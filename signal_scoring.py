@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vektörize Sinyal Skorlama
+Günlük (7 indikatör) ve haftalık (5 indikatör) koşullarını boolean maskelere
+çevirir ve her mum için alış / satış skorlarını tek geçişte hesaplar
+
+Canlı modda son eleman okunur; backtest ve tarayıcılar tüm seriyi kullanır.
+Sebep metinleri sadece sinyal oluştuğunda üretilir.
+"""
+
+import numpy as np
+
+BUY = 1
+SELL = -1
+
+
+def _column(data, name):
+    return np.asarray(data[name], dtype=np.float64)
+
+
+def _shift(values):
+    """Bir önceki mumun değeri (ilk mum için NaN)"""
+    shifted = np.empty_like(values)
+    shifted[0] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def daily_conditions(data, rsi_oversold=25, rsi_overbought=75, volume_multiplier=1.3):
+    """
+    Günlük botun 7 alış ve 7 satış koşulu
+
+    Returns:
+        (buy, sell): Her biri {koşul_adı: bool dizisi} sözlüğü
+    """
+    close = _column(data, 'close')
+    rsi = _column(data, 'rsi')
+    macd = _column(data, 'macd')
+    macd_signal = _column(data, 'macd_signal')
+    ema_short = _column(data, 'ema_short')
+    ema_medium = _column(data, 'ema_medium')
+    stoch_k = _column(data, 'stoch_k')
+    volume_ratio = _column(data, 'volume_ratio')
+    vwap = _column(data, 'vwap')
+    bb_low = _column(data, 'bb_low')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bb_position = (close - bb_low) / (_column(data, 'bb_high') - bb_low)
+
+    # NaN karşılaştırmaları False döner (generate_signals ile aynı davranış)
+    high_volume = volume_ratio > volume_multiplier
+    has_vwap = vwap != 0
+
+    buy = {
+        'rsi': rsi < rsi_oversold,
+        'bb': bb_position < 0.2,
+        'macd': macd > macd_signal,
+        'ema': ema_short > ema_medium,
+        'stoch': stoch_k < 20,
+        'volume': high_volume,
+        'vwap': has_vwap & (close < vwap),
+    }
+    sell = {
+        'rsi': rsi > rsi_overbought,
+        'bb': bb_position > 0.8,
+        'macd': macd < macd_signal,
+        'ema': ema_short < ema_medium,
+        'stoch': stoch_k > 80,
+        'volume': high_volume,
+        'vwap': has_vwap & (close > vwap),
+    }
+    return buy, sell
+
+
+def daily_scores(data, **thresholds):
+    """
+    Her mum için günlük alış / satış skorları (0-7)
+
+    Returns:
+        (buy_score, sell_score): int8 dizileri
+    """
+    buy, sell = daily_conditions(data, **thresholds)
+    buy_score = np.sum(list(buy.values()), axis=0, dtype=np.int8)
+    sell_score = np.sum(list(sell.values()), axis=0, dtype=np.int8)
+    return buy_score, sell_score
+
+
+def daily_signals(buy_score, sell_score, min_score=5):
+    """Skorlardan sinyal dizisi: BUY (1), SELL (-1) veya 0 - alış önceliklidir"""
+    return np.where(buy_score >= min_score, BUY, np.where(sell_score >= min_score, SELL, 0))
+
+
+def daily_reasons(row, signal, rsi_oversold=25, rsi_overbought=75, volume_multiplier=1.3):
+    """Tek mum için sinyal sebeplerini metin olarak üret (sadece sinyal oluştuğunda)"""
+    current_price = row['close']
+    bb_position = (current_price - row['bb_low']) / (row['bb_high'] - row['bb_low'])
+    reasons = []
+
+    if signal == 'BUY':
+        if row['rsi'] < rsi_oversold:
+            reasons.append(f"RSI({row['rsi']:.1f})<{rsi_oversold}")
+        if bb_position < 0.2:
+            reasons.append(f"BB Alt(%{bb_position*100:.0f})")
+        if row['macd'] > row['macd_signal']:
+            reasons.append("MACD+")
+        if row['ema_short'] > row['ema_medium']:
+            reasons.append("EMA+")
+        if row['stoch_k'] < 20:
+            reasons.append(f"Stoch({row['stoch_k']:.0f})<20")
+        if row['volume_ratio'] > volume_multiplier:
+            reasons.append(f"Vol({row['volume_ratio']:.1f}x)")
+        if row['vwap'] and current_price < row['vwap']:
+            reasons.append("VWAP Altı")
+    else:
+        if row['rsi'] > rsi_overbought:
+            reasons.append(f"RSI({row['rsi']:.1f})>{rsi_overbought}")
+        if bb_position > 0.8:
+            reasons.append(f"BB Üst(%{bb_position*100:.0f})")
+        if row['macd'] < row['macd_signal']:
+            reasons.append("MACD-")
+        if row['ema_short'] < row['ema_medium']:
+            reasons.append("EMA-")
+        if row['stoch_k'] > 80:
+            reasons.append(f"Stoch({row['stoch_k']:.0f})>80")
+        if row['volume_ratio'] > volume_multiplier:
+            reasons.append(f"Vol({row['volume_ratio']:.1f}x)")
+        if row['vwap'] and current_price > row['vwap']:
+            reasons.append("VWAP Üstü")
+
+    return reasons
+
+
+WEEKLY_REQUIRED_FIELDS = [
+    'rsi', 'close', 'bb_low', 'bb_high', 'macd',
+    'macd_signal', 'ema_20', 'ema_50', 'volume',
+    'volume_ma', 'atr'
+]
+
+
+def weekly_scores(data, rsi_buy=35, rsi_sell=65, volume_multiplier=1.2):
+    """
+    Her mum için haftalık alış / satış skorları (0-5, 0.5 kısmi puan dahil)
+
+    MACD kesişimi bir önceki mumla karşılaştırılır. Gerekli alanlardan biri
+    NaN olan mumların skoru 0'dır.
+
+    Returns:
+        (buy_score, sell_score): float64 dizileri
+    """
+    close = _column(data, 'close')
+    rsi = _column(data, 'rsi')
+    macd = _column(data, 'macd')
+    macd_signal = _column(data, 'macd_signal')
+    ema_20 = _column(data, 'ema_20')
+    ema_50 = _column(data, 'ema_50')
+    volume = _column(data, 'volume')
+    volume_ma = _column(data, 'volume_ma')
+    bb_low = _column(data, 'bb_low')
+    bb_range = _column(data, 'bb_high') - bb_low
+
+    prev_macd = _shift(macd)
+    prev_signal = _shift(macd_signal)
+    has_prev = ~np.isnan(prev_macd) & ~np.isnan(prev_signal)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        position = (close - bb_low) / bb_range
+        ema_close = (np.abs(ema_20 - ema_50) / ema_50 < 0.01) & (ema_50 > 0)
+        high_volume = (volume_ma > 0) & (volume > volume_ma * volume_multiplier)
+
+    bullish = macd > macd_signal
+    bearish = macd < macd_signal
+    bull_cross = bullish & (prev_macd <= prev_signal)
+    bear_cross = bearish & (prev_macd >= prev_signal)
+
+    buy_score = (
+        (rsi < rsi_buy).astype(np.float64)
+        + ((bb_range > 0) & (position < 0.2))
+        + has_prev * np.where(bull_cross, 1.0, np.where(bullish, 0.5, 0.0))
+        + np.where(ema_20 > ema_50, 1.0, np.where(ema_close, 0.5, 0.0))
+        + high_volume
+    )
+    sell_score = (
+        (rsi > rsi_sell).astype(np.float64)
+        + ((bb_range > 0) & (position > 0.8))
+        + has_prev * np.where(bear_cross, 1.0, np.where(bearish, 0.5, 0.0))
+        + np.where(ema_20 < ema_50, 1.0, np.where(ema_close, 0.5, 0.0))
+        + high_volume
+    )
+
+    missing = np.zeros(len(close), dtype=bool)
+    for field in WEEKLY_REQUIRED_FIELDS:
+        missing |= np.isnan(_column(data, field))
+    buy_score[missing] = 0.0
+    sell_score[missing] = 0.0
+    return buy_score, sell_score
+
+
+def weekly_signals(buy_score, sell_score, min_score=4):
+    """Skorlardan sinyal dizisi; ikisi de eşiği geçerse yüksek olan kazanır (eşitlikte sinyal yok)"""
+    buy_ok = buy_score >= min_score
+    sell_ok = sell_score >= min_score
+    buy = buy_ok & (~sell_ok | (buy_score > sell_score))
+    sell = sell_ok & (~buy_ok | (sell_score > buy_score))
+    return np.where(buy, BUY, np.where(sell, SELL, 0))
+
+
+def weekly_reasons(latest, prev, signal, rsi_buy=35, rsi_sell=65, volume_multiplier=1.2):
+    """Tek mum için haftalık sinyal sebeplerini metin olarak üret (sadece sinyal oluştuğunda)"""
+    reasons = []
+    bb_range = latest['bb_high'] - latest['bb_low']
+    position = (latest['close'] - latest['bb_low']) / bb_range if bb_range > 0 else None
+    has_prev = not np.isnan(prev['macd']) and not np.isnan(prev['macd_signal'])
+    ema_close = (latest['ema_50'] > 0 and
+                 abs(latest['ema_20'] - latest['ema_50']) / latest['ema_50'] < 0.01)
+    high_volume = latest['volume_ma'] > 0 and latest['volume'] > latest['volume_ma'] * volume_multiplier
+
+    if signal == 'BUY':
+        if latest['rsi'] < rsi_buy:
+            reasons.append(f"✓ RSI aşırı satım: {latest['rsi']:.1f}")
+        if position is not None and position < 0.2:
+            reasons.append("✓ Fiyat BB alt bandına yakın")
+        if has_prev:
+            if latest['macd'] > latest['macd_signal'] and prev['macd'] <= prev['macd_signal']:
+                reasons.append("✓ MACD bullish crossover")
+            elif latest['macd'] > latest['macd_signal']:
+                reasons.append("✓ MACD bullish")
+        if latest['ema_20'] > latest['ema_50']:
+            reasons.append("✓ EMA trend yukarı")
+        elif ema_close:
+            reasons.append("✓ EMA'lar yakın (potansiyel golden cross)")
+    else:
+        if latest['rsi'] > rsi_sell:
+            reasons.append(f"✓ RSI aşırı alım: {latest['rsi']:.1f}")
+        if position is not None and position > 0.8:
+            reasons.append("✓ Fiyat BB üst bandına yakın")
+        if has_prev:
+            if latest['macd'] < latest['macd_signal'] and prev['macd'] >= prev['macd_signal']:
+                reasons.append("✓ MACD bearish crossover")
+            elif latest['macd'] < latest['macd_signal']:
+                reasons.append("✓ MACD bearish")
+        if latest['ema_20'] < latest['ema_50']:
+            reasons.append("✓ EMA trend aşağı")
+        elif ema_close:
+            reasons.append("✓ EMA'lar yakın (potansiyel death cross)")
+
+    if high_volume:
+        reasons.append(f"✓ Hacim yüksek: {latest['volume']/latest['volume_ma']:.2f}x")
+    return reasons
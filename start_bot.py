@@ -4,6 +4,7 @@ Hızlı Başlangıç Scripti
 Bot'u kolayca başlatmak için
 """
 
+import importlib.util
 import os
 import sys
 
@@ -44,10 +45,9 @@ def check_dependencies():
     required = ['ccxt', 'pandas', 'numpy', 'requests', 'ta']
     missing = []
     
+    # Paketler sadece bulunur, içe aktarılmaz (bot zaten ihtiyaç duyduğunda yükler)
     for package in required:
-        try:
-            __import__(package)
-        except ImportError:
+        if importlib.util.find_spec(package) is None:
             missing.append(package)
     
     if missing:
@@ -85,7 +85,8 @@ def main():
     
     # Botu import et ve çalıştır
     try:
-        from bitcoin_weekly_bot import BitcoinWeeklyBot
+        from bitcoin_weekly_bot import BitcoinWeeklyBot, setup_logging
+        setup_logging()
         
         # Dosyadan token ve chat ID'yi oku
         with open('bitcoin_weekly_bot.py', 'r', encoding='utf-8') as f:
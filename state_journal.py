@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çökmeye Dayanıklı Durum Günlüğü
+Bot durumunu (pozisyon, sayaçlar, son sinyal zamanı) yeniden başlatmalarda korur
+
+- Her değişiklik sadece değişen alanları içeren bir kayıt olarak journal.log
+  dosyasının sonuna eklenir (append-only); kayıt satırı CRC32 ile korunur
+- Yazma ve fsync arka plan iş parçacığında toplu yapılır (group commit),
+  record() bot döngüsünü bekletmez
+- Belirli sayıda kayıttan sonra tüm durum snapshot.json dosyasına atomik
+  yazılır ve günlük sıfırlanır
+- Açılışta snapshot + günlük tekrar oynatılır; çökme anında yarım kalmış son
+  kayıt (CRC tutmayan / satır sonu olmayan) atılır ve dosya kesilir
+
+Dosya düzeni:
+  data/state/daily/snapshot.json   {"seq": 120, "state": {...}}
+  data/state/daily/journal.log     <crc32 hex> {"seq": 121, "state": {...}}\\n
+"""
+
+import json
+import logging
+import os
+import threading
+import zlib
+from datetime import date, datetime
+
+STATE_DIR = os.path.join('data', 'state')
+FLUSH_INTERVAL = 0.05  # Kayıtların tek fsync'te toplanması için bekleme (saniye)
+SNAPSHOT_EVERY = 1000  # Bu kadar kayıttan sonra snapshot alınır
+
+
+def _encode(value):
+    """datetime / date değerlerini JSON'a uygun etiketli sözlüğe çevir"""
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if '$datetime' in value:
+            return datetime.fromisoformat(value['$datetime'])
+        if '$date' in value:
+            return date.fromisoformat(value['$date'])
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+def _frame(record):
+    payload = json.dumps(record, separators=(',', ':'))
+    return f"{zlib.crc32(payload.encode()):08x} {payload}\n".encode()
+
+
+def _parse(line):
+    """Tek satırı çöz; bozuk / yarım satırda None döner"""
+    try:
+        crc, payload = line.split(b' ', 1)
+        if int(crc, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _fsync_dir(directory):
+    """Dosya adı değişikliğini (os.replace) kalıcı yap - desteklenmeyen sistemlerde atlanır"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class StateJournal:
+    def __init__(self, directory, flush_interval=FLUSH_INTERVAL, snapshot_every=SNAPSHOT_EVERY):
+        """
+        Args:
+            directory: Snapshot ve günlük dosyalarının klasörü (ör. data/state/daily)
+            flush_interval: Kayıtları toplu yazmak için bekleme süresi (saniye)
+            snapshot_every: Bu kadar kayıttan sonra günlük snapshot'a sıkıştırılır
+        """
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, 'snapshot.json')
+        self.journal_path = os.path.join(directory, 'journal.log')
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+
+        self.state = {}  # Kodlanmış (JSON uyumlu) son durum
+        self.seq = 0  # Son kaydın sıra numarası
+        self.durable_seq = 0  # Diske fsync ile yazılmış son kayıt
+        self.stats = {'records': 0, 'fsyncs': 0, 'snapshots': 0, 'dropped_bytes': 0}
+
+        self._pending = []
+        self._since_snapshot = 0
+        self._snapshot_requested = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._worker = None
+
+    # ------------------------------------------------------------------
+    # Açılış
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """
+        Snapshot'ı oku ve günlüğü üzerine uygula
+
+        Returns:
+            dict: Geri yüklenen durum (datetime / date değerleri çözülmüş)
+        """
+        state, seq = {}, 0
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            state, seq = snapshot['state'], snapshot['seq']
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError) as e:
+            logging.warning(f"⚠️ Durum snapshot'ı okunamadı, sadece günlük kullanılacak: {e}")
+
+        records = 0
+        try:
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+
+        good = 0  # Son sağlam kaydın bittiği konum
+        while True:
+            end = data.find(b'\n', good)
+            if end < 0:
+                break  # Satır sonu yok: yarım kalmış kayıt
+            record = _parse(data[good:end])
+            if record is None:
+                break
+            if record['seq'] > seq:
+                state.update(record['state'])
+                seq = record['seq']
+                records += 1
+            good = end + 1
+
+        if good < len(data):
+            dropped = len(data) - good
+            self.stats['dropped_bytes'] += dropped
+            logging.warning(f"⚠️ Durum günlüğünün sonundaki {dropped} bayt bozuk/yarım, atıldı")
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+
+        with self._condition:
+            self.state = state
+            self.seq = self.durable_seq = seq
+            self._since_snapshot = records
+        return _decode(state)
+
+    # ------------------------------------------------------------------
+    # Yazma (bot döngüsü)
+    # ------------------------------------------------------------------
+
+    def record(self, changes):
+        """
+        Değişen alanları günlüğe ekle (bloklamaz, yazma arka planda)
+
+        Args:
+            changes: {alan: değer} - datetime / date desteklenir
+
+        Returns:
+            int: Kaydın sıra numarası (flush ile beklenebilir)
+        """
+        if not changes:
+            return self.seq
+        encoded = _encode(changes)
+        with self._condition:
+            self.seq += 1
+            self._pending.append(_frame({'seq': self.seq, 'state': encoded}))
+            self.state.update(encoded)
+            self._since_snapshot += 1
+            self.stats['records'] += 1
+            self._ensure_worker()
+            self._condition.notify_all()
+            return self.seq
+
+    def changes(self, state):
+        """`state` içinde son kayıtlı durumdan farklı olan alanlar"""
+        encoded = _encode(state)
+        with self._condition:
+            return {key: state[key] for key, value in encoded.items()
+                    if key not in self.state or self.state[key] != value}
+
+    def flush(self, timeout=5):
+        """Bekleyen kayıtlar diske yazılana kadar bekle"""
+        with self._condition:
+            target = self.seq
+            if self._worker is None:
+                return self.durable_seq >= target
+            return self._condition.wait_for(lambda: self.durable_seq >= target, timeout)
+
+    def snapshot(self):
+        """Bir sonraki yazma turunda snapshot alınmasını iste"""
+        with self._condition:
+            self._snapshot_requested = True
+            self._ensure_worker()
+            self._condition.notify_all()
+
+    def close(self, timeout=5):
+        """Bekleyen kayıtları yaz, snapshot al ve iş parçacığını durdur"""
+        with self._condition:
+            worker = self._worker
+            if worker is None:
+                return
+            self._stopping = True
+            self._snapshot_requested = True
+            self._condition.notify_all()
+        worker.join(timeout)
+        with self._condition:
+            self._worker = None
+            self._stopping = False
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='state-journal', daemon=True)
+            self._worker.start()
+
+    # ------------------------------------------------------------------
+    # Yazıcı (arka plan)
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.journal_path, 'ab') as journal:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._pending or self._snapshot_requested or self._stopping)
+                    stopping = self._stopping
+                    if not stopping and self.flush_interval > 0:
+                        # Kısa süre bekle, yakın zamanlı kayıtlar aynı fsync'e girsin
+                        self._condition.wait(self.flush_interval)
+                    batch, self._pending = self._pending, []
+                    seq = self.seq
+                    compact = self._snapshot_requested or self._since_snapshot >= self.snapshot_every
+                    state = dict(self.state) if compact else None
+                    if compact:
+                        self._snapshot_requested = False
+                        self._since_snapshot = 0
+
+                written = True
+                try:
+                    if batch:
+                        journal.write(b''.join(batch))
+                        journal.flush()
+                        os.fsync(journal.fileno())
+                        self.stats['fsyncs'] += 1
+                    if compact:
+                        self._write_snapshot(state, seq)
+                        # Snapshot'taki kayıtlar artık gereksiz
+                        journal.truncate(0)
+                        journal.flush()
+                        os.fsync(journal.fileno())
+                        self.stats['snapshots'] += 1
+                except OSError as e:
+                    logging.error(f"❌ Durum günlüğü yazılamadı: {e}")
+                    written = False
+
+                with self._condition:
+                    if written:
+                        self.durable_seq = max(self.durable_seq, seq)
+                    else:
+                        # Bellekteki durum eksiksiz: sonraki turda snapshot olarak yazılır
+                        self._snapshot_requested = True
+                    self._condition.notify_all()
+                    if stopping and not self._pending:
+                        return
+
+    def _write_snapshot(self, state, seq):
+        tmp = f'{self.snapshot_path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'seq': seq, 'state': state}, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        _fsync_dir(self.directory)
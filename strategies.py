@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Strateji Eklentileri
+Her strateji ihtiyaç duyduğu indikatörleri bildirir (indicator_columns parametreleri)
+ve ortak IndicatorFrame'in kendi kolon adlarıyla okunan görünümünden sinyal üretir.
+Strateji veri çekmez, indikatör hesaplamaz; aynı mum serisindeki tüm stratejiler
+tek bir çerçeveyi paylaşır (bkz. strategy_runner).
+
+Yeni strateji: Strategy'den türet, `indicators` ve evaluate() tanımla, STRATEGIES'e ekle.
+"""
+
+import logging
+
+import numpy as np
+
+from signal_scoring import (WEEKLY_REQUIRED_FIELDS, daily_reasons, daily_scores, weekly_reasons,
+                            weekly_scores)
+
+# Günlük bot (15m, 7 indikatör) varsayılanları
+DAILY_INDICATORS = {
+    'rsi': 9,
+    'ema': {'ema_short': 9, 'ema_medium': 21, 'ema_long': 50},
+    'macd': (8, 17, 9),
+    'bollinger': (20, 2),
+    'stochastic': (14, 3),
+    'atr': 14,
+    'volume_ma': 20,
+    'vwap': 0,
+}
+
+# Haftalık bot (1h, 5 indikatör) varsayılanları
+WEEKLY_INDICATORS = {
+    'rsi': 14,
+    'ema': {'ema_20': 20, 'ema_50': 50},
+    'macd': (12, 26, 9),
+    'bollinger': (20, 2),
+    'atr': 14,
+    'volume_ma': 20,
+}
+
+
+class Strategy:
+    """
+    Strateji arayüzü
+
+    evaluate() kapanmış son mumu (data[-1]) değerlendirir ve
+    (sinyal, skor, sebepler) döndürür; sinyal 'BUY', 'SELL' veya None.
+    """
+
+    kind = None
+    indicators = {}
+    min_bars = 2
+    warm_up = False  # True: indikatörleri hesaplanmamış ilk mumlar verilmez
+
+    def __init__(self, name=None, symbol='BTC/USDT', timeframe='15m', indicators=None, **params):
+        self.name = name or self.kind
+        self.symbol = symbol
+        self.timeframe = timeframe
+        if indicators is not None:
+            self.indicators = indicators
+        self.params = params
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, {self.symbol}, {self.timeframe})"
+
+    def evaluate(self, data):
+        raise NotImplementedError
+
+
+class DailyStrategy(Strategy):
+    """Günlük bot: 7 koşul, minimum skor (varsayılan 5/7) - alış önceliklidir"""
+
+    kind = 'daily'
+    indicators = DAILY_INDICATORS
+    min_bars = 100
+
+    def __init__(self, name=None, symbol='BTC/USDT', timeframe='15m', indicators=None,
+                 rsi_oversold=25, rsi_overbought=75, volume_multiplier=1.3, min_score=5):
+        super().__init__(name, symbol, timeframe, indicators)
+        self.thresholds = dict(rsi_oversold=rsi_oversold, rsi_overbought=rsi_overbought,
+                               volume_multiplier=volume_multiplier)
+        self.min_score = min_score
+        self.params = dict(self.thresholds, min_score=min_score)
+
+    def evaluate(self, data):
+        if data is None or len(data) < self.min_bars:
+            return None, 0, None
+
+        # Skorlar vektörize hesaplanır, sadece son mum okunur
+        buy_scores, sell_scores = daily_scores(data[-1:], **self.thresholds)
+        buy_score = int(buy_scores[-1])
+        sell_score = int(sell_scores[-1])
+
+        signal = None
+        score = 0
+        if buy_score >= self.min_score:
+            signal, score = 'BUY', buy_score
+        elif sell_score >= self.min_score:
+            signal, score = 'SELL', sell_score
+
+        if buy_score >= 4 or sell_score >= 4:
+            logging.debug(f"📊 {self.name} BUY: {buy_score}/7 | SELL: {sell_score}/7")
+
+        if not signal:
+            return None, 0, None
+
+        # Sebep metinleri sadece sinyal oluştuğunda üretilir
+        return signal, score, daily_reasons(data[-1], signal, **self.thresholds)
+
+
+class WeeklyStrategy(Strategy):
+    """Haftalık bot: 5 koşul (0.5 kısmi puan), minimum skor 4 - ikisi geçerse yüksek olan"""
+
+    kind = 'weekly'
+    indicators = WEEKLY_INDICATORS
+    warm_up = True
+
+    def __init__(self, name=None, symbol='BTC/USDT', timeframe='1h', indicators=None,
+                 rsi_buy=35, rsi_sell=65, volume_multiplier=1.2, min_score=4):
+        super().__init__(name, symbol, timeframe, indicators)
+        self.thresholds = dict(rsi_buy=rsi_buy, rsi_sell=rsi_sell, volume_multiplier=volume_multiplier)
+        self.min_score = min_score
+        self.params = dict(self.thresholds, min_score=min_score)
+
+    def evaluate(self, data):
+        if data is None or len(data) < self.min_bars:
+            return None, 0, []
+
+        latest = data[-1]
+        for field in WEEKLY_REQUIRED_FIELDS:
+            if np.isnan(latest[field]):
+                logging.warning(f"{self.name}: {field} değeri NaN, sinyal üretilemiyor")
+                return None, 0, []
+
+        # MACD kesişimi için son iki mum
+        buy_scores, sell_scores = weekly_scores(data[-2:], **self.thresholds)
+        buy_score = float(buy_scores[-1])
+        sell_score = float(sell_scores[-1])
+
+        signal = None
+        score = 0
+        if buy_score >= self.min_score and sell_score >= self.min_score:
+            if buy_score > sell_score:
+                signal, score = 'BUY', buy_score
+            elif sell_score > buy_score:
+                signal, score = 'SELL', sell_score
+        elif buy_score >= self.min_score:
+            signal, score = 'BUY', buy_score
+        elif sell_score >= self.min_score:
+            signal, score = 'SELL', sell_score
+
+        if not signal:
+            return None, 0, []
+        return signal, score, weekly_reasons(latest, data[-2], signal, **self.thresholds)
+
+
+STRATEGIES = {cls.kind: cls for cls in (DailyStrategy, WeeklyStrategy)}
+
+
+def from_config(config):
+    """
+    Yapılandırmadan strateji oluştur
+
+    Örnek: {"name": "daily-agresif", "kind": "daily", "timeframe": "15m", "min_score": 4}
+    """
+    config = dict(config)
+    kind = config.pop('kind')
+    if kind not in STRATEGIES:
+        raise ValueError(f"Bilinmeyen strateji türü: {kind} ({', '.join(STRATEGIES)})")
+    return STRATEGIES[kind](**config)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Strateji Çalıştırıcı
+Tek süreçte, tek olay döngüsünde çok sayıda strateji örneği çalıştırır
+
+- Stratejiler (sembol, timeframe) beslemelerine gruplanır: her besleme için tek
+  CandleStore ve tek IndicatorFrame - birden çok stratejinin ihtiyaç duyduğu
+  indikatör mum başına bir kez hesaplanır
+- Mumlar veri merkezinden (market_hub), WebSocket akışından veya REST ile gelir
+- Her mum kapanışında beslemenin tüm stratejileri aynı çerçeveyi değerlendirir,
+  sinyaller geri çağrılara (log, defter) iletilir
+- Pozisyon ve limit yönetimi botlarda kalır; çalıştırıcı sinyal üretir
+
+Yapılandırma (JSON listesi, bkz. strategies.from_config):
+  [{"name": "daily-7", "kind": "daily"},
+   {"name": "daily-4", "kind": "daily", "min_score": 4},
+   {"name": "weekly-5", "kind": "weekly", "timeframe": "1h", "rsi_buy": 30}]
+
+Kullanım:
+  python strategy_runner.py [--config strategies.json] [--hub 127.0.0.1:8765] [--once]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+import kline_stream
+import market_hub
+from candle_store import CandleStore
+from scheduler import CandleScheduler, ServerClock, closed_frame
+from strategies import from_config
+from streaming_indicators import IndicatorFrame
+
+DEFAULT_STRATEGIES = [
+    {'name': 'daily-7', 'kind': 'daily', 'timeframe': '15m'},
+    {'name': 'weekly-5', 'kind': 'weekly', 'timeframe': '1h'},
+]
+RUNNER_WINDOW = 200  # Besleme başına bellekte tutulan mum sayısı
+CANDLE_CLOSE_DELAY_MS = 300  # Mum kapanışından sonra uyanma gecikmesi
+RETRY_DELAY = 1.0  # Kapanan mum henüz hazır değilse tekrar deneme aralığı (saniye)
+
+
+class Feed:
+    """Aynı (sembol, timeframe) üzerindeki stratejilerin ortak mum deposu ve indikatör çerçevesi"""
+
+    def __init__(self, symbol, timeframe, window=RUNNER_WINDOW):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.store = CandleStore(symbol, timeframe, window=window)
+        self.frame = IndicatorFrame(history=window)
+        self.strategies = []
+        self.last_closed_bar = None
+
+    def add(self, strategy):
+        self.frame.register(strategy.name, strategy.indicators)
+        self.strategies.append(strategy)
+
+    def evaluate(self, candles):
+        """
+        Kapanmış mumları çerçeveye bir kez işle ve tüm stratejileri değerlendir
+
+        Returns:
+            list: (strateji, sinyal, skor, sebepler, son_mum) - sadece sinyal üretenler
+        """
+        records = self.frame.update_candles(candles)
+        results = []
+        for strategy in self.strategies:
+            data = self.frame.select(records, strategy.name)
+            if strategy.warm_up:
+                data = self.frame.warmed_up(data, strategy.name)
+            try:
+                signal, score, reasons = strategy.evaluate(data)
+            except Exception as e:
+                logging.error(f"❌ {strategy.name} değerlendirilemedi: {e}")
+                continue
+            if signal:
+                results.append((strategy, signal, score, reasons, data[-1]))
+        return results
+
+
+class StrategyRunner:
+    def __init__(self, exchange, strategies=(), window=RUNNER_WINDOW, hub=None, stream=True,
+                 ledger=None, delay_ms=CANDLE_CLOSE_DELAY_MS, clock=None):
+        """
+        Args:
+            exchange: REST borsa nesnesi (rate_limiter ile sarılması önerilir)
+            strategies: Strateji örnekleri
+            window: Besleme başına tutulan mum sayısı
+            hub: Veri merkezi adresi (host, port) - verilirse mumlar market_hub'dan gelir
+            stream: Merkez yoksa websockets kuruluysa WebSocket kline akışı
+            ledger: TradeLedger - verilirse sinyaller deftere yazılır
+        """
+        self.exchange = exchange
+        self.window = window
+        self.hub = hub
+        self.stream = stream
+        self.ledger = ledger
+        self.delay_ms = delay_ms
+        self.clock = clock or ServerClock(exchange)
+        self.feeds = {}  # (sembol, timeframe) -> Feed
+        self.signal_callbacks = [self._log_signal]  # fn(strateji, sinyal, skor, sebepler, son_mum)
+        if ledger is not None:
+            self.signal_callbacks.append(self._record_signal)
+        self.streams = []
+        self._stopping = None
+        for strategy in strategies:
+            self.add(strategy)
+
+    @property
+    def strategies(self):
+        return [strategy for feed in self.feeds.values() for strategy in feed.strategies]
+
+    def add(self, strategy):
+        """Strateji örneği ekle - aynı (sembol, timeframe) beslemesini paylaşır"""
+        if any(other.name == strategy.name for other in self.strategies):
+            raise ValueError(f"Aynı isimli strateji zaten var: {strategy.name}")
+        key = (strategy.symbol, strategy.timeframe)
+        if key not in self.feeds:
+            self.feeds[key] = Feed(*key, window=self.window)
+        self.feeds[key].add(strategy)
+        return strategy
+
+    # ------------------------------------------------------------------
+    # Sinyaller
+    # ------------------------------------------------------------------
+
+    def _log_signal(self, strategy, signal, score, reasons, row):
+        logging.info(f"🎯 {strategy.name} ({strategy.symbol} {strategy.timeframe}): {signal} "
+                     f"skor {score} @ ${float(row['close']):,.2f} | {', '.join(reasons)}")
+
+    def _record_signal(self, strategy, signal, score, reasons, row):
+        self.ledger.record_signal(strategy.name, strategy.symbol, int(row['timestamp']), signal,
+                                  score, float(row['close']), reasons, acted=False)
+
+    def on_bar(self, feed, closed_bar):
+        """
+        Kapanan mumu beslemenin stratejilerine değerlendir
+
+        Returns:
+            bool: Borsada yeni mum henüz yoksa False (tekrar denenir)
+        """
+        candles = closed_frame(feed.store.view(), closed_bar)
+        if candles is None:
+            return False
+        feed.last_closed_bar = closed_bar
+        for result in feed.evaluate(candles):
+            for callback in self.signal_callbacks:
+                try:
+                    callback(*result)
+                except Exception as e:
+                    logging.error(f"❌ Sinyal geri çağrısı hatası: {e}")
+        return True
+
+    # ------------------------------------------------------------------
+    # Olay döngüsü
+    # ------------------------------------------------------------------
+
+    def _attach_streams(self):
+        """Sembol başına tek abonelik: tüm timeframe'ler aynı bağlantıdan"""
+        symbols = {}
+        for feed in self.feeds.values():
+            symbols.setdefault(feed.symbol, []).append(feed.store)
+        for stores in symbols.values():
+            if self.hub:
+                client = market_hub.attach(stores, self.hub)
+            elif self.stream:
+                client = kline_stream.attach(stores, self.exchange, book_ticker=False)
+            else:
+                client = None
+            if client is not None:
+                self.streams.append(client)
+
+    async def _run_feed(self, feed, once=False):
+        loop = asyncio.get_running_loop()
+        timeframe_ms = self.exchange.parse_timeframe(feed.timeframe) * 1000
+        scheduler = CandleScheduler(timeframe_ms, self.clock, delay_ms=self.delay_ms)
+
+        while not self._stopping.is_set():
+            now = await loop.run_in_executor(None, self.clock.now_ms)
+            bar = scheduler.latest_closed_bar(now)
+
+            if feed.last_closed_bar is None or bar > feed.last_closed_bar:
+                try:
+                    # Akış / merkez bağlıyken istek yapılmaz
+                    await loop.run_in_executor(None, feed.store.update, self.exchange)
+                    ready = self.on_bar(feed, bar)
+                except Exception as e:
+                    logging.warning(f"⚠️ {feed.symbol} {feed.timeframe} güncellenemedi: {e}")
+                    ready = False
+                if ready and once:
+                    return
+                if not ready:
+                    await asyncio.sleep(RETRY_DELAY)
+                continue
+
+            wait = max(bar + 2 * timeframe_ms + self.delay_ms - now, 0) / 1000
+            try:
+                await asyncio.wait_for(self._stopping.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, once=False):
+        """Tüm beslemeleri aynı olay döngüsünde çalıştır (once: her beslemeyi bir kez değerlendir)"""
+        self._stopping = asyncio.Event()
+        if not once:
+            self._attach_streams()
+        logging.info(f"🚀 {len(self.strategies)} strateji, {len(self.feeds)} besleme: "
+                     + ', '.join(f"{s}/{t} [{', '.join(x.name for x in f.strategies)}] "
+                                 f"{len(f.frame.components)} indikatör"
+                                 for (s, t), f in self.feeds.items()))
+        try:
+            await asyncio.gather(*(self._run_feed(feed, once) for feed in self.feeds.values()))
+        finally:
+            for client in self.streams:
+                client.stop()
+            self.streams = []
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
+
+
+def load_strategies(path=None):
+    """JSON yapılandırmasından strateji örnekleri (yoksa varsayılan günlük + haftalık)"""
+    if path is None:
+        return [from_config(config) for config in DEFAULT_STRATEGIES]
+    with open(path, encoding='utf-8') as f:
+        return [from_config(config) for config in json.load(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çoklu strateji çalıştırıcı")
+    parser.add_argument('--config', help="Strateji yapılandırması (JSON listesi)")
+    parser.add_argument('--hub', help="Veri merkezi adresi (host:port)")
+    parser.add_argument('--no-stream', action='store_true', help="WebSocket yerine REST")
+    parser.add_argument('--ledger', help="Sinyallerin yazılacağı SQLite defteri")
+    parser.add_argument('--window', type=int, default=RUNNER_WINDOW)
+    parser.add_argument('--once', action='store_true', help="Son kapanan mumu değerlendir ve çık")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger('websockets').setLevel(logging.WARNING)
+    try:
+        strategies = load_strategies(args.config)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"✗ Strateji yapılandırması okunamadı: {e}")
+        return 1
+
+    import lazy_ccxt
+    import rate_limiter
+    exchange = rate_limiter.attach(lazy_ccxt.binance({'enableRateLimit': True}))
+    ledger = None
+    if args.ledger:
+        from trade_ledger import TradeLedger
+        ledger = TradeLedger(args.ledger)
+    hub = None
+    if args.hub:
+        host, port = args.hub.rsplit(':', 1)
+        hub = (host, int(port))
+
+    runner = StrategyRunner(exchange, strategies, window=args.window, hub=hub,
+                            stream=not args.no_stream, ledger=ledger)
+    try:
+        asyncio.run(runner.run(once=args.once))
+    except KeyboardInterrupt:
+        logging.info("👋 Strateji çalıştırıcı durduruldu")
+    finally:
+        if ledger is not None:
+            ledger.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Akışkan (Streaming) İndikatör Motoru
+Her indikatör kendi durumunu tutar, yeni mum eklemek O(1) maliyetlidir
+Oluşmakta olan son mum geri alınıp (rollback) yeniden uygulanabilir
+Sonuçlar `ta` kütüphanesi ile aynı formülleri kullanır
+Mumlar ve indikatör değerleri önceden ayrılmış yapılandırılmış dizide tutulur;
+update_candles kopyasız görünüm döndürür
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+from candle_store import CANDLE_DTYPE, RecordBuffer
+
+NAN = float('nan')
+_EMPTY = object()
+
+HOUR_MS = 3_600_000
+DAY_MS = 86_400_000
+
+
+class StreamingEMA:
+    """Üssel hareketli ortalama (ta: ewm(span=window, adjust=False))"""
+
+    def __init__(self, window, alpha=None):
+        self.window = window
+        self.alpha = alpha if alpha is not None else 2.0 / (window + 1)
+        self.value = None
+        self.count = 0
+        self._undo = None
+
+    def update(self, x):
+        self._undo = (self.value, self.count)
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        self.count += 1
+        return self.current()
+
+    def rollback(self):
+        self.value, self.count = self._undo
+
+    def current(self):
+        return self.value if self.count >= self.window else NAN
+
+
+class RollingWindow:
+    """Sabit pencerede toplam ve kareler toplamı (ortalama / std için)"""
+
+    RESYNC_EVERY = 1024  # Kayan nokta hatası birikmesin diye periyodik yeniden toplama
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nan_count = 0
+        self.pushes = 0
+        self.offset = None  # Büyük fiyatlarda iptal hatasını azaltmak için kaydırma
+        self._undo = None
+
+    def update(self, x):
+        evicted = _EMPTY
+        if len(self.values) == self.window:
+            evicted = self.values.popleft()
+        self._undo = (evicted, self.total, self.total_sq, self.nan_count, self.pushes, self.offset)
+
+        if self.offset is None and not math.isnan(x):
+            self.offset = x
+
+        if evicted is not _EMPTY:
+            self._remove(evicted)
+        self.values.append(x)
+        self._add(x)
+
+        self.pushes += 1
+        if self.pushes % self.RESYNC_EVERY == 0:
+            self._resync()
+
+    def rollback(self):
+        evicted, self.total, self.total_sq, self.nan_count, self.pushes, self.offset = self._undo
+        self.values.pop()
+        if evicted is not _EMPTY:
+            self.values.appendleft(evicted)
+
+    def _add(self, x):
+        if math.isnan(x):
+            self.nan_count += 1
+        else:
+            d = x - self.offset
+            self.total += d
+            self.total_sq += d * d
+
+    def _remove(self, x):
+        if math.isnan(x):
+            self.nan_count -= 1
+        else:
+            d = x - self.offset
+            self.total -= d
+            self.total_sq -= d * d
+
+    def _resync(self):
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nan_count = 0
+        for x in self.values:
+            self._add(x)
+
+    def ready(self):
+        return len(self.values) == self.window and self.nan_count == 0
+
+    def mean(self):
+        if not self.ready():
+            return NAN
+        return self.offset + self.total / self.window
+
+    def std(self):
+        """Popülasyon standart sapması (ddof=0)"""
+        if not self.ready():
+            return NAN
+        m = self.total / self.window
+        return math.sqrt(max(self.total_sq / self.window - m * m, 0.0))
+
+
+class MonotonicExtreme:
+    """Monoton deque ile kayan pencere maksimum / minimum"""
+
+    def __init__(self, window, mode='max'):
+        self.window = window
+        self.is_max = mode == 'max'
+        self.items = deque()  # (index, value)
+        self.index = -1
+        self._undo = None
+
+    def update(self, x):
+        self.index += 1
+        popped_back = []
+        while self.items and (self.items[-1][1] <= x if self.is_max else self.items[-1][1] >= x):
+            popped_back.append(self.items.pop())
+        self.items.append((self.index, x))
+
+        popped_front = []
+        while self.items[0][0] <= self.index - self.window:
+            popped_front.append(self.items.popleft())
+
+        self._undo = (popped_back, popped_front)
+
+    def rollback(self):
+        popped_back, popped_front = self._undo
+        for item in reversed(popped_front):
+            self.items.appendleft(item)
+        self.items.pop()
+        for item in reversed(popped_back):
+            self.items.append(item)
+        self.index -= 1
+
+    def current(self):
+        if self.index < self.window - 1:
+            return NAN
+        return self.items[0][1]
+
+
+class StreamingRSI:
+    """RSI - Wilder yumuşatması (ta: ewm(alpha=1/window, adjust=False))"""
+
+    def __init__(self, window):
+        self.window = window
+        self.up = StreamingEMA(window, alpha=1.0 / window)
+        self.down = StreamingEMA(window, alpha=1.0 / window)
+        self.prev_close = None
+        self._undo = None
+
+    def update(self, close):
+        self._undo = self.prev_close
+        # İlk mumda fark yok, ta bunu 0 olarak sayar
+        diff = 0.0 if self.prev_close is None else close - self.prev_close
+        self.up.update(diff if diff > 0 else 0.0)
+        self.down.update(-diff if diff < 0 else 0.0)
+        self.prev_close = close
+        return self.current()
+
+    def rollback(self):
+        self.up.rollback()
+        self.down.rollback()
+        self.prev_close = self._undo
+
+    def current(self):
+        up = self.up.current()
+        down = self.down.current()
+        if math.isnan(down):
+            return NAN
+        if down == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + up / down)
+
+
+class StreamingMACD:
+    """MACD, sinyal ve histogram"""
+
+    def __init__(self, fast, slow, signal):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self._signal_updated = False
+        self._undo = None
+
+    def update(self, close):
+        self._undo = self._signal_updated
+        macd = self.fast.update(close) - self.slow.update(close)
+        # Sinyal EMA'sı ilk geçerli MACD değeriyle başlar
+        self._signal_updated = not math.isnan(macd)
+        if self._signal_updated:
+            self.signal.update(macd)
+
+    def rollback(self):
+        self.fast.rollback()
+        self.slow.rollback()
+        if self._signal_updated:
+            self.signal.rollback()
+        self._signal_updated = self._undo
+
+    def current(self):
+        macd = self.fast.current() - self.slow.current()
+        signal = self.signal.current()
+        return macd, signal, macd - signal
+
+
+class StreamingStochastic:
+    """Stochastic Oscillator %K ve %D"""
+
+    def __init__(self, window, smooth_window):
+        self.highest = MonotonicExtreme(window, 'max')
+        self.lowest = MonotonicExtreme(window, 'min')
+        self.d_window = RollingWindow(smooth_window)
+        self.k = NAN
+
+    def update(self, high, low, close):
+        self.highest.update(high)
+        self.lowest.update(low)
+        smax = self.highest.current()
+        smin = self.lowest.current()
+        if math.isnan(smax) or smax == smin:
+            self.k = NAN
+        else:
+            self.k = 100.0 * (close - smin) / (smax - smin)
+        self.d_window.update(self.k)
+
+    def rollback(self):
+        self.highest.rollback()
+        self.lowest.rollback()
+        self.d_window.rollback()
+        self.k = self.d_window.values[-1] if self.d_window.values else NAN
+
+    def current(self):
+        return self.k, self.d_window.mean()
+
+
+class StreamingATR:
+    """ATR (ta: ilk değer ilk `window` TR ortalaması, sonrası Wilder; öncesi 0)"""
+
+    def __init__(self, window=14):
+        self.window = window
+        self.prev_close = None
+        self.count = 0
+        self.tr_sum = 0.0
+        self.value = 0.0
+        self._undo = None
+
+    def update(self, high, low, close):
+        self._undo = (self.prev_close, self.count, self.tr_sum, self.value)
+        tr = high - low
+        if self.prev_close is not None:
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+
+        self.count += 1
+        if self.count < self.window:
+            self.tr_sum += tr
+        elif self.count == self.window:
+            self.value = (self.tr_sum + tr) / self.window
+        else:
+            self.value = (self.value * (self.window - 1) + tr) / self.window
+        self.prev_close = close
+
+    def rollback(self):
+        self.prev_close, self.count, self.tr_sum, self.value = self._undo
+
+    def current(self):
+        return self.value
+
+
+class SessionVWAP:
+    """
+    Seans VWAP - kümülatif (tipik fiyat × hacim) / hacim
+
+    Seans her gün `session_start_hour` (UTC) saatinde sıfırlanır.
+    """
+
+    def __init__(self, session_start_hour=0):
+        self.offset_ms = int(session_start_hour * HOUR_MS)
+        self.session = None
+        self.cum_pv = 0.0
+        self.cum_volume = 0.0
+        self._undo = None
+
+    def update(self, timestamp, high, low, close, volume):
+        self._undo = (self.session, self.cum_pv, self.cum_volume)
+        session = (timestamp - self.offset_ms) // DAY_MS
+        if session != self.session:
+            self.session = session
+            self.cum_pv = 0.0
+            self.cum_volume = 0.0
+        self.cum_pv += (high + low + close) / 3.0 * volume
+        self.cum_volume += volume
+
+    def rollback(self):
+        self.session, self.cum_pv, self.cum_volume = self._undo
+
+    def current(self):
+        return self.cum_pv / self.cum_volume if self.cum_volume else NAN
+
+
+# ----------------------------------------------------------------------------
+# İndikatör çerçevesi (bir veya birden çok strateji, tek hesap)
+# ----------------------------------------------------------------------------
+
+class _RSIColumn:
+    def __init__(self, window):
+        self.rsi = StreamingRSI(window)
+        self.names = ('rsi',)
+
+    def update(self, timestamp, high, low, close, volume):
+        self.rsi.update(close)
+
+    def rollback(self):
+        self.rsi.rollback()
+
+    def values(self, volume):
+        return (self.rsi.current(),)
+
+
+class _EMAColumn:
+    def __init__(self, window):
+        self.ema = StreamingEMA(window)
+        self.names = ('ema',)
+
+    def update(self, timestamp, high, low, close, volume):
+        self.ema.update(close)
+
+    def rollback(self):
+        self.ema.rollback()
+
+    def values(self, volume):
+        return (self.ema.current(),)
+
+
+class _MACDColumns:
+    def __init__(self, fast, slow, signal):
+        self.macd = StreamingMACD(fast, slow, signal)
+        self.names = ('macd', 'macd_signal', 'macd_diff')
+
+    def update(self, timestamp, high, low, close, volume):
+        self.macd.update(close)
+
+    def rollback(self):
+        self.macd.rollback()
+
+    def values(self, volume):
+        return self.macd.current()
+
+
+class _BollingerColumns:
+    def __init__(self, window, std):
+        self.bb = RollingWindow(window)
+        self.std = std
+        self.names = ('bb_high', 'bb_mid', 'bb_low')
+
+    def update(self, timestamp, high, low, close, volume):
+        self.bb.update(close)
+
+    def rollback(self):
+        self.bb.rollback()
+
+    def values(self, volume):
+        mid = self.bb.mean()
+        std = self.bb.std()
+        return mid + self.std * std, mid, mid - self.std * std
+
+
+class _StochasticColumns:
+    def __init__(self, window, smooth_window):
+        self.stoch = StreamingStochastic(window, smooth_window)
+        self.names = ('stoch_k', 'stoch_d')
+
+    def update(self, timestamp, high, low, close, volume):
+        self.stoch.update(high, low, close)
+
+    def rollback(self):
+        self.stoch.rollback()
+
+    def values(self, volume):
+        return self.stoch.current()
+
+
+class _ATRColumn:
+    def __init__(self, window):
+        self.atr = StreamingATR(window)
+        self.names = ('atr',)
+
+    def update(self, timestamp, high, low, close, volume):
+        self.atr.update(high, low, close)
+
+    def rollback(self):
+        self.atr.rollback()
+
+    def values(self, volume):
+        return (self.atr.current(),)
+
+
+class _VolumeColumns:
+    def __init__(self, window):
+        self.volume = RollingWindow(window)
+        self.names = ('volume_ma', 'volume_ratio')
+
+    def update(self, timestamp, high, low, close, volume):
+        self.volume.update(volume)
+
+    def rollback(self):
+        self.volume.rollback()
+
+    def values(self, volume):
+        volume_ma = self.volume.mean()
+        return volume_ma, volume / volume_ma if volume_ma else NAN
+
+
+class _VWAPColumn:
+    def __init__(self, session_start_hour):
+        self.vwap = SessionVWAP(session_start_hour)
+        self.names = ('vwap',)
+
+    def update(self, timestamp, high, low, close, volume):
+        self.vwap.update(timestamp, high, low, close, volume)
+
+    def rollback(self):
+        self.vwap.rollback()
+
+    def values(self, volume):
+        return (self.vwap.current(),)
+
+
+_COMPONENTS = {'rsi': _RSIColumn, 'ema': _EMAColumn, 'macd': _MACDColumns,
+               'bollinger': _BollingerColumns, 'stochastic': _StochasticColumns,
+               'atr': _ATRColumn, 'volume_ma': _VolumeColumns, 'vwap': _VWAPColumn}
+
+
+def indicator_columns(rsi=14, ema=None, macd=(12, 26, 9), bollinger=(20, 2), stochastic=None,
+                      atr=14, volume_ma=20, vwap=None):
+    """
+    İndikatör parametrelerini kolon tanımlarına çevir
+
+    Args:
+        rsi: RSI periyodu
+        ema: {kolon_adı: periyot} sözlüğü
+        macd: (hızlı, yavaş, sinyal)
+        bollinger: (periyot, std çarpanı)
+        stochastic: (%K penceresi, %D yumuşatma) veya None
+        atr: ATR periyodu
+        volume_ma: Hacim ortalaması periyodu
+        vwap: Seans VWAP başlangıç saati (UTC) veya None
+
+    Returns:
+        list: (kolon_adı, (bileşen, *parametreler), bileşen_çıktı_sırası)
+    """
+    columns = [('rsi', ('rsi', rsi), 0)]
+    columns += [(name, ('ema', window), 0) for name, window in (ema or {}).items()]
+    columns += [(name, ('macd', *macd), i) for i, name in enumerate(('macd', 'macd_signal', 'macd_diff'))]
+    columns += [(name, ('bollinger', *bollinger), i) for i, name in enumerate(('bb_high', 'bb_mid', 'bb_low'))]
+    if stochastic:
+        columns += [(name, ('stochastic', *stochastic), i) for i, name in enumerate(('stoch_k', 'stoch_d'))]
+    columns += [('volume_ma', ('volume_ma', volume_ma), 0), ('volume_ratio', ('volume_ma', volume_ma), 1),
+                ('atr', ('atr', atr), 0)]
+    if vwap is not None:
+        columns.append(('vwap', ('vwap', vwap), 0))
+    return columns
+
+
+class IndicatorFrame:
+    """
+    Mum bazlı akışkan indikatör çerçevesi (aynı mum serisini kullanan stratejiler için ortak)
+
+    Stratejiler ihtiyaç duydukları indikatörleri indicator_columns parametreleriyle
+    kaydeder (register). Aynı parametreli indikatör (ör. iki stratejinin RSI(14)'ü)
+    tek bir bileşenle mum başına bir kez hesaplanır. Her strateji ortak diziyi
+    kendi kolon adlarıyla kopyasız görünüm olarak okur (select).
+    """
+
+    def __init__(self, history=500):
+        self.history = history
+        self.components = {}  # (bileşen, *parametreler) -> akışkan bileşen
+        self.layouts = {}  # kayıt adı -> [(kolon_adı, ortak_kolon_adı)]
+        self._views = {}
+        self._build()
+
+    @staticmethod
+    def _field(key, index, names):
+        return '_'.join([names[index], *map(str, key[1:])])
+
+    def _build(self):
+        """Dizi düzenini kayıtlı bileşenlerden yeniden kur (durum sıfırlanır)"""
+        self.components = {key: _COMPONENTS[key[0]](*key[1:]) for key in self.components}
+        self.fields = [self._field(key, i, component.names)
+                       for key, component in self.components.items()
+                       for i in range(len(component.names))]
+        self.dtype = np.dtype(CANDLE_DTYPE.descr + [(name, np.float64) for name in self.fields])
+        self.buffer = RecordBuffer(self.dtype, self.history)
+        self.last_timestamp = None
+        self._views = {}
+
+    def register(self, name, indicators):
+        """
+        Strateji indikatörlerini kaydet
+
+        Args:
+            name: Kayıt adı (select ile okunur)
+            indicators: indicator_columns parametreleri ({'rsi': 14, 'ema': {...}, ...})
+
+        Returns:
+            list: Stratejinin indikatör kolon adları
+        """
+        columns = indicator_columns(**indicators)
+        new = [key for _, key, _ in columns if key not in self.components]
+        for key in new:
+            self.components[key] = _COMPONENTS[key[0]](*key[1:])
+        if new:
+            # Yeni bileşen: düzen değişir, sonraki update_candles tüm seriyi yeniden işler
+            self._build()
+        self.layouts[name] = [(column, self._field(key, index, self.components[key].names))
+                              for column, key, index in columns]
+        self._views.pop(name, None)
+        return [column for column, _ in self.layouts[name]]
+
+    def reset(self):
+        """Tüm durumu sıfırla (aynı kayıtlarla)"""
+        self._build()
+
+    def columns(self, name):
+        return [column for column, _ in self.layouts[name]]
+
+    def _view_dtype(self, name):
+        dtype = self._views.get(name)
+        if dtype is None:
+            fields = [(column, column) for column in CANDLE_DTYPE.names] + self.layouts[name]
+            dtype = np.dtype({'names': [column for column, _ in fields],
+                              'formats': [self.dtype.fields[field][0] for _, field in fields],
+                              'offsets': [self.dtype.fields[field][1] for _, field in fields],
+                              'itemsize': self.dtype.itemsize})
+            self._views[name] = dtype
+        return dtype
+
+    def select(self, records, name):
+        """Ortak kayıtları `name` stratejisinin kolon adlarıyla oku (kopyasız görünüm)"""
+        return records.view(self._view_dtype(name))
+
+    def update(self, timestamp, open_, high, low, close, volume):
+        """Tek bir mumu tüm bileşenlere işle (aynı zaman damgası: oluşan mum yeniden uygulanır)"""
+        replace = False
+        if self.last_timestamp is not None:
+            if timestamp == self.last_timestamp:
+                for component in self.components.values():
+                    component.rollback()
+                replace = True
+            elif timestamp < self.last_timestamp:
+                return
+
+        values = []
+        for component in self.components.values():
+            component.update(timestamp, high, low, close, volume)
+            values.extend(component.values(volume))
+
+        self.last_timestamp = timestamp
+        records = self.buffer.view()[-1:] if replace else self.buffer.push()
+        records[0] = (timestamp, open_, high, low, close, volume, *values)
+
+    def update_candles(self, candles):
+        """
+        Yapılandırılmış mum dizisindeki (CandleStore.view) yeni mumları işle
+
+        Sadece çerçevenin son mumundan itibaren olan satırlar işlenir (son mum
+        değişmemişse ondan sonrakiler). Çerçevenin son mumu verilen seride yoksa
+        (ör. pencere tamamen yeniden çekildi) çerçeve sıfırlanır ve tüm seri
+        baştan işlenir.
+
+        Returns:
+            Son len(candles) mumun ortak kayıtları (kopyasız görünüm, çerçeve geçmişi
+            daha kısaysa o kadar satır) - select ile stratejiye göre okunur
+        """
+        timestamps = candles['timestamp']
+        start = 0
+        if self.last_timestamp is not None:
+            start = int(np.searchsorted(timestamps, self.last_timestamp))
+            if start == len(timestamps) or timestamps[start] != self.last_timestamp:
+                self.reset()
+                start = 0
+            elif (tuple(self.buffer.view()[-1][list(CANDLE_DTYPE.names)])
+                  == tuple(candles[start][list(CANDLE_DTYPE.names)])):
+                # Son mum değişmemiş (kapanmış / aynı oluşan mum): yeniden uygulanmaz
+                start += 1
+        opens, highs, lows = candles['open'], candles['high'], candles['low']
+        closes, volumes = candles['close'], candles['volume']
+        for i in range(start, len(timestamps)):
+            self.update(int(timestamps[i]), float(opens[i]), float(highs[i]),
+                        float(lows[i]), float(closes[i]), float(volumes[i]))
+        records = self.buffer.view()
+        return records[len(records) - min(len(candles), len(records)):]
+
+    def warmed_up(self, data, name):
+        """`name` stratejisinin tüm kolonlarının hesaplandığı ilk satırdan itibaren görünüm"""
+        start = 0
+        for column in self.columns(name):
+            values = data[column][start:]
+            if len(values) == 0:
+                break
+            valid = ~np.isnan(values)
+            start += int(valid.argmax()) if valid.any() else len(values)
+        return data[start:]
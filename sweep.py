@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Paralel Parametre Taraması
+Strateji sabitlerinin binlerce kombinasyonunu tüm çekirdeklerde değerlendirir
+
+- Mumlar bir kez paylaşımlı belleğe (shared memory) yüklenir, işçiler kopyalamaz
+- İndikatör kolonları benzersiz indikatör parametresi başına bir kez hesaplanır;
+  sadece eşiklerde farklı olan kombinasyonlar aynı kolonları kullanır
+- Her görev sonucu ayrı parça dosyasına yazılır; yarıda kalan tarama aynı
+  çıktı klasörüyle tekrar çalıştırılınca biten görevleri atlar
+- Sonuçlar toplam net kara göre sıralanıp kolonsal dosyaya yazılır
+  (pyarrow kuruluysa parquet, değilse kolon başına dizi içeren .npz)
+- İndikatör kolonları ve kombinasyon sonuçları içerik adresli disk önbelleğine
+  yazılır (result_cache): aynı veriyle tekrarlanan taramalar hesaplamayı atlar
+- --minutes ile 1m mumlar verilirse kar hedefi / stop mum içi high / low ile
+  değerlendirilir (trade_simulator.simulate_intrabar)
+- Haftalık strateji canlı bot gibi simüle edilir: pozisyon yok, haftada 1 alış +
+  1 satış sinyali hedef / stop'a kadar ayrı izlenir (trade_simulator.simulate_signals)
+
+Kullanım:
+  python sweep.py mumlar.csv --out sweep_sonuc [--strategy daily|weekly] [--grid grid.json]
+  python sweep.py mumlar_15m.csv --minutes mumlar_1m.csv --out sweep_sonuc
+
+grid.json: {"RSI_PERIOD": [7, 9, 14], "MIN_SIGNAL_SCORE": [4, 5, 6], ...}
+Verilmeyen parametreler botun mevcut değerlerini kullanır.
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import bitcoin_daily_bot_fixed as daily
+from indicator_kernels import compute_indicators
+from result_cache import CACHE_ROOT, content_key, indicator_cache, result_cache
+from signal_scoring import daily_scores, daily_signals, weekly_scores, weekly_signals
+from trade_simulator import (SubBars, simulate_intrabar, simulate_signals, simulate_trades,
+                             summarize)
+
+METRIC_COLUMNS = ['trades', 'win_rate', 'total_net', 'avg_net', 'max_drawdown', 'profit_factor']
+TASK_SIZE = 64  # Görev başına eşik kombinasyonu
+CACHE_SIZE = 8  # İşçi başına saklanan indikatör seti
+
+# Strateji tanımları: parametre isimleri botlardaki sabit / attribute isimleridir
+STRATEGIES = {
+    'daily': {
+        'indicators': {
+            'RSI_PERIOD': daily.RSI_PERIOD,
+            'EMA_SHORT': daily.EMA_SHORT,
+            'EMA_MEDIUM': daily.EMA_MEDIUM,
+            'EMA_LONG': daily.EMA_LONG,
+            'MACD_FAST': daily.MACD_FAST,
+            'MACD_SLOW': daily.MACD_SLOW,
+            'MACD_SIGNAL': daily.MACD_SIGNAL,
+            'BOLLINGER_PERIOD': daily.BOLLINGER_PERIOD,
+            'BOLLINGER_STD': daily.BOLLINGER_STD,
+            'STOCHASTIC_K': daily.STOCHASTIC_K,
+            'STOCHASTIC_D': daily.STOCHASTIC_D,
+        },
+        'thresholds': {
+            'RSI_OVERSOLD': daily.RSI_OVERSOLD,
+            'RSI_OVERBOUGHT': daily.RSI_OVERBOUGHT,
+            'MIN_VOLUME_MULTIPLIER': daily.MIN_VOLUME_MULTIPLIER,
+            'MIN_SIGNAL_SCORE': daily.MIN_SIGNAL_SCORE,
+            'SIGNAL_PROFIT_TARGET': daily.SIGNAL_PROFIT_TARGET,
+            'STOP_LOSS_PERCENT': daily.STOP_LOSS_PERCENT,
+            'DAILY_PROFIT_TARGET': daily.DAILY_PROFIT_TARGET,
+        },
+        'grid': {
+            'RSI_PERIOD': [7, 9, 14],
+            'EMA_SHORT': [9, 12],
+            'MACD_FAST': [8, 12],
+            'RSI_OVERSOLD': [20, 25, 30],
+            'RSI_OVERBOUGHT': [70, 75, 80],
+            'MIN_SIGNAL_SCORE': [4, 5, 6],
+            'MIN_VOLUME_MULTIPLIER': [1.1, 1.3, 1.5],
+            'SIGNAL_PROFIT_TARGET': [0.5, 0.8, 1.2],
+            'STOP_LOSS_PERCENT': [1.5, 2.5],
+        },
+    },
+    'weekly': {
+        'indicators': {
+            'rsi_period': 14,
+            'ema_short': 20,
+            'ema_long': 50,
+            'bb_period': 20,
+            'bb_std': 2,
+        },
+        'thresholds': {
+            'rsi_buy': 35,
+            'rsi_sell': 65,
+            'volume_multiplier': 1.2,
+            'min_score': 4,
+            'signal_profit_target': 1.5,
+            'stop_atr_multiplier': 2,
+        },
+        'grid': {
+            'rsi_period': [10, 14, 21],
+            'ema_short': [12, 20],
+            'ema_long': [50, 100],
+            'rsi_buy': [30, 35, 40],
+            'rsi_sell': [60, 65, 70],
+            'min_score': [3.5, 4, 4.5],
+            'signal_profit_target': [1.0, 1.5, 2.0],
+            'stop_atr_multiplier': [1.5, 2, 3],
+        },
+    },
+}
+
+
+def indicator_params(strategy, p):
+    """Kombinasyondan compute_indicators parametreleri"""
+    if strategy == 'daily':
+        return {
+            'rsi': p['RSI_PERIOD'],
+            'ema': {'ema_short': p['EMA_SHORT'], 'ema_medium': p['EMA_MEDIUM'],
+                    'ema_long': p['EMA_LONG']},
+            'macd': (p['MACD_FAST'], p['MACD_SLOW'], p['MACD_SIGNAL']),
+            'bollinger': (p['BOLLINGER_PERIOD'], p['BOLLINGER_STD']),
+            'stochastic': (p['STOCHASTIC_K'], p['STOCHASTIC_D']),
+            'atr': 14,
+            'volume_ma': 20,
+            'vwap': daily.VWAP_SESSION_HOUR,
+        }
+    return {
+        'rsi': p['rsi_period'],
+        'ema': {'ema_20': p['ema_short'], 'ema_50': p['ema_long']},
+        'macd': (12, 26, 9),
+        'bollinger': (p['bb_period'], p['bb_std']),
+        'atr': 14,
+        'volume_ma': 20,
+    }
+
+
+def indicator_columns(strategy, indicators, candles, cache=None):
+    """
+    (N, 6) mumlardan kombinasyonun indikatör kolonları (+ OHLCV)
+
+    cache: ResultCache - verilirse aynı mumlar + parametreler diskten (mmap) okunur
+    """
+    params = indicator_params(strategy, indicators)
+
+    def compute():
+        columns = compute_indicators(candles[:, 1], candles[:, 2], candles[:, 3], candles[:, 4],
+                                     candles[:, 5], timestamps=candles[:, 0], **params)
+        for i, name in enumerate(('open', 'high', 'low', 'close', 'volume'), start=1):
+            columns[name] = candles[:, i]
+        return columns
+
+    if cache is None:
+        return compute()
+    return cache.arrays(content_key('indicators', candles, params), compute)
+
+
+def result_key(data_key, strategy, params):
+    """Kombinasyon sonucunun önbellek anahtarı (veri + strateji + bot sabitleri)"""
+    return content_key('sweep', data_key, strategy, params, daily.COMMISSION_PERCENT,
+                       daily.MIN_SIGNAL_INTERVAL)
+
+
+def strategy_trades(strategy, columns, timestamps, p, sub_bars=None, window=None):
+    """
+    Tek kombinasyonun işlem listesi (trade_simulator.TRADE_FIELDS)
+
+    sub_bars: mum içi çıkışlar için SubBars. window: sinyaller tüm kolonlardan
+    hesaplanır, simülasyon sadece bu dilimde yapılır (indeksler dilime göre).
+    """
+    close = columns['close']
+    if strategy == 'daily':
+        buy, sell = daily_scores(columns, rsi_oversold=p['RSI_OVERSOLD'],
+                                 rsi_overbought=p['RSI_OVERBOUGHT'],
+                                 volume_multiplier=p['MIN_VOLUME_MULTIPLIER'])
+        signals = daily_signals(buy, sell, p['MIN_SIGNAL_SCORE'])
+        target, stop = p['SIGNAL_PROFIT_TARGET'], p['STOP_LOSS_PERCENT']
+        limits = dict(period_target_pct=p['DAILY_PROFIT_TARGET'], period='day',
+                      min_interval_ms=daily.MIN_SIGNAL_INTERVAL * 1000)
+    else:
+        buy, sell = weekly_scores(columns, rsi_buy=p['rsi_buy'], rsi_sell=p['rsi_sell'],
+                                  volume_multiplier=p['volume_multiplier'])
+        signals = weekly_signals(buy, sell, p['min_score'])
+        # format_signal_message ile aynı: ATR bazlı stop, ATR yoksa %3
+        atr = np.nan_to_num(columns['atr'])
+        target = p['signal_profit_target']
+        stop = np.where(atr > 0, atr / close * 100 * p['stop_atr_multiplier'], 3.0)
+
+    if window is not None:
+        timestamps, close, signals = timestamps[window], close[window], signals[window]
+        stop = stop[window] if np.ndim(stop) else stop
+    if strategy == 'weekly':
+        # Haftalık bot pozisyon açmaz: gönderilen her sinyal hedef / stop'a kadar
+        # ayrı izlenir (haftada 1 alış + 1 satış, haftalık kar hedefi kapısı yok)
+        if sub_bars is None:
+            bars = [columns[name] if window is None else columns[name][window]
+                    for name in ('open', 'high', 'low')]
+            sub_bars = SubBars(np.column_stack([timestamps, *bars, close]))
+        return simulate_signals(sub_bars, timestamps, close, signals, target, stop,
+                                daily.COMMISSION_PERCENT, period='week')
+    if sub_bars is None:
+        return simulate_trades(timestamps, close, signals, target, stop,
+                               daily.COMMISSION_PERCENT, **limits)
+    return simulate_intrabar(sub_bars, timestamps, close, signals, target, stop,
+                             daily.COMMISSION_PERCENT, **limits)
+
+
+def evaluate(strategy, columns, timestamps, p, sub_bars=None, window=None):
+    """Tek kombinasyonu değerlendir, metrik sözlüğü döndür (sub_bars: mum içi çıkışlar)"""
+    return summarize(strategy_trades(strategy, columns, timestamps, p, sub_bars, window))
+
+
+def expand_grid(strategy, grid):
+    """Grid'i (indikatör parametreleri, eşik kombinasyonları listesi) gruplarına ayır"""
+    spec = STRATEGIES[strategy]
+    unknown = set(grid) - set(spec['indicators']) - set(spec['thresholds'])
+    if unknown:
+        raise ValueError(f"Bilinmeyen parametre(ler): {', '.join(sorted(unknown))}")
+
+    def combos(defaults):
+        values = [grid.get(name, [default]) for name, default in defaults.items()]
+        return [dict(zip(defaults, combo)) for combo in itertools.product(*values)]
+
+    thresholds = combos(spec['thresholds'])
+    return [(indicators, thresholds) for indicators in combos(spec['indicators'])]
+
+
+def task_id(strategy, indicators, thresholds):
+    payload = json.dumps([strategy, indicators, thresholds], sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def data_hash(candles):
+    return hashlib.sha1(np.ascontiguousarray(candles).tobytes()).hexdigest()
+
+
+# ----------------------------------------------------------------------------
+# Kolonsal dosya (parquet veya npz)
+# ----------------------------------------------------------------------------
+
+def _has_parquet():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def write_columns(df, path):
+    """DataFrame'i kolonsal dosyaya atomik olarak yaz (uzantıya göre parquet / npz)"""
+    tmp = path + '.tmp'
+    if path.endswith('.parquet'):
+        df.to_parquet(tmp, index=False)
+    else:
+        with open(tmp, 'wb') as f:
+            np.savez(f, **{name: df[name].to_numpy() for name in df.columns})
+    os.replace(tmp, path)
+
+
+def read_columns(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    with np.load(path, allow_pickle=False) as data:
+        return pd.DataFrame({name: data[name] for name in data.files})
+
+
+# ----------------------------------------------------------------------------
+# İşçi tarafı
+# ----------------------------------------------------------------------------
+
+_shm = None
+_minutes_shm = None
+_candles = None
+_sub_bars = None
+_caches = (None, None)  # (indikatör, sonuç) disk önbellekleri
+_data_key = None
+_cache = {}
+
+
+def _attach(name, shape, minutes_name=None, minutes_shape=None, caches=None, data_key=None):
+    """İşçi başlangıcı: paylaşımlı bellekteki mumlara kopyasız görünüm"""
+    global _shm, _minutes_shm, _candles, _sub_bars, _caches, _data_key
+    _caches = caches or (None, None)
+    _data_key = data_key
+    _shm = shared_memory.SharedMemory(name=name)
+    _candles = np.ndarray(shape, dtype=np.float64, buffer=_shm.buf)
+    if minutes_name is not None:
+        # Dokunuş tabloları işçi başına bir kez kurulur, tüm görevler paylaşır
+        _minutes_shm = shared_memory.SharedMemory(name=minutes_name)
+        _sub_bars = SubBars(np.ndarray(minutes_shape, dtype=np.float64, buffer=_minutes_shm.buf))
+
+
+def _indicator_columns(strategy, indicators):
+    """İndikatör kolonları - işçi içinde bellekten, yoksa disk önbelleğinden"""
+    key = json.dumps(indicators, sort_keys=True)
+    if key not in _cache:
+        if len(_cache) >= CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = indicator_columns(strategy, indicators, _candles, _caches[0])
+    return _cache[key]
+
+
+def _run_task(strategy, indicators, thresholds, part_path):
+    results = _caches[1]
+    combos = [{**indicators, **combo} for combo in thresholds]
+    keys = [result_key(_data_key, strategy, params) for params in combos]
+    found = results.get_json_many(keys) if results is not None else {}
+
+    computed = {}
+    rows = []
+    for params, key in zip(combos, keys):
+        metrics = found.get(key)
+        if metrics is None:
+            # İndikatörler sadece önbellekte olmayan kombinasyon varsa hesaplanır
+            metrics = evaluate(strategy, _indicator_columns(strategy, indicators),
+                               _candles[:, 0].astype(np.int64), params, _sub_bars)
+            computed[key] = metrics
+        rows.append({**params, **metrics})
+    if results is not None and computed:
+        results.put_json_many(computed)
+    write_columns(pd.DataFrame(rows), part_path)
+    return len(rows)
+
+
+# ----------------------------------------------------------------------------
+# Tarama
+# ----------------------------------------------------------------------------
+
+def rank_results(df):
+    """Toplam net kar (azalan), sonra maksimum düşüş (artan) sırası"""
+    return df.sort_values(['total_net', 'max_drawdown'], ascending=[False, True],
+                          kind='stable').reset_index(drop=True)
+
+
+def run_sweep(candles, out_dir, strategy='daily', grid=None, workers=None, task_size=TASK_SIZE,
+              minutes=None, cache_root=CACHE_ROOT):
+    """
+    Grid taramasını çalıştır
+
+    Args:
+        candles: (N, 6) dizi - timestamp_ms, open, high, low, close, volume
+        out_dir: Parça dosyaları, manifest ve sıralı sonuç klasörü
+        grid: {parametre: [değerler]} - None ise stratejinin varsayılan grid'i
+        minutes: (M, 6) 1m mumlar - verilirse çıkışlar mum içi (simulate_intrabar)
+        cache_root: İndikatör / sonuç önbelleği klasörü (None: önbellek yok)
+
+    Returns:
+        (ranked, path): Sıralı sonuç DataFrame'i ve yazılan dosya yolu
+    """
+    candles = np.ascontiguousarray(candles, dtype=np.float64)
+    grid = STRATEGIES[strategy]['grid'] if grid is None else grid
+    parts_dir = os.path.join(out_dir, 'parts')
+    os.makedirs(parts_dir, exist_ok=True)
+    extension = '.parquet' if _has_parquet() else '.npz'
+
+    # Farklı veri / strateji ile devam etmeyi engelle
+    manifest = {'strategy': strategy, 'data_hash': data_hash(candles), 'candles': len(candles)}
+    if minutes is not None:
+        minutes = np.ascontiguousarray(minutes, dtype=np.float64)
+        manifest['minutes_hash'] = data_hash(minutes)
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+        if previous != manifest:
+            raise ValueError(f"{out_dir} farklı bir veri / strateji ile başlatılmış")
+    else:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    tasks = []
+    for indicators, thresholds in expand_grid(strategy, grid):
+        for start in range(0, len(thresholds), task_size):
+            chunk = thresholds[start:start + task_size]
+            path = os.path.join(parts_dir, task_id(strategy, indicators, chunk) + extension)
+            tasks.append((indicators, chunk, path))
+
+    pending = [task for task in tasks if not os.path.exists(task[2])]
+    total = sum(len(task[1]) for task in tasks)
+    print(f"📊 {total} kombinasyon, {len(tasks)} görev ({len(tasks) - len(pending)} tamamlanmış)")
+
+    if pending:
+        caches = None
+        if cache_root is not None:
+            caches = (indicator_cache(cache_root), result_cache(cache_root))
+        data_key = [manifest['data_hash'], manifest.get('minutes_hash'), len(candles)]
+        blocks = []
+        try:
+            initargs = []
+            for array in (candles, minutes):
+                if array is None:
+                    initargs += [None, None]
+                    continue
+                shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+                blocks.append(shm)
+                np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)[:] = array
+                initargs += [shm.name, array.shape]
+            for cache in caches or ():
+                cache.close()  # İşçiler kendi bağlantılarını açar
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                     initargs=(*initargs, caches, data_key)) as pool:
+                futures = [pool.submit(_run_task, strategy, indicators, chunk, path)
+                           for indicators, chunk, path in pending]
+                done = 0
+                for future in as_completed(futures):
+                    done += future.result()
+                    print(f"  ✓ {done} kombinasyon değerlendirildi", end='\r')
+            print()
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    ranked = rank_results(pd.concat([read_columns(path) for _, _, path in tasks],
+                                    ignore_index=True))
+    result_path = os.path.join(out_dir, 'ranked' + extension)
+    write_columns(ranked, result_path)
+    return ranked, result_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paralel strateji parametre taraması")
+    parser.add_argument('candles', help="Mum CSV dosyası")
+    parser.add_argument('--out', default='sweep_results', help="Çıktı klasörü")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='daily')
+    parser.add_argument('--grid', help="Parametre grid'i (JSON)")
+    parser.add_argument('--minutes', help="1m mum CSV dosyası (mum içi kar hedefi / stop)")
+    parser.add_argument('--cache', default=CACHE_ROOT, help="İndikatör / sonuç önbelleği klasörü")
+    parser.add_argument('--no-cache', action='store_true', help="Disk önbelleğini kullanma")
+    parser.add_argument('--workers', type=int, help="İşçi sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument('--top', type=int, default=10, help="Gösterilecek sonuç sayısı")
+    args = parser.parse_args()
+
+    from backtest import load_candles
+
+    grid = None
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    started = datetime.now()
+    try:
+        minutes = load_candles(args.minutes) if args.minutes else None
+        ranked, path = run_sweep(load_candles(args.candles), args.out, args.strategy,
+                                 grid, args.workers, minutes=minutes,
+                                 cache_root=None if args.no_cache else args.cache)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+    elapsed = (datetime.now() - started).total_seconds()
+
+    print("\n" + "="*60)
+    print(f"📈 EN İYİ {args.top} KOMBİNASYON")
+    print("="*60)
+    print(ranked.head(args.top).to_string())
+    print("="*60)
+    print(f"Süre: {elapsed:.1f}s | Sonuçlar: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bloklamayan Telegram Bildirim Kuyruğu
+Mesajlar sınırlı bir kuyruğa eklenir, arka plan iş parçacığı gönderir
+
+- Tek bir keep-alive requests.Session (bağlantı havuzu) kullanılır
+- Ağ / 5xx hatalarında üstel bekleme ile tekrar denenir, 429 cevabındaki
+  `retry_after` süresine uyulur
+- Art arda gelen durum mesajları (status=True) tek mesajda birleştirilir
+- send() bir Future döndürür: sonuç True (gönderildi) / False (başarısız)
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TELEGRAM_API = 'https://api.telegram.org'
+MAX_MESSAGE_LENGTH = 4096  # Telegram mesaj sınırı
+
+_STOP = object()
+
+
+class TelegramNotifier:
+    def __init__(self, token, chat_id, parse_mode='Markdown', api_url=TELEGRAM_API,
+                 maxsize=100, max_retries=5, backoff=1.0, max_backoff=30.0,
+                 coalesce_window=2.0, timeout=10):
+        """
+        Args:
+            token / chat_id: Telegram bot bilgileri
+            parse_mode: 'Markdown' veya 'HTML'
+            api_url: Telegram API adresi (yerel test sunucusu verilebilir)
+            maxsize: Kuyruk kapasitesi - doluysa mesaj reddedilir (bot beklemez)
+            max_retries: Mesaj başına maksimum deneme
+            backoff / max_backoff: Üstel bekleme başlangıcı ve üst sınırı (saniye)
+            coalesce_window: Durum mesajlarının birleştirilmek üzere beklendiği süre
+        """
+        self.url = f"{api_url}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.parse_mode = parse_mode
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.coalesce_window = coalesce_window
+        self.timeout = timeout
+
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.stats = {'sent': 0, 'failed': 0, 'dropped': 0, 'merged': 0, 'retries': 0}
+        self.delivery_callbacks = []  # fn(süre_saniye, başarılı) - her gönderimden sonra
+        self._session = None
+        self._worker = None
+        self._held = None  # Birleştirme sırasında sıradan alınmış sonraki mesaj
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Üretici tarafı (bot döngüsü)
+    # ------------------------------------------------------------------
+
+    def send(self, text, status=False):
+        """
+        Mesajı kuyruğa ekle (bloklamaz)
+
+        Args:
+            status: Durum mesajı mı (art arda gelenler birleştirilebilir)
+
+        Returns:
+            Future: Gönderim sonucu (True / False)
+        """
+        future = Future()
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait((text, status, future))
+        except queue.Full:
+            self.stats['dropped'] += 1
+            logging.warning("⚠️ Telegram kuyruğu dolu, mesaj atlandı")
+            future.set_result(False)
+        return future
+
+    def close(self, timeout=15):
+        """Kuyruktaki mesajları gönderip iş parçacığını durdur"""
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+        if worker is None:
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logging.warning("⚠️ Telegram kuyruğu kapatılırken dolu")
+            return
+        worker.join(timeout)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='telegram-sender', daemon=True)
+                self._worker.start()
+
+    # ------------------------------------------------------------------
+    # Gönderici tarafı (arka plan)
+    # ------------------------------------------------------------------
+
+    def _next(self, timeout=None):
+        if self._held is not None:
+            item, self._held = self._held, None
+            return item
+        return self.queue.get(timeout=timeout)
+
+    def _collect_status(self, first):
+        """İlk durum mesajına pencere içinde gelen diğer durum mesajlarını ekle"""
+        texts = [first[0]]
+        futures = [first[2]]
+        length = len(first[0])
+        deadline = time.monotonic() + self.coalesce_window
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._next(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP or not item[1] or length + len(item[0]) + 2 > MAX_MESSAGE_LENGTH:
+                self._held = item  # Sinyal mesajı sırayı bozmadan ayrıca gönderilir
+                break
+            texts.append(item[0])
+            futures.append(item[2])
+            length += len(item[0]) + 2
+
+        self.stats['merged'] += len(texts) - 1
+        return "\n\n".join(texts), futures
+
+    def _run(self):
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        try:
+            while True:
+                item = self._next()
+                if item is _STOP:
+                    break
+                text, status, future = item
+                if status and self.coalesce_window > 0:
+                    text, futures = self._collect_status(item)
+                else:
+                    futures = [future]
+
+                started = time.perf_counter()
+                try:
+                    success = self._deliver(text)
+                except Exception as e:
+                    logging.error(f"Telegram gönderici hatası: {e}")
+                    success = False
+                for callback in self.delivery_callbacks:
+                    callback(time.perf_counter() - started, success)
+                self.stats['sent' if success else 'failed'] += len(futures)
+                for f in futures:
+                    f.set_result(success)
+        finally:
+            self._session.close()
+
+    def _deliver(self, text):
+        """Tek mesajı gönder: 429'da retry_after, ağ / 5xx hatasında üstel bekleme"""
+        payload = {'chat_id': self.chat_id, 'text': text, 'parse_mode': self.parse_mode}
+        delay = self.backoff
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                response = self._session.post(self.url, json=payload, timeout=self.timeout)
+                if response.status_code == 200:
+                    return True
+
+                if response.status_code == 429:
+                    try:
+                        wait = float(response.json()['parameters']['retry_after'])
+                    except (ValueError, KeyError, TypeError):
+                        wait = delay
+                    logging.warning(f"⏳ Telegram rate limit, {wait:.0f}s bekleniyor")
+                elif response.status_code >= 500:
+                    wait = delay
+                    logging.warning(f"Telegram sunucu hatası (HTTP {response.status_code}), "
+                                    f"deneme {attempt}/{self.max_retries}")
+                else:
+                    # 400/401/403 gibi hatalar tekrar denemekle düzelmez
+                    logging.error(f"Telegram hatası (HTTP {response.status_code}): {response.text}")
+                    return False
+
+            except requests.exceptions.RequestException as e:
+                wait = delay
+                logging.warning(f"Telegram gönderim hatası: {e}, deneme {attempt}/{self.max_retries}")
+
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                time.sleep(wait)
+                delay = min(delay * 2, self.max_backoff)
+
+        logging.error("Telegram mesajı gönderilemedi (tüm denemeler başarısız)")
+        return False
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel Telegram API Taklidi ve Kuyruk Yük Testi
+İnternet olmadan TelegramNotifier'ı gecikme, 5xx ve 429 (retry_after) altında dener
+
+Kullanım:
+  python telegram_stub.py                        # Varsayılan yük testi
+  python telegram_stub.py --messages 500 --latency 0.05 --error-rate 0.1 --rate-limit 0.05
+  python telegram_stub.py --serve --port 8081    # Sadece sunucuyu çalıştır
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telegram_queue import TelegramNotifier
+
+
+class TelegramStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, error_rate=0.0, rate_limit=0.0, retry_after=1, seed=None):
+        """
+        Args:
+            port: Dinlenecek port (0: boş port)
+            latency: İstek başına gecikme (saniye)
+            error_rate: HTTP 500 dönme olasılığı
+            rate_limit: HTTP 429 (retry_after ile) dönme olasılığı
+        """
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.messages = []
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        time.sleep(server.latency)
+
+        with server.lock:
+            server.requests += 1
+            roll = server.random.random()
+        if roll < server.rate_limit:
+            return self._reply(429, {'ok': False, 'error_code': 429,
+                                     'description': 'Too Many Requests',
+                                     'parameters': {'retry_after': server.retry_after}})
+        if roll < server.rate_limit + server.error_rate:
+            return self._reply(500, {'ok': False, 'error_code': 500})
+        if not self.path.endswith('/sendMessage') or 'text' not in payload:
+            return self._reply(400, {'ok': False, 'error_code': 400})
+
+        with server.lock:
+            server.messages.append(payload['text'])
+        self._reply(200, {'ok': True, 'result': {'message_id': len(server.messages)}})
+
+
+def load_test(messages=200, status_ratio=0.7, latency=0.02, error_rate=0.05, rate_limit=0.02,
+              retry_after=1, seed=1):
+    """Kuyruğu yerel sunucuya karşı çalıştır, sonuç özetini döndür"""
+    server = TelegramStubServer(latency=latency, error_rate=error_rate, rate_limit=rate_limit,
+                                retry_after=retry_after, seed=seed).start()
+    notifier = TelegramNotifier('test', 'test', api_url=server.url, maxsize=messages,
+                                backoff=0.1, coalesce_window=0.2)
+    rng = random.Random(seed)
+
+    started = time.perf_counter()
+    futures = []
+    enqueue_times = []
+    for i in range(messages):
+        status = rng.random() < status_ratio
+        t0 = time.perf_counter()
+        futures.append(notifier.send(f"{'Durum' if status else 'Sinyal'} #{i}", status=status))
+        enqueue_times.append(time.perf_counter() - t0)
+    delivered = sum(f.result(timeout=300) for f in futures)
+    elapsed = time.perf_counter() - started
+    notifier.close()
+    server.shutdown()
+
+    return {
+        'messages': messages,
+        'delivered': delivered,
+        'http_requests': server.requests,
+        'telegram_messages': len(server.messages),
+        'max_enqueue_ms': max(enqueue_times) * 1000,
+        'elapsed_s': elapsed,
+        **notifier.stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel Telegram taklidi / kuyruk yük testi")
+    parser.add_argument('--serve', action='store_true', help="Sadece sunucuyu çalıştır")
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.05)
+    parser.add_argument('--rate-limit', type=float, default=0.02)
+    args = parser.parse_args()
+
+    if args.serve:
+        server = TelegramStubServer(args.port, args.latency, args.error_rate, args.rate_limit)
+        print(f"🧪 Telegram taklidi: {server.url} (Ctrl+C ile durdur)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    result = load_test(args.messages, latency=args.latency, error_rate=args.error_rate,
+                       rate_limit=args.rate_limit)
+    print("\n" + "="*60)
+    print("📨 TELEGRAM KUYRUK YÜK TESTİ")
+    print("="*60)
+    for key, value in result.items():
+        print(f"{key:18}: {value:.2f}" if isinstance(value, float) else f"{key:18}: {value}")
+    print("="*60)
+    return 0 if result['delivered'] == result['messages'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Olay Tabanlı Backtest Testi
+Sabit mum dosyasının (golden/backtest_15m.csv) kayıtlı işlem listesini
+(golden/backtest_trades.csv) aynen ürettiğini, her kapanan mumun bir kez
+değerlendirildiğini, replay kaynağının ileriye bakmadığını, atlanan izleme
+anlarının sonucu değiştirmediğini ve önbellekten okunan sonucun replay ile
+aynı olduğunu dener (ağ gerekmez)
+
+Kullanım:
+  python test_backtest.py               # Testleri çalıştır
+  python test_backtest.py --regenerate  # Golden mum / işlem dosyalarını yeniden üret
+"""
+
+import logging
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import bitcoin_daily_bot_fixed as daily
+from backtest import (TRADE_COLUMNS, BacktestDailyBot, ReplayExchange, SimulatedClock,
+                      cached_backtest, load_candles, run_backtest)
+from result_cache import ResultCache
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+CANDLES_PATH = os.path.join(GOLDEN_DIR, 'backtest_15m.csv')
+TRADES_PATH = os.path.join(GOLDEN_DIR, 'backtest_trades.csv')
+TIMEFRAME_MS = 900_000
+
+
+def synthetic_candles(count=1000, seed=21):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, count)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.003)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.003)
+    volume = rng.lognormal(3, 0.6, count)
+    timestamps = 1_700_006_400_000 + np.arange(count) * TIMEFRAME_MS
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+def write_golden():
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    candles = pd.DataFrame(synthetic_candles(),
+                           columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    candles['timestamp'] = candles['timestamp'].astype(np.int64)
+    candles.to_csv(CANDLES_PATH, index=False, float_format='%.17g')
+    trades, _ = run_backtest(load_candles(CANDLES_PATH))
+    trades.to_csv(TRADES_PATH, index=False, float_format='%.17g')
+    print(f"✓ {CANDLES_PATH} ({len(candles)} mum), {TRADES_PATH} ({len(trades)} işlem) yazıldı")
+
+
+def check_golden_trades():
+    """Sabit mumlarla işlem listesi kayıtlı listeyle aynı olmalı"""
+    print("\n" + "="*60)
+    print("1. GOLDEN İŞLEM LİSTESİ")
+    print("="*60)
+
+    try:
+        trades, pnl = run_backtest(load_candles(CANDLES_PATH))
+        expected = pd.read_csv(TRADES_PATH, parse_dates=['entry_time', 'exit_time'])
+
+        ok = list(trades.columns) == TRADE_COLUMNS and len(trades) == len(expected) > 0
+        for column in TRADE_COLUMNS:
+            if not ok:
+                break
+            if column in ('entry_price', 'exit_price', 'net_profit'):
+                same = np.allclose(trades[column], expected[column], rtol=1e-12)
+            elif column.endswith('_time'):
+                same = (trades[column].values.astype('datetime64[ms]')
+                        == expected[column].values.astype('datetime64[ms]')).all()
+            else:
+                same = (trades[column].values == expected[column].values).all()
+            if not same:
+                print(f"  ✗ {column} kolonu farklı")
+            ok = ok and same
+        print(f"  {'✓' if ok else '✗'} {len(trades)} işlem (beklenen {len(expected)}), "
+              f"toplam net %{trades['net_profit'].sum():.2f}, {len(pnl)} gün")
+        return ok
+
+    except FileNotFoundError as e:
+        print(f"✗ Golden dosya bulunamadı: {e}")
+        return False
+    except Exception as e:
+        print(f"✗ Golden işlem testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_replay_cadence():
+    """Her kapanan mum sırayla ve bir kez değerlendirilmeli"""
+    print("\n" + "="*60)
+    print("2. MUM BAŞINA TEK DEĞERLENDİRME")
+    print("="*60)
+
+    evaluated = []
+    original = BacktestDailyBot.run_cycle
+
+    def run_cycle(bot, closed_bar=None):
+        evaluated.append(closed_bar)
+        return original(bot, closed_bar)
+
+    try:
+        candles = load_candles(CANDLES_PATH)
+        BacktestDailyBot.run_cycle = run_cycle
+        run_backtest(candles)
+        expected = candles[daily.CANDLE_WINDOW:-1, 0].astype(np.int64).tolist()
+        ok = evaluated == expected
+        print(f"  {'✓' if ok else '✗'} {len(evaluated)} run_cycle çağrısı, "
+              f"{len(expected)} kapanan mum (son mum: yeni mum açılmadı)")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Değerlendirme sıklığı testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        BacktestDailyBot.run_cycle = original
+
+
+def check_no_lookahead():
+    """Replay kaynağı sadece kapanmış mumları ve oluşan mumun geçmiş dakikalarını sunmalı"""
+    print("\n" + "="*60)
+    print("3. İLERİYE BAKIŞ YOK")
+    print("="*60)
+
+    try:
+        candles = synthetic_candles(count=8)
+        rng = np.random.default_rng(4)
+        minutes = np.column_stack([
+            candles[0, 0] + np.arange(8 * 15) * 60_000,
+            *(rng.uniform(29_000, 31_000, (4, 8 * 15))), np.ones(8 * 15)])
+        clock = SimulatedClock(0)
+        exchange = ReplayExchange(candles, clock, minutes=minutes)
+
+        ok = True
+        bar = candles[5, 0]
+        for offset in (0, 30_000, 60_000, 7 * 60_000 + 300, TIMEFRAME_MS - 1):
+            clock.set(bar + offset)
+            rows = exchange.fetch_ohlcv(daily.SYMBOL, daily.TIMEFRAME)
+            closed = [row for row in rows[:-1] if row[0] + TIMEFRAME_MS > clock.current_ms]
+            forming = rows[-1]
+            seen = minutes[(minutes[:, 0] >= bar) & (minutes[:, 0] + 60_000 <= clock.current_ms)]
+            expected_close = seen[-1, 4] if len(seen) else candles[5, 1]
+            step_ok = (not closed and forming[0] == bar and len(rows) == 6
+                       and forming[4] == expected_close
+                       and forming[5] == (len(seen) if len(seen) else 0.0))
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} açılış +{offset / 1000:.1f}s: {len(rows) - 1} kapanmış mum, "
+                  f"oluşan mum {len(seen)} dakikadan")
+
+        rows = exchange.fetch_ohlcv(daily.SYMBOL, daily.TIMEFRAME, since=int(bar))
+        ok = ok and len(rows) == 1 and rows[0][0] == bar
+        print(f"  {'✓' if ok else '✗'} since ile sadece oluşan mum döndü")
+        return ok
+
+    except Exception as e:
+        print(f"✗ İleriye bakış testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_monitor_ticks():
+    """Görünen mumu değişmeyen izleme anlarını atlamak her anı çalıştırmakla aynı işlemleri vermeli"""
+    print("\n" + "="*60)
+    print("4. POZİSYON İZLEME ANLARI")
+    print("="*60)
+
+    calls = []
+    original_monitor = BacktestDailyBot.monitor_position
+    original_changes = ReplayExchange.changes
+
+    def monitor_position(bot):
+        calls.append(bot.clock.current_ms)
+        return original_monitor(bot)
+
+    try:
+        candles = load_candles(CANDLES_PATH)
+        rng = np.random.default_rng(8)
+        count = len(candles) * 15
+        opens = np.repeat(candles[:, 1], 15) * (1 + rng.normal(0, 0.002, count))
+        minutes = np.column_stack([candles[0, 0] + np.arange(count) * 60_000, opens,
+                                   opens * 1.001, opens * 0.999, opens, np.ones(count)])
+        BacktestDailyBot.monitor_position = monitor_position
+
+        ok = True
+        for name, data in (('sadece mum açılışı', None), ('1m mumlar', minutes)):
+            calls.clear()
+            skipped, _ = run_backtest(candles, minutes=data)
+            skipped_calls = len(calls)
+            calls.clear()
+            ReplayExchange.changes = lambda exchange, ticks: ticks
+            every, _ = run_backtest(candles, minutes=data)
+            ReplayExchange.changes = original_changes
+            step_ok = skipped.equals(every) and len(every) > 0 and skipped_calls < len(calls)
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} {name}: {len(every)} işlem aynı, "
+                  f"{skipped_calls} / {len(calls)} izleme çalıştı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ İzleme anları testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        BacktestDailyBot.monitor_position = original_monitor
+        ReplayExchange.changes = original_changes
+
+
+def check_cached():
+    """Önbellekten okunan işlem listesi replay sonucuyla (kolon tipleri dahil) aynı olmalı"""
+    print("\n" + "="*60)
+    print("5. SONUÇ ÖNBELLEĞİ")
+    print("="*60)
+
+    try:
+        candles = load_candles(CANDLES_PATH)
+        with tempfile.TemporaryDirectory() as root:
+            cache = ResultCache(root, budget_bytes=16 * 1024 ** 2)
+            trades, pnl, first = cached_backtest(candles, cache=cache)
+            stored, stored_pnl, second = cached_backtest(candles, cache=cache)
+            cache.close()
+        ok = (not first and second and stored.equals(trades) and stored_pnl.equals(pnl)
+              and (stored.dtypes == trades.dtypes).all())
+        print(f"  {'✓' if ok else '✗'} {len(stored)} işlem önbellekten aynen okundu "
+              f"(zaman kolonları {stored['entry_time'].dtype})")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Önbellek testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.ERROR)
+    if '--regenerate' in sys.argv:
+        write_golden()
+        return 0
+
+    print("\n" + "="*60)
+    print("OLAY TABANLI BACKTEST TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Golden İşlemler", check_golden_trades()))
+    results.append(("Tek Değerlendirme", check_replay_cadence()))
+    results.append(("İleriye Bakış Yok", check_no_lookahead()))
+    results.append(("İzleme Anları", check_monitor_ticks()))
+    results.append(("Sonuç Önbelleği", check_cached()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
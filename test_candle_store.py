@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mum Deposu Testi
+Yapılandırılmış dizi penceresinin eski liste tabanlı birleştirme davranışıyla
+aynı sonucu verdiğini ve görünümlerin kopyasız / kararlı olduğunu dener
+
+Kullanım:
+  python test_candle_store.py
+"""
+
+import sys
+
+import numpy as np
+
+from candle_store import CandleStore, ohlcv_array
+
+TIMEFRAME_MS = 900_000
+
+
+def reference_merge(candles, ohlcv, window):
+    """Eski liste tabanlı birleştirme (beklenen sonuç)"""
+    for candle in ohlcv:
+        if not candles or candle[0] > candles[-1][0]:
+            candles.append(list(candle))
+        elif candle[0] == candles[-1][0]:
+            candles[-1] = list(candle)
+    del candles[:max(0, len(candles) - window)]
+    return candles
+
+
+def check_merge():
+    """Oluşan mum güncellemesi, yeni mumlar ve pencere kaydırma liste sürümüyle aynı olmalı"""
+    print("\n" + "="*60)
+    print("1. BİRLEŞTİRME VE PENCERE")
+    print("="*60)
+
+    try:
+        rng = np.random.default_rng(5)
+        window = 50
+        store = CandleStore('BTC/USDT', '15m', window=window)
+        expected = []
+        bar = 0
+        for _ in range(2000):
+            # Oluşan mumu tekrar gönder (0-1 mum geriden) ve 0-3 yeni mum ekle
+            first = max(bar - int(rng.integers(0, 2)), 0)
+            bar += int(rng.integers(0, 4))
+            ohlcv = [[(i + 1) * TIMEFRAME_MS, *rng.random(5)] for i in range(first, bar + 1)]
+            store.merge(ohlcv)
+            reference_merge(expected, ohlcv, window)
+
+        actual = ohlcv_array(store.view())
+        ok = np.array_equal(actual, np.array(expected, dtype=np.float64))
+        print(f"  {'✓' if ok else '✗'} {len(store)} mum, son mum {store.last_timestamp // TIMEFRAME_MS}. "
+              f"(beklenen {int(expected[-1][0]) // TIMEFRAME_MS}.)")
+
+        before = len(store)
+        store.merge([[store.last_timestamp + TIMEFRAME_MS, 1.0, None, 1.0, 1.0, 1.0]])
+        nan_ok = len(store) == before and not np.isnan(ohlcv_array(store.view())).any()
+        print(f"  {'✓' if nan_ok else '✗'} eksik değerli mum atlandı")
+        return ok and nan_ok
+
+    except Exception as e:
+        print(f"✗ Birleştirme testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_views():
+    """Görünümler kopyasız olmalı; yeni mumlar ve dizi taşıma eski görünümü bozmamalı"""
+    print("\n" + "="*60)
+    print("2. KOPYASIZ GÖRÜNÜMLER")
+    print("="*60)
+
+    try:
+        store = CandleStore('BTC/USDT', '15m', window=10)
+        store.merge([[(i + 1) * TIMEFRAME_MS, i, i, i, i, i] for i in range(10)])
+        view = store.view()
+        closes = view['close']
+        shared = np.shares_memory(closes, store.buffer._data)
+
+        # Aynı zamanlı mum yerinde güncellenir
+        store.merge([[10 * TIMEFRAME_MS, 9, 9, 9, 99.0, 9]])
+        in_place = closes[-1] == 99.0
+
+        # Dizi dolup taşındıktan sonra eski görünüm aynı kalır
+        snapshot = closes.copy()
+        for i in range(10, 40):
+            store.merge([[(i + 1) * TIMEFRAME_MS, i, i, i, i, i]])
+        stable = np.array_equal(closes, snapshot) and len(store) == 10
+        latest = store.view()['close'][-1] == 39.0
+
+        ok = shared and in_place and stable and latest
+        print(f"  {'✓' if ok else '✗'} ortak bellek: {shared}, yerinde güncelleme: {in_place}, "
+              f"eski görünüm kararlı: {stable}")
+
+        df = store.to_dataframe()
+        df_ok = len(df) == 10 and str(df['timestamp'].dtype).startswith('datetime64')
+        print(f"  {'✓' if df_ok else '✗'} DataFrame isteğe bağlı: {len(df)} satır")
+        return ok and df_ok
+
+    except Exception as e:
+        print(f"✗ Görünüm testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("MUM DEPOSU TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Birleştirme", check_merge()))
+    results.append(("Kopyasız Görünümler", check_views()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
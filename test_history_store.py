@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geçmiş Mum Deposu Testi
+HistoryStore.backfill'in sayfa sayfa çektiği mumları gün bölümlerine yazdığını,
+yarıda kesilince kaldığı yerden devam ettiğini, borsadaki boşlukları
+find_gaps ile bildirdiğini, yarım yazılmış bölümü açılışta kırpıp
+onardığını ve CandleStore.warm_up'ın pencereyi diskten doldurduğunu dener (ağ gerekmez; borsa taklit edilir)
+
+Kullanım:
+  python test_history_store.py
+"""
+
+import logging
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from candle_store import CandleStore
+from history_store import DAY_MS, RECORD_BYTES, HistoryStore, day_of
+
+TIMEFRAME_MS = 900_000
+START_MS = 1_700_006_400_000 - 1_700_006_400_000 % DAY_MS  # UTC gün başı
+
+
+def random_candles(count, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.003, count)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.003)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.003)
+    volume = rng.lognormal(3, 0.6, count)
+    timestamps = START_MS + np.arange(count) * TIMEFRAME_MS
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+class FakeExchange:
+    """fetch_ohlcv'yi `since` / `limit` ile sayfalayan borsa; istenirse N sayfadan sonra hata verir"""
+
+    rateLimit = 0
+    enableRateLimit = True
+
+    def __init__(self, candles, now_ms=None, fail_after=None):
+        self.candles = candles
+        self.now_ms = now_ms if now_ms is not None else int(candles[-1, 0]) + TIMEFRAME_MS
+        self.fail_after = fail_after
+        self.requests = []
+
+    def milliseconds(self):
+        return self.now_ms
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        if self.fail_after is not None and len(self.requests) >= self.fail_after:
+            raise ConnectionError('binance GET klines: timeout')
+        self.requests.append(since)
+        start = np.searchsorted(self.candles[:, 0], since)
+        return self.candles[start:start + limit].tolist()
+
+
+def check_backfill_resume():
+    """Kesilen backfill tekrar çalışınca son mumdan devam etmeli, tekrar / eksik olmamalı"""
+    print("\n" + "="*60)
+    print("1. SAYFALI BACKFILL VE DEVAM")
+    print("="*60)
+
+    try:
+        candles = random_candles(96 * 3 + 40)
+        with tempfile.TemporaryDirectory() as root:
+            store = HistoryStore('BTC/USDT', '15m', root)
+            exchange = FakeExchange(candles, fail_after=2)
+            written = store.backfill(exchange, START_MS, limit=100, max_retries=0)
+            ok = written == 200 and store.last_timestamp == int(candles[199, 0])
+            print(f"  {'✓' if ok else '✗'} 2 sayfadan sonra bağlantı koptu: {written} mum yazıldı")
+
+            # Yeni süreç: depo diskten açılır, borsa yeniden çalışıyor
+            store = HistoryStore('BTC/USDT', '15m', root)
+            exchange = FakeExchange(candles)
+            written = store.backfill(exchange, START_MS, limit=100)
+            step_ok = (written == len(candles) - 200 and exchange.requests[0] == int(candles[200, 0]))
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Tekrar çalıştırma son mumdan devam etti: {written} mum, "
+                  f"{len(exchange.requests)} sayfa")
+
+            loaded = store.load()
+            step_ok = np.array_equal(loaded, candles) and store.days() == sorted(
+                {day_of(t) for t in candles[:, 0]})
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Diskteki {len(loaded)} mum borsayla aynı, "
+                  f"{len(store.days())} gün bölümü")
+
+            step_ok = store.backfill(FakeExchange(candles), START_MS, limit=100) == 0
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Güncel depo: yeni mum yazılmadı")
+
+            # Oluşmakta olan son mum yazılmaz
+            forming = np.vstack([candles, candles[-1] + [TIMEFRAME_MS, 0, 0, 0, 0, 0]])
+            exchange = FakeExchange(forming, now_ms=int(forming[-1, 0]) + TIMEFRAME_MS // 2)
+            step_ok = store.backfill(exchange, START_MS, limit=100) == 0
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Kapanmamış mum yazılmadı")
+
+            step_ok = np.array_equal(store.tail(50), candles[-50:])
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} tail(50) bölüm sınırını aşarak son mumları verdi")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Backfill testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_gaps():
+    """Borsada eksik mumlar find_gaps ile (gün sınırında da) bildirilmeli"""
+    print("\n" + "="*60)
+    print("2. BOŞLUK RAPORU")
+    print("="*60)
+
+    try:
+        candles = random_candles(96 * 3)
+        # 10 mumluk kesinti gün içinde, 6 mumluk kesinti gece yarısını kapsıyor
+        missing = np.r_[50:60, 96 * 2 - 3:96 * 2 + 3]
+        served = np.delete(candles, missing, axis=0)
+        with tempfile.TemporaryDirectory() as root:
+            store = HistoryStore('BTC/USDT', '15m', root)
+            store.backfill(FakeExchange(served), START_MS, limit=64)
+            gaps = store.find_gaps()
+            expected = [(int(candles[50, 0]), int(candles[59, 0]), 10),
+                        (int(candles[96 * 2 - 3, 0]), int(candles[96 * 2 + 2, 0]), 6)]
+            ok = gaps == expected
+            print(f"  {'✓' if ok else '✗'} {len(gaps)} boşluk: "
+                  f"{', '.join(f'{count} mum' for _, _, count in gaps)}")
+
+            step_ok = store.find_gaps(int(candles[96, 0]), int(candles[-1, 0])) == expected[1:]
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Aralık verildiğinde sadece içindeki boşluk bildirildi")
+
+            step_ok = HistoryStore('BTC/USDT', '15m', os.path.join(root, 'bos')).find_gaps() == []
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Boş depo: boşluk yok")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Boşluk testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_torn_partition():
+    """Yarım yazılmış son kayıt açılışta kırpılmalı, backfill eksik mumu yeniden yazmalı"""
+    print("\n" + "="*60)
+    print("3. YARIM BÖLÜM ONARIMI")
+    print("="*60)
+
+    try:
+        series = random_candles(96 * 2 + 4)
+        candles = series[:96 + 30]
+        with tempfile.TemporaryDirectory() as root:
+            store = HistoryStore('BTC/USDT', '15m', root)
+            store.append(candles[:120])
+
+            # Süreç son kaydın ortasında öldü: 121. mumun ilk 20 baytı diske yazılmış
+            path = store._partition_path(day_of(candles[120, 0]))
+            with open(path, 'ab') as f:
+                f.write(candles[120].tobytes()[:20])
+
+            store = HistoryStore('BTC/USDT', '15m', root)
+            ok = (store.last_timestamp == int(candles[119, 0])
+                  and os.path.getsize(path) % RECORD_BYTES == 0)
+            print(f"  {'✓' if ok else '✗'} Açılışta yarım kayıt kırpıldı, son mum diskteki son tam kayıt")
+
+            written = store.backfill(FakeExchange(candles), START_MS, limit=100)
+            step_ok = written == 6 and np.array_equal(store.load(), candles) and not store.find_gaps()
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Backfill kırpılan mumu ve kalanları yazdı ({written} mum), "
+                  f"boşluk yok")
+
+            # Sadece yarım kayıttan oluşan bölüm: boş okunur, önceki günden devam edilir
+            path = store._partition_path(day_of(series[96 * 2, 0]))
+            with open(path, 'wb') as f:
+                f.write(series[96 * 2].tobytes()[:RECORD_BYTES - 1])
+            store = HistoryStore('BTC/USDT', '15m', root)
+            step_ok = store.last_timestamp == int(candles[-1, 0]) and os.path.getsize(path) == 0
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Tek yarım kayıtlı bölüm boşaltıldı, önceki günden devam")
+
+            written = store.backfill(FakeExchange(series), START_MS, limit=100)
+            step_ok = written == len(series) - len(candles) and np.array_equal(store.load(), series)
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Backfill boş bölümü doldurdu ({written} mum)")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Yarım bölüm testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_warm_up():
+    """Bot ısınması kapalıyken kaçan mumları çekmeli ve pencereyi diskten doldurmalı"""
+    print("\n" + "="*60)
+    print("4. BOT ISINMASI")
+    print("="*60)
+
+    try:
+        candles = random_candles(96 + 60)
+        with tempfile.TemporaryDirectory() as root:
+            HistoryStore('BTC/USDT', '15m', root).append(candles[:100])
+
+            # Bot 56 mum boyunca kapalıydı
+            store = CandleStore('BTC/USDT', '15m', window=80, history=HistoryStore('BTC/USDT', '15m', root))
+            exchange = FakeExchange(candles)
+            loaded = store.warm_up(exchange)
+            view = store.view()
+            ok = (loaded == 80 and np.array_equal(view['timestamp'], candles[-80:, 0].astype(np.int64))
+                  and np.array_equal(view['close'], candles[-80:, 4]))
+            print(f"  {'✓' if ok else '✗'} Kaçan mumlar {len(exchange.requests)} istekle çekildi, "
+                  f"pencere son {loaded} mumla dolu")
+
+            step_ok = np.array_equal(store.history.load(), candles) and not store.history.find_gaps()
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Kaçan mumlar diske de yazıldı, boşluk yok")
+
+            history = HistoryStore('BTC/USDT', '15m', os.path.join(root, 'bos'))
+            empty = CandleStore('BTC/USDT', '15m', history=history)
+            step_ok = empty.warm_up(FakeExchange(candles)) == 0 and not len(empty)
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Boş depo: ısınma atlandı, pencere REST ile dolacak")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Isınma testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    print("\n" + "="*60)
+    print("GEÇMİŞ MUM DEPOSU TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Backfill / Devam", check_backfill_resume()))
+    results.append(("Boşluk Raporu", check_gaps()))
+    results.append(("Yarım Bölüm Onarımı", check_torn_partition()))
+    results.append(("Bot Isınması", check_warm_up()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
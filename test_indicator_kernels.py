@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İndikatör Çekirdekleri Parite Testi
+NumPy çekirdeklerinin (indicator_kernels) ve akışkan motorun (streaming_indicators)
+`ta` kütüphanesi ile aynı sonucu verdiğini kontrol eder
+
+Kullanım:
+  python test_indicator_kernels.py            # Testleri çalıştır
+  python test_indicator_kernels.py --regenerate  # Golden dosyaları sentetik mumlardan yeniden üret
+  python test_indicator_kernels.py --record      # Golden dosyaları Binance mumlarından üret
+"""
+
+import os
+import sys
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+TOLERANCE = 1e-9  # Göreli hata toleransı
+
+# Günlük bot (15m) ve haftalık bot (1h) parametreleri
+PARAM_SETS = {
+    'daily': {
+        'rsi': 9,
+        'ema': {'ema_short': 9, 'ema_medium': 21, 'ema_long': 50},
+        'macd': (8, 17, 9),
+        'bollinger': (20, 2),
+        'stochastic': (14, 3),
+        'atr': 14,
+        'volume_ma': 20,
+    },
+    'weekly': {
+        'rsi': 14,
+        'ema': {'ema_20': 20, 'ema_50': 50},
+        'macd': (12, 26, 9),
+        'bollinger': (20, 2),
+        'atr': 14,
+        'volume_ma': 20,
+    },
+}
+
+
+def synthetic_candles(n=300, seed=42):
+    """Tekrarlanabilir sentetik 15 dakikalık mumlar"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = 40000 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.random(n) * 0.002)
+    low = np.minimum(open_, close) * (1 - rng.random(n) * 0.002)
+    volume = rng.lognormal(3, 0.5, n)
+    timestamp = 1_700_000_000_000 + np.arange(n) * 900_000
+    return pd.DataFrame({'timestamp': timestamp, 'open': open_, 'high': high,
+                         'low': low, 'close': close, 'volume': volume})
+
+
+def ta_reference(df, params):
+    """Aynı kolonları `ta` kütüphanesi ile hesapla"""
+    import pandas as pd
+    from ta.momentum import RSIIndicator, StochasticOscillator
+    from ta.trend import MACD, EMAIndicator
+    from ta.volatility import BollingerBands, AverageTrueRange
+
+    out = pd.DataFrame(index=df.index)
+    out['rsi'] = RSIIndicator(close=df['close'], window=params['rsi']).rsi()
+    for name, window in params['ema'].items():
+        out[name] = EMAIndicator(close=df['close'], window=window).ema_indicator()
+
+    fast, slow, sign = params['macd']
+    macd = MACD(close=df['close'], window_slow=slow, window_fast=fast, window_sign=sign)
+    out['macd'] = macd.macd()
+    out['macd_signal'] = macd.macd_signal()
+    out['macd_diff'] = macd.macd_diff()
+
+    bb = BollingerBands(close=df['close'], window=params['bollinger'][0],
+                        window_dev=params['bollinger'][1])
+    out['bb_high'] = bb.bollinger_hband()
+    out['bb_mid'] = bb.bollinger_mavg()
+    out['bb_low'] = bb.bollinger_lband()
+
+    if params.get('stochastic'):
+        stoch = StochasticOscillator(high=df['high'], low=df['low'], close=df['close'],
+                                     window=params['stochastic'][0],
+                                     smooth_window=params['stochastic'][1])
+        out['stoch_k'] = stoch.stoch()
+        out['stoch_d'] = stoch.stoch_signal()
+
+    out['volume_ma'] = df['volume'].rolling(window=params['volume_ma']).mean()
+    out['volume_ratio'] = df['volume'] / out['volume_ma']
+    out['atr'] = AverageTrueRange(high=df['high'], low=df['low'], close=df['close'],
+                                  window=params['atr']).average_true_range()
+    return out
+
+
+def compare(actual, expected):
+    """İki kolonu karşılaştır, (başarılı, maksimum göreli hata) döndür"""
+    import numpy as np
+
+    actual = np.asarray(actual, dtype=float)
+    expected = np.asarray(expected, dtype=float)
+    if not (np.isnan(actual) == np.isnan(expected)).all():
+        return False, float('inf')
+    mask = ~np.isnan(expected)
+    if not mask.any():
+        return True, 0.0
+    error = np.abs(actual[mask] - expected[mask]) / np.maximum(1.0, np.abs(expected[mask]))
+    return bool(error.max() <= TOLERANCE), float(error.max())
+
+
+def check_columns(actual, expected):
+    all_ok = True
+    for column in expected.columns:
+        ok, error = compare(actual[column], expected[column])
+        mark = "✓" if ok else "✗"
+        print(f"  {mark} {column:14} max hata: {error:.2e}")
+        all_ok = all_ok and ok
+    return all_ok
+
+
+def golden_path(set_name):
+    return os.path.join(GOLDEN_DIR, f'{set_name}_indicators.csv')
+
+
+def write_golden(df):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for set_name, params in PARAM_SETS.items():
+        out = df.join(ta_reference(df, params))
+        out.to_csv(golden_path(set_name), index=False, float_format='%.17g')
+        print(f"✓ {golden_path(set_name)} yazıldı ({len(out)} satır)")
+
+
+def record_golden():
+    """Binance'den 15 dakikalık mum kaydet ve golden dosyaları üret"""
+    import ccxt
+    import pandas as pd
+
+    exchange = ccxt.binance({'enableRateLimit': True})
+    ohlcv = exchange.fetch_ohlcv('BTC/USDT', '15m', limit=300)
+    write_golden(pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']))
+
+
+def check_golden_files():
+    """Çekirdekleri kayıtlı golden dosyalarla karşılaştır (ta kurulu olmasa da çalışır)"""
+    print("\n" + "="*60)
+    print("1. GOLDEN DOSYA PARİTESİ")
+    print("="*60)
+
+    try:
+        import pandas as pd
+        from indicator_kernels import compute_indicators
+
+        all_ok = True
+        for set_name, params in PARAM_SETS.items():
+            golden = pd.read_csv(golden_path(set_name))
+            candles = golden[['open', 'high', 'low', 'close', 'volume']]
+            actual = pd.DataFrame(compute_indicators(*(candles[c].values for c in candles), **params))
+            expected = golden.drop(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            print(f"\n  {set_name} ({len(golden)} mum):")
+            all_ok = check_columns(actual, expected) and all_ok
+        return all_ok
+
+    except FileNotFoundError as e:
+        print(f"✗ Golden dosya bulunamadı: {e}")
+        return False
+    except Exception as e:
+        print(f"✗ Golden parite hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_synthetic_parity():
+    """Çekirdekleri uzun sentetik seride `ta` ile karşılaştır"""
+    print("\n" + "="*60)
+    print("2. SENTETİK SERİ PARİTESİ (NumPy çekirdekleri)")
+    print("="*60)
+
+    try:
+        import pandas as pd
+        import indicator_kernels
+        from indicator_kernels import compute_indicators
+
+        print(f"  JIT: {'açık (numba)' if indicator_kernels.USE_JIT else 'kapalı (saf NumPy)'}")
+        df = synthetic_candles(n=5000, seed=7)
+        all_ok = True
+        for set_name, params in PARAM_SETS.items():
+            actual = pd.DataFrame(compute_indicators(df['open'], df['high'], df['low'],
+                                                     df['close'], df['volume'], **params))
+            print(f"\n  {set_name}:")
+            all_ok = check_columns(actual, ta_reference(df, params)) and all_ok
+        return all_ok
+
+    except ImportError as e:
+        print(f"✗ Paket eksik: {e}")
+        return False
+    except Exception as e:
+        print(f"✗ Sentetik parite hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_streaming_parity():
+    """Akışkan çerçeveyi oluşan mum güncellemeleri ile `ta` ile karşılaştır"""
+    print("\n" + "="*60)
+    print("3. AKIŞKAN MOTOR PARİTESİ (oluşan mum geri alma dahil)")
+    print("="*60)
+
+    try:
+        import numpy as np
+        import pandas as pd
+        from streaming_indicators import IndicatorFrame
+
+        df = synthetic_candles(n=2000, seed=11)
+        rng = np.random.default_rng(3)
+        all_ok = True
+        for set_name, params in PARAM_SETS.items():
+            frame = IndicatorFrame(history=len(df))
+            columns = frame.register(set_name, params)
+            for row in df.itertuples(index=False):
+                # Mum kapanmadan önce iki ara güncelleme
+                for _ in range(2):
+                    close = row.close * (1 + rng.normal(0, 0.001))
+                    frame.update(row.timestamp, row.open, max(row.high, close),
+                                 min(row.low, close), close, row.volume * rng.random())
+                frame.update(*row)
+
+            records = frame.select(frame.buffer.view(), set_name)
+            actual = pd.DataFrame({column: records[column] for column in columns})
+            print(f"\n  {set_name}:")
+            all_ok = check_columns(actual, ta_reference(df, params)) and all_ok
+        return all_ok
+
+    except ImportError as e:
+        print(f"✗ Paket eksik: {e}")
+        return False
+    except Exception as e:
+        print(f"✗ Akışkan parite hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_session_vwap():
+    """Seans VWAP çekirdeği ve akışkan akümülatörü pandas groupby ile karşılaştır"""
+    print("\n" + "="*60)
+    print("4. SEANS VWAP (UTC gün sınırı)")
+    print("="*60)
+
+    try:
+        import pandas as pd
+        from indicator_kernels import session_vwap
+        from streaming_indicators import IndicatorFrame
+
+        df = synthetic_candles(n=1000, seed=5)
+        day = pd.to_datetime(df['timestamp'], unit='ms').dt.floor('D')
+        pv = (df['high'] + df['low'] + df['close']) / 3 * df['volume']
+        expected = pv.groupby(day).cumsum() / df['volume'].groupby(day).cumsum()
+
+        vectorized = session_vwap(df['timestamp'], df['high'], df['low'], df['close'], df['volume'])
+        frame = IndicatorFrame(history=len(df))
+        frame.register('vwap', {'vwap': 0})
+        for row in df.itertuples(index=False):
+            frame.update(*row)
+        streaming = pd.Series(frame.select(frame.buffer.view(), 'vwap')['vwap'])
+
+        all_ok = True
+        for name, actual in [('vektörize', vectorized), ('akışkan', streaming)]:
+            ok, error = compare(actual, expected)
+            print(f"  {'✓' if ok else '✗'} {name:14} max hata: {error:.2e}")
+            all_ok = all_ok and ok
+        return all_ok
+
+    except Exception as e:
+        print(f"✗ VWAP test hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_batch_rows():
+    """(sembol x mum) 2 boyutlu giriş her satırda tek sembol sonucu ile aynı olmalı"""
+    print("\n" + "="*60)
+    print("5. ÇOKLU SEMBOL (2 BOYUTLU GİRİŞ)")
+    print("="*60)
+
+    try:
+        import numpy as np
+        from indicator_kernels import compute_indicators
+
+        frames = [synthetic_candles(n=250, seed=seed) for seed in range(8)]
+        stacked = {name: np.stack([df[name].to_numpy() for df in frames])
+                   for name in ('open', 'high', 'low', 'close', 'volume')}
+        timestamps = frames[0]['timestamp'].to_numpy()
+
+        all_ok = True
+        for set_name, params in PARAM_SETS.items():
+            params = dict(params, vwap=0)
+            batch = compute_indicators(stacked['open'], stacked['high'], stacked['low'],
+                                       stacked['close'], stacked['volume'],
+                                       timestamps=timestamps, **params)
+            worst = 0.0
+            for i, df in enumerate(frames):
+                single = compute_indicators(df['open'], df['high'], df['low'], df['close'],
+                                            df['volume'], timestamps=timestamps, **params)
+                for name, values in single.items():
+                    ok, error = compare(batch[name][i], values)
+                    all_ok = all_ok and ok
+                    worst = max(worst, error)
+            print(f"  {'✓' if all_ok else '✗'} {set_name:8} {len(frames)} sembol, max hata: {worst:.2e}")
+        return all_ok
+
+    except Exception as e:
+        print(f"✗ Çoklu sembol test hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    if '--regenerate' in sys.argv:
+        write_golden(synthetic_candles())
+        return
+    if '--record' in sys.argv:
+        record_golden()
+        return
+
+    print("\n" + "="*60)
+    print("İNDİKATÖR ÇEKİRDEKLERİ - PARİTE TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Golden Dosyalar", check_golden_files()))
+    results.append(("Sentetik Parite", check_synthetic_parity()))
+    results.append(("Akışkan Motor", check_streaming_parity()))
+    results.append(("Seans VWAP", check_session_vwap()))
+    results.append(("Çoklu Sembol", check_batch_rows()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+
+    if all_passed:
+        print("\n🎉 TÜM TESTLER BAŞARILI!")
+    else:
+        print("\n⚠️  BAZI TESTLER BAŞARISIZ!")
+
+    print("")
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
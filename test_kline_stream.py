@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebSocket Kline Akışı Testi
+KlineStream'in kline / bookTicker mesajlarını CandleStore'a ve geri çağırmalara
+işlediğini, yerel replay sunucusuyla kopan bağlantı sonrası boşluğu REST ile
+doldurduğunu, sessiz akışta yeniden bağlandığını ve websockets kurulu değilse
+REST'e düştüğünü dener (internet gerekmez; yerel replay sunucusu kullanılır)
+
+Kullanım:
+  python test_kline_stream.py
+"""
+
+import logging
+import sys
+import time
+
+import numpy as np
+
+import kline_stream
+from candle_store import CandleStore
+from kline_stream import KlineStream, ReplayServer, replay_benchmark
+
+TIMEFRAME_MS = 900_000
+
+
+def random_candles(count, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.003, count)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.003)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.003)
+    volume = rng.lognormal(3, 0.6, count)
+    timestamps = 1_700_006_400_000 + np.arange(count) * TIMEFRAME_MS
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def check_handle():
+    """Kline mesajları mumu güncellemeli, bookTicker anlık fiyatı vermeli"""
+    print("\n" + "="*60)
+    print("1. MESAJ İŞLEME")
+    print("="*60)
+
+    try:
+        candles = random_candles(3)
+        # Mesajlar replay sunucusunun ürettiği Binance formatında (sunucu başlatılmaz)
+        server = ReplayServer(candles, updates_per_bar=3)
+        store = CandleStore('BTC/USDT', '15m', window=10)
+        stream = KlineStream([store])
+        closes, prices = [], []
+        stream.close_callbacks.append(lambda timeframe, candle: closes.append((timeframe, candle[0])))
+        stream.price_callbacks.append(lambda price, event_ms: prices.append(price))
+
+        for step in range(2):
+            for message in server._messages(server.candles[0], step):
+                stream._handle(message)
+        forming = store.view()
+        ok = (len(forming) == 1 and not closes and forming['volume'][-1] < candles[0, 5]
+              and stream.stats['klines'] == 2)
+        print(f"  {'✓' if ok else '✗'} Oluşan mum güncellemeleri yerinde işlendi, kapanış bildirilmedi")
+
+        for candle in server.candles:
+            for message in server._messages(candle, 2):
+                stream._handle(message)
+        view = store.view()
+        step_ok = (len(view) == 3 and np.array_equal(view['close'], candles[:, 4])
+                   and np.array_equal(view['volume'], candles[:, 5])
+                   and closes == [('15m', int(t)) for t in candles[:, 0]]
+                   and stream.stats['closed_bars'] == 3)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} {len(closes)} kapanış bildirimi, pencere kapanan mumlarla aynı")
+
+        step_ok = (stream.last_price == candles[-1, 4] and prices[-1] == candles[-1, 4]
+                   and len(prices) == stream.stats['prices'] == 5)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} bookTicker: anlık fiyat alış / satış ortası ({stream.last_price:.2f})")
+
+        # Abone olunmayan timeframe yok sayılır
+        other = ReplayServer(candles, timeframe='1h')
+        stream._handle(other._messages(other.candles[0], 2)[0])
+        step_ok = len(store.view()) == 3 and stream.stats['klines'] == 5
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Abone olunmayan timeframe yok sayıldı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Mesaj işleme testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_replay_reconnect():
+    """Bağlantı koptuğunda kaçan mumlar REST ile doldurulmalı, pencere kayıpsız olmalı"""
+    print("\n" + "="*60)
+    print("2. REPLAY VE YENİDEN BAĞLANMA")
+    print("="*60)
+
+    try:
+        result = replay_benchmark(random_candles(320), bars_per_second=100, drop_after=40, window=100)
+        ok = (result['window_matches'] and result['connects'] >= 2 and result['backfills'] >= 2
+              and result['closed_bars'] > 0 and result['errors'] >= 1)
+        print(f"  {'✓' if ok else '✗'} {result['bars']} mum, {result['connects']} bağlantı, "
+              f"{result['rest_requests']} REST isteği, pencere "
+              f"{'aynı' if result['window_matches'] else 'FARKLI'}")
+        print(f"  ✓ Gecikme: {result['latency_ms']}")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Replay testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_stale_and_stop():
+    """Sessiz akışta yeniden bağlanmalı; stop() sonrası store'lar REST'e dönmeli"""
+    print("\n" + "="*60)
+    print("3. SESSİZ AKIŞ VE DURDURMA")
+    print("="*60)
+
+    server = None
+    stream = None
+    try:
+        # Saniyede 0.1 mum: ilk mesajdan sonra akış saniyelerce sessiz kalır
+        server = ReplayServer(random_candles(5), bars_per_second=0.1).start()
+        store = CandleStore('BTC/USDT', '15m', window=10)
+        stream = KlineStream([store], server.rest(), url=server.url, stale_after=0.3).start()
+
+        live = wait_until(lambda: store.live)
+        ok = live and stream.healthy
+        print(f"  {'✓' if ok else '✗'} Bağlandı, store REST isteği yapmıyor (live)")
+
+        stale = wait_until(lambda: stream.stats['stale'] >= 1 and stream.stats['connects'] >= 2)
+        ok = ok and stale
+        print(f"  {'✓' if stale else '✗'} Sessiz akış: {stream.stats['stale']} kez bayat, "
+              f"{stream.stats['connects']} bağlantı")
+
+        stream.stop()
+        step_ok = not stream._thread.is_alive() and not stream.healthy and not store.live
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} stop(): iş parçacığı durdu, store REST'e döndü")
+
+        stream.stop()  # Kapanış yolunda ikinci çağrı hata vermemeli
+        print("  ✓ İkinci stop() çağrısı sorunsuz")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Sessiz akış testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if stream is not None:
+            stream.stop()
+        if server is not None:
+            server.stop()
+
+
+def check_optional_dependency():
+    """websockets kurulu değilse attach() None dönmeli (bot REST ile devam eder)"""
+    print("\n" + "="*60)
+    print("4. İSTEĞE BAĞLI BAĞIMLILIK")
+    print("="*60)
+
+    original = kline_stream.websockets
+    try:
+        kline_stream.websockets = None
+        store = CandleStore('BTC/USDT', '15m')
+        ok = not kline_stream.available() and kline_stream.attach([store], None) is None
+        try:
+            KlineStream([store])
+            ok = False
+        except ImportError:
+            pass
+        print(f"  {'✓' if ok else '✗'} websockets yok: attach() None, KlineStream ImportError")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Bağımlılık testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        kline_stream.websockets = original
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    print("\n" + "="*60)
+    print("WEBSOCKET KLINE AKIŞI TESTİ")
+    print("="*60)
+
+    if not kline_stream.available():
+        print("✗ websockets kurulu değil: pip install websockets")
+        return 1
+
+    results = []
+    results.append(("Mesaj İşleme", check_handle()))
+    results.append(("Replay / Yeniden Bağlanma", check_replay_reconnect()))
+    results.append(("Sessiz Akış / Durdurma", check_stale_and_stop()))
+    results.append(("İsteğe Bağlı Bağımlılık", check_optional_dependency()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hafif ccxt Yükleyici Testi
+lazy_ccxt.binance()'ın ccxt paket __init__'ini çalıştırmadan borsa nesnesi
+verdiğini ve piyasa bilgisini disk önbelleğinden (taze / eski / farklı piyasa
+tipi) doğru yüklediğini dener (ağ gerekmez; load_markets taklit edilir)
+
+Kullanım:
+  python test_lazy_ccxt.py
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+import lazy_ccxt
+
+MARKETS = {'BTC/USDT': {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT',
+                        'baseId': 'BTC', 'quoteId': 'USDT', 'type': 'spot', 'spot': True,
+                        'active': True, 'precision': {'amount': 5, 'price': 2},
+                        'limits': {'amount': {'min': 1e-5, 'max': None}}}}
+
+LAZY_IMPORT = """
+import sys
+import lazy_ccxt
+exchange = lazy_ccxt.binance(markets_cache=None)
+lazy = 'ccxt' not in sys.modules and not any(name.startswith('ccxt.bybit') for name in sys.modules)
+errors = lazy_ccxt.NetworkError.__module__
+import ccxt
+same = ccxt.binance is type(exchange) and ccxt.NetworkError is lazy_ccxt.NetworkError
+print(lazy, errors, same, exchange.options['fetchMarkets']['types'])
+"""
+
+
+class MarketsDownload:
+    """binance.load_markets yerine geçer: çağrıları sayar, istenirse hata verir"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self, exchange, reload=False, params={}):
+        self.calls += 1
+        if self.fail:
+            raise lazy_ccxt.NetworkError('binance GET exchangeInfo: timeout')
+        exchange.set_markets(MARKETS)
+        return exchange.markets
+
+
+def check_lazy_import():
+    """ccxt paketi yüklenmeden binance nesnesi ve hata sınıfları gelmeli"""
+    print("\n" + "="*60)
+    print("1. TEMBEL YÜKLEME")
+    print("="*60)
+
+    try:
+        # Temiz yorumlayıcı: bu süreçte ccxt başka testlerce yüklenmiş olabilir
+        output = subprocess.run([sys.executable, '-c', LAZY_IMPORT], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=60)
+        lazy, errors, same, types = output.stdout.split(maxsplit=3)
+        ok = lazy == 'True' and errors == 'ccxt.base.errors'
+        print(f"  {'✓' if ok else '✗'} binance() ve NetworkError paket __init__'i çalışmadan yüklendi")
+
+        step_ok = same == 'True'
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Sonraki `import ccxt` aynı sınıfları kullandı")
+
+        step_ok = types.strip() == "['spot']"
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Sadece spot piyasa istenir: {types.strip()}")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Tembel yükleme testi hatası: {e}")
+        if 'output' in locals():
+            print(output.stderr)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_markets_cache():
+    """Piyasa bilgisi TTL içinde önbellekten, sonra borsadan yüklenmeli"""
+    print("\n" + "="*60)
+    print("2. PİYASA ÖNBELLEĞİ")
+    print("="*60)
+
+    binance = lazy_ccxt.import_ccxt('binance').binance
+    original = binance.load_markets
+    download = MarketsDownload()
+    try:
+        binance.load_markets = lambda exchange, reload=False, params={}: download(exchange, reload, params)
+        with tempfile.TemporaryDirectory() as root:
+            exchange = lazy_ccxt.binance(markets_cache=root)
+            path = os.path.join(root, 'binance.json')
+            with open(path) as f:
+                cached = json.load(f)
+            ok = (download.calls == 1 and cached['types'] == ['spot']
+                  and cached['markets']['BTC/USDT']['id'] == 'BTCUSDT')
+            print(f"  {'✓' if ok else '✗'} İlk başlatma: borsadan indirildi, diske yazıldı")
+
+            exchange = lazy_ccxt.binance(markets_cache=root)
+            step_ok = download.calls == 1 and exchange.market('BTC/USDT')['id'] == 'BTCUSDT'
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Yeniden başlatma: önbellekten, ağ isteği yok")
+
+            status = lazy_ccxt.load_markets(lazy_ccxt.binance(markets_cache=None), root, ttl=0)
+            step_ok = status == 'network' and download.calls == 2
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} TTL doldu: yeniden indirildi ({status})")
+
+            download.fail = True
+            exchange = lazy_ccxt.binance(markets_cache=None)
+            status = lazy_ccxt.load_markets(exchange, root, ttl=0)
+            step_ok = status == 'stale' and exchange.market('BTC/USDT')['id'] == 'BTCUSDT'
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} İndirme hatası: eski önbellek kullanıldı ({status})")
+
+            # Farklı piyasa tipleriyle yazılmış önbellek kullanılmaz
+            exchange = lazy_ccxt.binance({'options': {'fetchMarkets': {'types': ['spot', 'linear']}}},
+                                         markets_cache=None)
+            status = lazy_ccxt.load_markets(exchange, root)
+            step_ok = status is None and not exchange.markets
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Farklı piyasa tipi: önbellek yok sayıldı, "
+                  f"indirme ilk isteğe kaldı")
+
+            with open(path, 'w') as f:
+                f.write('{"saved": ')
+            download.fail = False
+            status = lazy_ccxt.load_markets(lazy_ccxt.binance(markets_cache=None), root)
+            step_ok = status == 'network' and download.calls == 5
+            ok = ok and step_ok
+            print(f"  {'✓' if step_ok else '✗'} Bozuk önbellek dosyası: yeniden indirildi")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Piyasa önbelleği testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        binance.load_markets = original
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print("\n" + "="*60)
+    print("HAFİF CCXT YÜKLEYİCİ TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Tembel Yükleme", check_lazy_import()))
+    results.append(("Piyasa Önbelleği", check_markets_cache()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
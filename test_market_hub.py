@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Veri Merkezi Testi
+1m mumlardan üst periyot toplamayı ve merkezden abonelere yayını dener
+(ağ gerekmez; borsa 1m mumlarla taklit edilir, merkez yerel portta çalışır)
+
+Kullanım:
+  python test_market_hub.py
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from candle_store import CandleStore, candle_array, ohlcv_array
+from market_hub import HubClient, MarketHub, resample, timeframe_ms
+
+START_MS = 1_700_000_000_000 - 1_700_000_000_000 % 3_600_000
+
+
+def minute_candles(count, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 40000 + np.cumsum(rng.normal(0, 20, count))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.random(count) * 10
+    low = np.minimum(open_, close) - rng.random(count) * 10
+    timestamps = START_MS + np.arange(count) * 60_000
+    return np.column_stack([timestamps, open_, high, low, close, rng.random(count) * 5])
+
+
+def pandas_resample(ohlcv, timeframe):
+    """Beklenen sonuç: pandas ile bağımsız toplama"""
+    df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df.index = pd.to_datetime(df['timestamp'].astype(np.int64), unit='ms')
+    bars = df.resample(pd.Timedelta(milliseconds=timeframe_ms(timeframe))).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}).dropna()
+    timestamps = bars.index.as_unit('ms').asi8.astype(np.float64)
+    return np.column_stack([timestamps, bars.to_numpy()])
+
+
+class FakeExchange:
+    """`now` dakikasına kadar (oluşan mum dahil) 1m verisinden mum sunan REST taklidi"""
+
+    def __init__(self, minutes):
+        self.minutes = minutes
+        self.now = 0  # Oluşmakta olan 1m mumun indeksi
+        self.requests = []  # İstenen timeframe'ler
+
+    def parse_timeframe(self, timeframe):
+        return timeframe_ms(timeframe) // 1000
+
+    def milliseconds(self):
+        return int(self.minutes[self.now][0]) + 30_000
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.requests.append(timeframe)
+        rows = self.minutes[:self.now + 1]
+        if timeframe != '1m':
+            rows = pandas_resample(rows, timeframe)
+        if since is not None:
+            rows = rows[rows[:, 0] >= since][:limit or 500]
+        else:
+            rows = rows[-(limit or 500):]
+        return rows.tolist()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def check_resample():
+    """1m -> 15m / 1h toplama pandas ile aynı olmalı"""
+    print("\n" + "="*60)
+    print("1. ÜST PERİYOT TOPLAMA")
+    print("="*60)
+
+    try:
+        minutes = minute_candles(1000)
+        ok = True
+        for timeframe in ('15m', '1h'):
+            actual = resample(candle_array(minutes), timeframe_ms(timeframe))
+            expected = pandas_resample(minutes, timeframe)
+            same = actual.shape == expected.shape and np.allclose(actual, expected, rtol=1e-12)
+            print(f"  {'✓' if same else '✗'} {timeframe}: {len(actual)} mum")
+            ok = ok and same
+        return ok
+
+    except Exception as e:
+        print(f"✗ Toplama testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_broadcast():
+    """İki abone aynı mumları almalı; abonelik borsaya istek eklememeli"""
+    print("\n" + "="*60)
+    print("2. ABONELERE YAYIN")
+    print("="*60)
+
+    hub = clients = None
+    try:
+        minutes = minute_candles(600)
+        exchange = FakeExchange(minutes)
+        exchange.now = 300
+        hub = MarketHub(exchange, address=('127.0.0.1', 0), window=50, stream=False,
+                        poll_interval=0.05).start()
+        startup_requests = len(exchange.requests)
+
+        stores = [CandleStore('BTC/USDT', '15m', window=20), CandleStore('BTC/USDT', '1h', window=20)]
+        clients = [HubClient([store], hub.address) for store in stores]
+        for client in clients:
+            client.start()
+        live_ok = wait_for(lambda: all(store.live for store in stores))
+        print(f"  {'✓' if live_ok else '✗'} abonelerin anlık görüntüsü alındı, REST kapalı")
+
+        # 1m mumlar ilerlerken aboneler yerelde toplanan mumları almalı
+        for now in range(301, 420, 7):
+            exchange.now = now
+            before = hub.stats['base_updates']
+            wait_for(lambda: hub.stats['base_updates'] > before + 1)
+        wait_for(lambda: False, 0.3)
+
+        ok = live_ok
+        for store in stores:
+            expected = pandas_resample(minutes[:exchange.now + 1], store.timeframe)[-store.window:]
+            actual = ohlcv_array(store.view())
+            same = actual.shape == expected.shape and np.allclose(actual, expected, rtol=1e-12)
+            print(f"  {'✓' if same else '✗'} {store.timeframe}: {len(store)} mum, son mum "
+                  f"{'aynı' if same else 'farklı'}")
+            ok = ok and same
+
+        # Açılıştan sonra sadece merkezin 1m yoklaması (abonelerden istek gelmez)
+        later = exchange.requests[startup_requests:]
+        load_ok = set(later) == {'1m'} and all(client.stats['connects'] == 1 for client in clients)
+        print(f"  {'✓' if load_ok else '✗'} açılışta {startup_requests} istek, sonra sadece "
+              f"{len(later)} 1m isteği ({len(clients)} abone)")
+        return ok and load_ok
+
+    except Exception as e:
+        print(f"✗ Yayın testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        for client in clients or []:
+            client.stop()
+        if hub is not None:
+            hub.stop()
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("VERİ MERKEZİ TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Üst Periyot Toplama", check_resample()))
+    results.append(("Abonelere Yayın", check_broadcast()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrik Testi
+@timed aşama sürelerinin ve hata sayaçlarının histograma yazıldığını,
+instrument_exchange'in uç nokta bazında istek / hata saydığını ve serve()'ün
+yerel /metrics adresinde geçerli Prometheus metin formatı sunduğunu dener
+(ağ gerekmez; yerel bir port kullanılır, borsa taklit edilir)
+
+Kullanım:
+  python test_metrics.py
+"""
+
+import logging
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from metrics import BUCKETS, Registry, instrument_exchange, serve, timed, watch_candles
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="[^"]*",?)*\})? (\S+)$')
+
+
+def parse(text):
+    """Prometheus metin formatını {(isim, etiketler): değer} sözlüğüne çevir; geçersiz satır hata verir"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('# HELP ') or line.startswith('# TYPE '):
+            continue
+        match = SAMPLE.match(line)
+        if match is None:
+            raise ValueError(f"Geçersiz satır: {line!r}")
+        name, labels, value = match.groups()
+        labels = tuple(re.findall(r'([a-zA-Z_][a-zA-Z0-9_]*)="([^"]*)"', labels or ''))
+        samples[name, labels] = float(value)
+    return samples
+
+
+class FakeExchange:
+    """ccxt'nin düşük seviye fetch(url, method, headers, body) metodunu taklit eder"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        self.calls += 1
+        if 'ticker' in url:
+            raise ConnectionError('timeout')
+        return []
+
+
+class FakeCandles:
+    timeframe = '15m'
+    last_timestamp = None
+
+
+def check_stage_timings():
+    """@timed süreleri aşama histogramına, hataları hata sayacına yazmalı"""
+    print("\n" + "="*60)
+    print("1. AŞAMA SÜRELERİ")
+    print("="*60)
+
+    try:
+        registry = Registry()
+
+        @timed('fetch', registry)
+        def fetch(delay):
+            time.sleep(delay)
+            return delay
+
+        @timed('signals', registry)
+        def signals():
+            raise ValueError('NaN')
+
+        results = [fetch(0.002), fetch(0.03), fetch(0)]
+        try:
+            signals()
+            raised = False
+        except ValueError:
+            raised = True
+
+        histogram = registry.histograms['bot_stage_seconds', (('stage', 'fetch'),)]
+        ok = (results == [0.002, 0.03, 0] and histogram.count == 3
+              and 0.032 <= histogram.sum < 1 and histogram.max >= 0.03)
+        print(f"  {'✓' if ok else '✗'} fetch: {histogram.count} ölçüm, toplam {histogram.sum * 1000:.1f}ms, "
+              f"dönüş değeri korundu")
+
+        step_ok = (raised and registry.histograms['bot_stage_seconds', (('stage', 'signals'),)].count == 1
+                   and registry.counters['bot_stage_errors_total', (('stage', 'signals'),)] == 1
+                   and ('bot_stage_errors_total', (('stage', 'fetch'),)) not in registry.counters)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} signals: hata yeniden fırlatıldı, süre ve hata sayacı yazıldı")
+
+        # Kova sınırı dahildir (le = "küçük eşit")
+        histogram = Registry()
+        for value in (0.001, 0.0011, 0.2, 20):
+            histogram.observe('h', value)
+        histogram = histogram.histograms['h', ()]
+        step_ok = (histogram.counts[BUCKETS.index(0.001)] == 1 and histogram.counts[BUCKETS.index(0.0025)] == 1
+                   and histogram.counts[-1] == 1 and histogram.quantile(0.5) == 0.0025
+                   and histogram.quantile(1) == 20)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Kovalar: sınır değeri kendi kovasında, "
+              f"p50≤{histogram.quantile(0.5)}s, +Inf kovası için max")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Aşama süresi testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_exchange_counters():
+    """instrument_exchange istekleri uç nokta bazında saymalı, tekrar sarmamalı"""
+    print("\n" + "="*60)
+    print("2. BORSA İSTEK SAYAÇLARI")
+    print("="*60)
+
+    try:
+        registry = Registry()
+        exchange = instrument_exchange(FakeExchange(), registry)
+        instrument_exchange(exchange, registry)  # İkinci çağrı yeniden sarmamalı
+
+        for _ in range(3):
+            exchange.fetch('https://api.binance.com/api/v3/klines?symbol=BTCUSDT&interval=15m')
+        errors = 0
+        for _ in range(2):
+            try:
+                exchange.fetch('https://api.binance.com/api/v3/ticker/bookTicker?symbol=BTCUSDT')
+            except ConnectionError:
+                errors += 1
+
+        counters = registry.counters
+        ok = (counters['exchange_requests_total', (('endpoint', '/api/v3/klines'),)] == 3
+              and counters['exchange_requests_total', (('endpoint', '/api/v3/ticker/bookTicker'),)] == 2
+              and exchange.calls == 5)
+        print(f"  {'✓' if ok else '✗'} İstekler sorgu parametresiz uç nokta yoluna göre sayıldı "
+              f"({exchange.calls} HTTP çağrısı)")
+
+        step_ok = (errors == 2 and counters['exchange_errors_total', (
+            ('endpoint', '/api/v3/ticker/bookTicker'), ('error', 'ConnectionError'))] == 2
+            and registry.histograms['exchange_request_seconds', (('endpoint', '/api/v3/klines'),)].count == 3)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Hatalar yeniden fırlatıldı ve hata tipine göre sayıldı")
+
+        plain = object()
+        step_ok = instrument_exchange(plain, registry) is plain
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} fetch metodu olmayan nesneye dokunulmadı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Sayaç testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_endpoint():
+    """/metrics geçerli metin formatı sunmalı; değerler kayıtla aynı olmalı"""
+    print("\n" + "="*60)
+    print("3. /metrics ADRESİ")
+    print("="*60)
+
+    server = None
+    try:
+        registry = Registry()
+        with registry.time('fetch'):
+            pass
+        for value in (0.003, 0.04, 7):
+            registry.observe('bot_stage_seconds', value, stage='signals')
+        registry.inc('exchange_requests_total', 4, endpoint='/api/v3/klines')
+        candles = FakeCandles()
+        watch_candles(candles, 900_000, registry)
+        registry.gauge('broken_gauge', lambda: 1 / 0)
+
+        server = serve(0, registry)
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(url, timeout=5) as response:
+            content_type = response.headers['Content-Type']
+            text = response.read().decode()
+        samples = parse(text)
+        ok = content_type.startswith('text/plain; version=0.0.4') and len(samples) == len(text.splitlines())
+        print(f"  {'✓' if ok else '✗'} {len(samples)} örnek, tüm satırlar geçerli ({content_type})")
+
+        signals = (('stage', 'signals'),)
+        buckets = [samples['bot_stage_seconds_bucket', signals + (('le', str(bound)),)]
+                   for bound in list(BUCKETS) + ['+Inf']]
+        step_ok = (buckets == sorted(buckets) and buckets[-1] == 3
+                   and samples['bot_stage_seconds_count', signals] == 3
+                   and abs(samples['bot_stage_seconds_sum', signals] - 7.043) < 1e-9
+                   and samples['bot_stage_seconds_bucket', signals + (('le', '0.005'),)] == 1
+                   and samples['bot_stage_seconds_count', (('stage', 'fetch'),)] == 1)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Histogram: kümülatif kovalar, +Inf = count = 3, sum doğru")
+
+        step_ok = (samples['exchange_requests_total', (('endpoint', '/api/v3/klines'),)] == 4
+                   and samples['candle_timeframe_seconds', (('timeframe', '15m'),)] == 900
+                   and not any(name in ('candle_staleness_seconds', 'broken_gauge') for name, _ in samples))
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Sayaç ve gauge değerleri; değeri olmayan / hatalı gauge atlandı")
+
+        candles.last_timestamp = time.time() * 1000 - 60_000
+        registry.inc('exchange_requests_total', endpoint='/api/v3/klines')
+        with urllib.request.urlopen(url, timeout=5) as response:
+            text = response.read().decode()
+        samples = parse(text)
+        staleness = samples['candle_staleness_seconds', (('timeframe', '15m'),)]
+        step_ok = (samples['exchange_requests_total', (('endpoint', '/api/v3/klines'),)] == 5
+                   and 59 <= staleness < 70 and '# HELP candle_staleness_seconds ' in text)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} İkinci okuma güncel: sayaç 5, mum bayatlığı {staleness:.0f}s")
+
+        try:
+            urllib.request.urlopen(url.replace('/metrics', '/'), timeout=5)
+            status = 200
+        except urllib.error.HTTPError as e:
+            status = e.code
+        step_ok = status == 404 and serve(server.server_address[1], registry) is None
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Başka adres 404; kullanılan port için serve() None döndü")
+        return ok
+
+    except Exception as e:
+        print(f"✗ /metrics testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    print("\n" + "="*60)
+    print("METRİK TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Aşama Süreleri", check_stage_timings()))
+    results.append(("Borsa Sayaçları", check_exchange_counters()))
+    results.append(("/metrics Adresi", check_endpoint()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
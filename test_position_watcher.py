@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hızlı Pozisyon İzleyici Testi
+PositionWatcher.on_price'ın pozisyonu position_lock altında ve eşzamanlı
+tick'lerde tek bir kez kapattığını, bot döngüsü pozisyonu kapatırken beklediğini
+ve akış sağlıklı değilken REST ticker'a düştüğünü dener (ağ gerekmez; bot ve
+borsa taklit edilir)
+
+Kullanım:
+  python test_position_watcher.py
+"""
+
+import logging
+import sys
+import threading
+import time
+
+from position_watcher import PositionWatcher
+
+ENTRY = 30000.0
+
+
+class OwnedLock:
+    """position_lock yerine geçen RLock - kilidi tutan iş parçacığını bilir"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.owner = None
+        self.depth = 0
+
+    def __enter__(self):
+        self._lock.acquire()
+        self.owner = threading.get_ident()
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.depth -= 1
+        if not self.depth:
+            self.owner = None
+        self._lock.release()
+
+    def held(self):
+        return self.owner == threading.get_ident()
+
+
+class FakeExchange:
+    def __init__(self, price):
+        self.price = price
+        self.requests = 0
+
+    def fetch_ticker(self, symbol):
+        self.requests += 1
+        return {'last': self.price, 'timestamp': time.time() * 1000}
+
+
+class FakeBot:
+    """BitcoinDailyBot'un izleyicinin kullandığı kısmı (%1 hedef, %0.5 stop)"""
+
+    symbol = 'BTC/USDT'
+
+    def __init__(self, position_type='BUY', entry_price=ENTRY):
+        self.position_lock = OwnedLock()
+        self.exchange = FakeExchange(entry_price)
+        self.in_position = True
+        self.position_type = position_type
+        self.entry_price = entry_price
+        self.closed = []  # (fiyat, net_kar, sebep, kilit_tutuluyor_mu)
+
+    def calculate_targets(self, signal, entry_price):
+        if signal == 'BUY':
+            return entry_price * 1.01, entry_price * 0.995
+        return entry_price * 0.99, entry_price * 1.005
+
+    def check_profit_with_commission(self, signal, entry_price, current_price):
+        direction = 1 if signal == 'BUY' else -1
+        return (current_price - entry_price) / entry_price * 100 * direction - 0.2
+
+    def close_position(self, exit_price, net_profit, reason):
+        time.sleep(0.01)  # Yavaş kapanış: yarış penceresini genişletir
+        self.closed.append((exit_price, net_profit, reason, self.position_lock.held()))
+        self.in_position = False
+
+
+class FakeStream:
+    def __init__(self, healthy):
+        self.healthy = healthy
+        self.price_callbacks = []
+
+
+def check_single_close():
+    """Eşzamanlı hedef tick'leri pozisyonu kilit altında tek bir kez kapatmalı"""
+    print("\n" + "="*60)
+    print("1. TEK KAPANIŞ")
+    print("="*60)
+
+    try:
+        bot = FakeBot('BUY')
+        watcher = PositionWatcher(bot)
+        barrier = threading.Barrier(8)
+
+        def ticks():
+            barrier.wait()
+            for _ in range(50):
+                watcher.on_price(ENTRY * 1.012, time.time() * 1000)
+
+        threads = [threading.Thread(target=ticks) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        ok = (len(bot.closed) == 1 and len(watcher.exits) == 1 and bot.closed[0][3]
+              and bot.closed[0][2] == "Kar Hedefi" and not bot.in_position)
+        print(f"  {'✓' if ok else '✗'} 8 iş parçacığı x 50 tick: {len(bot.closed)} kapanış, "
+              f"{len(watcher.exits)} çıkış kaydı, kapanış kilit altında: {bool(bot.closed and bot.closed[0][3])}")
+
+        record = watcher.exits[0]
+        step_ok = abs(record['slippage_pct'] - (-0.2 / 1.01)) < 1e-9 and record['level'] == ENTRY * 1.01
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Kayma hedefe göre %{record['slippage_pct']:+.3f} (lehe)")
+
+        ticks_before = watcher.ticks
+        watcher.on_price(ENTRY * 1.02, time.time() * 1000)
+        step_ok = watcher.ticks == ticks_before and len(bot.closed) == 1
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Pozisyon yokken tick sayılmadı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Tek kapanış testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_levels():
+    """Sadece hedef / stop seviyeleri pozisyonu kapatmalı (BUY ve SELL)"""
+    print("\n" + "="*60)
+    print("2. HEDEF VE STOP SEVİYELERİ")
+    print("="*60)
+
+    try:
+        bot = FakeBot('BUY')
+        watcher = PositionWatcher(bot)
+        for price in (ENTRY * 0.996, ENTRY, ENTRY * 1.009):
+            watcher.on_price(price, time.time() * 1000)
+        ok = not bot.closed and watcher.ticks == 3
+        print(f"  {'✓' if ok else '✗'} BUY: hedef ile stop arasındaki {watcher.ticks} tick kapatmadı")
+
+        bot = FakeBot('SELL')
+        watcher = PositionWatcher(bot)
+        watcher.on_price(ENTRY * 1.006, time.time() * 1000)
+        record = watcher.exits[0] if watcher.exits else {}
+        step_ok = (len(bot.closed) == 1 and bot.closed[0][2] == "Stop Loss"
+                   and record.get('type') == 'SELL' and record.get('slippage_pct', 0) > 0
+                   and abs(bot.closed[0][1] - (-0.6 - 0.2)) < 1e-9)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} SELL: stop üstünde kapandı, net %{bot.closed[0][1]:.2f}, "
+              f"kayma %{record.get('slippage_pct', 0):+.3f} (aleyhe)")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Seviye testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_bot_closes_first():
+    """Bot döngüsü kilidi tutarken tick beklemeli ve kapanmış pozisyonu tekrar kapatmamalı"""
+    print("\n" + "="*60)
+    print("3. BOT DÖNGÜSÜ İLE YARIŞ")
+    print("="*60)
+
+    try:
+        bot = FakeBot('BUY')
+        watcher = PositionWatcher(bot)
+        thread = threading.Thread(target=watcher.on_price, args=(ENTRY * 0.99, time.time() * 1000))
+
+        with bot.position_lock:
+            thread.start()
+            time.sleep(0.1)
+            waiting = thread.is_alive() and not bot.closed
+            bot.in_position = False  # Bot döngüsü pozisyonu kendi kapattı
+        thread.join(5)
+
+        ok = waiting and not bot.closed and not watcher.exits
+        print(f"  {'✓' if ok else '✗'} Tick kilidi bekledi, kilit açılınca pozisyon kapalı olduğu için çıktı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Yarış testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_poll_fallback():
+    """Akış sağlıklıyken REST yoklanmamalı, koptuğunda ticker ile kapanmalı"""
+    print("\n" + "="*60)
+    print("4. REST YOKLAMA")
+    print("="*60)
+
+    watcher = None
+    try:
+        bot = FakeBot('BUY')
+        bot.exchange.price = ENTRY * 1.011
+        stream = FakeStream(healthy=True)
+        watcher = PositionWatcher(bot, stream=stream, poll_interval=0.01).start()
+        time.sleep(0.1)
+        ok = watcher.on_price in stream.price_callbacks and bot.exchange.requests == 0
+        print(f"  {'✓' if ok else '✗'} Akış sağlıklı: fiyat akıştan, {bot.exchange.requests} REST isteği")
+
+        stream.healthy = False
+        deadline = time.monotonic() + 5
+        while bot.in_position and time.monotonic() < deadline:
+            time.sleep(0.01)
+        step_ok = len(bot.closed) == 1 and bot.closed[0][0] == ENTRY * 1.011 and bot.exchange.requests >= 1
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Akış koptu: REST ticker ile kapandı")
+
+        watcher.stop()
+        step_ok = watcher.on_price not in stream.price_callbacks and not watcher._thread.is_alive()
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} stop(): geri çağırma kaldırıldı, iş parçacığı durdu")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Yoklama testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if watcher is not None:
+            watcher.stop()
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print("\n" + "="*60)
+    print("HIZLI POZİSYON İZLEYİCİ TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Tek Kapanış", check_single_close()))
+    results.append(("Hedef / Stop", check_levels()))
+    results.append(("Bot Döngüsü Yarışı", check_bot_closes_first()))
+    results.append(("REST Yoklama", check_poll_fallback()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
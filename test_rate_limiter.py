@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İstek Zamanlayıcı Testi
+Öncelik sırası, dakika içine yayma ve 429 / 418 sonrası tekrar denemeyi dener
+(ağ gerekmez; borsa yanıtları taklit edilir)
+
+Kullanım:
+  python test_rate_limiter.py
+"""
+
+import sys
+import threading
+import time
+
+import lazy_ccxt as ccxt
+from rate_limiter import BULK, CRITICAL, NORMAL, RequestScheduler, attach
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_040.0):  # Dakika penceresinin başı
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def check_priority():
+    """Bütçe dolduğunda bekleyen istekler öncelik sırasıyla geçmeli"""
+    print("\n" + "="*60)
+    print("1. ÖNCELİK SIRASI")
+    print("="*60)
+
+    try:
+        clock = FakeClock()
+        scheduler = RequestScheduler(limit=100, safety=1.0, clock=clock)
+        scheduler._roll(clock.now)
+        scheduler.used = 100
+
+        order = []
+        threads = [threading.Thread(target=lambda level=level: (scheduler.acquire(1, level),
+                                                               order.append(level)))
+                   for level in (BULK, NORMAL, CRITICAL)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        clock.now += 60  # Yeni pencere
+        with scheduler._condition:
+            scheduler._condition.notify_all()
+        for thread in threads:
+            thread.join(5)
+
+        ok = order == [CRITICAL, NORMAL, BULK]
+        print(f"  {'✓' if ok else '✗'} geçiş sırası: {order}")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Öncelik testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_pacing():
+    """Pencere başında sadece patlama payı, kritik istekler bütçe payına kadar beklemez"""
+    print("\n" + "="*60)
+    print("2. DAKİKAYA YAYMA")
+    print("="*60)
+
+    try:
+        clock = FakeClock()
+        scheduler = RequestScheduler(limit=1000, safety=1.0, clock=clock)
+        granted = 0
+        while scheduler._delay(1, NORMAL, clock.now) == 0:
+            scheduler._grant(1, NORMAL, 0)
+            granted += 1
+        expected = int(1000 * scheduler.shares[NORMAL] * scheduler.burst)
+        delay = scheduler._delay(1, NORMAL, clock.now)
+        ok = abs(granted - expected) <= 1 and 0 < delay < 1
+        print(f"  {'✓' if ok else '✗'} pencere başında {granted} istek (beklenen ~{expected}), "
+              f"sonraki {delay:.2f}s sonra")
+
+        critical_ok = scheduler._delay(1, CRITICAL, clock.now) == 0
+        clock.now += 30
+        half_ok = scheduler._delay(1, NORMAL, clock.now) == 0
+        print(f"  {'✓' if critical_ok and half_ok else '✗'} kritik istek beklemez, "
+              f"30s sonra normal akış devam eder")
+        return ok and critical_ok and half_ok
+
+    except Exception as e:
+        print(f"✗ Yayma testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_backoff():
+    """429 / 418 tekrar denenmeli, sunucu ağırlığı okunmalı; POST ağ hatası tekrarlanmamalı"""
+    print("\n" + "="*60)
+    print("3. 429 / 418 GERİ ÇEKİLME")
+    print("="*60)
+
+    try:
+        exchange = ccxt.binance({'enableRateLimit': True}, markets_cache=None)
+        scheduler = RequestScheduler()
+        attach(exchange, scheduler)
+
+        calls = []
+
+        def fetch(url, method='GET', headers=None, body=None):
+            calls.append(method)
+            if len(calls) == 1:
+                exchange.last_response_headers = {'Retry-After': '0'}
+                raise ccxt.RateLimitExceeded('429')
+            if len(calls) == 2:
+                exchange.last_response_headers = {}
+                raise ccxt.DDoSProtection('418')
+            exchange.last_response_headers = {'x-mbx-used-weight-1m': '321'}
+            return {'serverTime': 1}
+
+        exchange.fetch = fetch
+        scheduler.penalize = lambda headers=None, banned=False, original=scheduler.penalize: (
+            original({'Retry-After': '0'}, banned))  # Testte 418 için 60s beklenmez
+        result = exchange.fetch2('time', 'public', 'GET', {})
+        ok = (result == {'serverTime': 1} and len(calls) == 3 and scheduler.server_used == 321
+              and scheduler.stats['rate_limited'] == 1 and scheduler.stats['banned'] == 1)
+        print(f"  {'✓' if ok else '✗'} {len(calls)} deneme, sunucu ağırlığı {scheduler.server_used}, "
+              f"istatistik {scheduler.stats['rate_limited']}x429 {scheduler.stats['banned']}x418")
+
+        def network_error(url, method='GET', headers=None, body=None):
+            calls.append(method)
+            raise ccxt.NetworkError('bağlantı koptu')
+
+        calls.clear()
+        exchange.fetch = network_error
+        try:
+            exchange.fetch2('order', 'public', 'POST', {})
+            post_ok = False
+        except ccxt.NetworkError:
+            post_ok = calls == ['POST']
+        print(f"  {'✓' if post_ok else '✗'} POST ağ hatası tekrar denenmedi")
+        return ok and post_ok
+
+    except Exception as e:
+        print(f"✗ Geri çekilme testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("İSTEK ZAMANLAYICI TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Öncelik Sırası", check_priority()))
+    results.append(("Dakikaya Yayma", check_pacing()))
+    results.append(("Geri Çekilme", check_backoff()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
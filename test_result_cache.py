@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sonuç Önbelleği Testi
+İçerik adresli önbelleğin diskten mmap ile okuduğunu, boyut bütçesinde en eski
+erişilen girdileri sildiğini, süreç havuzu işçilerinin aynı önbelleği birlikte
+kullanabildiğini ve taramanın ikinci çalıştırmada hesaplama yapmadığını dener
+(ağ gerekmez)
+
+Kullanım:
+  python test_result_cache.py
+"""
+
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import result_cache
+import sweep
+from result_cache import ResultCache, content_key
+
+TIMEFRAME_MS = 900_000
+
+
+def random_candles(count, seed=9):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.003, count)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.003)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.003)
+    volume = rng.lognormal(3, 0.6, count)
+    timestamps = 1_700_006_400_000 + np.arange(count) * TIMEFRAME_MS
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+def _worker(root, seed):
+    """Aynı anahtarları yazan / okuyan işçi - okunan her değer hesaplananla aynı olmalı"""
+    cache = ResultCache(root, budget_bytes=64 * 1024)
+    rng = np.random.default_rng(seed)
+    errors = 0
+    for key_id in rng.integers(0, 12, 60):
+        columns = cache.arrays(content_key('columns', int(key_id)),
+                               lambda: {'value': np.full(1000, float(key_id))})
+        key = content_key('result', int(key_id))
+        result = cache.get_json(key) or {'id': int(key_id)}
+        cache.put_json(key, result)
+        errors += int(not np.all(columns['value'] == key_id) or result['id'] != key_id)
+    cache.close()
+    return errors
+
+
+def check_arrays_and_lru():
+    """Kolonlar mmap ile okunmalı, bütçe aşılınca en eski erişilen girdi silinmeli"""
+    print("\n" + "="*60)
+    print("1. MMAP OKUMA VE LRU")
+    print("="*60)
+
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            cache = ResultCache(root, budget_bytes=3 * 8_500)  # ~3 kolon seti
+            columns = {'a': np.arange(500, dtype=np.float64), 'b': np.ones(500)}
+            cache.put_arrays('k0', columns)
+            loaded = cache.get_arrays('k0')
+            ok = (isinstance(loaded['a'], np.memmap) and not loaded['a'].flags.writeable
+                  and np.array_equal(loaded['a'], columns['a']))
+            print(f"  {'✓' if ok else '✗'} Kolonlar salt okunur mmap görünüm olarak okundu")
+
+            result_cache.TOUCH_INTERVAL = 0
+            for index in range(1, 3):
+                cache.put_arrays(f'k{index}', {'a': np.full(1000, index)})
+            cache.get_arrays('k0')  # k0 en son erişilen olur, k1 en eski
+            cache.put_arrays('k3', {'a': np.full(1000, 3.0)})
+            kept = [key for key in ('k0', 'k1', 'k2', 'k3') if cache.get_arrays(key) is not None]
+            files = sum(len(names) for _, _, names in os.walk(root)
+                        if names and not any(name.startswith('index') for name in names))
+            lru = 'k1' not in kept and 'k0' in kept and 'k3' in kept and cache.size() <= cache.budget
+            ok = ok and lru and files == len(kept)
+            print(f"  {'✓' if lru else '✗'} Bütçe aşıldı: kalan {kept}, {files} dosya")
+            print(f"  ✓ İstatistik: {cache.stats}")
+            cache.close()
+        return ok
+
+    except Exception as e:
+        print(f"✗ Önbellek testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        result_cache.TOUCH_INTERVAL = 60
+
+
+def check_concurrent():
+    """Süreç havuzu işçileri küçük bütçeli aynı önbelleği birlikte kullanmalı"""
+    print("\n" + "="*60)
+    print("2. EŞZAMANLI ERİŞİM")
+    print("="*60)
+
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            ResultCache(root, budget_bytes=64 * 1024).close()  # Şema; işçiler kendi bağlantısını açar
+            with ProcessPoolExecutor(max_workers=4) as pool:
+                errors = sum(pool.map(_worker, [root] * 8, range(8)))
+            cache = ResultCache(root, budget_bytes=64 * 1024)
+            ok = errors == 0 and cache.size() <= cache.budget
+            print(f"  {'✓' if ok else '✗'} 8 işçi x 60 erişim: {errors} hatalı değer, "
+                  f"{cache.size():,} / {cache.budget:,} byte")
+            cache.close()
+        return ok
+
+    except Exception as e:
+        print(f"✗ Eşzamanlı erişim testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_sweep_cache():
+    """Aynı veriyle ikinci tarama sonuçları önbellekten almalı (indikatör hesaplamadan)"""
+    print("\n" + "="*60)
+    print("3. TARAMA ÖNBELLEĞİ")
+    print("="*60)
+
+    try:
+        candles = random_candles(3000)
+        grid = {'RSI_PERIOD': [7, 9], 'MIN_SIGNAL_SCORE': [3, 4], 'RSI_OVERSOLD': [30, 40]}
+        with tempfile.TemporaryDirectory() as root:
+            cache_root = os.path.join(root, 'cache')
+            first, _ = sweep.run_sweep(candles, os.path.join(root, 'a'), grid=grid, workers=2,
+                                       cache_root=cache_root)
+            indicators = result_cache.indicator_cache(cache_root)
+            computed = indicators.summary()['arrays']
+            # Sonuçlar önbellekteyse ikinci tarama indikatörleri hiç istememeli
+            indicators.clear()
+            second, _ = sweep.run_sweep(candles, os.path.join(root, 'b'), grid=grid, workers=2,
+                                        cache_root=cache_root)
+            recomputed = indicators.summary()['arrays']
+            indicators.close()
+            results_cache = result_cache.result_cache(cache_root)
+            results = results_cache.summary()
+            results_cache.close()
+        ok = first.equals(second) and computed == 2 and recomputed == 0 and results['results'] == 8
+        print(f"  {'✓' if ok else '✗'} {results['results']} sonuç, {computed} indikatör seti; "
+              f"ikinci tarama {recomputed} indikatör seti hesapladı, sıralama aynı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Tarama önbelleği testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("SONUÇ ÖNBELLEĞİ TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("MMAP ve LRU", check_arrays_and_lru()))
+    results.append(("Eşzamanlı Erişim", check_concurrent()))
+    results.append(("Tarama Önbelleği", check_sweep_cache()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
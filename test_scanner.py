@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çoklu Sembol Tarayıcı Testi
+MarketScanner'ın (sembol x mum) matrisiyle hesapladığı skorların her sembol
+için günlük botun tek sembollük yoluyla (IndicatorFrame + DailyStrategy) aynı
+olduğunu, hata veren / eksik geçmişli sembollerin turu bozmadığını ve ikinci
+turda sadece son mumlardan itibaren çekildiğini dener (ağ gerekmez; asyncio
+borsa taklit edilir)
+
+Kullanım:
+  python test_scanner.py
+"""
+
+import asyncio
+import logging
+import sys
+
+import numpy as np
+
+import bitcoin_daily_bot_fixed as daily
+import lazy_ccxt
+from candle_store import CandleStore
+from scanner import MarketScanner
+from signal_scoring import daily_scores
+from strategies import DailyStrategy
+from streaming_indicators import IndicatorFrame
+
+TIMEFRAME_MS = 900_000
+START_MS = 1_700_006_400_000
+BARS = 400
+WINDOW = 200
+
+
+def random_candles(count, seed, drift=0.0):
+    """Sentetik mumlar; drift son 30 mumda güçlü eğilim verir (sinyal oluşsun diye)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.004, count)
+    returns[-30:] += drift
+    close = 100 * np.exp(np.cumsum(returns))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.004)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.004)
+    volume = rng.lognormal(3, 0.6, count)
+    volume[-3:] *= 4
+    timestamps = START_MS + np.arange(count) * TIMEFRAME_MS
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+class FakeAsyncExchange:
+    """asyncio ccxt borsası yerine: sembol başına mum serisi, istenen semboller hata verir"""
+
+    def __init__(self, series, now_ms, errors=None):
+        self.series = series
+        self.now = now_ms
+        self.errors = errors or {}
+        self.requests = []  # (sembol, since, limit)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def parse_timeframe(self, timeframe):
+        return TIMEFRAME_MS // 1000
+
+    async def fetch_time(self):
+        return self.now
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.requests.append((symbol, since, limit))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if symbol in self.errors:
+                raise self.errors[symbol]
+            candles = self.series[symbol]
+            candles = candles[candles[:, 0] <= self.now]  # Oluşan mum dahil
+            if since is not None:
+                candles = candles[candles[:, 0] >= since]
+            else:
+                candles = candles[-limit:]
+            return candles[:limit].tolist()
+        finally:
+            self.in_flight -= 1
+
+
+def single_symbol(candles, closed_bar):
+    """Günlük botun tek sembol yolu: pencere -> IndicatorFrame -> DailyStrategy"""
+    store = CandleStore('X', daily.TIMEFRAME, window=WINDOW)
+    store.merge(candles[candles[:, 0] <= closed_bar][-WINDOW:])
+    frame = IndicatorFrame(history=WINDOW)
+    frame.register('daily', daily.INDICATOR_PARAMS)
+    data = frame.select(frame.update_candles(store.view()), 'daily')
+    strategy = DailyStrategy('daily', indicators=daily.INDICATOR_PARAMS, min_score=daily.MIN_SIGNAL_SCORE,
+                             **daily.SIGNAL_THRESHOLDS)
+    buy_score, sell_score = daily_scores(data[-1:], **daily.SIGNAL_THRESHOLDS)
+    signal, _, reasons = strategy.evaluate(data)
+    return int(buy_score[-1]), int(sell_score[-1]), signal, reasons or []
+
+
+def make_series():
+    series = {f'C{i}/USDT': random_candles(BARS, seed=i) for i in range(6)}
+    series['DOWN/USDT'] = random_candles(BARS, seed=20, drift=-0.006)
+    series['UP/USDT'] = random_candles(BARS, seed=21, drift=0.006)
+    series['NEW/USDT'] = random_candles(BARS, seed=22)[-50:]  # Yeni listelenmiş: pencere dolmaz
+    series['FAIL/USDT'] = random_candles(BARS, seed=23)
+    series['LIMIT/USDT'] = random_candles(BARS, seed=24)
+    return series
+
+
+def compare(results, series, closed_bar, symbols):
+    """Tarayıcı sonuçlarını tek sembol skorlarıyla karşılaştır - (eşleşen, farklı) listeleri"""
+    by_symbol = {r['symbol']: r for r in results}
+    matched, mismatched = [], []
+    for symbol in symbols:
+        expected = single_symbol(series[symbol], closed_bar)
+        r = by_symbol.get(symbol)
+        actual = None if r is None else (r['buy_score'], r['sell_score'], r['signal'], r['reasons'])
+        price = series[symbol][series[symbol][:, 0] == closed_bar][0, 4]
+        if actual == expected and r['price'] == price:
+            matched.append(symbol)
+        else:
+            mismatched.append((symbol, actual, expected))
+    return matched, mismatched
+
+
+def check_scores():
+    """Her sembolün skoru, sinyali ve sebepleri tek sembol yoluyla aynı olmalı"""
+    print("\n" + "="*60)
+    print("1. TEK SEMBOL PARİTESİ")
+    print("="*60)
+
+    try:
+        series = make_series()
+        closed_bar = START_MS + (BARS - 2) * TIMEFRAME_MS
+        # Son mum oluşmakta
+        exchange = FakeAsyncExchange(series, now_ms=closed_bar + TIMEFRAME_MS + 60_000)
+        scanner = MarketScanner(exchange, list(series), window=WINDOW, concurrency=4)
+        results = asyncio.run(scanner.scan(closed_bar))
+
+        scorable = [s for s in series if s != 'NEW/USDT']
+        matched, mismatched = compare(results, series, closed_bar, scorable)
+        ok = not mismatched and len(results) == len(scorable)
+        print(f"  {'✓' if ok else '✗'} {len(matched)}/{len(scorable)} sembol tek sembol skorlarıyla aynı")
+        for symbol, actual, expected in mismatched:
+            print(f"    ✗ {symbol}: tarayıcı {actual} / tek sembol {expected}")
+
+        signals = {r['symbol']: r['signal'] for r in results if r['signal']}
+        step_ok = len(signals) >= 1 and all(r['reasons'] for r in results if r['signal'])
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Sinyaller: {signals or 'yok'} (sebepler dolu)")
+
+        keys = [(-max(r['buy_score'], r['sell_score']), r['signal'] is None, r['symbol']) for r in results]
+        step_ok = keys == sorted(keys)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Sonuçlar skora göre sıralı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Parite testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_isolation():
+    """Hata veren ve geçmişi kısa semboller atlanmalı, diğerleri skorlanmalı"""
+    print("\n" + "="*60)
+    print("2. HATA İZOLASYONU")
+    print("="*60)
+
+    try:
+        series = make_series()
+        closed_bar = START_MS + (BARS - 2) * TIMEFRAME_MS
+        errors = {'FAIL/USDT': lazy_ccxt.NetworkError('binance GET klines: timeout'),
+                  'LIMIT/USDT': lazy_ccxt.RateLimitExceeded('binance 429 Too Many Requests')}
+        exchange = FakeAsyncExchange(series, now_ms=closed_bar + TIMEFRAME_MS + 60_000, errors=errors)
+        scanner = MarketScanner(exchange, list(series), window=WINDOW, concurrency=4)
+
+        async def two_rounds():
+            # Tarayıcının semaforu ilk çalıştığı döngüye bağlanır: iki tur aynı döngüde
+            first = await scanner.scan(closed_bar)
+            timings = dict(scanner.last_timings)
+            max_in_flight = exchange.max_in_flight
+            # Hata düzelince sonraki tur: yeni mum kapandı, sadece son mumlar çekilir
+            exchange.errors = {}
+            exchange.requests = []
+            exchange.now += TIMEFRAME_MS
+            second = await scanner.scan(closed_bar + TIMEFRAME_MS)
+            return first, timings, max_in_flight, second
+
+        results, timings, max_in_flight, second = asyncio.run(two_rounds())
+
+        symbols = {r['symbol'] for r in results}
+        ok = (timings['failed'] == 2 and not symbols & {'FAIL/USDT', 'LIMIT/USDT', 'NEW/USDT'}
+              and timings['symbols'] == len(series) - 3)
+        print(f"  {'✓' if ok else '✗'} {timings['failed']} sembol güncellenemedi, "
+              f"{len(results)} sembol skorlandı, yeni listelenen sembol atlandı")
+
+        step_ok = max_in_flight <= 4
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Eşzamanlı istek en fazla {max_in_flight} (sınır 4)")
+
+        incremental = {symbol: limit for symbol, since, limit in exchange.requests if since is not None}
+        full = {symbol for symbol, since, _ in exchange.requests if since is None}
+        scorable = [s for s in series if s != 'NEW/USDT']
+        step_ok = (set(incremental) == set(series) - {'FAIL/USDT', 'LIMIT/USDT'}
+                   and all(limit <= 3 for limit in incremental.values())
+                   and full == {'FAIL/USDT', 'LIMIT/USDT'})
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} İkinci tur: {len(incremental)} sembol son mumdan çekildi "
+              f"(limit ≤ 3), hata veren semboller tam pencere çekti")
+
+        matched, mismatched = compare(second, series, closed_bar + TIMEFRAME_MS, scorable)
+        step_ok = not mismatched and scanner.last_timings['failed'] == 0
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} {len(matched)}/{len(scorable)} sembol yeni mumda tek sembol "
+              f"skorlarıyla aynı")
+        for symbol, actual, expected in mismatched:
+            print(f"    ✗ {symbol}: tarayıcı {actual} / tek sembol {expected}")
+        return ok
+
+    except Exception as e:
+        print(f"✗ İzolasyon testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print("\n" + "="*60)
+    print("ÇOKLU SEMBOL TARAYICI TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Tek Sembol Paritesi", check_scores()))
+    results.append(("Hata İzolasyonu", check_isolation()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
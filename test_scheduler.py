@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mum Kapanışı Zamanlayıcısı Testi
+CandleScheduler'ın kapanan mum (BAR) ve pozisyon izleme (TICK) olaylarını doğru
+anda ürettiğini, aynı mum tekrar istendiğinde bekleyip yeniden denediğini ve
+ServerClock'un sunucu saat farkını ölçüp yenilediğini dener (ağ gerekmez; saat
+ve borsa yanıtları taklit edilir)
+
+Kullanım:
+  python test_scheduler.py
+"""
+
+import logging
+import sys
+
+import numpy as np
+
+import scheduler
+from scheduler import BAR, TICK, CandleScheduler, ServerClock, closed_frame
+
+TIMEFRAME_MS = 900_000
+DELAY_MS = 300
+BOUNDARY = 1_700_006_400_000  # 15 dakikalık mum sınırı
+
+
+class FakeClock:
+    """now_ms() sağlayan saat; sleep çağrıları saati ilerletir ve kaydedilir"""
+
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def now_ms(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += round(seconds * 1000)
+
+
+class FakeTime:
+    """scheduler modülündeki time.time() yerine geçen yerel saat (saniye)"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class FakeExchange:
+    """fetch_time() gidiş-dönüş süresi kadar yerel saati ilerletir"""
+
+    def __init__(self, local, offset_ms, round_trip_ms=62.5):
+        self.local = local
+        self.offset_ms = offset_ms
+        self.round_trip_ms = round_trip_ms
+        self.calls = 0
+        self.fail = False
+
+    def fetch_time(self):
+        self.calls += 1
+        self.local.now += self.round_trip_ms / 2000
+        server = self.local.now * 1000 + self.offset_ms
+        self.local.now += self.round_trip_ms / 2000
+        if self.fail:
+            raise ConnectionError('timeout')
+        return server
+
+
+def check_bar_and_tick():
+    """Pozisyon yokken sadece BAR, pozisyon varken mumlar arasında TICK üretilmeli"""
+    print("\n" + "="*60)
+    print("1. BAR VE TICK OLAYLARI")
+    print("="*60)
+
+    try:
+        clock = FakeClock(BOUNDARY + 5_000)
+        candles = CandleScheduler(TIMEFRAME_MS, clock, delay_ms=DELAY_MS,
+                                  monitor_interval=30, sleep=clock.sleep)
+
+        event = candles.wait(None)
+        ok = event == (BAR, BOUNDARY - TIMEFRAME_MS) and not clock.sleeps
+        print(f"  {'✓' if ok else '✗'} İlk çağrı: kapanmış son mum beklemeden döndü")
+
+        event = candles.wait(BOUNDARY - TIMEFRAME_MS)
+        step_ok = (event == (BAR, BOUNDARY) and clock.sleeps == [895.3]
+                   and clock.now == BOUNDARY + TIMEFRAME_MS + DELAY_MS)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Pozisyon yok: {clock.sleeps} sn bekleyip "
+              f"sınırdan {DELAY_MS}ms sonra BAR")
+
+        clock.sleeps = []
+        events = []
+        while not events or events[-1][0] == TICK:
+            events.append(candles.wait(BOUNDARY, monitor=True))
+        ticks = sum(kind == TICK for kind, _ in events)
+        step_ok = (ticks == 29 and events[-1] == (BAR, BOUNDARY + TIMEFRAME_MS)
+                   and all(seconds == 30 for seconds in clock.sleeps)
+                   and clock.now == BOUNDARY + 2 * TIMEFRAME_MS + DELAY_MS)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Pozisyon var: {ticks} TICK (30 sn arayla), "
+              f"sonra zamanında BAR")
+
+        # İzleme aralığı kalan süreden uzunsa TICK beklemesi mum sınırını aşmamalı
+        clock.now = BOUNDARY + 2 * TIMEFRAME_MS + DELAY_MS + TIMEFRAME_MS - 10_000
+        clock.sleeps = []
+        event = candles.wait(BOUNDARY + TIMEFRAME_MS, monitor=True)
+        step_ok = event == (BAR, BOUNDARY + 2 * TIMEFRAME_MS) and clock.sleeps == [10.0]
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Sınıra 10 sn kala TICK yerine BAR beklendi")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Olay testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_retry():
+    """Bot mumu değerlendiremezse aynı mum retry_delay sonra tekrar verilmeli"""
+    print("\n" + "="*60)
+    print("2. AYNI MUM TEKRARI")
+    print("="*60)
+
+    try:
+        clock = FakeClock(BOUNDARY + DELAY_MS)
+        candles = CandleScheduler(TIMEFRAME_MS, clock, delay_ms=DELAY_MS,
+                                  retry_delay=1.5, sleep=clock.sleep)
+        previous = BOUNDARY - 2 * TIMEFRAME_MS
+
+        first = candles.wait(previous)
+        ok = first == (BAR, BOUNDARY - TIMEFRAME_MS) and not clock.sleeps
+        print(f"  {'✓' if ok else '✗'} Yeni mum beklemeden verildi")
+
+        # Bot veri hazır değil diye last_closed_bar'ı ilerletmedi
+        retries = [candles.wait(previous) for _ in range(3)]
+        step_ok = (all(event == first for event in retries) and clock.sleeps == [1.5] * 3
+                   and clock.now == BOUNDARY + DELAY_MS + 4_500)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Aynı mum 3 kez, her seferinde {candles.retry_delay} sn "
+              f"bekleyip tekrar verildi")
+
+        clock.sleeps = []
+        event = candles.wait(BOUNDARY - TIMEFRAME_MS)
+        step_ok = event == (BAR, BOUNDARY) and clock.now == BOUNDARY + TIMEFRAME_MS + DELAY_MS
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Değerlendirme sonrası bir sonraki mum sınırı beklendi")
+
+        # Mum sınırı kaçırıldıysa (uzun cycle) araya giren mumlar atlanır
+        clock.now += 2 * TIMEFRAME_MS + 40_000
+        clock.sleeps = []
+        event = candles.wait(BOUNDARY)
+        step_ok = event == (BAR, BOUNDARY + 2 * TIMEFRAME_MS) and not clock.sleeps
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Kaçırılan sınırlardan sonra kapanmış son mum verildi")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Tekrar testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_server_clock():
+    """Sunucu saat farkı RTT/2 düzeltmesiyle ölçülmeli, hata olursa korunmalı"""
+    print("\n" + "="*60)
+    print("3. SUNUCU SAATİ")
+    print("="*60)
+
+    original = scheduler.time
+    try:
+        local = FakeTime()
+        scheduler.time = local
+        exchange = FakeExchange(local, offset_ms=5_000)
+        clock = ServerClock(exchange, resync_interval=60)
+
+        now = clock.now_ms()
+        ok = (clock.offset_ms == 5_000 and clock.round_trip_ms == 62.5
+              and now == int(local.now * 1000 + 5_000) and exchange.calls == 1)
+        print(f"  {'✓' if ok else '✗'} Fark {clock.offset_ms:+.0f}ms, RTT {clock.round_trip_ms}ms")
+
+        local.now += 30
+        exchange.offset_ms = -2_000
+        clock.now_ms()
+        step_ok = exchange.calls == 1 and clock.offset_ms == 5_000
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} resync_interval dolmadan tekrar ölçülmedi")
+
+        local.now += 31
+        now = clock.now_ms()
+        step_ok = (exchange.calls == 2 and clock.offset_ms == -2_000
+                   and now == int(local.now * 1000 - 2_000))
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Süre dolunca yenilendi: {clock.offset_ms:+.0f}ms")
+
+        local.now += 61
+        exchange.fail = True
+        now = clock.now_ms()
+        step_ok = (exchange.calls == 3 and clock.offset_ms == -2_000
+                   and now == int(local.now * 1000 - 2_000))
+        local.now += 1
+        clock.now_ms()
+        step_ok = step_ok and exchange.calls == 3
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Hata: önceki fark korundu, hemen tekrar denenmedi")
+
+        fresh = ServerClock(exchange)
+        now = fresh.now_ms()
+        step_ok = fresh.offset_ms == 0 and now == int(local.now * 1000)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} İlk ölçüm başarısız: yerel saat kullanıldı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Sunucu saati testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        scheduler.time = original
+
+
+def check_closed_frame():
+    """Mumlar kapanan muma kadar kesilmeli; daha yeni mum yoksa None dönmeli"""
+    print("\n" + "="*60)
+    print("4. KAPANAN MUM KESİTİ")
+    print("="*60)
+
+    try:
+        timestamps = BOUNDARY + np.arange(5) * TIMEFRAME_MS
+        records = np.zeros(5, dtype=[('timestamp', 'i8'), ('close', 'f8')])
+        records['timestamp'] = timestamps
+
+        frame = closed_frame(records, int(timestamps[2]))
+        ok = len(frame) == 3 and frame['timestamp'][-1] == timestamps[2] and frame.base is not None
+        print(f"  {'✓' if ok else '✗'} Kapanan mum dahil {len(frame)} mum (kopyasız görünüm)")
+
+        step_ok = closed_frame(records, int(timestamps[-1])) is None
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Borsada yeni mum yok: None")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Kesit testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print("\n" + "="*60)
+    print("MUM KAPANIŞI ZAMANLAYICISI TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("BAR ve TICK", check_bar_and_tick()))
+    results.append(("Aynı Mum Tekrarı", check_retry()))
+    results.append(("Sunucu Saati", check_server_clock()))
+    results.append(("Kapanan Mum Kesiti", check_closed_frame()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
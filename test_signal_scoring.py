@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vektörize Sinyal Skorlama Testi
+signal_scoring'in boolean maske skorlarını, koşul bayraklarını, sinyal
+kararlarını ve sebep metinlerini eski satır satır değerlendirmeyle (botların
+vektörizasyondan önceki generate_signals / generate_signal mantığı) her mumda
+karşılaştırır (ağ gerekmez; sentetik seriler kullanılır)
+
+Kullanım:
+  python test_signal_scoring.py
+"""
+
+import sys
+
+import numpy as np
+
+from indicator_kernels import compute_indicators
+from signal_scoring import (WEEKLY_REQUIRED_FIELDS, daily_conditions, daily_reasons, daily_scores,
+                            daily_signals, weekly_reasons, weekly_scores, weekly_signals)
+from strategies import DAILY_INDICATORS, WEEKLY_INDICATORS
+
+BARS = 4000
+SEEDS = (3, 7, 11)
+DAILY_THRESHOLDS = dict(rsi_oversold=25, rsi_overbought=75, volume_multiplier=1.3)
+WEEKLY_THRESHOLDS = dict(rsi_buy=35, rsi_sell=65, volume_multiplier=1.2)
+
+
+def random_series(count, seed, timeframe_ms):
+    """Sentetik mumlar ve indikatör kolonları (RSI / Stochastic uçları oluşsun diye oynak)"""
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 0.004, count // 50 + 1), 50)[:count]
+    close = 30000 * np.exp(np.cumsum(rng.normal(drift, 0.006, count)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.003)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.003)
+    volume = rng.lognormal(3, 0.6, count)
+    timestamps = 1_700_006_400_000 + np.arange(count) * timeframe_ms
+    return timestamps, open_, high, low, close, volume
+
+
+def daily_series(seed):
+    timestamps, open_, high, low, close, volume = random_series(BARS, seed, 900_000)
+    data = compute_indicators(open_, high, low, close, volume, timestamps=timestamps,
+                              **DAILY_INDICATORS)
+    data['close'] = close
+    # Uç durumlar: sıfır genişlikli Bollinger bandı ve VWAP'ı 0 olan mumlar
+    data['bb_high'][500:510] = data['bb_low'][500:510]
+    data['vwap'][700:710] = 0.0
+    return data
+
+
+def weekly_series(seed):
+    timestamps, open_, high, low, close, volume = random_series(BARS, seed, 3_600_000)
+    data = compute_indicators(open_, high, low, close, volume, **WEEKLY_INDICATORS)
+    data['close'] = close
+    data['volume'] = volume
+    data['bb_high'][500:510] = data['bb_low'][500:510]
+    data['ema_20'][900:905] = data['ema_50'][900:905] * 1.005  # EMA'lar yakın (0.5 puan)
+    data['volume_ma'][1200:1205] = 0.0
+    return data
+
+
+def row(data, index):
+    return {name: values[index] for name, values in data.items()}
+
+
+def check_buy_conditions(latest, rsi_oversold=25, volume_multiplier=1.3):
+    """Eski satır satır günlük alış değerlendirmesi: (skor, bayraklar, sebepler)"""
+    current_price = latest['close']
+    flags = {}
+    reasons = []
+
+    flags['rsi'] = latest['rsi'] < rsi_oversold
+    if flags['rsi']:
+        reasons.append(f"RSI({latest['rsi']:.1f})<{rsi_oversold}")
+    bb_position = (current_price - latest['bb_low']) / (latest['bb_high'] - latest['bb_low'])
+    flags['bb'] = bb_position < 0.2
+    if flags['bb']:
+        reasons.append(f"BB Alt(%{bb_position*100:.0f})")
+    flags['macd'] = latest['macd'] > latest['macd_signal']
+    if flags['macd']:
+        reasons.append("MACD+")
+    flags['ema'] = latest['ema_short'] > latest['ema_medium']
+    if flags['ema']:
+        reasons.append("EMA+")
+    flags['stoch'] = latest['stoch_k'] < 20
+    if flags['stoch']:
+        reasons.append(f"Stoch({latest['stoch_k']:.0f})<20")
+    flags['volume'] = latest['volume_ratio'] > volume_multiplier
+    if flags['volume']:
+        reasons.append(f"Vol({latest['volume_ratio']:.1f}x)")
+    flags['vwap'] = bool(latest['vwap'] and current_price < latest['vwap'])
+    if flags['vwap']:
+        reasons.append("VWAP Altı")
+    return sum(flags.values()), flags, reasons
+
+
+def check_sell_conditions(latest, rsi_overbought=75, volume_multiplier=1.3):
+    """Eski satır satır günlük satış değerlendirmesi: (skor, bayraklar, sebepler)"""
+    current_price = latest['close']
+    flags = {}
+    reasons = []
+
+    flags['rsi'] = latest['rsi'] > rsi_overbought
+    if flags['rsi']:
+        reasons.append(f"RSI({latest['rsi']:.1f})>{rsi_overbought}")
+    bb_position = (current_price - latest['bb_low']) / (latest['bb_high'] - latest['bb_low'])
+    flags['bb'] = bb_position > 0.8
+    if flags['bb']:
+        reasons.append(f"BB Üst(%{bb_position*100:.0f})")
+    flags['macd'] = latest['macd'] < latest['macd_signal']
+    if flags['macd']:
+        reasons.append("MACD-")
+    flags['ema'] = latest['ema_short'] < latest['ema_medium']
+    if flags['ema']:
+        reasons.append("EMA-")
+    flags['stoch'] = latest['stoch_k'] > 80
+    if flags['stoch']:
+        reasons.append(f"Stoch({latest['stoch_k']:.0f})>80")
+    flags['volume'] = latest['volume_ratio'] > volume_multiplier
+    if flags['volume']:
+        reasons.append(f"Vol({latest['volume_ratio']:.1f}x)")
+    flags['vwap'] = bool(latest['vwap'] and current_price > latest['vwap'])
+    if flags['vwap']:
+        reasons.append("VWAP Üstü")
+    return sum(flags.values()), flags, reasons
+
+
+def check_weekly_conditions(latest, prev):
+    """
+    Eski satır satır haftalık değerlendirme
+
+    Returns:
+        (alış_skoru, satış_skoru, alış_sebepleri, satış_sebepleri) veya NaN alan varsa None
+    """
+    for field in WEEKLY_REQUIRED_FIELDS:
+        if np.isnan(latest[field]):
+            return None
+
+    buy, sell = 0, 0
+    buy_reasons, sell_reasons = [], []
+    has_prev = not np.isnan(prev['macd']) and not np.isnan(prev['macd_signal'])
+    bb_range = latest['bb_high'] - latest['bb_low']
+
+    if latest['rsi'] < 35:
+        buy += 1
+        buy_reasons.append(f"✓ RSI aşırı satım: {latest['rsi']:.1f}")
+    if bb_range > 0 and (latest['close'] - latest['bb_low']) / bb_range < 0.2:
+        buy += 1
+        buy_reasons.append("✓ Fiyat BB alt bandına yakın")
+    if has_prev:
+        if latest['macd'] > latest['macd_signal'] and prev['macd'] <= prev['macd_signal']:
+            buy += 1
+            buy_reasons.append("✓ MACD bullish crossover")
+        elif latest['macd'] > latest['macd_signal']:
+            buy += 0.5
+            buy_reasons.append("✓ MACD bullish")
+    if latest['ema_20'] > latest['ema_50']:
+        buy += 1
+        buy_reasons.append("✓ EMA trend yukarı")
+    elif latest['ema_50'] > 0 and abs(latest['ema_20'] - latest['ema_50']) / latest['ema_50'] < 0.01:
+        buy += 0.5
+        buy_reasons.append("✓ EMA'lar yakın (potansiyel golden cross)")
+    if latest['volume_ma'] > 0 and latest['volume'] > latest['volume_ma'] * 1.2:
+        buy += 1
+        buy_reasons.append(f"✓ Hacim yüksek: {latest['volume']/latest['volume_ma']:.2f}x")
+
+    if latest['rsi'] > 65:
+        sell += 1
+        sell_reasons.append(f"✓ RSI aşırı alım: {latest['rsi']:.1f}")
+    if bb_range > 0 and (latest['close'] - latest['bb_low']) / bb_range > 0.8:
+        sell += 1
+        sell_reasons.append("✓ Fiyat BB üst bandına yakın")
+    if has_prev:
+        if latest['macd'] < latest['macd_signal'] and prev['macd'] >= prev['macd_signal']:
+            sell += 1
+            sell_reasons.append("✓ MACD bearish crossover")
+        elif latest['macd'] < latest['macd_signal']:
+            sell += 0.5
+            sell_reasons.append("✓ MACD bearish")
+    if latest['ema_20'] < latest['ema_50']:
+        sell += 1
+        sell_reasons.append("✓ EMA trend aşağı")
+    elif latest['ema_50'] > 0 and abs(latest['ema_20'] - latest['ema_50']) / latest['ema_50'] < 0.01:
+        sell += 0.5
+        sell_reasons.append("✓ EMA'lar yakın (potansiyel death cross)")
+    if latest['volume_ma'] > 0 and latest['volume'] > latest['volume_ma'] * 1.2:
+        sell += 1
+        sell_reasons.append(f"✓ Hacim yüksek: {latest['volume']/latest['volume_ma']:.2f}x")
+    return buy, sell, buy_reasons, sell_reasons
+
+
+def weekly_decision(buy, sell, min_score=4):
+    """Eski haftalık sinyal kararı"""
+    if buy >= min_score and sell >= min_score:
+        if buy > sell:
+            return 'BUY'
+        if sell > buy:
+            return 'SELL'
+        return None
+    if buy >= min_score:
+        return 'BUY'
+    if sell >= min_score:
+        return 'SELL'
+    return None
+
+
+def check_daily_parity():
+    """Günlük skorlar, koşul bayrakları, sinyaller ve sebepler her mumda aynı olmalı"""
+    print("\n" + "="*60)
+    print("1. GÜNLÜK SKOR PARİTESİ")
+    print("="*60)
+
+    try:
+        ok = True
+        for seed in SEEDS:
+            data = daily_series(seed)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                buy_flags, sell_flags = daily_conditions(data, **DAILY_THRESHOLDS)
+                buy_scores, sell_scores = daily_scores(data, **DAILY_THRESHOLDS)
+            signals = daily_signals(buy_scores, sell_scores, min_score=5)
+
+            mismatches = 0
+            fired = 0
+            for i in range(BARS):
+                latest = row(data, i)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    buy, buy_ref, buy_reasons = check_buy_conditions(latest, 25, 1.3)
+                    sell, sell_ref, sell_reasons = check_sell_conditions(latest, 75, 1.3)
+                expected = 'BUY' if buy >= 5 else 'SELL' if sell >= 5 else None
+                signal = {1: 'BUY', -1: 'SELL', 0: None}[int(signals[i])]
+
+                same = (buy_scores[i] == buy and sell_scores[i] == sell and signal == expected
+                        and all(buy_flags[name][i] == buy_ref[name] for name in buy_ref)
+                        and all(sell_flags[name][i] == sell_ref[name] for name in sell_ref))
+                if same and signal:
+                    fired += 1
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        reasons = daily_reasons(latest, signal, **DAILY_THRESHOLDS)
+                    same = reasons == (buy_reasons if signal == 'BUY' else sell_reasons)
+                mismatches += not same
+
+            seed_ok = mismatches == 0 and fired > 0
+            ok = ok and seed_ok
+            print(f"  {'✓' if seed_ok else '✗'} seed {seed}: {BARS} mum, {mismatches} farklı, "
+                  f"{fired} sinyal (sebepler dahil), en yüksek skor "
+                  f"{int(buy_scores.max())}/{int(sell_scores.max())}")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Günlük parite testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_weekly_parity():
+    """Haftalık kısmi puanlı skorlar, sinyal kararları ve sebepler her mumda aynı olmalı"""
+    print("\n" + "="*60)
+    print("2. HAFTALIK SKOR PARİTESİ")
+    print("="*60)
+
+    try:
+        ok = True
+        for seed in SEEDS:
+            data = weekly_series(seed)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                buy_scores, sell_scores = weekly_scores(data, **WEEKLY_THRESHOLDS)
+            signals = weekly_signals(buy_scores, sell_scores, min_score=4)
+
+            mismatches = 0
+            fired = 0
+            partial = 0
+            for i in range(1, BARS):
+                latest, prev = row(data, i), row(data, i - 1)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    reference = check_weekly_conditions(latest, prev)
+                if reference is None:
+                    # NaN alanlı mumlar skorlanmaz
+                    mismatches += not (buy_scores[i] == 0 and sell_scores[i] == 0 and signals[i] == 0)
+                    continue
+
+                buy, sell, buy_reasons, sell_reasons = reference
+                expected = weekly_decision(buy, sell)
+                signal = {1: 'BUY', -1: 'SELL', 0: None}[int(signals[i])]
+                same = buy_scores[i] == buy and sell_scores[i] == sell and signal == expected
+                partial += (buy % 1 != 0) or (sell % 1 != 0)
+                if same and signal:
+                    fired += 1
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        reasons = weekly_reasons(latest, prev, signal, **WEEKLY_THRESHOLDS)
+                    same = reasons == (buy_reasons if signal == 'BUY' else sell_reasons)
+                mismatches += not same
+
+            seed_ok = mismatches == 0 and fired > 0 and partial > 0
+            ok = ok and seed_ok
+            print(f"  {'✓' if seed_ok else '✗'} seed {seed}: {BARS - 1} mum, {mismatches} farklı, "
+                  f"{fired} sinyal (sebepler dahil), {partial} kısmi puanlı mum")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Haftalık parite testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("VEKTÖRİZE SİNYAL SKORLAMA TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Günlük Parite", check_daily_parity()))
+    results.append(("Haftalık Parite", check_weekly_parity()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Durum Günlüğü Testi
+Kayıt / geri yükleme, yarım kalmış son kayıt ve snapshot sıkıştırmasını dener
+
+Kullanım:
+  python test_state_journal.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from state_journal import StateJournal
+
+
+def check_roundtrip(directory):
+    """Kaydedilen durum yeni bir günlük nesnesiyle aynen geri yüklenmeli"""
+    print("\n" + "="*60)
+    print("1. KAYIT / GERİ YÜKLEME")
+    print("="*60)
+
+    try:
+        journal = StateJournal(directory)
+        journal.load()
+        journal.record({'in_position': True, 'position_type': 'BUY', 'entry_price': 43250.5,
+                        'entry_time': datetime(2024, 3, 1, 14, 15)})
+        journal.record({'buy_signals': 1, 'last_reset_date': date(2024, 3, 1)})
+        journal.record({'signals_this_week': {'buy': 1, 'sell': 0}})
+        journal.record(journal.changes({'buy_signals': 1, 'daily_profit': 0.42}))
+        journal.flush()
+
+        started = time.perf_counter()
+        state = StateJournal(directory).load()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        expected = {'in_position': True, 'position_type': 'BUY', 'entry_price': 43250.5,
+                    'entry_time': datetime(2024, 3, 1, 14, 15), 'buy_signals': 1,
+                    'last_reset_date': date(2024, 3, 1), 'signals_this_week': {'buy': 1, 'sell': 0},
+                    'daily_profit': 0.42}
+        ok = state == expected and journal.stats['records'] == 4
+        print(f"  {'✓' if ok else '✗'} {len(state)} alan geri yüklendi ({elapsed:.2f}ms), "
+              f"{journal.stats['records']} kayıt, {journal.stats['fsyncs']} fsync")
+        journal.close()
+        return ok
+
+    except Exception as e:
+        print(f"✗ Kayıt testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_torn_record(directory):
+    """Çökme anında yarım yazılmış son kayıt atılmalı, sonraki kayıtlar sağlam eklenmeli"""
+    print("\n" + "="*60)
+    print("2. YARIM KALMIŞ SON KAYIT")
+    print("="*60)
+
+    try:
+        journal = StateJournal(directory, snapshot_every=10_000)
+        journal.load()
+        journal.record({'daily_profit': 0.3})
+        journal.record({'daily_profit': 0.5})
+        journal.close()
+
+        # Yarım satır (satır sonu yok) ve CRC'si tutmayan satır
+        path = os.path.join(directory, 'journal.log')
+        size = os.path.getsize(path)
+        with open(path, 'ab') as f:
+            f.write(b'00000000 {"seq":3,"state":{"daily_profit":9.9}}\n')
+            f.write(b'1a2b3c4d {"seq":4,"state":{"daily_pro')
+
+        journal = StateJournal(directory)
+        state = journal.load()
+        truncated = os.path.getsize(path) == size
+        ok = state['daily_profit'] == 0.5 and truncated and journal.stats['dropped_bytes'] > 0
+        print(f"  {'✓' if ok else '✗'} son sağlam değer: {state['daily_profit']}, "
+              f"{journal.stats['dropped_bytes']} bayt atıldı, dosya kesildi: {truncated}")
+
+        journal.record({'daily_profit': 0.7})
+        journal.close()
+        state = StateJournal(directory).load()
+        after = state['daily_profit'] == 0.7
+        print(f"  {'✓' if after else '✗'} kesilen günlüğe yeni kayıt eklendi")
+        return ok and after
+
+    except Exception as e:
+        print(f"✗ Yarım kayıt testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_snapshot(directory):
+    """Snapshot sonrası günlük kısalmalı; eski sıra numaralı kayıtlar tekrar uygulanmamalı"""
+    print("\n" + "="*60)
+    print("3. SNAPSHOT SIKIŞTIRMA")
+    print("="*60)
+
+    try:
+        journal = StateJournal(directory, flush_interval=0, snapshot_every=10)
+        journal.load()
+        for i in range(25):
+            journal.record({'counter': i})
+            journal.flush()
+        journal.close()
+
+        path = os.path.join(directory, 'journal.log')
+        with open(path, 'rb') as f:
+            lines = f.read().count(b'\n')
+        state = StateJournal(directory).load()
+        ok = state['counter'] == 24 and journal.stats['snapshots'] >= 2 and lines < 10
+        print(f"  {'✓' if ok else '✗'} {journal.stats['snapshots']} snapshot, günlükte {lines} kayıt, "
+              f"geri yüklenen sayaç: {state['counter']}")
+
+        # Snapshot yazıldı ama günlük kesilemeden çöktü: eski kayıtlar atlanmalı
+        with open(path, 'ab') as f:
+            from state_journal import _frame
+            f.write(_frame({'seq': 5, 'state': {'counter': 5}}))
+        state = StateJournal(directory).load()
+        skipped = state['counter'] == 24
+        print(f"  {'✓' if skipped else '✗'} snapshot'tan eski kayıt atlandı")
+        return ok and skipped
+
+    except Exception as e:
+        print(f"✗ Snapshot testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("DURUM GÜNLÜĞÜ TESTİ")
+    print("="*60)
+
+    root = tempfile.mkdtemp(prefix='state-journal-')
+    try:
+        results = []
+        results.append(("Kayıt / Geri Yükleme", check_roundtrip(os.path.join(root, 'roundtrip'))))
+        results.append(("Yarım Kayıt", check_torn_record(os.path.join(root, 'torn'))))
+        results.append(("Snapshot", check_snapshot(os.path.join(root, 'snapshot'))))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
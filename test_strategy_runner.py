@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Strateji Çalıştırıcı Testi
+Ortak indikatör çerçevesinin stratejiye özel çerçevelerle aynı değerleri verdiğini ve
+tek beslemedeki çok sayıda stratejinin ayrı ayrı çalıştırılmış halleriyle aynı
+sinyalleri ürettiğini dener (ağ gerekmez)
+
+Kullanım:
+  python test_strategy_runner.py
+"""
+
+import sys
+
+import numpy as np
+
+from candle_store import candle_array
+from strategies import DAILY_INDICATORS, WEEKLY_INDICATORS, DailyStrategy, WeeklyStrategy
+from strategy_runner import StrategyRunner
+from streaming_indicators import IndicatorFrame
+
+TIMEFRAME_MS = 900_000
+
+
+def random_candles(count, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, count)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.003)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.003)
+    volume = rng.lognormal(3, 0.6, count)
+    timestamps = 1_700_000_100_000 // TIMEFRAME_MS * TIMEFRAME_MS + np.arange(count) * TIMEFRAME_MS
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+def single_frame(name, indicators):
+    """Tek stratejilik çerçeve (karşılaştırma için)"""
+    frame = IndicatorFrame(history=200)
+    frame.register(name, indicators)
+    return frame
+
+
+def check_frame():
+    """Ortak çerçeve (oluşan mum güncellemeleriyle) stratejiye özel çerçevelerle birebir aynı olmalı"""
+    print("\n" + "="*60)
+    print("1. ORTAK İNDİKATÖR ÇERÇEVESİ")
+    print("="*60)
+
+    try:
+        ohlcv = random_candles(800)
+        frame = IndicatorFrame(history=200)
+        frame.register('daily', DAILY_INDICATORS)
+        frame.register('weekly', WEEKLY_INDICATORS)
+        engines = {'daily': single_frame('daily', DAILY_INDICATORS),
+                   'weekly': single_frame('weekly', WEEKLY_INDICATORS)}
+        separate = sum(len(engine.columns(name)) for name, engine in engines.items())
+        print(f"  ✓ {separate} kolon için {len(frame.components)} ortak bileşen")
+
+        ok = True
+        for end in range(250, len(ohlcv)):
+            window = ohlcv[end - 200:end].copy()
+            for fraction in (0.5, 1.0):
+                # Oluşan mum önce yarım, sonra son haliyle gelir
+                forming = window.copy()
+                forming[-1, 4] = window[-1, 1] + (window[-1, 4] - window[-1, 1]) * fraction
+                candles = candle_array(forming)
+                records = frame.update_candles(candles)
+                for name, engine in engines.items():
+                    expected = engine.select(engine.update_candles(candles), name)
+                    actual = frame.select(records, name)
+                    for column in ('close', *engine.columns(name)):
+                        if not np.array_equal(actual[column], expected[column], equal_nan=True):
+                            ok = False
+        print(f"  {'✓' if ok else '✗'} {len(ohlcv) - 250} mum x 2 güncelleme: değerler birebir aynı")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Çerçeve testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_runner():
+    """Tek beslemedeki stratejiler tek başına çalıştırılmış halleriyle aynı sinyalleri üretmeli"""
+    print("\n" + "="*60)
+    print("2. ÇOKLU STRATEJİ")
+    print("="*60)
+
+    try:
+        strategies = [
+            DailyStrategy('daily-7'),
+            DailyStrategy('daily-4', min_score=4, rsi_oversold=30, rsi_overbought=70),
+            WeeklyStrategy('weekly-5', timeframe='15m'),
+            WeeklyStrategy('weekly-3', timeframe='15m', min_score=3, rsi_buy=40, rsi_sell=60),
+        ]
+        runner = StrategyRunner(exchange=None, strategies=strategies, clock=object())
+        feed = runner.feeds[('BTC/USDT', '15m')]
+        actual = []
+        runner.signal_callbacks = [lambda strategy, signal, score, reasons, row: actual.append(
+            (strategy.name, int(row['timestamp']), signal, float(score), list(reasons)))]
+
+        ohlcv = random_candles(1500)
+        engines = {strategy.name: single_frame(strategy.name, strategy.indicators)
+                   for strategy in strategies}
+        expected = []
+        for end in range(201, len(ohlcv)):
+            # Pencere + oluşan mum; kapanan mum ohlcv[end - 1]
+            feed.store.merge(ohlcv[end - 200:end + 1])
+            runner.on_bar(feed, int(ohlcv[end - 1][0]))
+
+            candles = candle_array(ohlcv[end - 200:end])
+            for strategy in strategies:
+                engine = engines[strategy.name]
+                data = engine.select(engine.update_candles(candles), strategy.name)
+                if isinstance(strategy, WeeklyStrategy):
+                    data = engine.warmed_up(data, strategy.name)
+                signal, score, reasons = strategy.evaluate(data)
+                if signal:
+                    expected.append((strategy.name, int(candles['timestamp'][-1]), signal,
+                                     float(score), list(reasons)))
+
+        counts = {strategy.name: sum(1 for s in actual if s[0] == strategy.name) for strategy in strategies}
+        ok = actual == expected and len(actual) > 0
+        print(f"  {'✓' if ok else '✗'} {len(actual)} sinyal (beklenen {len(expected)}): {counts}")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Çoklu strateji testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("STRATEJİ ÇALIŞTIRICI TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Ortak Çerçeve", check_frame()))
+    results.append(("Çoklu Strateji", check_runner()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
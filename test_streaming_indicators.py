@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Akışkan İndikatör Çerçevesi Testi
+Canlı botun kayan mum penceresiyle beslenen IndicatorFrame'in son mum
+değerlerini aynı pencerede toplu `ta` hesabıyla karşılaştırır ve oluşan mumun
+geri alınıp (rollback) yeniden uygulanmasının sonucu değiştirmediğini dener
+(ağ gerekmez)
+
+Toplu hesap EMA tabanlı indikatörleri (EMA, MACD, RSI, ATR) her pencerenin ilk
+mumundan yeniden başlatır, akışkan çerçeve ise önceki mumlardan gelen değeri
+taşır (yeniden tohumlama yok). Bu fark seed_tolerance ile sınırlanır; pencere
+bazlı indikatörler (Bollinger, Stochastic, hacim, seans VWAP) birebir aynıdır.
+
+Kullanım:
+  python test_streaming_indicators.py
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from candle_store import candle_array
+from strategies import DAILY_INDICATORS
+from streaming_indicators import DAY_MS, IndicatorFrame
+
+TIMEFRAME_MS = 900_000
+WINDOW = 200  # Canlı botun mum penceresi (CANDLE_WINDOW)
+TOLERANCE = 1e-9  # Pencere bazlı indikatörler için göreli hata
+SEED_GAP = 0.1  # Pencere başında EMA ile fiyat arasındaki fark üst sınırı (fiyatın oranı)
+
+
+def random_candles(count, seed=17):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, count)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.003)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.003)
+    volume = rng.lognormal(3, 0.6, count)
+    timestamps = 1_700_006_400_000 + np.arange(count) * TIMEFRAME_MS
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+def seed_tolerance(alpha, bars, scale):
+    """
+    Yeniden tohumlanmayan üssel ortalamanın toplu hesaptan farkının üst sınırı
+
+    Toplu hesap ortalamayı pencerenin ilk mumundan başlatır (e0 = x0), akışkan
+    hesap o mumda gerçek değeri taşır. Başlangıçtaki fark her mumda (1 - alpha)
+    oranında söner: |fark| <= (1 - alpha)^bars * |x0 - e0| <= (1 - alpha)^bars * scale
+    """
+    return (1 - alpha) ** bars * scale
+
+
+def tolerances(params, close):
+    """Kolon başına mutlak tolerans (son mum kapanışı `close` için)"""
+    fast, slow, signal = params['macd']
+    gap = SEED_GAP * close
+    tol = {'rsi': seed_tolerance(1 / params['rsi'], WINDOW - 1, 100.0),
+           'atr': seed_tolerance(1 / params['atr'], WINDOW - params['atr'], gap)}
+    for name, window in params['ema'].items():
+        tol[name] = seed_tolerance(2 / (window + 1), WINDOW - 1, gap)
+    # MACD iki EMA farkıdır; sinyal çizgisi ilk geçerli MACD değerinden sonra başlar
+    macd = seed_tolerance(2 / (slow + 1), WINDOW - slow - signal, 2 * gap)
+    tol.update(macd=macd, macd_signal=macd, macd_diff=2 * macd)
+    return tol
+
+
+def batch_reference(window, params):
+    """Penceredeki mumlar için `ta` ile toplu hesap (akışkan çerçeveden önceki yöntem)"""
+    from ta.momentum import RSIIndicator, StochasticOscillator
+    from ta.trend import MACD, EMAIndicator
+    from ta.volatility import AverageTrueRange, BollingerBands
+
+    df = pd.DataFrame(window[:, 1:], columns=['open', 'high', 'low', 'close', 'volume'])
+    out = {'rsi': RSIIndicator(close=df['close'], window=params['rsi']).rsi()}
+    for name, period in params['ema'].items():
+        out[name] = EMAIndicator(close=df['close'], window=period).ema_indicator()
+    fast, slow, signal = params['macd']
+    macd = MACD(close=df['close'], window_slow=slow, window_fast=fast, window_sign=signal)
+    out.update(macd=macd.macd(), macd_signal=macd.macd_signal(), macd_diff=macd.macd_diff())
+    bb = BollingerBands(close=df['close'], window=params['bollinger'][0],
+                        window_dev=params['bollinger'][1])
+    out.update(bb_high=bb.bollinger_hband(), bb_mid=bb.bollinger_mavg(), bb_low=bb.bollinger_lband())
+    stoch = StochasticOscillator(high=df['high'], low=df['low'], close=df['close'],
+                                 window=params['stochastic'][0],
+                                 smooth_window=params['stochastic'][1])
+    out.update(stoch_k=stoch.stoch(), stoch_d=stoch.stoch_signal())
+    out['volume_ma'] = df['volume'].rolling(window=params['volume_ma']).mean()
+    out['volume_ratio'] = df['volume'] / out['volume_ma']
+    out['atr'] = AverageTrueRange(high=df['high'], low=df['low'], close=df['close'],
+                                  window=params['atr']).average_true_range()
+    # Seans VWAP: son mumun seansı (UTC gün) pencerenin içinde başlar
+    session = (window[:, 0] - params['vwap'] * 3_600_000) // DAY_MS
+    today = session == session[-1]
+    typical = (df['high'] + df['low'] + df['close']) / 3
+    out['vwap'] = pd.Series(np.nan, index=df.index)
+    out['vwap'].iloc[-1] = ((typical * df['volume'])[today].sum() / df['volume'][today].sum())
+    return {name: float(series.iloc[-1]) for name, series in out.items()}
+
+
+def check_window_parity():
+    """Kayan pencere ile beslenen çerçevenin son mumu toplu `ta` hesabına yakın olmalı"""
+    print("\n" + "="*60)
+    print("1. KAYAN PENCERE PARİTESİ (toplu `ta`)")
+    print("="*60)
+
+    try:
+        params = DAILY_INDICATORS
+        frame = IndicatorFrame(history=WINDOW)
+        columns = frame.register('daily', params)
+        ohlcv = random_candles(WINDOW + 600)
+
+        worst = {column: 0.0 for column in columns}  # Gözlenen hata / tolerans
+        ok = True
+        for end in range(WINDOW, len(ohlcv) + 1):
+            window = ohlcv[end - WINDOW:end]
+            records = frame.select(frame.update_candles(candle_array(window)), 'daily')
+            expected = batch_reference(window, params)
+            close = float(window[-1, 4])
+            limits = tolerances(params, close)
+            for column in columns:
+                actual = float(records[column][-1])
+                if np.isnan(expected[column]) or np.isnan(actual):
+                    ok = ok and np.isnan(expected[column]) == np.isnan(actual)
+                    continue
+                limit = max(limits.get(column, 0.0), TOLERANCE * max(1.0, abs(expected[column])))
+                ratio = abs(actual - expected[column]) / limit
+                worst[column] = max(worst[column], ratio)
+                ok = ok and ratio <= 1.0
+
+        for column in columns:
+            mark = '✓' if worst[column] <= 1.0 else '✗'
+            seeded = ' (yeniden tohumlama yok)' if column in limits else ''
+            print(f"  {mark} {column:13} hata / tolerans: {worst[column]:.2e}{seeded}")
+        print(f"  {'✓' if ok else '✗'} {len(ohlcv) - WINDOW + 1} pencere, son mum değerleri")
+        return ok
+
+    except ImportError as e:
+        print(f"✗ Paket eksik: {e}")
+        return False
+    except Exception as e:
+        print(f"✗ Kayan pencere testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_forming_rollback():
+    """Oluşan mum iki kez güncellenip kapanınca sonuç sadece son hali görmüş gibi olmalı"""
+    print("\n" + "="*60)
+    print("2. OLUŞAN MUM GERİ ALMA")
+    print("="*60)
+
+    try:
+        params = DAILY_INDICATORS
+        ohlcv = random_candles(1500, seed=23)
+        rng = np.random.default_rng(5)
+        forming = IndicatorFrame(history=len(ohlcv))
+        forming.register('daily', params)
+        closed = IndicatorFrame(history=len(ohlcv))
+        closed.register('daily', params)
+
+        kept = True
+        for i, (timestamp, open_, high, low, close, volume) in enumerate(ohlcv):
+            # İki ara güncelleme (fiyat ve hacim kapanıştan farklı), sonra kapanış
+            for _ in range(2):
+                partial = close * (1 + rng.normal(0, 0.002))
+                forming.update(int(timestamp), open_, max(high, partial), min(low, partial),
+                               partial, volume * rng.random())
+            forming.update(int(timestamp), open_, high, low, close, volume)
+            closed.update(int(timestamp), open_, high, low, close, volume)
+            if i:
+                # Kapanmış önceki mumun satırı sonraki güncellemelerle değişmemeli
+                previous = forming.buffer.view()[-2]
+                kept = kept and previous.tobytes() == closed.buffer.view()[-2].tobytes()
+
+        same = forming.buffer.view().tobytes() == closed.buffer.view().tobytes()
+        print(f"  {'✓' if same else '✗'} {len(ohlcv)} mum x 2 ara güncelleme: tüm kolonlar bit bit aynı")
+        print(f"  {'✓' if kept else '✗'} Kapanan mum satırı yeni mumda değişmedi")
+
+        # Eski zaman damgalı mum yok sayılır
+        before = forming.buffer.view().tobytes()
+        forming.update(int(ohlcv[-2, 0]), *ohlcv[-1, 1:])
+        ignored = forming.buffer.view().tobytes() == before
+        print(f"  {'✓' if ignored else '✗'} Eski zaman damgalı güncelleme yok sayıldı")
+        return same and kept and ignored
+
+    except Exception as e:
+        print(f"✗ Geri alma testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("AKIŞKAN İNDİKATÖR ÇERÇEVESİ TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Kayan Pencere Paritesi", check_window_parity()))
+    results.append(("Oluşan Mum Geri Alma", check_forming_rollback()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Telegram Bildirim Kuyruğu Testi
+TelegramNotifier'ın send() Future'larını gönderim sonucuyla tamamladığını,
+durum mesajlarını birleştirdiğini, kuyruk dolunca beklemeden reddettiğini ve
+close() çağrısında kuyruktaki mesajları gönderip durduğunu dener (internet
+gerekmez; yerel Telegram taklidi kullanılır)
+
+Kullanım:
+  python test_telegram_queue.py
+"""
+
+import logging
+import sys
+import time
+
+from telegram_queue import TelegramNotifier
+from telegram_stub import TelegramStubServer
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def check_futures():
+    """Future gönderilince True, tüm denemeler başarısızsa False olmalı"""
+    print("\n" + "="*60)
+    print("1. FUTURE SONUÇLARI")
+    print("="*60)
+
+    server = TelegramStubServer().start()
+    failing = TelegramStubServer(error_rate=1.0).start()
+    try:
+        notifier = TelegramNotifier('test', 'test', api_url=server.url, coalesce_window=0)
+        deliveries = []
+        notifier.delivery_callbacks.append(lambda seconds, success: deliveries.append(success))
+        futures = [notifier.send(f"Sinyal #{i}") for i in range(5)]
+        results = [future.result(timeout=10) for future in futures]
+        ok = (results == [True] * 5 and server.messages == [f"Sinyal #{i}" for i in range(5)]
+              and notifier.stats['sent'] == 5 and deliveries == [True] * 5)
+        print(f"  {'✓' if ok else '✗'} 5 mesaj: Future'lar True, sunucuda sırasıyla {len(server.messages)} mesaj")
+        notifier.close()
+
+        notifier = TelegramNotifier('test', 'test', api_url=failing.url, max_retries=3,
+                                    backoff=0.01, coalesce_window=0)
+        result = notifier.send("Sinyal").result(timeout=10)
+        step_ok = (result is False and failing.requests == 3
+                   and notifier.stats['failed'] == 1 and notifier.stats['retries'] == 2)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} HTTP 500: {failing.requests} deneme, Future False")
+        notifier.close()
+        return ok
+
+    except Exception as e:
+        print(f"✗ Future testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        server.shutdown()
+        failing.shutdown()
+
+
+def check_coalesce_and_full():
+    """Durum mesajları tek mesajda birleşmeli, dolu kuyruk bot'u bekletmemeli"""
+    print("\n" + "="*60)
+    print("2. BİRLEŞTİRME VE DOLU KUYRUK")
+    print("="*60)
+
+    server = TelegramStubServer().start()
+    slow = TelegramStubServer(latency=0.3).start()
+    try:
+        notifier = TelegramNotifier('test', 'test', api_url=server.url, coalesce_window=0.3)
+        futures = [notifier.send(f"Durum {i}", status=True) for i in range(3)]
+        futures.append(notifier.send("Sinyal"))
+        results = [future.result(timeout=10) for future in futures]
+        ok = (results == [True] * 4 and server.messages == ["Durum 0\n\nDurum 1\n\nDurum 2", "Sinyal"]
+              and notifier.stats['merged'] == 2 and notifier.stats['sent'] == 4)
+        print(f"  {'✓' if ok else '✗'} 3 durum + 1 sinyal: {len(server.messages)} Telegram mesajı, "
+              f"{notifier.stats['merged']} birleştirme")
+        notifier.close()
+
+        notifier = TelegramNotifier('test', 'test', api_url=slow.url, maxsize=1, coalesce_window=0)
+        first = notifier.send("Bir")
+        wait_until(notifier.queue.empty)  # Gönderici ilk mesajı aldı, sunucu yanıtını bekliyor
+        second = notifier.send("İki")
+        started = time.perf_counter()
+        third = notifier.send("Üç")
+        elapsed = time.perf_counter() - started
+        step_ok = (third.done() and third.result() is False and notifier.stats['dropped'] == 1
+                   and elapsed < 0.05 and first.result(timeout=10) and second.result(timeout=10))
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Dolu kuyruk: mesaj {elapsed * 1000:.1f}ms içinde reddedildi, "
+              f"önceki mesajlar gönderildi")
+        notifier.close()
+        return ok
+
+    except Exception as e:
+        print(f"✗ Birleştirme testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        server.shutdown()
+        slow.shutdown()
+
+
+def check_close_drains():
+    """close() kuyruktaki tüm mesajları gönderip iş parçacığını durdurmalı"""
+    print("\n" + "="*60)
+    print("3. KAPANIŞTA KUYRUĞU BOŞALTMA")
+    print("="*60)
+
+    server = TelegramStubServer(latency=0.02).start()
+    try:
+        notifier = TelegramNotifier('test', 'test', api_url=server.url, coalesce_window=0)
+        notifier.close()
+        ok = notifier._worker is None
+        print(f"  {'✓' if ok else '✗'} Hiç mesaj yokken close() beklemeden döndü")
+
+        futures = [notifier.send(f"Sinyal #{i}") for i in range(10)]
+        worker = notifier._worker
+        notifier.close()
+        step_ok = (all(future.done() and future.result() for future in futures)
+                   and len(server.messages) == 10 and not worker.is_alive()
+                   and notifier._worker is None)
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} close(): 10 Future tamamlandı, {len(server.messages)} mesaj "
+              f"gönderildi, iş parçacığı durdu")
+
+        # Kapanıştan sonra gönderilen mesaj yeni iş parçacığıyla gider
+        step_ok = notifier.send("Tekrar").result(timeout=10) and server.messages[-1] == "Tekrar"
+        ok = ok and step_ok
+        print(f"  {'✓' if step_ok else '✗'} Kapanış sonrası send() yeni iş parçacığı başlattı")
+        notifier.close()
+        return ok
+
+    except Exception as e:
+        print(f"✗ Kapanış testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        server.shutdown()
+
+
+def main():
+    """Ana test fonksiyonu"""
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    print("\n" + "="*60)
+    print("TELEGRAM BİLDİRİM KUYRUĞU TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Future Sonuçları", check_futures()))
+    results.append(("Birleştirme / Dolu Kuyruk", check_coalesce_and_full()))
+    results.append(("Kapanışta Boşaltma", check_close_drains()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
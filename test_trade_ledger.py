@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İşlem Defteri Testi
+Toplu yazma ve raporların (dönemlik kar, düşüş, skor aralığı) doğruluğunu dener
+
+Kullanım:
+  python test_trade_ledger.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from trade_ledger import DAY_MS, TradeLedger
+
+
+def check_reports(path):
+    """Rapor sonuçları aynı verinin NumPy ile hesaplanmış değerleriyle aynı olmalı"""
+    print("\n" + "="*60)
+    print("1. RAPORLAR")
+    print("="*60)
+
+    try:
+        rng = np.random.default_rng(7)
+        n = 2000
+        nets = rng.normal(0.1, 1.0, n).round(4)
+        scores = rng.integers(5, 8, n)
+        start = 1_704_067_200_000  # 2024-01-01 (Pazartesi) UTC
+        exits = start + np.arange(n) * (DAY_MS // 4)
+
+        ledger = TradeLedger(path)
+        started = time.perf_counter()
+        for i in range(n):
+            ledger.record_trade('daily', 'BTC/USDT', 'BUY', int(exits[i]) - 900_000, 40000.0,
+                                int(exits[i]), 40100.0, nets[i], 0.2, 'Kar Hedefi',
+                                score=int(scores[i]), reasons=['RSI'])
+        enqueue = (time.perf_counter() - started) / n * 1e6
+        ledger.record_signal('daily', 'BTC/USDT', start, 'SELL', 6, 40000.0, acted=False)
+        flushed = ledger.flush(30)
+
+        summary = ledger.summary('daily')
+        ok = (flushed and summary['trades'] == n and summary['wins'] == int((nets > 0).sum())
+              and abs(summary['total_net'] - nets.sum()) < 1e-6)
+        print(f"  {'✓' if ok else '✗'} {summary['trades']} işlem, toplam net %{summary['total_net']:.2f} "
+              f"(kayıt başına {enqueue:.1f}µs)")
+
+        equity = np.cumsum(nets)
+        expected = (np.maximum.accumulate(np.maximum(equity, 0)) - equity).max()
+        drawdown = ledger.max_drawdown('daily')
+        dd_ok = abs(drawdown - expected) < 1e-6
+        print(f"  {'✓' if dd_ok else '✗'} maksimum düşüş %{drawdown:.2f} (beklenen %{expected:.2f})")
+
+        weeks = ledger.pnl('daily', period='week')
+        week_ok = (weeks[0]['period'] == '2024-01-01' and weeks[0]['trades'] == 28
+                   and sum(w['trades'] for w in weeks) == n)
+        print(f"  {'✓' if week_ok else '✗'} {len(weeks)} hafta, ilk hafta {weeks[0]['period']} "
+              f"({weeks[0]['trades']} işlem)")
+
+        buckets = {row['score']: row for row in ledger.score_buckets('daily')}
+        bucket_ok = all(buckets[s]['trades'] == int((scores == s).sum()) for s in (5, 6, 7))
+        signals = ledger.signal_counts('daily')
+        signal_ok = len(signals) == 1 and signals[0]['acted'] == 0
+        print(f"  {'✓' if bucket_ok and signal_ok else '✗'} skor aralıkları ve sinyal sayıları")
+
+        ledger.close()
+        return ok and dd_ok and week_ok and bucket_ok and signal_ok
+
+    except Exception as e:
+        print(f"✗ Rapor testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_reopen(path):
+    """Kapatılan defter yeniden açılınca kayıtlar korunmalı, yeni kayıtlar eklenmeli"""
+    print("\n" + "="*60)
+    print("2. YENİDEN AÇMA")
+    print("="*60)
+
+    try:
+        ledger = TradeLedger(path)
+        ledger.record_trade('weekly', 'BTC/USDT', 'SELL', 1_000, 40000.0, 2_000, 39400.0, 1.3, 0.2)
+        ledger.close()
+
+        ledger = TradeLedger(path)
+        before = ledger.summary('weekly')['trades']
+        ledger.record_trade('weekly', 'BTC/USDT', 'BUY', 3_000, 39400.0, 4_000, 38200.0, -3.2, 0.2)
+        ledger.flush()
+        summary = ledger.summary('weekly')
+        ok = before == 1 and summary['trades'] == 2 and abs(summary['total_net'] + 1.9) < 1e-9
+        print(f"  {'✓' if ok else '✗'} {summary['trades']} işlem, toplam net %{summary['total_net']:.2f}")
+        ledger.close()
+        return ok
+
+    except Exception as e:
+        print(f"✗ Yeniden açma testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("İŞLEM DEFTERİ TESTİ")
+    print("="*60)
+
+    root = tempfile.mkdtemp(prefix='trade-ledger-')
+    try:
+        results = []
+        results.append(("Raporlar", check_reports(os.path.join(root, 'reports.sqlite'))))
+        results.append(("Yeniden Açma", check_reopen(os.path.join(root, 'reopen.sqlite'))))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mum İçi İşlem Simülatörü Testi
+simulate_intrabar'ın 1m alt mumları tek tek dolaşan basit bir döngüyle,
+simulate_signals'ın haftalık botun sinyal takibiyle aynı işlemleri ürettiğini
+dener ve ilk dokunuş çözümünün hızını ölçer (ağ gerekmez)
+
+Kullanım:
+  python test_trade_simulator.py
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from trade_simulator import (DAY_MS, EXIT_END, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, MINUTE_MS,
+                             SubBars, simulate_intrabar, simulate_signals)
+
+TIMEFRAME_MS = 900_000
+
+
+def random_minutes(count, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, count)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.0003, count))
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.001)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.001)
+    timestamps = 1_700_006_400_000 + np.arange(count) * MINUTE_MS
+    return np.column_stack([timestamps, open_, high, low, close, np.ones(count)])
+
+
+def reference(timestamps, close, signals, minutes, take_profit_pct, stop_loss_pct,
+              commission_pct, period_target_pct, min_interval_ms):
+    """Dakika dakika dolaşan referans (günlük limitler, kötümser aynı dakika kuralı)"""
+    minute_ts, opening, high, low, last = (minutes[:, i] for i in range(5))
+    trades = []
+    free_ms = 0
+    period, profit, buys, sells, last_signal = -1, 0.0, 0, 0, -1
+    pending = None
+    for i, signal in enumerate(signals):
+        entry_ms = timestamps[i] + TIMEFRAME_MS
+        start = np.searchsorted(minute_ts, entry_ms)
+        if signal == 0 or start >= len(minute_ts) or entry_ms < free_ms:
+            continue
+        if pending is not None:
+            if pending[0] != period:
+                period, profit, buys, sells = pending[0], 0.0, 0, 0
+            profit += pending[1]
+            pending = None
+        if timestamps[i] // DAY_MS != period:
+            period, profit, buys, sells = timestamps[i] // DAY_MS, 0.0, 0, 0
+        if (profit >= period_target_pct or (signal == 1 and buys >= 1)
+                or (signal == -1 and sells >= 1)
+                or (last_signal >= 0 and timestamps[i] - last_signal < min_interval_ms)):
+            continue
+
+        price = close[i]
+        stop = stop_loss_pct[i] if np.ndim(stop_loss_pct) else stop_loss_pct
+        target_level = price * (1 + signal * take_profit_pct / 100)
+        stop_level = price * (1 - signal * stop / 100)
+        exit_at = (len(minute_ts) - 1, last[-1], EXIT_END)
+        for j in range(start, len(minute_ts)):
+            if signal == 1:
+                hit_target, hit_stop = high[j] >= target_level, low[j] <= stop_level
+                gap = opening[j] >= target_level
+            else:
+                hit_target, hit_stop = low[j] <= target_level, high[j] >= stop_level
+                gap = opening[j] <= target_level
+            if not (hit_target or hit_stop):
+                continue
+            if hit_target and (not hit_stop or gap):
+                fill = max(target_level, opening[j]) if signal == 1 else min(target_level, opening[j])
+                exit_at = (j, fill, EXIT_TAKE_PROFIT)
+            else:
+                fill = min(stop_level, opening[j]) if signal == 1 else max(stop_level, opening[j])
+                exit_at = (j, fill, EXIT_STOP_LOSS)
+            break
+
+        j, fill, reason = exit_at
+        net = (fill - price) / price * 100 * signal - 2 * commission_pct
+        buys += signal == 1
+        sells += signal == -1
+        last_signal = timestamps[i]
+        free_ms = minute_ts[j] + MINUTE_MS
+        pending = (minute_ts[j] // DAY_MS, net)
+        trades.append((i, np.searchsorted(timestamps, minute_ts[j], 'right') - 1, signal,
+                       price, fill, net, reason))
+    return np.array(trades, dtype=np.float64).reshape(-1, 7)
+
+
+def signal_reference(timestamps, close, signals, bars, take_profit_pct, stop_loss_pct, commission_pct):
+    """BitcoinWeeklyBot: haftada 1 alış + 1 satış, her sinyal _track_open_signals gibi mum mum izlenir"""
+    bar_ts, high, low, last = bars[:, 0], bars[:, 2], bars[:, 3], bars[:, 4]
+    trades = []
+    sent = {}
+    for i, signal in enumerate(signals):
+        start = np.searchsorted(bar_ts, timestamps[i] + TIMEFRAME_MS)
+        if signal == 0 or start >= len(bar_ts):
+            continue
+        week = datetime.fromtimestamp(timestamps[i] / 1000, timezone.utc).isocalendar()[:2]
+        if sent.get((week, signal), 0) >= 1:
+            continue
+        sent[week, signal] = 1
+
+        price = close[i]
+        stop = stop_loss_pct[i] if np.ndim(stop_loss_pct) else stop_loss_pct
+        target_level = price * (1 + signal * take_profit_pct / 100)
+        stop_level = price * (1 - signal * stop / 100)
+        exit_at = (len(bar_ts) - 1, last[-1], EXIT_END)
+        for j in range(start, len(bar_ts)):
+            if signal == 1:
+                hit_target, hit_stop = high[j] >= target_level, low[j] <= stop_level
+            else:
+                hit_target, hit_stop = low[j] <= target_level, high[j] >= stop_level
+            if hit_stop:
+                exit_at = (j, stop_level, EXIT_STOP_LOSS)
+                break
+            if hit_target:
+                exit_at = (j, target_level, EXIT_TAKE_PROFIT)
+                break
+
+        j, fill, reason = exit_at
+        net = (fill - price) / price * 100 * signal - 2 * commission_pct
+        trades.append((i, np.searchsorted(timestamps, bar_ts[j], 'right') - 1, signal,
+                       price, fill, net, reason))
+    return np.array(trades, dtype=np.float64).reshape(-1, 7)
+
+
+def resample(minutes, size=15):
+    """1m mumları size dakikalık mumlara birleştir"""
+    blocks = minutes[:len(minutes) // size * size].reshape(-1, size, minutes.shape[1])
+    return np.column_stack([blocks[:, 0, 0], blocks[:, 0, 1], blocks[:, :, 2].max(axis=1),
+                            blocks[:, :, 3].min(axis=1), blocks[:, -1, 4], blocks[:, :, 5].sum(axis=1)])
+
+
+def check_intrabar():
+    """Vektörize çıkışlar + aday seçimi referans döngüyle birebir aynı olmalı"""
+    print("\n" + "="*60)
+    print("1. MUM İÇİ ÇIKIŞLAR")
+    print("="*60)
+
+    try:
+        minutes = random_minutes(60 * 24 * 20)
+        timestamps = minutes[::15, 0].astype(np.int64)
+        close = minutes[14::15, 4]
+        cases = [
+            ('sabit stop', SubBars(minutes), 0.8, 1.0, 0.1, float('inf'), 0),
+            ('mum bazlı stop + limitler', SubBars(minutes), 0.5, None, 0.1, 1.0, 3_600_000),
+            ('kısa bloklar (çok geçiş)', SubBars(minutes, levels=3), 3.0, 3.0, 0.1,
+             float('inf'), 0),
+        ]
+
+        ok = True
+        for seed in range(3):
+            rng = np.random.default_rng(seed)
+            signals = rng.choice([0, 0, 0, 1, -1], len(timestamps))
+            for name, sub_bars, target, stop, commission, period_target, interval in cases:
+                stop = rng.uniform(0.3, 1.5, len(timestamps)) if stop is None else stop
+                actual = simulate_intrabar(sub_bars, timestamps, close, signals, target, stop,
+                                           commission, period_target, min_interval_ms=interval)
+                expected = reference(timestamps, close, signals, minutes, target, stop,
+                                     commission, period_target, interval)
+                same = actual.shape == expected.shape and np.allclose(actual, expected)
+                ok = ok and same and len(actual) > 0
+                reasons = np.bincount(actual[:, 6].astype(int), minlength=4)[1:]
+                print(f"  {'✓' if same else '✗'} tohum {seed}, {name}: {len(actual)} işlem "
+                      f"(TP/SL/son: {'/'.join(map(str, reasons))})")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Mum içi simülasyon hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_signals():
+    """Haftalık sinyal takibi referans döngüyle aynı olmalı; açık sinyal yenisini engellememeli"""
+    print("\n" + "="*60)
+    print("2. HAFTALIK SİNYAL TAKİBİ")
+    print("="*60)
+
+    try:
+        minutes = random_minutes(60 * 24 * 35, seed=11)
+        bars = resample(minutes)
+        timestamps = bars[:, 0].astype(np.int64)
+        close = bars[:, 4]
+
+        ok = True
+        for seed in range(3):
+            rng = np.random.default_rng(seed)
+            signals = rng.choice([0] * 30 + [1, -1], len(timestamps))
+            stop = rng.uniform(0.5, 2.0, len(timestamps))
+            for name, data in (('sinyal mumları', bars), ('1m alt mumlar', minutes)):
+                actual = simulate_signals(SubBars(data), timestamps, close, signals, 1.5, stop, 0.1)
+                expected = signal_reference(timestamps, close, signals, data, 1.5, stop, 0.1)
+                same = actual.shape == expected.shape and np.allclose(actual, expected)
+                ok = ok and same and len(actual) > 0
+                reasons = np.bincount(actual[:, 6].astype(int), minlength=4)[1:]
+                print(f"  {'✓' if same else '✗'} tohum {seed}, {name}: {len(actual)} işlem "
+                      f"(TP/SL/son: {'/'.join(map(str, reasons))})")
+
+            # Açık alış sinyali varken aynı haftanın satış sinyali de takip edilir
+            overlap = any(later[0] <= earlier[1] for earlier, later in zip(actual, actual[1:]))
+            ok = ok and overlap
+            print(f"  {'✓' if overlap else '✗'} Üst üste binen sinyaller ayrı ayrı izlendi")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Sinyal takibi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_throughput():
+    """Bir yıllık 1m veride milyonlarca aday girişin ilk dokunuşu"""
+    print("\n" + "="*60)
+    print("3. İLK DOKUNUŞ HIZI")
+    print("="*60)
+
+    try:
+        minutes = random_minutes(525_600, seed=5)
+        started = time.perf_counter()
+        sub_bars = SubBars(minutes)
+        print(f"  ✓ {len(sub_bars):,} dakika için tablolar: {time.perf_counter() - started:.2f}s")
+
+        rng = np.random.default_rng(7)
+        count = 2_000_000
+        start = rng.integers(0, len(sub_bars), count)
+        direction = rng.choice([1, -1], count)
+        price = minutes[start, 4]
+        started = time.perf_counter()
+        index, reason, _ = sub_bars.first_touch(start, direction, price * (1 + direction * 0.008),
+                                                price * (1 - direction * 0.01))
+        elapsed = time.perf_counter() - started
+        ok = bool((index >= start).all()) and bool(np.isin(reason, (1, 2, 3)).all())
+        print(f"  {'✓' if ok else '✗'} {count:,} giriş {elapsed:.2f}s "
+              f"({count / elapsed / 1e6:.2f}M giriş/s)")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Hız testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("MUM İÇİ İŞLEM SİMÜLATÖRÜ TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Mum İçi Çıkışlar", check_intrabar()))
+    results.append(("Haftalık Sinyal Takibi", check_signals()))
+    results.append(("İlk Dokunuş Hızı", check_throughput()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
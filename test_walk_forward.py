@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Walk-Forward Testi
+Fold sınırlarının geçmiş uzadıkça sabit kaldığını, önbellekteki fold'ların
+yeniden hesaplanmadığını ve örneklem dışı işlemlerin test pencerelerinde
+kaldığını dener (ağ gerekmez)
+
+Kullanım:
+  python test_walk_forward.py
+"""
+
+import sys
+import tempfile
+
+import numpy as np
+
+from trade_simulator import DAY_MS
+from walk_forward import make_folds, run_walk_forward
+
+TIMEFRAME_MS = 900_000
+GRID = {'MIN_SIGNAL_SCORE': [3, 4], 'RSI_OVERSOLD': [30, 40]}
+
+
+def random_candles(days, seed=5):
+    count = days * DAY_MS // TIMEFRAME_MS
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.003, count)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(count) * 0.003)
+    low = np.minimum(open_, close) * (1 - rng.random(count) * 0.003)
+    volume = rng.lognormal(3, 0.6, count)
+    timestamps = 1_700_006_400_000 // DAY_MS * DAY_MS + np.arange(count) * TIMEFRAME_MS
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+def check_folds():
+    """Fold sınırları veri başlangıcından bağımsız adım katlarında olmalı"""
+    print("\n" + "="*60)
+    print("1. FOLD SINIRLARI")
+    print("="*60)
+
+    try:
+        start = 1_700_006_400_000
+        folds = make_folds(start, start + 120 * DAY_MS, train_days=30, test_days=14)
+        longer = make_folds(start, start + 134 * DAY_MS, train_days=30, test_days=14)
+        ok = (len(folds) > 0 and longer[:len(folds)] == folds and len(longer) == len(folds) + 1
+              and all(test_start % (14 * DAY_MS) == 0 and train_start >= start
+                      and test_end <= start + 120 * DAY_MS
+                      for train_start, test_start, test_end in folds))
+        print(f"  {'✓' if ok else '✗'} {len(folds)} fold, +14 gün ile {len(longer)} "
+              f"(eskiler aynı)")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Fold testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def check_cache():
+    """Tekrar çalıştırma ve uzatılmış geçmiş sadece yeni fold'ları hesaplamalı"""
+    print("\n" + "="*60)
+    print("2. FOLD ÖNBELLEĞİ")
+    print("="*60)
+
+    try:
+        candles = random_candles(134)
+        shorter = candles[:-14 * DAY_MS // TIMEFRAME_MS]
+        with tempfile.TemporaryDirectory() as cache_root:
+            options = dict(grid=GRID, train_days=30, test_days=14, cache_root=cache_root,
+                           workers=1, min_trades=1)
+            first, first_trades = run_walk_forward(shorter, **options)
+            again, again_trades = run_walk_forward(shorter, **options)
+            extended, extended_trades = run_walk_forward(candles, **options)
+
+        ok = not first['cached'].any() and again['cached'].all()
+        ok = ok and again.drop(columns='cached').equals(first.drop(columns='cached'))
+        ok = ok and again_trades.equals(first_trades)
+        print(f"  {'✓' if ok else '✗'} {len(first)} fold hesaplandı, tekrar çalıştırmada "
+              f"{int(again['cached'].sum())} önbellekten")
+
+        old = extended.iloc[:len(first)]
+        same = (len(extended) > len(first) and old['cached'].all()
+                and not extended['cached'].iloc[len(first):].any()
+                and old.drop(columns='cached').equals(first.drop(columns='cached')))
+        ok = ok and same
+        print(f"  {'✓' if same else '✗'} Geçmiş uzayınca {int((~extended['cached']).sum())} "
+              f"yeni fold hesaplandı")
+
+        inside = all(((extended_trades['entry_ms'] >= row['test_start'])
+                      & (extended_trades['entry_ms'] < row['test_end'])).sum() == row['test_trades']
+                     for _, row in extended.iterrows())
+        equity = np.allclose(extended_trades['equity'], extended_trades['net_profit'].cumsum())
+        ok = ok and inside and equity and len(extended_trades) > 0
+        print(f"  {'✓' if inside and equity else '✗'} {len(extended_trades)} örneklem dışı "
+              f"işlem test pencerelerinde, net {extended_trades['equity'].iloc[-1]:+.2f}%")
+        return ok
+
+    except Exception as e:
+        print(f"✗ Önbellek testi hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Ana test fonksiyonu"""
+    print("\n" + "="*60)
+    print("WALK-FORWARD TESTİ")
+    print("="*60)
+
+    results = []
+    results.append(("Fold Sınırları", check_folds()))
+    results.append(("Fold Önbelleği", check_cache()))
+
+    print("\n" + "="*60)
+    print("TEST SONUÇLARI")
+    print("="*60)
+
+    all_passed = True
+    for test_name, passed in results:
+        status = "✓ BAŞARILI" if passed else "✗ BAŞARISIZ"
+        print(f"{test_name:25} : {status}")
+        if not passed:
+            all_passed = False
+
+    print("="*60)
+    return 0 if all_passed else 1
+
+
+def test_main():
+    """pytest girişi: tüm kontroller başarılı olmalı"""
+    assert main() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
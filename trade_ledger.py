@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İşlem ve Sinyal Defteri (SQLite)
+Her sinyali (uygulansın / uygulanmasın) ve kapanan her işlemi kalıcı kaydeder
+
+- İndeksli şema: signals (bot, ts); trades için (bot, exit_ts) ve (bot, score)
+  kapsayan indeksler
+- WAL modu: raporlar yazıcıyı beklemeden okur
+- Yazmalar arka plan iş parçacığında toplanıp tek işlemde (transaction) yapılır,
+  bot döngüsü diski beklemez
+- Raporlar (dönemlik kar/zarar, kazanma oranı, maksimum düşüş, skor aralığı
+  isabeti) doğrudan SQL ile hesaplanır, log ayrıştırılmaz
+
+Kullanım:
+  python trade_ledger.py                          # Tüm botlar için özet rapor
+  python trade_ledger.py --bot daily --period week --start 2024-01-01
+  python trade_ledger.py --db data/ledger.sqlite --bucket 0.5 --bot weekly
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+LEDGER_PATH = os.path.join('data', 'ledger.sqlite')
+FLUSH_INTERVAL = 0.2  # Kayıtların tek işlemde toplanması için bekleme (saniye)
+BATCH_SIZE = 500
+DAY_MS = 86_400_000
+WEEK_OFFSET_MS = 3 * DAY_MS  # 1970-01-01 Perşembe - haftalar Pazartesi başlar
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY,
+    bot TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    score REAL,
+    price REAL,
+    take_profit REAL,
+    stop_loss REAL,
+    reasons TEXT,
+    acted INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signals_bot_ts ON signals (bot, ts);
+
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    bot TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    score REAL,
+    reasons TEXT,
+    entry_ts INTEGER NOT NULL,
+    entry_price REAL NOT NULL,
+    exit_ts INTEGER NOT NULL,
+    exit_price REAL NOT NULL,
+    take_profit REAL,
+    stop_loss REAL,
+    gross_pct REAL NOT NULL,
+    commission_pct REAL NOT NULL,
+    net_pct REAL NOT NULL,
+    exit_reason TEXT
+);
+-- Kapsayan (covering) indeksler: raporlar tabloya inmeden sadece indeksten okunur
+CREATE INDEX IF NOT EXISTS trades_bot_exit ON trades (bot, exit_ts, net_pct, commission_pct, score);
+CREATE INDEX IF NOT EXISTS trades_bot_score ON trades (bot, score, net_pct, exit_ts);
+"""
+
+INSERT_SIGNAL = """
+INSERT INTO signals (bot, symbol, ts, side, score, price, take_profit, stop_loss, reasons, acted)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_TRADE = """
+INSERT INTO trades (bot, symbol, side, score, reasons, entry_ts, entry_price, exit_ts, exit_price,
+                    take_profit, stop_loss, gross_pct, commission_pct, net_pct, exit_reason)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_STOP = object()
+
+
+def to_ms(value):
+    """datetime (naive: yerel saat) veya ms -> epoch ms"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+def _optional(value):
+    return None if value is None else float(value)
+
+
+class TradeLedger:
+    def __init__(self, path=LEDGER_PATH, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE):
+        """
+        Args:
+            path: SQLite dosyası (klasör yoksa oluşturulur)
+            flush_interval: Kayıtları toplu yazmak için bekleme süresi (saniye)
+            batch_size: Tek işlemde yazılacak maksimum kayıt
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.stats = {'signals': 0, 'trades': 0, 'batches': 0, 'errors': 0}
+
+        self._queued = 0
+        self._written = 0
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._worker = None
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with sqlite3.connect(path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Kayıt (bot döngüsü - bloklamaz)
+    # ------------------------------------------------------------------
+
+    def record_signal(self, bot, symbol, ts, side, score, price, reasons=None, acted=True,
+                      take_profit=None, stop_loss=None):
+        """Üretilen sinyali kaydet (acted: pozisyon açıldı / bildirim gönderildi mi)"""
+        self._put(INSERT_SIGNAL, (bot, symbol, to_ms(ts), side, _optional(score), _optional(price),
+                                  _optional(take_profit), _optional(stop_loss),
+                                  json.dumps(list(reasons or []), ensure_ascii=False), int(acted)))
+        self.stats['signals'] += 1
+
+    def record_trade(self, bot, symbol, side, entry_ts, entry_price, exit_ts, exit_price, net_pct,
+                     commission_pct, exit_reason=None, score=None, reasons=None,
+                     take_profit=None, stop_loss=None):
+        """
+        Kapanan işlemi kaydet
+
+        Args:
+            net_pct: Komisyon düşülmüş kar / zarar (%)
+            commission_pct: İşlemin toplam komisyonu (alış + satış, %)
+        """
+        self._put(INSERT_TRADE, (bot, symbol, side, _optional(score),
+                                 json.dumps(list(reasons or []), ensure_ascii=False),
+                                 to_ms(entry_ts), float(entry_price), to_ms(exit_ts), float(exit_price),
+                                 _optional(take_profit), _optional(stop_loss),
+                                 float(net_pct) + float(commission_pct), float(commission_pct),
+                                 float(net_pct), exit_reason))
+        self.stats['trades'] += 1
+
+    def _put(self, sql, params):
+        with self._condition:
+            self._queued += 1
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='trade-ledger', daemon=True)
+                self._worker.start()
+        self.queue.put((sql, params))
+
+    def flush(self, timeout=5):
+        """Kuyruktaki kayıtlar veritabanına yazılana kadar bekle"""
+        with self._condition:
+            target = self._queued
+            return self._condition.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout=5):
+        """Kalan kayıtları yazıp iş parçacığını durdur"""
+        with self._condition:
+            worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        self.queue.put(_STOP)
+        worker.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Yazıcı (arka plan)
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute('PRAGMA synchronous=NORMAL')  # WAL ile güvenli, commit başına fsync yok
+        try:
+            while True:
+                item = self.queue.get()
+                stopping = item is _STOP
+                batch = [] if stopping else [item]
+
+                # Kısa süre içinde gelen kayıtları aynı işleme topla
+                deadline = time.monotonic() + self.flush_interval
+                while not stopping and len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self.queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                if batch:
+                    self._write(conn, batch)
+                if stopping:
+                    # close() çağrısından sonra kuyrukta kalanlar
+                    remaining = []
+                    while not self.queue.empty():
+                        item = self.queue.get_nowait()
+                        if item is not _STOP:
+                            remaining.append(item)
+                    if remaining:
+                        self._write(conn, remaining)
+                    return
+        finally:
+            conn.close()
+
+    def _write(self, conn, batch):
+        try:
+            with conn:
+                for sql, params in batch:
+                    conn.execute(sql, params)
+            self.stats['batches'] += 1
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            logging.error(f"❌ İşlem defteri yazılamadı ({len(batch)} kayıt): {e}")
+        with self._condition:
+            self._written += len(batch)
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    # Raporlar (her iş parçacığı kendi okuma bağlantısını kullanır)
+    # ------------------------------------------------------------------
+
+    def _reader(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _where(bot, start, end, column='exit_ts'):
+        clauses, params = [], []
+        if bot:
+            clauses.append('bot = ?')
+            params.append(bot)
+        if start is not None:
+            clauses.append(f'{column} >= ?')
+            params.append(to_ms(start))
+        if end is not None:
+            clauses.append(f'{column} < ?')
+            params.append(to_ms(end))
+        return ('WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def _query(self, sql, params=()):
+        return [dict(row) for row in self._reader().execute(sql, params)]
+
+    def pnl(self, bot=None, period='day', start=None, end=None):
+        """
+        Dönemlik net kar / zarar (UTC gün veya Pazartesi başlayan hafta)
+
+        Returns:
+            list: {'period': 'YYYY-MM-DD' (dönem başı), 'trades', 'wins', 'net_pct'}
+        """
+        where, params = self._where(bot, start, end)
+        if period == 'week':
+            bucket = f'(exit_ts + {WEEK_OFFSET_MS}) / {7 * DAY_MS} * {7 * DAY_MS} - {WEEK_OFFSET_MS}'
+        else:
+            bucket = f'exit_ts / {DAY_MS} * {DAY_MS}'
+        rows = self._query(f"""
+            SELECT {bucket} AS bucket, COUNT(*) AS trades, SUM(net_pct > 0) AS wins,
+                   SUM(net_pct) AS net_pct
+            FROM trades {where} GROUP BY bucket ORDER BY bucket""", params)
+        for row in rows:
+            bucket_ms = row.pop('bucket')
+            row['period'] = datetime.fromtimestamp(bucket_ms / 1000, timezone.utc).strftime('%Y-%m-%d')
+        return rows
+
+    def summary(self, bot=None, start=None, end=None):
+        """İşlem sayısı, kazanma oranı, toplam / ortalama net kar, en iyi / en kötü işlem"""
+        where, params = self._where(bot, start, end)
+        row = self._query(f"""
+            SELECT COUNT(*) AS trades, COALESCE(SUM(net_pct > 0), 0) AS wins,
+                   COALESCE(SUM(net_pct), 0) AS total_net, AVG(net_pct) AS avg_net,
+                   MAX(net_pct) AS best, MIN(net_pct) AS worst,
+                   COALESCE(SUM(commission_pct), 0) AS commission
+            FROM trades {where}""", params)[0]
+        row['win_rate'] = row['wins'] / row['trades'] * 100 if row['trades'] else 0.0
+        return row
+
+    def max_drawdown(self, bot=None, start=None, end=None):
+        """Kümülatif net kar eğrisinde (%) zirveden en büyük düşüş"""
+        where, params = self._where(bot, start, end)
+        # Kapsayan indeks sırasıyla tek geçiş (iç içe pencere fonksiyonlarından hızlı)
+        cursor = self._reader().execute(f"SELECT net_pct FROM trades {where} ORDER BY exit_ts", params)
+        equity = peak = drawdown = 0.0
+        for (net,) in cursor:
+            equity += net
+            if equity > peak:
+                peak = equity
+            elif peak - equity > drawdown:
+                drawdown = peak - equity
+        return drawdown
+
+    def score_buckets(self, bot=None, start=None, end=None, width=1.0):
+        """
+        Skor aralığına göre isabet: işlem sayısı, kazanma oranı, ortalama net kar
+
+        Returns:
+            list: {'score': aralık başı, 'trades', 'wins', 'hit_rate', 'avg_net'}
+        """
+        where, params = self._where(bot, start, end)
+        rows = self._query(f"""
+            SELECT CAST(score / ? AS INTEGER) * ? AS score, COUNT(*) AS trades,
+                   SUM(net_pct > 0) AS wins, AVG(net_pct) AS avg_net
+            FROM trades {where} GROUP BY 1 ORDER BY 1""", [width, width] + params)
+        for row in rows:
+            row['hit_rate'] = row['wins'] / row['trades'] * 100
+        return rows
+
+    def signal_counts(self, bot=None, start=None, end=None):
+        """Yön ve uygulanma durumuna göre sinyal sayıları"""
+        where, params = self._where(bot, start, end, column='ts')
+        return self._query(f"""
+            SELECT bot, side, acted, COUNT(*) AS signals, AVG(score) AS avg_score
+            FROM signals {where} GROUP BY bot, side, acted ORDER BY bot, side, acted""", params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İşlem defteri raporu")
+    parser.add_argument('--db', default=LEDGER_PATH, help="SQLite dosyası")
+    parser.add_argument('--bot', help="daily / weekly (varsayılan: hepsi)")
+    parser.add_argument('--period', choices=['day', 'week'], default='day')
+    parser.add_argument('--start', help="Başlangıç tarihi (YYYY-MM-DD, UTC)")
+    parser.add_argument('--end', help="Bitiş tarihi (YYYY-MM-DD, hariç)")
+    parser.add_argument('--bucket', type=float, default=1.0, help="Skor aralığı genişliği")
+    parser.add_argument('--last', type=int, default=14, help="Gösterilecek son dönem sayısı")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"✗ Defter bulunamadı: {args.db}")
+        return 1
+
+    def parse(value):
+        return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc) if value else None
+
+    ledger = TradeLedger(args.db)
+    start, end = parse(args.start), parse(args.end)
+    started = time.perf_counter()
+    summary = ledger.summary(args.bot, start, end)
+    drawdown = ledger.max_drawdown(args.bot, start, end)
+    periods = ledger.pnl(args.bot, args.period, start, end)
+    buckets = ledger.score_buckets(args.bot, start, end, args.bucket)
+    signals = ledger.signal_counts(args.bot, start, end)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print("\n" + "="*60)
+    print(f"📒 İŞLEM DEFTERİ - {args.bot or 'tüm botlar'}")
+    print("="*60)
+    print(f"İşlem sayısı : {summary['trades']}")
+    if summary['trades']:
+        print(f"Kazanan      : {summary['wins']} (%{summary['win_rate']:.1f})")
+        print(f"Toplam net   : %{summary['total_net']:.2f} (komisyon %{summary['commission']:.2f})")
+        print(f"Ortalama net : %{summary['avg_net']:.3f}")
+        print(f"En iyi/kötü  : %{summary['best']:.2f} / %{summary['worst']:.2f}")
+        print(f"Maks. düşüş  : %{drawdown:.2f}")
+
+        print(f"\n{'Dönem':12} {'İşlem':>6} {'Kazanan':>8} {'Net %':>8}")
+        for row in periods[-args.last:]:
+            print(f"{row['period']:12} {row['trades']:>6} {row['wins']:>8} {row['net_pct']:>8.2f}")
+
+        print(f"\n{'Skor':>6} {'İşlem':>6} {'İsabet %':>9} {'Ort. net %':>11}")
+        for row in buckets:
+            score = '-' if row['score'] is None else f"{row['score']:g}"
+            print(f"{score:>6} {row['trades']:>6} {row['hit_rate']:>9.1f} {row['avg_net']:>11.3f}")
+
+    if signals:
+        print(f"\n{'Bot':8} {'Yön':5} {'Uygulandı':>10} {'Sinyal':>7} {'Ort. skor':>10}")
+        for row in signals:
+            avg = '-' if row['avg_score'] is None else f"{row['avg_score']:.2f}"
+            print(f"{row['bot']:8} {row['side']:5} {'evet' if row['acted'] else 'hayır':>10} "
+                  f"{row['signals']:>7} {avg:>10}")
+    print("="*60)
+    print(f"Sorgu süresi: {elapsed:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hızlı İşlem Simülatörü
+Sinyal dizisinden botların pozisyon kurallarıyla işlem listesi üretir
+
+Kurallar BitcoinDailyBot ile aynıdır: pozisyon varken sadece kar hedefi /
+stop loss kontrol edilir (mum kapanışı ile), periyot (gün / hafta) başına en
+fazla 1 alış + 1 satış, periyot kar hedefine ulaşılınca yeni işlem yok,
+sinyaller arası minimum süre ve commission (alış + satış) düşülür.
+
+simulate_intrabar aynı kuralları 1m alt mumlarla uygular: kar hedefi / stop
+mum içinde high / low ile ilk dokunulduğu dakikada, seviye fiyatından kapanır.
+Tüm aday girişlerin çıkışları vektörize bulunur; sıralı kısım sadece adaylar
+üzerinde döner.
+
+simulate_signals BitcoinWeeklyBot'un sinyal takibidir: pozisyon yok, her
+gönderilen sinyal hedef / stop'a kadar ayrı izlenir, periyot kar hedefi yoktur.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba isteğe bağlı
+    njit = None
+
+DAY_MS = 86_400_000
+WEEK_MS = 7 * DAY_MS
+# 1970-01-01 Perşembe; haftalar Pazartesi başlasın diye 3 gün kaydırılır
+WEEK_OFFSET_MS = 3 * DAY_MS
+
+TRADE_FIELDS = ['entry_index', 'exit_index', 'direction', 'entry_price', 'exit_price',
+                'net_profit', 'exit_reason']
+
+EXIT_TAKE_PROFIT = 1
+EXIT_STOP_LOSS = 2
+EXIT_END = 3  # Veri bitti, pozisyon son kapanışla kapatıldı
+
+
+def _simulate_loop(timestamps, close, signals, take_profit_pct, stop_loss_pct, commission_pct,
+                   period_target_pct, period_ms, period_offset_ms, min_interval_ms, max_per_side):
+    n = close.shape[0]
+    out = np.empty((n, 7))
+    count = 0
+
+    in_position = False
+    direction = 0
+    entry_index = 0
+    entry_price = 0.0
+    take_profit = 0.0
+    stop_loss = 0.0
+
+    period = -1
+    period_profit = 0.0
+    buys = 0
+    sells = 0
+    last_signal_ms = -1
+
+    for i in range(n):
+        current_period = (timestamps[i] + period_offset_ms) // period_ms
+        if current_period != period:
+            period = current_period
+            period_profit = 0.0
+            buys = 0
+            sells = 0
+
+        price = close[i]
+        if in_position:
+            hit_target = price >= take_profit if direction == 1 else price <= take_profit
+            hit_stop = price <= stop_loss if direction == 1 else price >= stop_loss
+            if hit_target or hit_stop:
+                gross = (price - entry_price) / entry_price * 100.0 * direction
+                net = gross - 2.0 * commission_pct
+                period_profit += net
+                out[count, 0] = entry_index
+                out[count, 1] = i
+                out[count, 2] = direction
+                out[count, 3] = entry_price
+                out[count, 4] = price
+                out[count, 5] = net
+                out[count, 6] = 1 if hit_target else 2
+                count += 1
+                in_position = False
+            continue
+
+        signal = signals[i]
+        if signal == 0 or period_profit >= period_target_pct:
+            continue
+        if signal == 1 and buys >= max_per_side:
+            continue
+        if signal == -1 and sells >= max_per_side:
+            continue
+        if last_signal_ms >= 0 and timestamps[i] - last_signal_ms < min_interval_ms:
+            continue
+
+        in_position = True
+        direction = signal
+        entry_index = i
+        entry_price = price
+        stop = stop_loss_pct[i]
+        if direction == 1:
+            buys += 1
+            take_profit = price * (1 + take_profit_pct / 100.0)
+            stop_loss = price * (1 - stop / 100.0)
+        else:
+            sells += 1
+            take_profit = price * (1 - take_profit_pct / 100.0)
+            stop_loss = price * (1 + stop / 100.0)
+        last_signal_ms = timestamps[i]
+
+    if in_position:
+        price = close[n - 1]
+        gross = (price - entry_price) / entry_price * 100.0 * direction
+        out[count, 0] = entry_index
+        out[count, 1] = n - 1
+        out[count, 2] = direction
+        out[count, 3] = entry_price
+        out[count, 4] = price
+        out[count, 5] = gross - 2.0 * commission_pct
+        out[count, 6] = 3
+        count += 1
+
+    return out[:count]
+
+
+if njit is not None:
+    _simulate_kernel = njit(cache=True)(_simulate_loop)
+else:
+    _simulate_kernel = _simulate_loop
+
+
+def simulate_trades(timestamps, close, signals, take_profit_pct, stop_loss_pct,
+                    commission_pct=0.1, period_target_pct=float('inf'), period='day',
+                    min_interval_ms=0, max_per_side=1):
+    """
+    Sinyal dizisinden işlem listesi üret
+
+    Args:
+        timestamps: Mum açılış zamanları (int64 ms, UTC)
+        close: Kapanış fiyatları
+        signals: 1 (BUY), -1 (SELL), 0 dizisi
+        take_profit_pct: Sinyal kar hedefi (%)
+        stop_loss_pct: Stop loss (%) - sabit veya mum bazlı dizi (ör. ATR bazlı)
+        commission_pct: İşlem başı commission (%), alış + satış için iki kez düşülür
+        period_target_pct: Periyot kar hedefi (%), ulaşılınca yeni işlem açılmaz
+        period: 'day' veya 'week' (limit ve hedef sıfırlama periyodu, UTC)
+        min_interval_ms: Sinyaller arası minimum süre
+        max_per_side: Periyot başına maksimum alış / satış sayısı
+
+    Returns:
+        np.ndarray: (işlem sayısı, 7) - TRADE_FIELDS sırasıyla
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    stop = np.broadcast_to(np.asarray(stop_loss_pct, dtype=np.float64), close.shape)
+    if period == 'week':
+        period_ms, offset_ms = WEEK_MS, WEEK_OFFSET_MS
+    else:
+        period_ms, offset_ms = DAY_MS, 0
+    return _simulate_kernel(np.ascontiguousarray(timestamps, dtype=np.int64), close,
+                            np.ascontiguousarray(signals, dtype=np.int64),
+                            float(take_profit_pct), np.ascontiguousarray(stop),
+                            float(commission_pct), float(period_target_pct),
+                            np.int64(period_ms), np.int64(offset_ms),
+                            np.int64(min_interval_ms), int(max_per_side))
+
+
+# ----------------------------------------------------------------------------
+# Mum içi (1m alt mum) çıkışlar
+# ----------------------------------------------------------------------------
+
+MINUTE_MS = 60_000
+TOUCH_LEVELS = 16  # Tek geçişte taranan en uzun blok: 2^16 - 1 dakika (~45 gün)
+
+
+def _doubling(values, levels):
+    """Seviye k: [i, i + 2^k) aralığının maksimumu (dizi sonunda mevcut kısım)"""
+    tables = [values]
+    for k in range(1, levels):
+        previous = tables[-1]
+        step = 1 << (k - 1)
+        current = previous.copy()
+        if step < len(previous):
+            np.maximum(previous[:-step], previous[step:], out=current[:-step])
+        tables.append(current)
+    return tables
+
+
+def _first_reach(tables, start, level):
+    """
+    Her sorgu için start'tan itibaren değerin level'a ulaştığı (>=) ilk indeks
+
+    Seviyeler büyükten küçüğe inilir: aralık maksimumu level'ın altındaki bloklar
+    atlanır. Tüm sorgular aynı anda ilerler; bulunamayanlar için len(values).
+    """
+    values = tables[0]
+    n = len(values)
+    result = np.full(len(start), n, dtype=np.int64)
+    active = np.flatnonzero(start < n)
+    position = start[active].astype(np.int64)
+    level = level[active]
+
+    while active.size:
+        for k in range(len(tables) - 1, -1, -1):
+            extreme = tables[k][np.minimum(position, n - 1)]
+            position += np.where(extreme < level, 1 << k, 0)
+        inside = position < n
+        reached = inside.copy()
+        reached[inside] = values[position[inside]] >= level[inside]
+        result[active[reached]] = position[reached]
+        # Blok sınırına kadar dokunulmadı: kalan sorgular oradan devam eder
+        again = inside & ~reached
+        active, position, level = active[again], position[again], level[again]
+    return result
+
+
+class SubBars:
+    """
+    Alt mumlar (varsayılan 1m) üzerinde ilk dokunuş sorguları
+
+    high ve -low için katlamalı aralık maksimumları bir kez hesaplanır
+    (dakika başına ~2 x TOUCH_LEVELS float); aynı alt mumlarla yapılan tüm
+    simülasyonlar (ör. tarama kombinasyonları) tabloları paylaşır.
+    """
+
+    def __init__(self, candles, interval_ms=MINUTE_MS, levels=TOUCH_LEVELS):
+        """
+        Args:
+            candles: (N, 6) dizi veya CANDLE_DTYPE kayıtları - zamana göre sıralı
+            interval_ms: Alt mum süresi
+        """
+        candles = np.asarray(candles)
+        if candles.dtype.names:
+            columns = [candles[name] for name in ('timestamp', 'open', 'high', 'low', 'close')]
+        else:
+            columns = [candles[:, i] for i in range(5)]
+        self.timestamps = np.ascontiguousarray(columns[0], dtype=np.int64)
+        self.open, high, low, self.close = (np.ascontiguousarray(column, dtype=np.float64)
+                                            for column in columns[1:])
+        self.interval_ms = interval_ms
+
+        # NaN (eksik dakika) hiçbir seviyeye dokunmaz
+        high = np.where(np.isnan(high), -np.inf, high)
+        low = np.where(np.isnan(low), -np.inf, -low)
+        levels = max(1, min(levels, int(np.ceil(np.log2(max(len(high), 2)))) + 1))
+        self._high = _doubling(high, levels)
+        self._low = _doubling(low, levels)  # -low: "low <= x" sorgusu "-low >= -x" olur
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def reach(self, start, direction, take_profit, stop_loss):
+        """
+        Kar hedefine ve stop'a ayrı ayrı ilk dokunulan alt mum indeksleri
+
+        Returns:
+            (target, stop): Dokunulmayan seviye için len(self)
+        """
+        start = np.asarray(start, dtype=np.int64)
+        long = direction == 1
+        target = np.empty(len(start), dtype=np.int64)
+        stop = np.empty(len(start), dtype=np.int64)
+        for side, up, down in ((long, self._high, self._low), (~long, self._low, self._high)):
+            sign = 1.0 if up is self._high else -1.0
+            target[side] = _first_reach(up, start[side], sign * take_profit[side])
+            stop[side] = _first_reach(down, start[side], -sign * stop_loss[side])
+        return target, stop
+
+    def first_touch(self, start, direction, take_profit, stop_loss):
+        """
+        Pozisyonların kar hedefi / stop seviyesine ilk dokunduğu dakika
+
+        Aynı dakikada iki seviyeye de dokunulursa: dakika seviyelerden birinin
+        ötesinde açıldıysa o, değilse stop (kötümser). Boşlukla seviyenin
+        ötesinde açılan dakikada fiyat açılış fiyatıdır.
+
+        Args:
+            start: İlk kontrol edilecek dakika indeksleri
+            direction: 1 (BUY) / -1 (SELL)
+            take_profit, stop_loss: Seviye fiyatları
+
+        Returns:
+            (index, reason, price): Çıkış dakikası, EXIT_* ve çıkış fiyatı -
+            dokunulmayanlar son dakikanın kapanışıyla EXIT_END
+        """
+        n = len(self)
+        long = direction == 1
+        target, stop = self.reach(start, direction, take_profit, stop_loss)
+
+        index = np.minimum(target, stop)
+        touched = index < n
+        index[~touched] = n - 1
+        opening = self.open[index]
+
+        gap_target = np.where(long, opening >= take_profit, opening <= take_profit)
+        take = (target < stop) | ((target == stop) & gap_target)
+        price = np.where(take,
+                         np.where(long, np.maximum(take_profit, opening),
+                                  np.minimum(take_profit, opening)),
+                         np.where(long, np.minimum(stop_loss, opening),
+                                  np.maximum(stop_loss, opening)))
+        reason = np.where(take, EXIT_TAKE_PROFIT, EXIT_STOP_LOSS)
+        price[~touched] = self.close[n - 1]
+        reason[~touched] = EXIT_END
+        return index, reason, price
+
+
+def _select_loop(signal_ms, entry_ms, direction, exit_ms, exit_period, net, period_target_pct,
+                 period_ms, period_offset_ms, min_interval_ms, max_per_side):
+    m = signal_ms.shape[0]
+    chosen = np.empty(m, dtype=np.int64)
+    count = 0
+
+    free_ms = 0  # Pozisyon bu andan itibaren kapalı (ms)
+    pending = False
+    pending_period = 0
+    pending_net = 0.0
+
+    period = -1
+    period_profit = 0.0
+    buys = 0
+    sells = 0
+    last_signal_ms = -1
+
+    for c in range(m):
+        if entry_ms[c] < free_ms:
+            continue
+
+        # Önceki işlemin karı çıktığı periyoda yazılır
+        if pending:
+            if pending_period != period:
+                period = pending_period
+                period_profit = 0.0
+                buys = 0
+                sells = 0
+            period_profit += pending_net
+            pending = False
+
+        current_period = (signal_ms[c] + period_offset_ms) // period_ms
+        if current_period != period:
+            period = current_period
+            period_profit = 0.0
+            buys = 0
+            sells = 0
+
+        signal = direction[c]
+        if period_profit >= period_target_pct:
+            continue
+        if signal == 1 and buys >= max_per_side:
+            continue
+        if signal == -1 and sells >= max_per_side:
+            continue
+        if last_signal_ms >= 0 and signal_ms[c] - last_signal_ms < min_interval_ms:
+            continue
+
+        if signal == 1:
+            buys += 1
+        else:
+            sells += 1
+        last_signal_ms = signal_ms[c]
+        chosen[count] = c
+        count += 1
+        free_ms = exit_ms[c]
+        pending = True
+        pending_period = exit_period[c]
+        pending_net = net[c]
+
+    return chosen[:count]
+
+
+if njit is not None:
+    _select_kernel = njit(cache=True)(_select_loop)
+else:
+    _select_kernel = _select_loop
+
+
+def simulate_intrabar(sub_bars, timestamps, close, signals, take_profit_pct, stop_loss_pct,
+                      commission_pct=0.1, period_target_pct=float('inf'), period='day',
+                      min_interval_ms=0, max_per_side=1, timeframe_ms=None):
+    """
+    Sinyal dizisinden işlem listesi üret - çıkışlar alt mumların high / low'u ile
+
+    Giriş sinyal mumunun kapanışında (close), çıkış kar hedefi / stop seviyesine
+    mum içinde ilk dokunulan dakikada. Pozisyon kapandıktan sonra kapanan ilk
+    sinyal mumunda yeni işlem açılabilir; limitler simulate_trades ile aynıdır.
+
+    Args:
+        sub_bars: SubBars (sinyal mumlarının aralığını kapsayan 1m mumlar)
+        timestamps, close, signals, take_profit_pct, stop_loss_pct, commission_pct,
+        period_target_pct, period, min_interval_ms, max_per_side: simulate_trades ile aynı
+        timeframe_ms: Sinyal mumu süresi (None: ardışık zamanların en küçük farkı)
+
+    Returns:
+        np.ndarray: (işlem sayısı, 7) - TRADE_FIELDS sırasıyla; exit_index çıkış
+        dakikasını içeren sinyal mumu
+    """
+    timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    signals = np.asarray(signals)
+    stop = np.broadcast_to(np.asarray(stop_loss_pct, dtype=np.float64), close.shape)
+    if timeframe_ms is None:
+        timeframe_ms = int(np.diff(timestamps).min()) if len(timestamps) > 1 else MINUTE_MS
+    if period == 'week':
+        period_ms, offset_ms = WEEK_MS, WEEK_OFFSET_MS
+    else:
+        period_ms, offset_ms = DAY_MS, 0
+
+    # Adaylar: sinyal mumunun kapanışından sonra alt mumu olan sinyaller
+    candidates = np.flatnonzero((signals != 0) & np.isfinite(close) & np.isfinite(stop))
+    entry_ms = timestamps[candidates] + timeframe_ms
+    start = np.searchsorted(sub_bars.timestamps, entry_ms)
+    keep = start < len(sub_bars)
+    candidates, entry_ms, start = candidates[keep], entry_ms[keep], start[keep]
+    if len(candidates) == 0:
+        return np.empty((0, 7))
+
+    direction = np.where(signals[candidates] > 0, 1, -1)
+    entry_price = close[candidates]
+    take_profit = entry_price * (1 + direction * take_profit_pct / 100.0)
+    stop_loss = entry_price * (1 - direction * stop[candidates] / 100.0)
+
+    minute, reason, exit_price = sub_bars.first_touch(start, direction, take_profit, stop_loss)
+    exit_open_ms = sub_bars.timestamps[minute]
+    gross = (exit_price - entry_price) / entry_price * 100.0 * direction
+    net = gross - 2.0 * commission_pct
+
+    chosen = _select_kernel(timestamps[candidates], entry_ms, direction.astype(np.int64),
+                            exit_open_ms + sub_bars.interval_ms,
+                            (exit_open_ms + offset_ms) // period_ms, net,
+                            float(period_target_pct), np.int64(period_ms), np.int64(offset_ms),
+                            np.int64(min_interval_ms), int(max_per_side))
+
+    exit_index = np.searchsorted(timestamps, exit_open_ms[chosen], side='right') - 1
+    return np.column_stack([candidates[chosen], exit_index, direction[chosen],
+                            entry_price[chosen], exit_price[chosen], net[chosen],
+                            reason[chosen]]).astype(np.float64)
+
+
+def simulate_signals(bars, timestamps, close, signals, take_profit_pct, stop_loss_pct,
+                     commission_pct=0.1, period='week', max_per_side=1, timeframe_ms=None):
+    """
+    Takip edilen sinyallerden işlem listesi üret - BitcoinWeeklyBot kuralları
+
+    Bot pozisyon açmaz, gönderdiği sinyalleri izler: her sinyal ayrı takip
+    edilir (açık sinyal yeni sinyali engellemez), periyot başına en fazla
+    max_per_side alış + satış gönderilir, periyot kar hedefi yoktur. Sonuç
+    sinyal mumundan sonraki ilk hedef / stop dokunuşudur (bars high / low);
+    aynı mumda ikisine birden dokunulursa stop sayılır, çıkış seviye fiyatından.
+
+    Args:
+        bars: SubBars - sinyal mumlarının kendisi (canlı bot) veya 1m alt mumlar
+        timestamps, close, signals, take_profit_pct, stop_loss_pct, commission_pct,
+        period, max_per_side: simulate_trades ile aynı
+        timeframe_ms: Sinyal mumu süresi (None: ardışık zamanların en küçük farkı)
+
+    Returns:
+        np.ndarray: (işlem sayısı, 7) - TRADE_FIELDS sırasıyla, giriş sırasına göre;
+        exit_index çıkış alt mumunu içeren sinyal mumu. Sonuçlanmayan sinyaller
+        son alt mumun kapanışıyla EXIT_END
+    """
+    timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    signals = np.asarray(signals)
+    stop = np.broadcast_to(np.asarray(stop_loss_pct, dtype=np.float64), close.shape)
+    if timeframe_ms is None:
+        timeframe_ms = int(np.diff(timestamps).min()) if len(timestamps) > 1 else MINUTE_MS
+    if period == 'week':
+        period_ms, offset_ms = WEEK_MS, WEEK_OFFSET_MS
+    else:
+        period_ms, offset_ms = DAY_MS, 0
+
+    # Adaylar: sinyal mumunun kapanışından sonra alt mumu olan sinyaller
+    candidates = np.flatnonzero((signals != 0) & np.isfinite(close) & np.isfinite(stop))
+    start = np.searchsorted(bars.timestamps, timestamps[candidates] + timeframe_ms)
+    candidates, start = candidates[start < len(bars)], start[start < len(bars)]
+    direction = np.where(signals[candidates] > 0, 1, -1)
+
+    # Periyot ve yön başına ilk max_per_side sinyal (adaylar zamana göre sıralı)
+    group = ((timestamps[candidates] + offset_ms) // period_ms) * 2 + (direction > 0)
+    order = np.argsort(group, kind='stable')
+    first = np.r_[True, group[order][1:] != group[order][:-1]]
+    position = np.arange(len(order))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = position - np.maximum.accumulate(np.where(first, position, 0))
+    keep = rank < max_per_side
+    candidates, start, direction = candidates[keep], start[keep], direction[keep]
+    if len(candidates) == 0:
+        return np.empty((0, 7))
+
+    entry_price = close[candidates]
+    take_profit = entry_price * (1 + direction * take_profit_pct / 100.0)
+    stop_loss = entry_price * (1 - direction * stop[candidates] / 100.0)
+    target, stopped = bars.reach(start, direction, take_profit, stop_loss)
+
+    index = np.minimum(target, stopped)
+    touched = index < len(bars)
+    index[~touched] = len(bars) - 1
+    take = target < stopped
+    exit_price = np.where(take, take_profit, stop_loss)
+    exit_price[~touched] = bars.close[-1]
+    reason = np.where(take, EXIT_TAKE_PROFIT, EXIT_STOP_LOSS)
+    reason[~touched] = EXIT_END
+
+    net = (exit_price - entry_price) / entry_price * 100.0 * direction - 2.0 * commission_pct
+    exit_index = np.searchsorted(timestamps, bars.timestamps[index], side='right') - 1
+    return np.column_stack([candidates, exit_index, direction, entry_price, exit_price, net,
+                            reason]).astype(np.float64)
+
+
+def summarize(trades):
+    """İşlem listesinden özet metrikler (kar % olarak, bileşik değil toplamsal)"""
+    net = trades[:, 5] if len(trades) else np.empty(0)
+    if len(net) == 0:
+        return {'trades': 0, 'win_rate': 0.0, 'total_net': 0.0, 'avg_net': 0.0,
+                'max_drawdown': 0.0, 'profit_factor': 0.0}
+
+    equity = np.cumsum(net)
+    peak = np.maximum.accumulate(np.concatenate([[0.0], equity]))[1:]
+    gains = net[net > 0].sum()
+    losses = -net[net < 0].sum()
+    return {
+        'trades': int(len(net)),
+        'win_rate': float((net > 0).mean() * 100),
+        'total_net': float(equity[-1]),
+        'avg_net': float(net.mean()),
+        'max_drawdown': float((peak - equity).max()),
+        'profit_factor': float(gains / losses) if losses > 0 else float('inf'),
+    }
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Walk-Forward Optimizasyonu
+Strateji sabitlerinin örneklem dışında (out-of-sample) tutup tutmadığını ölçer
+
+- Geçmiş kayan eğitim / test pencerelerine (fold) bölünür; her eğitim
+  penceresinde grid taranır (sweep ile aynı değerlendirme), en iyi kombinasyon
+  hemen sonraki test penceresinde çalıştırılır
+- Test pencerelerindeki işlemler birleştirilerek örneklem dışı equity eğrisi çıkar
+- Test pencereleri UTC'de epoch'tan itibaren adım katlarında başlar; geçmiş
+  uzadıkça eski fold sınırları değişmez
+- Fold sonuçları (veri özeti, parametre özeti, fold sınırları) anahtarıyla
+  sonuç önbelleğine yazılır (result_cache): geçmiş bir hafta uzayınca sadece
+  yeni fold'lar hesaplanır; fold indikatörleri de indikatör önbelleğinden okunur
+
+Kullanım:
+  python walk_forward.py mumlar.csv [--strategy daily|weekly] [--grid grid.json]
+  python walk_forward.py history/ --train-days 120 --test-days 14 --out wf_sonuc
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import bitcoin_daily_bot_fixed as daily
+from result_cache import CACHE_ROOT, content_key, indicator_cache, result_cache
+from sweep import (METRIC_COLUMNS, STRATEGIES, evaluate, expand_grid, indicator_columns,
+                   rank_results, strategy_trades)
+from trade_simulator import DAY_MS, SubBars, summarize
+
+TRAIN_DAYS = 90  # Eğitim penceresi
+TEST_DAYS = 30  # Test penceresi (varsayılan adım)
+WARMUP_BARS = daily.CANDLE_WINDOW  # Eğitim öncesi indikatör ısınma payı
+MIN_TRAIN_TRADES = 5  # Daha az işlemli kombinasyonlar ancak başka aday yoksa seçilir
+FOLD_VERSION = 1  # Fold hesaplaması değişince artır (eski sonuçlar kullanılmaz)
+
+# Örneklem dışı işlemler: TRADE_FIELDS ile aynı sıra, indeksler yerine zaman
+OOS_FIELDS = ['entry_ms', 'exit_ms', 'direction', 'entry_price', 'exit_price', 'net_profit',
+              'exit_reason']
+
+
+def make_folds(start_ms, end_ms, train_days=TRAIN_DAYS, test_days=TEST_DAYS, step_days=None):
+    """
+    Tamamlanmış fold sınırları
+
+    Test pencereleri epoch'tan itibaren adımın (varsayılan test_days) katlarında
+    başlar; eğitim penceresi veriden taşan ve test penceresi biten veriyi aşan
+    fold'lar alınmaz.
+
+    Returns:
+        list: (train_start, test_start, test_end) ms
+    """
+    train_ms = train_days * DAY_MS
+    test_ms = test_days * DAY_MS
+    step_ms = (step_days or test_days) * DAY_MS
+    test_start = -(-(start_ms + train_ms) // step_ms) * step_ms
+    folds = []
+    while test_start + test_ms <= end_ms:
+        folds.append((test_start - train_ms, test_start, test_start + test_ms))
+        test_start += step_ms
+    return folds
+
+
+def params_hash(strategy, grid, min_trades):
+    """Grid + sabit parametreler + bot sabitleri: biri değişince tüm fold'lar yeniden"""
+    spec = STRATEGIES[strategy]
+    return content_key('walk_forward', FOLD_VERSION, strategy, grid, spec['indicators'],
+                       spec['thresholds'], min_trades, daily.COMMISSION_PERCENT,
+                       daily.MIN_SIGNAL_INTERVAL)
+
+
+def fold_key(candles, minutes, params_digest, bounds):
+    return content_key('fold', candles, minutes, params_digest, list(bounds))
+
+
+def _sub_bars(minutes, start_ms, end_ms):
+    """Pencere içindeki 1m mumlar - sonraki pencerenin verisi görülmez"""
+    if minutes is None:
+        return None
+    times = minutes[:, 0]
+    return SubBars(minutes[np.searchsorted(times, start_ms):np.searchsorted(times, end_ms)])
+
+
+def run_fold(strategy, candles, bounds, grid, minutes=None, min_trades=MIN_TRAIN_TRADES,
+             cache=None):
+    """
+    Tek fold: eğitimde grid taraması, en iyi kombinasyonla test
+
+    Args:
+        candles: Isınma payı + eğitim + test mumları (N, 6)
+        bounds: (train_start, test_start, test_end) ms
+        minutes: Aynı aralığın 1m mumları (verilirse mum içi çıkışlar)
+        cache: İndikatör önbelleği (ResultCache)
+
+    Returns:
+        dict: Sınırlar, seçilen parametreler, eğitim / test metrikleri ve test işlemleri
+    """
+    train_start, test_start, test_end = bounds
+    timestamps = candles[:, 0].astype(np.int64)
+    first, middle, last = np.searchsorted(timestamps, [train_start, test_start, test_end])
+    train, test = slice(first, middle), slice(middle, last)
+
+    train_bars = _sub_bars(minutes, train_start, test_start)
+    rows = []
+    for indicators, thresholds in expand_grid(strategy, grid):
+        columns = indicator_columns(strategy, indicators, candles, cache)
+        for combo in thresholds:
+            params = {**indicators, **combo}
+            rows.append({**params, **evaluate(strategy, columns, timestamps, params, train_bars,
+                                              window=train)})
+    # Satır sırası korunur: seçilen değerler grid'deki tipleriyle (int / float) okunur
+    ranked = rank_results(pd.DataFrame(rows).assign(row=np.arange(len(rows))))
+    qualified = ranked[ranked['trades'] >= min_trades]
+    best = rows[int((qualified if len(qualified) else ranked)['row'].iloc[0])]
+
+    spec = STRATEGIES[strategy]
+    params = {name: best[name] for name in (*spec['indicators'], *spec['thresholds'])}
+    indicators = {name: params[name] for name in spec['indicators']}
+    trades = strategy_trades(strategy, indicator_columns(strategy, indicators, candles, cache),
+                             timestamps, params, _sub_bars(minutes, test_start, test_end),
+                             window=test)
+
+    test_times = timestamps[test]
+    oos = trades.copy()
+    if len(oos):
+        oos[:, 0] = test_times[trades[:, 0].astype(np.int64)]
+        oos[:, 1] = test_times[trades[:, 1].astype(np.int64)]
+    return {
+        'bounds': [int(value) for value in bounds],
+        'params': params,
+        'combinations': len(rows),
+        'train': {name: best[name] for name in METRIC_COLUMNS},
+        'test': summarize(trades),
+        'trades': oos.tolist(),
+    }
+
+
+# ----------------------------------------------------------------------------
+# Walk-forward
+# ----------------------------------------------------------------------------
+
+def run_walk_forward(candles, strategy='daily', grid=None, train_days=TRAIN_DAYS,
+                     test_days=TEST_DAYS, step_days=None, cache_root=CACHE_ROOT, workers=None,
+                     minutes=None, min_trades=MIN_TRAIN_TRADES, warmup=WARMUP_BARS):
+    """
+    Walk-forward çalışmasını çalıştır (önbellekteki fold'lar yeniden hesaplanmaz)
+
+    Args:
+        candles: (N, 6) dizi - timestamp_ms, open, high, low, close, volume
+        grid: {parametre: [değerler]} - None ise stratejinin varsayılan grid'i
+        minutes: (M, 6) 1m mumlar - verilirse çıkışlar mum içi (simulate_intrabar)
+        cache_root: Önbellek klasörü (fold sonuçları + indikatörler)
+        workers: Paralel fold sayısı (1: aynı süreçte)
+
+    Returns:
+        (folds, trades): Fold başına özet DataFrame'i ve birleştirilmiş örneklem
+        dışı işlemler (OOS_FIELDS + equity)
+    """
+    candles = np.ascontiguousarray(candles, dtype=np.float64)
+    if minutes is not None:
+        minutes = np.ascontiguousarray(minutes, dtype=np.float64)
+    grid = STRATEGIES[strategy]['grid'] if grid is None else grid
+    expand_grid(strategy, grid)  # Bilinmeyen parametreleri erkenden yakala
+
+    timestamps = candles[:, 0].astype(np.int64)
+    timeframe_ms = int(np.diff(timestamps).min()) if len(timestamps) > 1 else 0
+    folds = make_folds(int(timestamps[0]), int(timestamps[-1]) + timeframe_ms,
+                       train_days, test_days, step_days)
+    digest = params_hash(strategy, grid, min_trades)
+    results_cache = result_cache(cache_root)
+    columns_cache = indicator_cache(cache_root)
+
+    jobs = []
+    results = {}
+    for bounds in folds:
+        first, last = np.searchsorted(timestamps, [bounds[0], bounds[2]])
+        fold_candles = candles[max(first - warmup, 0):last]
+        fold_minutes = None
+        if minutes is not None:
+            lo, hi = np.searchsorted(minutes[:, 0], [bounds[0], bounds[2]])
+            fold_minutes = minutes[lo:hi]
+        key = fold_key(fold_candles, fold_minutes, digest, bounds)
+        cached = results_cache.get_json(key)
+        if cached is not None:
+            results[bounds] = (cached, True)
+        else:
+            jobs.append((bounds, key, fold_candles, fold_minutes))
+
+    print(f"📊 {len(folds)} fold ({len(folds) - len(jobs)} önbellekte, {len(jobs)} hesaplanacak)")
+    if jobs:
+        if workers == 1:
+            for bounds, key, fold_candles, fold_minutes in jobs:
+                result = run_fold(strategy, fold_candles, bounds, grid, fold_minutes, min_trades,
+                                  columns_cache)
+                results_cache.put_json(key, result)
+                results[bounds] = (result, False)
+        else:
+            columns_cache.close()  # İşçiler kendi bağlantılarını açar
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_fold, strategy, fold_candles, bounds, grid,
+                                       fold_minutes, min_trades, columns_cache): (bounds, key)
+                           for bounds, key, fold_candles, fold_minutes in jobs}
+                for future in as_completed(futures):
+                    bounds, key = futures[future]
+                    result = future.result()
+                    results_cache.put_json(key, result)
+                    results[bounds] = (result, False)
+                    print(f"  ✓ {len(results)}/{len(folds)} fold", end='\r')
+            print()
+    results_cache.close()
+    columns_cache.close()
+
+    rows = []
+    stitched = []
+    for bounds in folds:
+        result, cached = results[bounds]
+        row = {'train_start': bounds[0], 'test_start': bounds[1], 'test_end': bounds[2],
+               'cached': cached}
+        row.update({name: result['params'][name] for name in grid})
+        row.update({f'train_{name}': result['train'][name] for name in METRIC_COLUMNS})
+        row.update({f'test_{name}': result['test'][name] for name in METRIC_COLUMNS})
+        rows.append(row)
+        stitched.extend(result['trades'])
+
+    trades = pd.DataFrame(stitched, columns=OOS_FIELDS)
+    trades['equity'] = trades['net_profit'].cumsum()
+    return pd.DataFrame(rows), trades
+
+
+def stability(folds, grid):
+    """Parametre başına fold'larda seçilen değerlerin sayısı"""
+    return {name: folds[name].value_counts().sort_index().to_dict() for name in grid}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward strateji optimizasyonu")
+    parser.add_argument('candles', help="Mum CSV dosyası veya geçmiş deposu klasörü")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='daily')
+    parser.add_argument('--grid', help="Parametre grid'i (JSON)")
+    parser.add_argument('--minutes', help="1m mum CSV dosyası (mum içi kar hedefi / stop)")
+    parser.add_argument('--train-days', type=int, default=TRAIN_DAYS)
+    parser.add_argument('--test-days', type=int, default=TEST_DAYS)
+    parser.add_argument('--step-days', type=int, help="Fold adımı (varsayılan: test-days)")
+    parser.add_argument('--cache', default=CACHE_ROOT, help="Fold / indikatör önbelleği klasörü")
+    parser.add_argument('--workers', type=int, help="İşçi sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument('--out', help="folds.csv ve trades.csv yazılacak klasör")
+    args = parser.parse_args()
+
+    from backtest import load_candles
+
+    grid = None
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+    grid = STRATEGIES[args.strategy]['grid'] if grid is None else grid
+
+    started = datetime.now()
+    try:
+        minutes = load_candles(args.minutes) if args.minutes else None
+        folds, trades = run_walk_forward(load_candles(args.candles), args.strategy, grid,
+                                         args.train_days, args.test_days, args.step_days,
+                                         args.cache, args.workers, minutes)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+    elapsed = (datetime.now() - started).total_seconds()
+    if folds.empty:
+        print("✗ Eğitim + test penceresi için yeterli veri yok")
+        return 1
+
+    def day(ms):
+        return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+    print("\n" + "="*60)
+    print("📈 FOLD'LAR (test penceresi, seçilen parametreler, eğitim / test net %)")
+    print("="*60)
+    for _, row in folds.iterrows():
+        params = ', '.join(f"{name}={row[name]}" for name in grid)
+        print(f"{day(row['test_start'])} → {day(row['test_end'])} | {params} | "
+              f"eğitim {row['train_total_net']:+.2f} | test {row['test_total_net']:+.2f} "
+              f"({row['test_trades']} işlem){' [önbellek]' if row['cached'] else ''}")
+
+    summary = summarize(trades[OOS_FIELDS].to_numpy())
+    print("="*60)
+    print(f"Örneklem dışı: {summary['trades']} işlem | net {summary['total_net']:+.2f}% | "
+          f"kazanma {summary['win_rate']:.1f}% | maks. düşüş {summary['max_drawdown']:.2f}%")
+    print(f"Eğitim ortalaması: {folds['train_total_net'].mean():+.2f}% / fold | "
+          f"test ortalaması: {folds['test_total_net'].mean():+.2f}% / fold")
+    for name, counts in stability(folds, grid).items():
+        print(f"  {name}: {counts}")
+    print(f"Süre: {elapsed:.1f}s")
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        folds.to_csv(os.path.join(args.out, 'folds.csv'), index=False)
+        trades.to_csv(os.path.join(args.out, 'trades.csv'), index=False)
+        print(f"Sonuçlar: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())